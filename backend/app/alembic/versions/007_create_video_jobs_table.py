@@ -0,0 +1,52 @@
+"""Create video_jobs table for asynchronous video generation
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+
+- Workflows park on a submitted video job instead of awaiting the render
+- Store the provider job id, state and the checkpoint used to resume
+- Index state so unfinished jobs can be reloaded on startup
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create video_jobs table."""
+    op.create_table(
+        'video_jobs',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('provider_job_id', sa.String(length=255), nullable=False),
+        sa.Column('workflow_id', sa.String(length=255), nullable=False),
+        sa.Column('state', sa.String(length=50), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('submitted_at', sa.DateTime(), nullable=False),
+        sa.Column('deadline_at', sa.DateTime(), nullable=False),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('result', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('context', postgresql.JSON(astext_type=sa.Text()), nullable=False, server_default='{}'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.create_index(op.f('ix_video_jobs_workflow_id'), 'video_jobs', ['workflow_id'], unique=False)
+    op.create_index('ix_video_jobs_state', 'video_jobs', ['state'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop video_jobs table."""
+    op.drop_index('ix_video_jobs_state', table_name='video_jobs')
+    op.drop_index(op.f('ix_video_jobs_workflow_id'), table_name='video_jobs')
+    op.drop_table('video_jobs')
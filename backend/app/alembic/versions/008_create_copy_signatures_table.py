@@ -0,0 +1,46 @@
+"""Create copy_signatures table for near-duplicate copy detection
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+
+- Store one MinHash signature per generated copy variant
+- Index user_id so a merchant's LSH index can be rebuilt in one query
+- One row per (workflow_id, channel); re-runs replace the signature
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create copy_signatures table."""
+    op.create_table(
+        'copy_signatures',
+        sa.Column('id', postgresql.UUID(as_uuid=True), server_default=sa.text('gen_random_uuid()'), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('workflow_id', sa.String(length=255), nullable=False),
+        sa.Column('channel', sa.String(length=50), nullable=False),
+        sa.Column('signature', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('workflow_id', 'channel', name='uq_copy_signatures_workflow_channel'),
+    )
+
+    op.create_index(op.f('ix_copy_signatures_user_id'), 'copy_signatures', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop copy_signatures table."""
+    op.drop_index(op.f('ix_copy_signatures_user_id'), table_name='copy_signatures')
+    op.drop_table('copy_signatures')
@@ -5,6 +5,7 @@ Implements a workflow for generating product images:
 Optimize Prompt -> Generate Image -> Persist Asset
 """
 import asyncio
+import json
 import logging
 import time
 import uuid
@@ -79,6 +80,9 @@ class ImageAgent:
     DEFAULT_MAX_TOKENS = 500
     DEFAULT_WIDTH = 512
     DEFAULT_HEIGHT = 512
+    BATCH_MAX_TOKENS = 4000
+    # Minimum seconds between relayed progress events (previews always go out)
+    PROGRESS_EMIT_INTERVAL = 0.25
     
     # Rate limiting for error logs
     _error_log_times: Dict[str, float] = defaultdict(float)
@@ -314,7 +318,10 @@ class ImageAgent:
             # Call MCP ImageGenerator (using factory/injected generator)
             generator = self._get_image_generator()
             async with generator:
-                artifact = await generator.generate(request)
+                artifact = await generator.generate(
+                    request,
+                    on_progress=self._make_progress_emitter(workflow_id),
+                )
             
             # Update artifact with workflow context
             artifact.original_prompt = state["prompt"]
@@ -354,6 +361,51 @@ class ImageAgent:
             )
             raise
     
+    def _make_progress_emitter(self, workflow_id: str):
+        """
+        Build a callback relaying generator progress as agent:tool_call events.
+        
+        Plain progress updates are throttled to PROGRESS_EMIT_INTERVAL;
+        updates carrying a preview image and the final update
+        (progress == total) are always sent.
+        
+        Args:
+            workflow_id: Workflow ID
+            
+        Returns:
+            Async progress callback for IImageGenerator.generate
+        """
+        last_emit = {"at": 0.0}
+        
+        async def emit_progress(update: Dict[str, Any]) -> None:
+            progress, total = update.get("progress"), update.get("total")
+            final = progress is not None and bool(total) and progress >= total
+            now = time.monotonic()
+            if (
+                not update.get("preview_url")
+                and not final
+                and now - last_emit["at"] < self.PROGRESS_EMIT_INTERVAL
+            ):
+                return
+            last_emit["at"] = now
+            
+            if update.get("message"):
+                message = update["message"]
+            elif progress is not None and total:
+                message = f"Generating image ({progress}/{total})"
+            else:
+                message = "Generating image"
+            
+            await socket_manager.emit_tool_call(
+                workflow_id=workflow_id,
+                tool_name="mcp_image_generator",
+                status="in_progress",
+                message=message,
+                progress=update,
+            )
+        
+        return emit_progress
+    
     async def persist_asset_node(self, state: ImageAgentState) -> ImageAgentState:
         """
         Persist Asset Node: Save image metadata to database.
@@ -368,6 +420,7 @@ class ImageAgent:
             Updated state with asset_id
         """
         from app.application.agents.prompts import IMAGE_PROMPTS
+        from app.application.services.derivative_service import schedule_asset_derivatives
         from app.infrastructure.database import get_session
         from app.infrastructure.repositories.video_asset_repository import VideoAssetRepository
         
@@ -398,6 +451,8 @@ class ImageAgent:
                 asset_id = str(saved_artifact.id)
                 break
             
+            schedule_asset_derivatives(saved_artifact.id, saved_artifact.url)
+            
             # Emit completion thought
             await socket_manager.emit_thought(
                 workflow_id=workflow_id,
@@ -563,3 +618,312 @@ class ImageAgent:
             # Clean up task reference
             _workflow_tasks.pop(workflow_id, None)
 
+    # =========================================================================
+    # Batch methods
+    # =========================================================================
+    
+    async def optimize_prompts_batch(
+        self,
+        prompts: List[str],
+        width: int,
+        height: int,
+    ) -> List[str]:
+        """
+        Optimize several prompts with a single DeepSeek call.
+        
+        Args:
+            prompts: Original prompts (should already be de-duplicated)
+            width: Target image width
+            height: Target image height
+            
+        Returns:
+            Optimized prompts in input order; originals are kept for any
+            entry the model response could not provide
+        """
+        from app.application.agents.prompts import IMAGE_PROMPTS
+        
+        generator = ProviderFactory.get_provider("deepseek")
+        async with generator:
+            response = await generator.generate(
+                GenerationRequest(
+                    prompt=IMAGE_PROMPTS.get_batch_optimize_prompt(prompts, width, height),
+                    model=self.model,
+                    temperature=self.temperature,
+                    max_tokens=min(self.max_tokens * len(prompts), self.BATCH_MAX_TOKENS),
+                )
+            )
+        
+        return self._parse_batch_optimized(response.content, prompts)
+    
+    @staticmethod
+    def _parse_batch_optimized(content: str, prompts: List[str]) -> List[str]:
+        """Parse a JSON array of optimized prompts, falling back to originals."""
+        text = (content or "").strip()
+        try:
+            parsed = json.loads(text[text.index("["):text.rindex("]") + 1])
+        except ValueError:
+            logger.warning("Batch prompt optimization returned non-JSON output, using original prompts")
+            return list(prompts)
+        
+        if not isinstance(parsed, list) or len(parsed) != len(prompts):
+            logger.warning("Batch prompt optimization returned wrong item count, using original prompts")
+            return list(prompts)
+        
+        return [
+            str(optimized).strip() or original
+            for optimized, original in zip(parsed, prompts)
+        ]
+    
+    async def run_batch(
+        self,
+        prompts: List[str],
+        width: int = DEFAULT_WIDTH,
+        height: int = DEFAULT_HEIGHT,
+        workflow_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Generate a batch of images under a single workflow ID.
+        
+        Stages:
+        1. Optimize all distinct prompts in one DeepSeek call
+        2. Generate every item with bounded concurrency over one generator session
+        3. Persist all generated assets in one transaction
+        
+        Each item emits an agent:result event (stage item_generated or
+        item_failed) as soon as it finishes; a final agent:result with
+        stage completed carries every item with its asset ID.
+        
+        Args:
+            prompts: One prompt per image (repeat a prompt for variants)
+            width: Image width in pixels
+            height: Image height in pixels
+            workflow_id: Optional batch workflow ID (generated if not provided)
+            
+        Returns:
+            Dict with workflow_id and per-item results
+        """
+        from app.application.agents.prompts import IMAGE_PROMPTS
+        from app.application.tools.image_tools import get_provider_semaphore
+        
+        workflow_id = workflow_id or str(uuid.uuid4())
+        items: List[Dict[str, Any]] = [
+            {
+                "index": index,
+                "prompt": prompt,
+                "optimized_prompt": None,
+                "status": "pending",
+                "image_url": None,
+                "asset_id": None,
+                "error": None,
+            }
+            for index, prompt in enumerate(prompts)
+        ]
+        _workflow_states[workflow_id] = {
+            "status": "running",
+            "current_stage": "optimize_prompt",
+            "state": {},
+            "items": items,
+        }
+        
+        logger.info(f"Starting batch image workflow {workflow_id} with {len(items)} items")
+        
+        # Stage 1: one optimizer call for all distinct prompts
+        await socket_manager.emit_thought(
+            workflow_id=workflow_id,
+            content=IMAGE_PROMPTS.batch_optimize_start,
+            node_name="optimize_prompt"
+        )
+        distinct = list(dict.fromkeys(prompts))
+        try:
+            optimized = dict(zip(distinct, await self.optimize_prompts_batch(distinct, width, height)))
+        except HTTPClientError as e:
+            await socket_manager.emit_error(
+                workflow_id=workflow_id,
+                error_code="OPTIMIZE_FAILED",
+                error_message=str(e)
+            )
+            raise
+        for item in items:
+            item["optimized_prompt"] = optimized[item["prompt"]]
+        
+        # Stage 2: bounded concurrent generation over a shared generator session
+        _workflow_states[workflow_id]["current_stage"] = "generate_image"
+        await socket_manager.emit_thought(
+            workflow_id=workflow_id,
+            content=IMAGE_PROMPTS.batch_generate_start,
+            node_name="generate_image"
+        )
+        
+        artifacts: Dict[int, ImageArtifact] = {}
+        semaphore = asyncio.Semaphore(max(1, settings.image_scene_concurrency))
+        provider_semaphore = get_provider_semaphore()
+        
+        async def generate_item(generator: IImageGenerator, item: Dict[str, Any]) -> None:
+            async with semaphore, provider_semaphore:
+                try:
+                    artifact = await generator.generate(
+                        ImageGenerationRequest(
+                            prompt=item["optimized_prompt"],
+                            width=width,
+                            height=height,
+                        )
+                    )
+                except Exception as e:
+                    item["status"] = "failed"
+                    item["error"] = str(e)
+                    logger.warning(f"Batch {workflow_id} item {item['index']} failed: {e}")
+                    await socket_manager.emit_result(
+                        workflow_id=workflow_id,
+                        result_data={
+                            "batchIndex": item["index"],
+                            "error": str(e),
+                            "stage": "item_failed",
+                        }
+                    )
+                    return
+            
+            artifact.original_prompt = item["prompt"]
+            artifact.workflow_id = workflow_id
+            artifacts[item["index"]] = artifact
+            item["status"] = "generated"
+            item["image_url"] = artifact.url
+            await socket_manager.emit_result(
+                workflow_id=workflow_id,
+                result_data={
+                    "batchIndex": item["index"],
+                    "imageUrl": artifact.url,
+                    "optimizedPrompt": item["optimized_prompt"],
+                    "stage": "item_generated",
+                }
+            )
+        
+        generator = self._get_image_generator()
+        async with generator:
+            await asyncio.gather(*[generate_item(generator, item) for item in items])
+        
+        if not artifacts:
+            raise RuntimeError("All batch items failed to generate")
+        
+        # Stage 3: persist every generated asset in one transaction
+        _workflow_states[workflow_id]["current_stage"] = "persist_asset"
+        await self._persist_batch(items, artifacts)
+        
+        await socket_manager.emit_thought(
+            workflow_id=workflow_id,
+            content=IMAGE_PROMPTS.batch_persist_complete,
+            node_name="persist_asset"
+        )
+        await socket_manager.emit_result(
+            workflow_id=workflow_id,
+            result_data={
+                "items": [
+                    {
+                        "batchIndex": item["index"],
+                        "imageUrl": item["image_url"],
+                        "assetId": item["asset_id"],
+                        "optimizedPrompt": item["optimized_prompt"],
+                        "status": item["status"],
+                        "error": item["error"],
+                    }
+                    for item in items
+                ],
+                "stage": "completed",
+            }
+        )
+        
+        _workflow_states[workflow_id]["status"] = "completed"
+        _workflow_states[workflow_id]["current_stage"] = "completed"
+        
+        logger.info(
+            f"Batch image workflow {workflow_id} completed: "
+            f"{len(artifacts)}/{len(items)} items generated"
+        )
+        return {"workflow_id": workflow_id, "items": items}
+    
+    async def _persist_batch(
+        self,
+        items: List[Dict[str, Any]],
+        artifacts: Dict[int, ImageArtifact],
+    ) -> None:
+        """Persist generated batch artifacts in a single transaction."""
+        from app.application.services.derivative_service import schedule_asset_derivatives
+        from app.infrastructure.database import get_session_context
+        from app.infrastructure.repositories.video_asset_repository import VideoAssetRepository
+        
+        indexes = sorted(artifacts)
+        async with get_session_context() as session:
+            repo = VideoAssetRepository(session)
+            saved = await repo.create_many([artifacts[index] for index in indexes])
+        
+        for index, saved_artifact in zip(indexes, saved):
+            items[index]["asset_id"] = str(saved_artifact.id)
+            items[index]["status"] = "completed"
+            schedule_asset_derivatives(saved_artifact.id, saved_artifact.url)
+    
+    async def run_batch_async(
+        self,
+        prompts: List[str],
+        width: int = DEFAULT_WIDTH,
+        height: int = DEFAULT_HEIGHT,
+        workflow_id: Optional[str] = None,
+    ) -> str:
+        """
+        Start a batch workflow asynchronously and return its workflow_id.
+        
+        Args:
+            prompts: One prompt per image
+            width: Image width in pixels
+            height: Image height in pixels
+            workflow_id: Optional batch workflow ID (generated if not provided)
+            
+        Returns:
+            Batch workflow_id for tracking
+        """
+        workflow_id = workflow_id or str(uuid.uuid4())
+        
+        task = asyncio.create_task(
+            self._run_batch_with_error_handling(
+                prompts=prompts,
+                width=width,
+                height=height,
+                workflow_id=workflow_id,
+            )
+        )
+        _workflow_tasks[workflow_id] = task
+        
+        return workflow_id
+    
+    async def _run_batch_with_error_handling(
+        self,
+        prompts: List[str],
+        width: int,
+        height: int,
+        workflow_id: str,
+    ) -> None:
+        """Run batch workflow with error handling for background execution."""
+        try:
+            await self.run_batch(
+                prompts=prompts,
+                width=width,
+                height=height,
+                workflow_id=workflow_id,
+            )
+        except asyncio.CancelledError:
+            logger.info(f"Batch workflow {workflow_id} was cancelled")
+            await socket_manager.emit_error(
+                workflow_id=workflow_id,
+                error_code="WORKFLOW_CANCELLED",
+                error_message="Workflow was cancelled by user"
+            )
+        except Exception as e:
+            logger.error(f"Batch workflow {workflow_id} failed: {e}")
+            if workflow_id in _workflow_states:
+                _workflow_states[workflow_id]["status"] = "failed"
+                _workflow_states[workflow_id]["error"] = str(e)
+            await socket_manager.emit_error(
+                workflow_id=workflow_id,
+                error_code="WORKFLOW_FAILED",
+                error_message=str(e)
+            )
+        finally:
+            _workflow_tasks.pop(workflow_id, None)
@@ -5,10 +5,17 @@ Analyzes product images and context to extract key information for content gener
 """
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from uuid import UUID
 
 from app.application.tools import ToolRegistry
+from app.infrastructure.storage.input_image import (
+    InputImage,
+    InputImageError,
+    InputImageLoader,
+    get_input_image_loader,
+)
+from app.infrastructure.vision.analysis_cache import AnalysisCache
 
 logger = logging.getLogger(__name__)
 
@@ -22,16 +29,41 @@ class ProductAnalysisAgent:
     - Key features and materials
     - Target audience
     - Suggested marketing angles
+
+    The input image is loaded once through the shared InputImageLoader
+    (saved to <workspace>/input/) and its bytes are handed to the vision
+    tools. Results are cached by image content and background text; a
+    request with options.use_analysis_cache=False always re-analyzes.
     """
 
-    def __init__(self, tools: ToolRegistry):
+    # Bump when the analysis prompt or output structure changes
+    ANALYSIS_VERSION = "1"
+
+    def __init__(
+        self,
+        tools: ToolRegistry,
+        cache: Optional[AnalysisCache] = None,
+        image_loader: Optional[InputImageLoader] = None,
+    ):
         """
         Initialize product analysis agent.
 
         Args:
             tools: ToolRegistry instance
+            cache: Analysis cache (default: the process-wide cache when
+                ANALYSIS_CACHE_ENABLED)
+            image_loader: Input image loader (default: the process-wide loader)
         """
         self.tools = tools
+        self.image_loader = image_loader
+        if cache is None:
+            from app.core.config import settings
+
+            if settings.analysis_cache_enabled:
+                from app.infrastructure.vision.analysis_cache import product_analysis_cache
+
+                cache = product_analysis_cache
+        self.cache = cache
 
     async def run(
         self,
@@ -71,10 +103,30 @@ class ProductAnalysisAgent:
         try:
             # Resolve input image
             image_source = self._resolve_input_image(request)
+            image = await self._load_input_image(image_source, workspace)
+
+            cache_key = None
+            use_cache = request.get("options", {}).get("use_analysis_cache", True)
+            if self.cache is not None and image is not None and use_cache:
+                cache_key = self.cache.make_key(
+                    image.digest,
+                    request.get("background", ""),
+                    self._cache_version(),
+                )
+            if cache_key is not None:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    logger.info(f"Analysis cache hit for image: {image_source}")
+                    self._save_analysis_report(cached, f"{workspace}/workspace/analysis_report.md")
+                    return cached
+
             logger.info(f"Analyzing image: {image_source}")
 
             # Analyze image using vision tools
-            analysis = await self.tools.vision.analyze_product_image(image_source)
+            analysis = await self.tools.vision.analyze_product_image(
+                image_source,
+                image_bytes=image.data if image is not None else None,
+            )
             logger.info(f"Vision analysis complete: {analysis.get('category', 'unknown')}")
 
             # Enhance with background context
@@ -88,6 +140,9 @@ class ProductAnalysisAgent:
             self._save_analysis_report(enhanced_analysis, report_path)
             logger.info(f"Analysis report saved to: {report_path}")
 
+            if cache_key is not None:
+                self.cache.set(cache_key, enhanced_analysis)
+
             return enhanced_analysis
 
         except Exception as e:
@@ -120,6 +175,40 @@ class ProductAnalysisAgent:
 
         raise ValueError("Either image_url or image_asset_id is required")
 
+    async def _load_input_image(self, image_source: str, workspace: str) -> Optional[InputImage]:
+        """
+        Load the input image once for all stages.
+
+        Args:
+            image_source: Resolved image URL
+            workspace: Workspace directory path
+
+        Returns:
+            InputImage, or None if the image cannot be loaded (analysis then
+            proceeds from the URL alone, without caching)
+        """
+        if not image_source.startswith(("http://", "https://")):
+            return None
+        loader = self.image_loader or get_input_image_loader()
+        try:
+            return await loader.load(image_source, workspace)
+        except InputImageError as e:
+            logger.warning(f"Could not load input image: {e}")
+            return None
+
+    def _cache_version(self) -> str:
+        """Version stamp of the analysis prompt and vision model."""
+        from app.core.config import settings
+
+        vision_client = getattr(self.tools.vision, "vision_client", None)
+        if vision_client is None:
+            model = "mock"
+        else:
+            model = getattr(vision_client, "model", None) or type(vision_client).__name__
+        return ":".join(
+            part for part in (self.ANALYSIS_VERSION, model, settings.analysis_cache_version) if part
+        )
+
     async def _enhance_with_context(
         self,
         base_analysis: Dict[str, Any],
@@ -4,7 +4,7 @@ Prompt templates for Image Generation Agent.
 Provides prompts for prompt optimization workflow.
 """
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
 
 
 @dataclass
@@ -18,6 +18,9 @@ class ImagePrompts:
     generate_complete: str = "✅ 图像生成完成"
     persist_start: str = "💾 正在保存图像资产..."
     persist_complete: str = "✅ 图像已保存"
+    batch_optimize_start: str = "🎨 正在批量优化图像描述..."
+    batch_generate_start: str = "🖼️ 正在批量生成图像..."
+    batch_persist_complete: str = "✅ 批量图像已保存"
     
     @staticmethod
     def get_optimize_prompt(user_prompt: str, width: int, height: int, style: Optional[str] = None) -> str:
@@ -66,5 +69,39 @@ Output ONLY the optimized prompt, no explanations or prefixes."""
         
         return base_prompt
 
+    @staticmethod
+    def get_batch_optimize_prompt(user_prompts: List[str], width: int, height: int) -> str:
+        """
+        Generate prompt for DeepSeek to optimize several image descriptions at once.
+        
+        Args:
+            user_prompts: Original user prompts
+            width: Target image width
+            height: Target image height
+            
+        Returns:
+            System prompt for DeepSeek requesting a JSON array response
+        """
+        numbered = "\n".join(
+            f'{i + 1}. "{prompt}"' for i, prompt in enumerate(user_prompts)
+        )
+        
+        return f"""You are an expert at crafting prompts for AI image generation.
+
+Your task is to enhance and optimize each of the following image descriptions to produce the best possible images.
+
+Original descriptions:
+{numbered}
+Target dimensions: {width}x{height} pixels
+
+Guidelines:
+1. Add specific details about lighting, composition, and style
+2. Include artistic direction (photorealistic, illustration, 3D render, etc.) matching each description
+3. Describe textures, colors, and atmosphere
+4. Keep the core subject matter from each original prompt
+5. Make each prompt concise but descriptive (max 200 words)
+
+Output ONLY a JSON array of {len(user_prompts)} strings, one optimized prompt per description, in the same order. No explanations or prefixes."""
+
 
 IMAGE_PROMPTS = ImagePrompts()
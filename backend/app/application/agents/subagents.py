@@ -4,12 +4,16 @@ Subagents
 Wrapper adapters for existing CopywritingAgent and ImageAgent.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any
-from uuid import UUID
+import time
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID, uuid4
 
 from app.application.agents.copywriting_agent import CopywritingAgent
 from app.application.agents.image_agent import ImageAgent
+from app.core.config import settings
+from app.interface.ws.socket_manager import socket_manager
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +25,8 @@ class CopywritingSubagent:
     Wraps the existing CopywritingAgent to provide a simplified interface.
     """
 
+    CHANNELS = ["product_page", "social_post", "ad_short"]
+
     def __init__(self, agent: CopywritingAgent, tools):
         """
         Initialize copywriting subagent.
@@ -37,6 +43,8 @@ class CopywritingSubagent:
         analysis: Dict[str, Any],
         request: Dict[str, Any],
         workspace: str,
+        channels: Optional[List[str]] = None,
+        version: int = 1,
     ) -> list[Dict[str, Any]]:
         """
         Generate copywriting for product.
@@ -45,6 +53,9 @@ class CopywritingSubagent:
             analysis: Product analysis data
             request: Original request dict
             workspace: Workspace directory path
+            channels: Channels to generate (default: all CHANNELS); used to
+                regenerate only the variants that failed QA
+            version: Version suffix of the saved files
 
         Returns:
             List of copywriting assets:
@@ -65,23 +76,28 @@ class CopywritingSubagent:
             product_name = analysis.get("category", "Product")
             features = analysis.get("key_features", [])
 
-            # Run existing copywriting agent
+            # Run existing copywriting agent; its thoughts go to the package owner
+            agent_workflow_id = str(uuid4())
+            socket_manager.register_workflow(agent_workflow_id, request.get("user_id"))
             result = await self.agent.run(
                 product_name=product_name,
                 features=features,
                 brand_guidelines=request.get("background", ""),
+                workflow_id=agent_workflow_id,
             )
 
             # Save each output variant
             outputs = []
-            channels = ["product_page", "social_post", "ad_short"]
 
-            for i, channel in enumerate(channels):
+            for i, channel in enumerate(self.CHANNELS):
+                if channels is not None and channel not in channels:
+                    continue
+
                 # Get content from result
                 content = result.get("final_copy", "")
 
                 # Generate path
-                path = f"{workspace}/artifacts/copy/{channel}_v1.md"
+                path = f"{workspace}/artifacts/copy/{channel}_v{version}.md"
 
                 # Save to file
                 self.tools.filesystem.write_file(path, content)
@@ -106,32 +122,49 @@ class ImageSubagent:
     Adapter for ImageAgent to work with DeepOrchestrator.
 
     Wraps the existing ImageAgent to provide a simplified interface.
+    Scenes are generated concurrently, bounded by a per-workflow semaphore
+    here and by the global provider semaphore inside ImageTools.
     """
 
-    def __init__(self, agent: ImageAgent, tools):
+    def __init__(self, agent: ImageAgent, tools, max_concurrency: Optional[int] = None):
         """
         Initialize image subagent.
 
         Args:
             agent: Existing ImageAgent instance
             tools: ToolRegistry for image operations
+            max_concurrency: Default per-workflow scene concurrency
+                (defaults to settings.image_scene_concurrency)
         """
         self.agent = agent
         self.tools = tools
+        self.max_concurrency = max_concurrency or settings.image_scene_concurrency
 
     async def run(
         self,
         analysis: Dict[str, Any],
         request: Dict[str, Any],
         workspace: str,
+        check: Optional[Callable[[str, Dict[str, Any]], List[str]]] = None,
+        max_regenerations: int = 0,
     ) -> list[Dict[str, Any]]:
         """
         Generate images for product.
 
+        Scenes run concurrently; results keep scene order. A failing scene is
+        logged and skipped so the remaining scenes are still returned. Only
+        when every scene fails is an error raised.
+
+        With a check, each image is checked as soon as it is rendered and,
+        while it has blocking issues, regenerated up to max_regenerations
+        times before it is saved. A scene that never passes counts as failed.
+
         Args:
             analysis: Product analysis data
             request: Original request dict
             workspace: Workspace directory path
+            check: Returns the blocking QA issues of (scene, generation result)
+            max_regenerations: Extra attempts per blocking image
 
         Returns:
             List of image assets:
@@ -140,7 +173,8 @@ class ImageSubagent:
                     "scene": "hero",
                     "url": "https://...",
                     "asset_id": "uuid",
-                    "label": "hero"
+                    "label": "hero",
+                    "duration_ms": 1234
                 },
                 ...
             ]
@@ -152,10 +186,55 @@ class ImageSubagent:
             scenes = analysis.get("suggested_scenes", ["hero", "lifestyle", "detail"])
             options = request.get("options", {})
             num_variants = min(options.get("image_variants", 3), len(scenes))
+            concurrency = max(1, options.get("image_concurrency") or self.max_concurrency)
+
+            semaphore = asyncio.Semaphore(concurrency)
+            outcomes = await asyncio.gather(*[
+                self._generate_scene(scene, analysis, request, semaphore, check, max_regenerations)
+                for scene in scenes[:num_variants]
+            ])
 
-            results = []
+            results = [outcome["asset"] for outcome in outcomes if outcome.get("asset")]
+            failures = [outcome for outcome in outcomes if outcome["status"] == "failed"]
 
-            for i, scene in enumerate(scenes[:num_variants]):
+            self._save_timing_report(outcomes, concurrency, workspace)
+
+            if failures and len(failures) == len(outcomes):
+                errors = "; ".join(f"{f['scene']}: {f['error']}" for f in failures)
+                raise RuntimeError(f"All scenes failed: {errors}")
+
+            logger.info(
+                f"Generated {len(results)} image assets "
+                f"({len(failures)} failed, concurrency={concurrency})"
+            )
+            return results
+
+        except Exception as e:
+            logger.error(f"Image generation failed: {str(e)}", exc_info=True)
+            raise RuntimeError(f"Image generation failed: {str(e)}")
+
+    async def _generate_scene(
+        self,
+        scene: str,
+        analysis: Dict[str, Any],
+        request: Dict[str, Any],
+        semaphore: asyncio.Semaphore,
+        check: Optional[Callable[[str, Dict[str, Any]], List[str]]] = None,
+        max_regenerations: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        Generate and save a single scene image.
+
+        Never raises; failures are reported in the returned outcome.
+
+        Returns:
+            Outcome dict with scene, status, duration_ms, attempts, error
+            and asset
+        """
+        async with semaphore:
+            started = time.perf_counter()
+            attempts = 0
+            try:
                 # Build prompt for this scene
                 prompt = self.tools.vision.build_image_generation_prompt(
                     scene=scene,
@@ -163,17 +242,26 @@ class ImageSubagent:
                     background=request.get("background", ""),
                 )
 
-                # Generate image
-                artifact = await self.tools.image.generate_image(
-                    prompt=prompt,
-                    width=1024,
-                    height=1024,
-                )
+                # Generate image, regenerating while QA finds blocking issues
+                while True:
+                    attempts += 1
+                    artifact = await self.tools.image.generate_image(
+                        prompt=prompt,
+                        width=1024,
+                        height=1024,
+                    )
+                    blocking = check(scene, artifact) if check is not None else []
+                    if not blocking:
+                        break
+                    if attempts > max_regenerations:
+                        raise RuntimeError(f"QA: {'; '.join(blocking)}")
+                    logger.info(f"Scene '{scene}' failed QA ({'; '.join(blocking)}); regenerating")
 
                 # Save asset
                 user_id = request.get("user_id")
                 workflow_id = request.get("workflow_id")
 
+                asset = None
                 if user_id and workflow_id:
                     saved = await self.tools.image.save_asset(
                         artifact=artifact,
@@ -181,15 +269,49 @@ class ImageSubagent:
                         workflow_id=workflow_id,
                         label=scene,
                     )
-
-                    results.append({
-                        "scene": scene,
-                        **saved,
-                    })
-
-            logger.info(f"Generated {len(results)} image assets")
-            return results
-
+                    asset = {"scene": scene, **saved}
+
+                duration_ms = int((time.perf_counter() - started) * 1000)
+                if asset is not None:
+                    asset["duration_ms"] = duration_ms
+                logger.info(f"Scene '{scene}' generated in {duration_ms}ms")
+
+                return {
+                    "scene": scene,
+                    "status": "completed",
+                    "duration_ms": duration_ms,
+                    "attempts": attempts,
+                    "error": None,
+                    "asset": asset,
+                }
+
+            except Exception as e:
+                duration_ms = int((time.perf_counter() - started) * 1000)
+                logger.warning(f"Scene '{scene}' failed after {duration_ms}ms: {str(e)}")
+                return {
+                    "scene": scene,
+                    "status": "failed",
+                    "duration_ms": duration_ms,
+                    "attempts": attempts,
+                    "error": str(e),
+                    "asset": None,
+                }
+
+    def _save_timing_report(
+        self,
+        outcomes: list[Dict[str, Any]],
+        concurrency: int,
+        workspace: str,
+    ) -> None:
+        """Write per-scene timings to the workspace logs directory."""
+        report = {
+            "concurrency": concurrency,
+            "scenes": [
+                {key: outcome.get(key) for key in ("scene", "status", "duration_ms", "attempts", "error")}
+                for outcome in outcomes
+            ],
+        }
+        try:
+            self.tools.filesystem.write_json(f"{workspace}/logs/image_generation.json", report)
         except Exception as e:
-            logger.error(f"Image generation failed: {str(e)}", exc_info=True)
-            raise RuntimeError(f"Image generation failed: {str(e)}")
+            logger.warning(f"Failed to save image timing report: {str(e)}")
@@ -5,10 +5,11 @@ Generates product videos with automatic slideshow fallback.
 """
 
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from uuid import UUID
 
 from app.application.tools import ToolRegistry
+from app.infrastructure.video.jobs import JOB_SUCCEEDED, VideoJob, VideoJobManager
 
 logger = logging.getLogger(__name__)
 
@@ -20,17 +21,23 @@ class VideoGenerationAgent:
     Strategy:
     1. Try primary video generation (e.g., Runway, Pika)
     2. On timeout (30s) or error, fallback to slideshow
+       (rendered in parallel when VIDEO_RACE_SLIDESHOW is on)
     3. Always returns a valid video asset
+
+    With a VideoJobManager the render is submitted as a job instead
+    (submit_job) and the asset is saved when the job finishes (complete_job).
     """
 
-    def __init__(self, tools: ToolRegistry):
+    def __init__(self, tools: ToolRegistry, video_jobs: Optional[VideoJobManager] = None):
         """
         Initialize video generation agent.
 
         Args:
             tools: ToolRegistry instance
+            video_jobs: Manager for asynchronous video jobs (optional)
         """
         self.tools = tools
+        self.video_jobs = video_jobs
 
     async def run(
         self,
@@ -87,28 +94,154 @@ class VideoGenerationAgent:
                 f"(fallback: {video_artifact.get('is_fallback', False)})"
             )
 
-            # Save asset to database
-            user_id = request.get("user_id")
-            workflow_id = request.get("workflow_id")
+            return await self._save(video_artifact, request, workspace)
+
+        except Exception as e:
+            logger.error(f"Video generation failed: {str(e)}", exc_info=True)
+            raise RuntimeError(f"Video generation failed: {str(e)}")
+
+    async def submit_job(
+        self,
+        analysis: Dict[str, Any],
+        image_assets: List[Dict[str, Any]],
+        request: Dict[str, Any],
+        workflow_id: str,
+        context: Dict[str, Any],
+    ) -> VideoJob:
+        """
+        Submit the video as an asynchronous job.
+
+        Args:
+            analysis: Product analysis data
+            image_assets: List of generated image assets
+            request: Original request dict with options
+            workflow_id: Workflow to resume when the job finishes
+            context: JSON-serializable workflow checkpoint
+
+        Returns:
+            Submitted VideoJob
+
+        Raises:
+            RuntimeError: If no job manager is configured
+            VideoJobError: If the provider rejects the job
+        """
+        if self.video_jobs is None:
+            raise RuntimeError("Video job manager not configured")
+
+        prompt = self._build_video_prompt(analysis, request.get("background", ""))
+        image_urls = [asset.get("url", "") for asset in image_assets]
+        duration = request.get("options", {}).get("video_duration_sec", 15)
+
+        return await self.video_jobs.submit(
+            prompt=prompt,
+            images=image_urls,
+            duration=duration,
+            workflow_id=workflow_id,
+            context={
+                **context,
+                "video": {"prompt": prompt, "images": image_urls, "duration": duration},
+            },
+        )
+
+    async def complete_job(
+        self,
+        job: VideoJob,
+        request: Dict[str, Any],
+        workspace: str,
+    ) -> Dict[str, Any]:
+        """
+        Save the video of a finished job, or a slideshow if it failed.
+
+        Args:
+            job: Job in a terminal state
+            request: Original request dict
+            workspace: Workspace directory path
+
+        Returns:
+            Video asset dict (see run)
+        """
+        video = job.context.get("video", {})
+        prompt = video.get("prompt", "")
+
+        if job.state == JOB_SUCCEEDED and (job.result or {}).get("url"):
+            video_artifact = {
+                "prompt": prompt,
+                "duration": video.get("duration"),
+                **job.result,
+                "is_fallback": False,
+            }
+        else:
+            logger.warning(
+                f"Video job {job.job_id} {job.state} ({job.error}), falling back to slideshow"
+            )
+            video_artifact = await self.tools.video.create_slideshow(
+                images=video.get("images", []),
+                captions=[prompt] if prompt else [],
+                duration_sec=video.get("duration", 15),
+            )
+            video_artifact["is_fallback"] = True
+
+        return await self._save(video_artifact, request, workspace)
+
+    async def _save(
+        self,
+        video_artifact: Dict[str, Any],
+        request: Dict[str, Any],
+        workspace: str,
+    ) -> Dict[str, Any]:
+        """
+        Persist a video artifact when the request identifies its owner.
 
-            if user_id and workflow_id:
-                saved_asset = await self.tools.video.save_asset(
-                    artifact=video_artifact,
-                    user_id=UUID(user_id) if isinstance(user_id, str) else user_id,
-                    workflow_id=workflow_id,
-                )
+        A slideshow that finished alongside a winning primary video
+        (video_artifact["secondary"]) is saved as its own asset and returned
+        under "secondary".
+        """
+        user_id = request.get("user_id")
+        workflow_id = request.get("workflow_id")
+
+        if user_id and workflow_id:
+            user_uuid = UUID(user_id) if isinstance(user_id, str) else user_id
+            secondary = video_artifact.pop("secondary", None)
+            saved_asset = await self.tools.video.save_asset(
+                artifact=video_artifact,
+                user_id=user_uuid,
+                workflow_id=workflow_id,
+            )
+            if secondary is not None:
+                saved_secondary = await self._save_secondary(secondary, user_uuid, workflow_id)
+                if saved_secondary is not None:
+                    saved_asset["secondary"] = saved_secondary
 
-                # Save metadata to workspace
-                self._save_video_metadata(saved_asset, workspace)
+            # Save metadata to workspace
+            self._save_video_metadata(saved_asset, workspace)
 
-                return saved_asset
-            else:
-                # Return unsaved artifact
-                return video_artifact
+            return saved_asset
+        else:
+            # Return unsaved artifact
+            return video_artifact
 
+    async def _save_secondary(
+        self,
+        slideshow: Dict[str, Any],
+        user_id: UUID,
+        workflow_id: str,
+    ) -> Optional[Dict[str, Any]]:
+        """Save the raced slideshow kept next to the primary video; None on failure."""
+        artifact = {
+            **slideshow,
+            "is_fallback": True,
+            "metadata": {**slideshow.get("metadata", {}), "role": "secondary"},
+        }
+        try:
+            return await self.tools.video.save_asset(
+                artifact=artifact,
+                user_id=user_id,
+                workflow_id=workflow_id,
+            )
         except Exception as e:
-            logger.error(f"Video generation failed: {str(e)}", exc_info=True)
-            raise RuntimeError(f"Video generation failed: {str(e)}")
+            # The primary video is already saved; losing the spare is not fatal
+            logger.warning(f"Failed to save secondary slideshow: {str(e)}")
+            return None
 
     def _build_video_prompt(
         self,
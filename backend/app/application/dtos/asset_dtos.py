@@ -5,7 +5,7 @@ Pydantic models for Asset Gallery API request/response.
 Uses camelCase aliases for frontend compatibility.
 """
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 from pydantic import BaseModel, Field, ConfigDict
 from pydantic.alias_generators import to_camel
@@ -26,6 +26,11 @@ class GalleryAssetDTO(BaseModel):
     tag: str = Field(..., description="Short tag: IMG, VIDEO, COPY, EMAIL")
     meta: str = Field(..., description="Meta information string")
     url: Optional[str] = Field(None, description="Asset URL (null for text assets)")
+    thumbnail_url: Optional[str] = Field(None, description="Small WebP rendition URL (falls back to url)")
+    medium_url: Optional[str] = Field(None, description="Medium WebP rendition URL (falls back to url)")
+    sources: Optional[Dict[str, Dict[str, str]]] = Field(
+        None, description="All renditions: size -> format (webp/avif) -> URL"
+    )
     content: Optional[str] = Field(None, description="Text content for copy assets")
     is_vertical: bool = Field(..., description="Whether asset is vertically oriented")
     is_text: bool = Field(..., description="Whether this is a text asset")
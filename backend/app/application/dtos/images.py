@@ -4,9 +4,13 @@ Image Generation DTOs.
 Pydantic models for image generation API request/response.
 """
 
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+
+# Upper bound on images produced by a single batch request
+MAX_BATCH_ITEMS = 16
 
 
 class ImageGenerationAPIRequest(BaseModel):
@@ -34,6 +38,64 @@ class ImageGenerationAPIRequest(BaseModel):
     model_config = {"extra": "forbid"}
 
 
+class ImageBatchGenerationAPIRequest(BaseModel):
+    """Request model for batch image generation.
+    
+    Provide either several prompts or a single prompt; each prompt is
+    rendered ``variants`` times.
+    """
+    
+    prompts: Optional[List[str]] = Field(
+        None,
+        description="Text descriptions of the images to generate",
+        min_length=1,
+        max_length=MAX_BATCH_ITEMS
+    )
+    prompt: Optional[str] = Field(
+        None,
+        description="Single text description to render multiple variants of",
+        min_length=1,
+        max_length=2000
+    )
+    variants: int = Field(
+        default=1,
+        description="Number of images to generate per prompt",
+        ge=1,
+        le=MAX_BATCH_ITEMS
+    )
+    width: int = Field(
+        default=512,
+        description="Image width in pixels",
+        ge=256,
+        le=2048
+    )
+    height: int = Field(
+        default=512,
+        description="Image height in pixels",
+        ge=256,
+        le=2048
+    )
+    
+    model_config = {"extra": "forbid"}
+    
+    @model_validator(mode="after")
+    def check_prompts(self):
+        """Validate prompt source and total batch size."""
+        if bool(self.prompts) == bool(self.prompt):
+            raise ValueError("Exactly one of prompts or prompt is required")
+        for prompt in self.prompts or []:
+            if not prompt.strip() or len(prompt) > 2000:
+                raise ValueError("Each prompt must be 1-2000 characters")
+        if len(self.expanded_prompts()) > MAX_BATCH_ITEMS:
+            raise ValueError(f"A batch may contain at most {MAX_BATCH_ITEMS} images")
+        return self
+    
+    def expanded_prompts(self) -> List[str]:
+        """Return one prompt per image to generate."""
+        prompts = self.prompts or [self.prompt]
+        return [prompt for prompt in prompts for _ in range(self.variants)]
+
+
 class ImageGenerationAPIResponse(BaseModel):
     """Response model for image generation initiation."""
     
@@ -42,6 +104,27 @@ class ImageGenerationAPIResponse(BaseModel):
     message: str = Field(..., description="Status message")
 
 
+class ImageBatchGenerationAPIResponse(BaseModel):
+    """Response model for batch image generation initiation."""
+    
+    workflow_id: str = Field(..., description="Batch workflow ID shared by all items")
+    status: str = Field(..., description="Workflow status (starting)")
+    item_count: int = Field(..., description="Number of images in the batch")
+    message: str = Field(..., description="Status message")
+
+
+class ImageBatchItemStatus(BaseModel):
+    """Status of a single item in a batch workflow."""
+    
+    index: int = Field(..., description="Position of the item in the batch")
+    prompt: str = Field(..., description="Original prompt")
+    optimized_prompt: Optional[str] = Field(None, description="DeepSeek optimized prompt")
+    status: str = Field(..., description="Item status (pending, generated, completed, failed)")
+    image_url: Optional[str] = Field(None, description="Generated image URL")
+    asset_id: Optional[str] = Field(None, description="Persisted asset UUID")
+    error: Optional[str] = Field(None, description="Error message if failed")
+
+
 class ImageStatusResponse(BaseModel):
     """Response model for image workflow status query."""
     
@@ -70,6 +153,10 @@ class ImageStatusResponse(BaseModel):
         None, 
         description="Error message if failed"
     )
+    items: Optional[List[ImageBatchItemStatus]] = Field(
+        None,
+        description="Per-item results for batch workflows"
+    )
 
 
 class ImageCancelResponse(BaseModel):
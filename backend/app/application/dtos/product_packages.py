@@ -4,7 +4,7 @@ Product Package DTOs
 Data transfer objects for product package API.
 """
 
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field, HttpUrl, model_validator
@@ -15,9 +15,11 @@ class ProductPackageOptions(BaseModel):
 
     copy_variants: int = Field(default=2, ge=1, le=5, description="Number of copywriting variants")
     image_variants: int = Field(default=3, ge=1, le=8, description="Number of image variants")
+    image_concurrency: Optional[int] = Field(default=None, ge=1, le=8, description="Maximum concurrent scene renders (defaults to server setting)")
     video_duration_sec: int = Field(default=15, ge=6, le=60, description="Video duration in seconds")
     require_approval: bool = Field(default=True, description="Whether manual approval is required")
     force_fallback_video: bool = Field(default=False, description="Force slideshow fallback for video")
+    use_analysis_cache: bool = Field(default=True, description="Reuse a cached analysis of the same image and background")
 
 
 class ProductPackageRequest(BaseModel):
@@ -144,3 +146,25 @@ class ApproveResponse(BaseModel):
     decision: str = Field(..., description="Decision made")
     status: str = Field(..., description="New status")
     comment: Optional[str] = Field(default=None, description="Comment")
+
+
+class DuplicateCopyMember(BaseModel):
+    """One copy variant in a near-duplicate cluster."""
+
+    workflow_id: str = Field(..., description="Workflow that produced the copy")
+    channel: str = Field(..., description="Copy channel")
+
+
+class DuplicateCopyCluster(BaseModel):
+    """Copy variants that near-duplicate each other."""
+
+    size: int = Field(..., description="Number of copy variants")
+    workflow_ids: List[str] = Field(..., description="Workflows sharing the copy")
+    members: List[DuplicateCopyMember] = Field(..., description="Copy variants")
+
+
+class DuplicateCopyClustersResponse(BaseModel):
+    """Near-duplicate copy clusters of the current user."""
+
+    enabled: bool = Field(..., description="Whether duplicate detection is enabled")
+    clusters: List[DuplicateCopyCluster] = Field(default_factory=list, description="Clusters, largest first")
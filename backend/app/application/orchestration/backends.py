@@ -5,7 +5,11 @@ Provides backend implementations for agent execution.
 """
 
 import logging
-from typing import Any, Dict
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from app.infrastructure.video.jobs import VideoJobProvider, VideoJobStatus
 
 logger = logging.getLogger(__name__)
 
@@ -32,8 +36,6 @@ class MockVideoProvider(ProviderBackend):
         duration: int,
     ) -> Dict[str, Any]:
         """Generate mock video."""
-        import uuid
-
         return {
             "url": f"mock://video/{uuid.uuid4()}",
             "provider": "mock_video",
@@ -58,8 +60,6 @@ class MockSlideshowProvider(ProviderBackend):
         transition: str = "fade",
     ) -> Dict[str, Any]:
         """Create mock slideshow."""
-        import uuid
-
         return {
             "url": f"mock://slideshow/{uuid.uuid4()}",
             "provider": "slideshow",
@@ -71,3 +71,59 @@ class MockSlideshowProvider(ProviderBackend):
                 "captions": captions,
             },
         }
+
+
+class MockVideoJobProvider(VideoJobProvider):
+    """
+    Mock submit/poll video provider for development/testing.
+
+    Jobs report pending until render_seconds have passed, then succeed.
+    """
+
+    name = "mock_video"
+
+    def __init__(self, render_seconds: float = 30.0):
+        self.render_seconds = render_seconds
+        self._submitted: Dict[str, float] = {}
+
+    async def submit(
+        self,
+        prompt: str,
+        images: list[str],
+        duration: int,
+        callback_url: Optional[str] = None,
+    ) -> str:
+        """Submit mock render."""
+        job_id = f"mock-{uuid.uuid4()}"
+        self._submitted[job_id] = time.monotonic()
+        return job_id
+
+    async def poll(self, provider_job_id: str) -> VideoJobStatus:
+        """Poll mock render."""
+        submitted = self._submitted.get(provider_job_id)
+        if submitted is None:
+            return VideoJobStatus(state="failed", error="Unknown job")
+        if time.monotonic() - submitted < self.render_seconds:
+            return VideoJobStatus(state="pending")
+        self._submitted.pop(provider_job_id, None)
+        return VideoJobStatus(
+            state="succeeded",
+            result={
+                "url": f"mock://video/{provider_job_id}",
+                "provider": self.name,
+            },
+        )
+
+
+def create_video_job_provider() -> Optional[VideoJobProvider]:
+    """
+    Create the submit/poll video provider selected by VIDEO_JOB_PROVIDER.
+
+    Returns:
+        Provider instance, or None when async video jobs are disabled
+    """
+    from app.core.config import settings
+
+    if settings.video_job_provider == "mock":
+        return MockVideoJobProvider(render_seconds=settings.video_job_mock_render_seconds)
+    return None
@@ -6,6 +6,7 @@ Coordinates all sub-agents and manages workflow state.
 """
 
 import asyncio
+import json
 import logging
 import uuid
 from datetime import datetime, timezone
@@ -16,8 +17,11 @@ from app.application.agents.product_analysis_agent import ProductAnalysisAgent
 from app.application.agents.subagents import CopywritingSubagent, ImageSubagent
 from app.application.agents.video_generation_agent import VideoGenerationAgent
 from app.application.agents.qa_agent import QAAgent
+from app.application.services.qa_gate import IncrementalQA, QAGateError
 from app.application.tools import ToolRegistry
 from app.infrastructure.repositories.product_package_repository import ProductPackageRepository
+from app.infrastructure.text.copy_index import CopyDuplicateIndex
+from app.infrastructure.video.jobs import VideoJob, VideoJobError, VideoJobManager
 from app.interface.ws.socket_manager import socket_manager
 
 logger = logging.getLogger(__name__)
@@ -44,6 +48,16 @@ class DeepOrchestrator:
     - running/image_generation -> running/video_generation
     - running/video_generation -> running/qa_review
     - running/qa_review -> approval_required/approval OR completed/done
+
+    With a VideoJobManager, step 5 submits a video job and run() returns
+    while the package is still running/video_generation. Nothing is held
+    open while the provider renders; resume_video_job() picks the workflow
+    up from the job's checkpoint when it finishes.
+
+    With an IncrementalQA gate, copy is checked as soon as step 3 finishes
+    and each image as soon as it is rendered. Blocking artifacts are
+    regenerated before the next stage; copy that stays blocking fails the
+    workflow before any image or video is paid for.
     """
 
     # Stage definitions
@@ -64,6 +78,9 @@ class DeepOrchestrator:
         repository: ProductPackageRepository,
         copywriting_agent=None,
         image_agent=None,
+        video_jobs: Optional[VideoJobManager] = None,
+        copy_duplicates: Optional[CopyDuplicateIndex] = None,
+        incremental_qa: Optional[IncrementalQA] = None,
     ):
         """
         Initialize DeepOrchestrator.
@@ -73,15 +90,22 @@ class DeepOrchestrator:
             repository: ProductPackageRepository instance
             copywriting_agent: Existing CopywritingAgent (for subagent wrapper)
             image_agent: Existing ImageAgent (for subagent wrapper)
+            video_jobs: Park workflows on asynchronous video jobs (optional)
+            copy_duplicates: Flag copy that near-duplicates the user's
+                earlier copy (optional)
+            incremental_qa: Check artifacts as they are generated (optional)
         """
         self.tools = tools
         self.repository = repository
+        self.video_jobs = video_jobs
+        self.copy_duplicates = copy_duplicates
+        self.incremental_qa = incremental_qa
 
         # Initialize sub-agents
         self.analysis_agent = ProductAnalysisAgent(tools)
         self.copywriting_subagent = CopywritingSubagent(copywriting_agent, tools) if copywriting_agent else None
         self.image_subagent = ImageSubagent(image_agent, tools) if image_agent else None
-        self.video_agent = VideoGenerationAgent(tools)
+        self.video_agent = VideoGenerationAgent(tools, video_jobs=video_jobs)
         self.qa_agent = QAAgent(tools)
 
         # Storage tools wrapper
@@ -113,6 +137,8 @@ class DeepOrchestrator:
                 "status": str,
                 "stage": str
             }
+            status is "running" (stage "video_generation") when the
+            workflow was parked on a video job.
         """
         # Generate workflow ID
         workflow_id = str(uuid.uuid4())
@@ -141,6 +167,7 @@ class DeepOrchestrator:
                 workflow_id=workflow_id,
                 analysis=analysis,
                 request=request,
+                user_id=user_id,
             )
 
             # Step 4: Image Generation
@@ -151,7 +178,24 @@ class DeepOrchestrator:
                 request=request,
             )
 
-            # Step 5: Video Generation
+            # Step 5: Video Generation (parks the workflow on a video job)
+            if self.video_jobs is not None:
+                parked = await self._park_on_video_job(
+                    package_id=package_id,
+                    workflow_id=workflow_id,
+                    analysis=analysis,
+                    copy_assets=copy_assets,
+                    image_assets=image_assets,
+                    request=request,
+                )
+                if parked:
+                    return {
+                        "package_id": package_id,
+                        "workflow_id": workflow_id,
+                        "status": "running",
+                        "stage": "video_generation",
+                    }
+
             video_asset = await self._run_video_generation(
                 package_id=package_id,
                 workflow_id=workflow_id,
@@ -160,50 +204,111 @@ class DeepOrchestrator:
                 request=request,
             )
 
-            # Step 6: QA Review
-            qa_report = await self._run_qa_review(
+            # Steps 6-7: QA Review, then Approval or Complete
+            return await self._complete_workflow(
                 package_id=package_id,
                 workflow_id=workflow_id,
                 analysis=analysis,
                 copy_assets=copy_assets,
                 image_assets=image_assets,
                 video_asset=video_asset,
+                request=request,
             )
 
-            # Step 7: Approval or Complete
-            options = request.get("options", {})
-            require_approval = options.get("require_approval", True)
+        except Exception as e:
+            logger.error(f"Workflow {workflow_id} failed: {str(e)}", exc_info=True)
+            await self._handle_failure(workflow_id, str(e))
+            raise
 
-            if require_approval:
-                await self._request_approval(
-                    package_id=package_id,
-                    workflow_id=workflow_id,
-                    qa_report=qa_report,
-                )
-                # Stop here - wait for manual approval
-                return {
-                    "package_id": package_id,
-                    "workflow_id": workflow_id,
-                    "status": "approval_required",
-                    "stage": "approval",
-                }
-            else:
-                await self._finalize_completed(
-                    package_id=package_id,
-                    workflow_id=workflow_id,
-                )
-                return {
-                    "package_id": package_id,
-                    "workflow_id": workflow_id,
-                    "status": "completed",
-                    "stage": "done",
-                }
+    async def resume_video_job(self, job: VideoJob) -> Dict[str, Any]:
+        """
+        Continue a workflow parked on a finished video job.
 
+        Saves the job's video (or a slideshow if the job failed or timed
+        out), then runs QA review and approval as run() would have.
+
+        Args:
+            job: Video job in a terminal state
+
+        Returns:
+            Workflow result (see run)
+        """
+        workflow_id = job.workflow_id
+        checkpoint = job.context
+        package_id = UUID(checkpoint["package_id"])
+        request = checkpoint.get("request", {})
+        logger.info(f"[{workflow_id}] Resuming after video job {job.job_id} ({job.state})")
+        socket_manager.register_workflow(workflow_id, request.get("user_id"))
+
+        try:
+            workspace = self.tools.filesystem.get_workspace_path(workflow_id)
+            video_asset = await self.video_agent.complete_job(job, request, workspace)
+            await self._link_video_asset(package_id, workflow_id, video_asset)
+
+            return await self._complete_workflow(
+                package_id=package_id,
+                workflow_id=workflow_id,
+                analysis=checkpoint.get("analysis", {}),
+                copy_assets=checkpoint.get("copy_assets", []),
+                image_assets=checkpoint.get("image_assets", []),
+                video_asset=video_asset,
+                request=request,
+            )
         except Exception as e:
             logger.error(f"Workflow {workflow_id} failed: {str(e)}", exc_info=True)
             await self._handle_failure(workflow_id, str(e))
             raise
 
+    async def _complete_workflow(
+        self,
+        package_id: UUID,
+        workflow_id: str,
+        analysis: Dict[str, Any],
+        copy_assets: list[Dict[str, Any]],
+        image_assets: list[Dict[str, Any]],
+        video_asset: Dict[str, Any],
+        request: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Run QA review, then request approval or finalize."""
+        # Step 6: QA Review
+        qa_report = await self._run_qa_review(
+            package_id=package_id,
+            workflow_id=workflow_id,
+            analysis=analysis,
+            copy_assets=copy_assets,
+            image_assets=image_assets,
+            video_asset=video_asset,
+        )
+
+        # Step 7: Approval or Complete
+        options = request.get("options", {})
+        require_approval = options.get("require_approval", True)
+
+        if require_approval:
+            await self._request_approval(
+                package_id=package_id,
+                workflow_id=workflow_id,
+                qa_report=qa_report,
+            )
+            # Stop here - wait for manual approval
+            return {
+                "package_id": package_id,
+                "workflow_id": workflow_id,
+                "status": "approval_required",
+                "stage": "approval",
+            }
+        else:
+            await self._finalize_completed(
+                package_id=package_id,
+                workflow_id=workflow_id,
+            )
+            return {
+                "package_id": package_id,
+                "workflow_id": workflow_id,
+                "status": "completed",
+                "stage": "done",
+            }
+
     async def _initialize_workflow(
         self,
         workflow_id: str,
@@ -213,6 +318,9 @@ class DeepOrchestrator:
         """Initialize workspace and package record."""
         logger.info(f"[{workflow_id}] Initializing workspace")
 
+        # Route this workflow's events to its owner's connections
+        socket_manager.register_workflow(workflow_id, user_id)
+
         # Create workspace directory
         workspace = self.tools.filesystem.create_workspace(workflow_id)
         logger.info(f"[{workflow_id}] Workspace created: {workspace}")
@@ -293,6 +401,7 @@ class DeepOrchestrator:
         workflow_id: str,
         analysis: Dict[str, Any],
         request: Dict[str, Any],
+        user_id: Optional[UUID] = None,
     ) -> list[Dict[str, Any]]:
         """Run copywriting generation stage."""
         logger.info(f"[{workflow_id}] Running copywriting generation")
@@ -320,6 +429,21 @@ class DeepOrchestrator:
             workspace=workspace,
         )
 
+        # Annotate near-duplicates of the user's earlier copy (QA penalizes them)
+        await self._check_copy_duplicates(workflow_id, user_id, copy_assets)
+
+        if self.incremental_qa is not None:
+            copy_assets = await self._gate_copy(
+                workflow_id, analysis, request, workspace, copy_assets, user_id
+            )
+
+        # Only the copy that survived the gate enters the duplicate index
+        if self.copy_duplicates is not None and user_id is not None:
+            try:
+                await self.copy_duplicates.register(user_id, workflow_id, copy_assets)
+            except Exception as e:
+                logger.warning(f"[{workflow_id}] Registering copy signatures failed: {e}")
+
         # Link assets to package
         for asset in copy_assets:
             await self.storage.link_asset(
@@ -338,6 +462,84 @@ class DeepOrchestrator:
         logger.info(f"[{workflow_id}] Copywriting complete: {len(copy_assets)} assets")
         return copy_assets
 
+    async def _gate_copy(
+        self,
+        workflow_id: str,
+        analysis: Dict[str, Any],
+        request: Dict[str, Any],
+        workspace: str,
+        copy_assets: list[Dict[str, Any]],
+        user_id: Optional[UUID] = None,
+    ) -> list[Dict[str, Any]]:
+        """
+        Check copy right after generation and regenerate blocking channels.
+
+        Regenerated variants are checked for near-duplicates before they
+        are scored again.
+
+        Returns:
+            Copy assets with blocking channels replaced by their regenerated
+            versions
+
+        Raises:
+            QAGateError: If copy is still blocking after max_regenerations
+                and the gate short-circuits
+        """
+        gate = self.incremental_qa
+        history = []
+        for attempt in range(gate.max_regenerations + 1):
+            checks = gate.check_copy(analysis, copy_assets)
+            history.append({"attempt": attempt + 1, "checks": [check.to_dict() for check in checks]})
+            blocked = gate.blocked(checks)
+            if not blocked or attempt == gate.max_regenerations:
+                break
+
+            channels = [check.key for check in blocked]
+            logger.info(f"[{workflow_id}] Copy failed QA, regenerating: {', '.join(channels)}")
+            await self._emit_progress(
+                workflow_id,
+                "copywriting",
+                self.STAGES["copywriting"],
+                f"Regenerating copy: {', '.join(channels)}",
+            )
+            regenerated = {
+                asset["channel"]: asset
+                for asset in await self.copywriting_subagent.run(
+                    analysis=analysis,
+                    request=request,
+                    workspace=workspace,
+                    channels=channels,
+                    version=attempt + 2,
+                )
+            }
+            await self._check_copy_duplicates(workflow_id, user_id, list(regenerated.values()))
+            copy_assets = [regenerated.pop(asset["channel"], asset) for asset in copy_assets]
+            copy_assets.extend(regenerated.values())
+
+        try:
+            self.tools.filesystem.write_json(f"{workspace}/logs/qa_copy_gate.json", history)
+        except Exception as e:
+            logger.warning(f"[{workflow_id}] Failed to save copy QA log: {str(e)}")
+
+        if blocked and gate.short_circuit:
+            issues = "; ".join(issue for check in blocked for issue in check.blocking)
+            raise QAGateError(f"Copy failed QA after {gate.max_regenerations} regeneration(s): {issues}")
+        return copy_assets
+
+    async def _check_copy_duplicates(
+        self,
+        workflow_id: str,
+        user_id: Optional[UUID],
+        copy_assets: list[Dict[str, Any]],
+    ) -> None:
+        """Annotate copy with near-duplicates without registering it."""
+        if self.copy_duplicates is None or user_id is None or not copy_assets:
+            return
+        try:
+            await self.copy_duplicates.check(user_id, workflow_id, copy_assets)
+        except Exception as e:
+            logger.warning(f"[{workflow_id}] Duplicate copy check failed: {e}")
+
     async def _run_image_generation(
         self,
         package_id: UUID,
@@ -364,11 +566,18 @@ class DeepOrchestrator:
             progress={"percentage": self.STAGES["image_generation"], "current_step": "image_generation"},
         )
 
-        # Run image subagent
+        # Run image subagent (each image is checked as soon as it is rendered)
+        gate = {}
+        if self.incremental_qa is not None:
+            gate = {
+                "check": self.incremental_qa.image_check(analysis),
+                "max_regenerations": self.incremental_qa.max_regenerations,
+            }
         image_assets = await self.image_subagent.run(
             analysis=analysis,
             request=request,
             workspace=workspace,
+            **gate,
         )
 
         # Link assets to package
@@ -424,12 +633,31 @@ class DeepOrchestrator:
             workspace=workspace,
         )
 
-        # Link asset to package
+        await self._link_video_asset(package_id, workflow_id, video_asset)
+
+        logger.info(f"[{workflow_id}] Video generation complete")
+        return video_asset
+
+    async def _link_video_asset(
+        self,
+        package_id: UUID,
+        workflow_id: str,
+        video_asset: Dict[str, Any],
+    ) -> None:
+        """Link the video asset (and a kept secondary slideshow) to the package and announce it."""
         await self.storage.link_asset(
             package_id=package_id,
             artifact_type="video",
             artifact_id=video_asset["asset_id"],
         )
+        secondary = video_asset.get("secondary")
+        if secondary is not None:
+            # Kept apart from "video", which holds the package's one video
+            await self.storage.link_asset(
+                package_id=package_id,
+                artifact_type="video_secondary",
+                artifact_id=secondary["asset_id"],
+            )
         await self._emit_artifact(
             workflow_id,
             "video",
@@ -438,8 +666,65 @@ class DeepOrchestrator:
             "product_video",
         )
 
-        logger.info(f"[{workflow_id}] Video generation complete")
-        return video_asset
+    async def _park_on_video_job(
+        self,
+        package_id: UUID,
+        workflow_id: str,
+        analysis: Dict[str, Any],
+        copy_assets: list[Dict[str, Any]],
+        image_assets: list[Dict[str, Any]],
+        request: Dict[str, Any],
+    ) -> bool:
+        """
+        Submit the video stage as a job and checkpoint the workflow.
+
+        Returns:
+            True if parked, False if submission failed and the video
+            should be generated inline instead
+        """
+        logger.info(f"[{workflow_id}] Submitting video job")
+
+        await self._emit_progress(
+            workflow_id,
+            "video_generation",
+            self.STAGES["video_generation"],
+            "Rendering video",
+        )
+
+        await self.storage.update_package_status(
+            package_id=package_id,
+            status="running",
+            stage="video_generation",
+            progress={"percentage": self.STAGES["video_generation"], "current_step": "waiting_video_job"},
+        )
+
+        checkpoint = self._json_safe({
+            "package_id": package_id,
+            "analysis": analysis,
+            "copy_assets": copy_assets,
+            "image_assets": image_assets,
+            "request": request,
+        })
+
+        try:
+            job = await self.video_agent.submit_job(
+                analysis=analysis,
+                image_assets=image_assets,
+                request=request,
+                workflow_id=workflow_id,
+                context=checkpoint,
+            )
+        except VideoJobError as e:
+            logger.warning(f"[{workflow_id}] {e}; generating video inline")
+            return False
+
+        logger.info(f"[{workflow_id}] Parked on video job {job.job_id}")
+        return True
+
+    @staticmethod
+    def _json_safe(value: Any) -> Any:
+        """Round-trip through JSON so UUIDs and datetimes become strings."""
+        return json.loads(json.dumps(value, default=str))
 
     async def _run_qa_review(
         self,
@@ -547,6 +832,15 @@ class DeepOrchestrator:
                 error_message=error_message,
             )
 
+        # Terminal event: tells subscribers, and lets the replay buffer expire
+        percentage = (package.progress or {}).get("percentage", 0) if package else 0
+        await self._emit_progress(
+            workflow_id,
+            "failed",
+            percentage,
+            "Workflow failed",
+        )
+
     async def _emit_progress(
         self,
         workflow_id: str,
@@ -556,7 +850,7 @@ class DeepOrchestrator:
     ) -> None:
         """Emit progress event via WebSocket."""
         try:
-            await socket_manager.broadcast(
+            await socket_manager.emit_event(
                 {
                     "type": "progress",
                     "workflowId": workflow_id,
@@ -582,7 +876,7 @@ class DeepOrchestrator:
     ) -> None:
         """Emit artifact event via WebSocket."""
         try:
-            await socket_manager.broadcast(
+            await socket_manager.emit_event(
                 {
                     "type": "artifact",
                     "workflowId": workflow_id,
@@ -607,7 +901,7 @@ class DeepOrchestrator:
     ) -> None:
         """Emit approval required event via WebSocket."""
         try:
-            await socket_manager.broadcast(
+            await socket_manager.emit_event(
                 {
                     "type": "approval_required",
                     "workflowId": workflow_id,
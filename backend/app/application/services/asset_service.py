@@ -6,13 +6,16 @@ Handles DTO transformation and repository coordination.
 """
 import math
 from datetime import datetime
-from typing import Optional, List
+from typing import TYPE_CHECKING, Optional, List
 from uuid import UUID
 
 from app.application.dtos.asset_dtos import GalleryAssetDTO, AssetListResponseDTO
 from app.domain.entities.asset import Asset
 from app.domain.interfaces.asset_repository import IAssetRepository
 
+if TYPE_CHECKING:
+    from app.infrastructure.storage.url_signer import PresignedURLSigner
+
 
 class AssetService:
     """
@@ -22,14 +25,21 @@ class AssetService:
     to frontend-compatible DTOs.
     """
 
-    def __init__(self, repository: IAssetRepository):
+    def __init__(
+        self,
+        repository: IAssetRepository,
+        url_signer: Optional["PresignedURLSigner"] = None,
+    ):
         """
         Initialize service with repository.
 
         Args:
             repository: Asset repository implementation
+            url_signer: Presigns object URLs for private buckets
+                (None serves stored URLs as-is)
         """
         self._repository = repository
+        self._url_signer = url_signer
 
     async def get_gallery_assets(
         self,
@@ -61,7 +71,7 @@ class AssetService:
         )
 
         # Transform entities to DTOs
-        items = [self._entity_to_dto(asset) for asset in assets]
+        items = self._sign_dtos([self._entity_to_dto(asset) for asset in assets])
 
         # Calculate pagination metadata
         pages = math.ceil(total / limit) if total > 0 else 1
@@ -87,7 +97,7 @@ class AssetService:
         asset = await self._repository.get_by_id(asset_id)
         if asset is None:
             return None
-        return self._entity_to_dto(asset)
+        return self._sign_dtos([self._entity_to_dto(asset)])[0]
 
     async def get_asset_by_uuid(self, asset_uuid: UUID) -> Optional[GalleryAssetDTO]:
         """
@@ -102,7 +112,7 @@ class AssetService:
         asset = await self._repository.get_by_uuid(asset_uuid)
         if asset is None:
             return None
-        return self._entity_to_dto(asset)
+        return self._sign_dtos([self._entity_to_dto(asset)])[0]
 
     async def get_asset_by_uuid_for_user(
         self, asset_uuid: UUID, user_id: UUID
@@ -122,7 +132,7 @@ class AssetService:
         asset = await self._repository.get_by_uuid_for_user(asset_uuid, user_id)
         if asset is None:
             return None
-        return self._entity_to_dto(asset)
+        return self._sign_dtos([self._entity_to_dto(asset)])[0]
 
     async def update_asset_title(self, asset_id: int, title: str) -> Optional[GalleryAssetDTO]:
         """
@@ -138,7 +148,7 @@ class AssetService:
         asset = await self._repository.update_title(asset_id, title)
         if asset is None:
             return None
-        return self._entity_to_dto(asset)
+        return self._sign_dtos([self._entity_to_dto(asset)])[0]
 
     async def delete_asset(self, asset_id: int) -> bool:
         """
@@ -164,6 +174,14 @@ class AssetService:
         Returns:
             GalleryAssetDTO with frontend-compatible fields
         """
+        derivatives = (asset.metadata or {}).get("derivatives") or None
+
+        def rendition(name: str) -> Optional[str]:
+            formats = (derivatives or {}).get(name) or {}
+            return formats.get("webp") or next(iter(formats.values()), None) or asset.url
+
+        is_image = asset.asset_type == "image"
+
         return GalleryAssetDTO(
             id=str(asset.id),
             title=asset.display_title,  # Uses fallback logic
@@ -171,9 +189,44 @@ class AssetService:
             tag=asset.tag,
             meta=asset.meta_string,
             url=asset.url,
+            thumbnail_url=rendition("thumbnail") if is_image else None,
+            medium_url=rendition("medium") if is_image else None,
+            sources=derivatives if is_image else None,
             content=asset.content,
             is_vertical=asset.is_vertical,
             is_text=asset.is_text,
             duration=asset.duration,
             created_at=asset.created_at,
         )
+
+    def _sign_dtos(self, items: List[GalleryAssetDTO]) -> List[GalleryAssetDTO]:
+        """
+        Presign all URLs of a page of DTOs in one bulk pass.
+
+        Args:
+            items: DTOs carrying stored object URLs
+
+        Returns:
+            DTOs with presigned URLs (unchanged if no signer is configured)
+        """
+        if self._url_signer is None or not items:
+            return items
+
+        fields = ("url", "thumbnail_url", "medium_url")
+        urls: List[Optional[str]] = []
+        for dto in items:
+            urls.extend(getattr(dto, field) for field in fields)
+            for formats in (dto.sources or {}).values():
+                urls.extend(formats.values())
+        signed = iter(self._url_signer.sign_many(urls))
+
+        result = []
+        for dto in items:
+            update = {field: next(signed) for field in fields}
+            if dto.sources:
+                update["sources"] = {
+                    name: {fmt: next(signed) for fmt in formats}
+                    for name, formats in dto.sources.items()
+                }
+            result.append(dto.model_copy(update=update))
+        return result
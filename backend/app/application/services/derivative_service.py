@@ -0,0 +1,177 @@
+"""
+Asset Derivative Service.
+
+Generates responsive renditions (thumbnail / medium, WebP / AVIF) for
+newly created image assets and records their URLs in the asset metadata,
+where the gallery DTO picks them up.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Set
+from uuid import UUID
+
+from app.core.config import settings
+from app.infrastructure.storage.derivatives import ImageDerivativeGenerator
+
+
+logger = logging.getLogger(__name__)
+
+
+class AssetDerivativeService:
+    """
+    Application service that attaches derivatives to image assets.
+
+    Rendering is scheduled in the background so persisting an asset is
+    never delayed; the gallery falls back to the original URL until the
+    derivatives exist.
+    """
+
+    def __init__(self, generator: ImageDerivativeGenerator, session_factory=None):
+        """
+        Initialize service.
+
+        Args:
+            generator: Derivative generator (rendering + storage)
+            session_factory: Async context manager yielding DB sessions
+                (default: get_session_context)
+        """
+        self._generator = generator
+        self._session_factory = session_factory
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def generate_for_asset(self, asset_uuid: UUID, url: str) -> Dict[str, Any]:
+        """
+        Create derivatives for an asset and store them in its metadata.
+
+        Args:
+            asset_uuid: Asset UUID
+            url: Original image URL
+
+        Returns:
+            Derivatives mapping (rendition -> format -> URL), empty if skipped
+        """
+        from app.infrastructure.repositories.asset_repository import PostgresAssetRepository
+
+        derivatives = await self._generator.create(url)
+        if not derivatives:
+            return {}
+
+        session_factory = self._session_factory
+        if session_factory is None:
+            from app.infrastructure.database import get_session_context
+            session_factory = get_session_context
+
+        async with session_factory() as session:
+            repo = PostgresAssetRepository(session)
+            await repo.merge_metadata(asset_uuid, {"derivatives": derivatives})
+
+        return derivatives
+
+    def schedule(self, asset_uuid: UUID, url: Optional[str]) -> Optional[asyncio.Task]:
+        """
+        Generate derivatives in the background.
+
+        Args:
+            asset_uuid: Asset UUID
+            url: Original image URL
+
+        Returns:
+            The background task, or None if nothing was scheduled
+        """
+        if not url or not self._generator.enabled:
+            return None
+
+        task = asyncio.get_running_loop().create_task(self._run(asset_uuid, url))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _run(self, asset_uuid: UUID, url: str) -> None:
+        """Background wrapper that logs instead of raising."""
+        try:
+            await self.generate_for_asset(asset_uuid, url)
+        except Exception as e:
+            logger.warning(f"Failed to create derivatives for asset {asset_uuid}: {e}")
+
+
+_derivative_service: Optional[AssetDerivativeService] = None
+
+# Session.info key of the derivative jobs waiting for that session to commit
+_PENDING_DERIVATIVES_KEY = "pending_asset_derivatives"
+
+
+def get_derivative_service() -> Optional[AssetDerivativeService]:
+    """
+    Get the shared derivative service.
+
+    Returns:
+        AssetDerivativeService, or None if derivatives are disabled
+    """
+    global _derivative_service
+    if not settings.image_derivatives_enabled:
+        return None
+
+    if _derivative_service is None:
+        from app.infrastructure.storage import get_storage_client
+
+        minio_client = get_storage_client()
+        generator = ImageDerivativeGenerator(
+            minio_client,
+            sizes={
+                "thumbnail": settings.image_thumbnail_size,
+                "medium": settings.image_medium_size,
+            },
+            formats=settings.image_derivative_formats_list,
+            allowed_domains=settings.mcp_allowed_domains_set,
+        )
+        _derivative_service = AssetDerivativeService(generator)
+
+    return _derivative_service
+
+
+def schedule_asset_derivatives(asset_uuid: UUID, url: Optional[str]) -> None:
+    """
+    Schedule derivative generation for a new image asset, if enabled.
+
+    Args:
+        asset_uuid: Asset UUID
+        url: Original image URL
+    """
+    service = get_derivative_service()
+    if service is not None:
+        service.schedule(asset_uuid, url)
+
+
+def schedule_asset_derivatives_after_commit(session: Any, asset_uuid: UUID, url: Optional[str]) -> None:
+    """
+    Schedule derivative generation once the session that created an asset commits.
+
+    The derivative job updates the asset row from its own session, so it
+    must not start before the row is committed. Nothing is scheduled if the
+    transaction rolls back.
+
+    Args:
+        session: AsyncSession (or Session) the asset was added to
+        asset_uuid: Asset UUID
+        url: Original image URL
+    """
+    from sqlalchemy import event
+
+    sync_session = getattr(session, "sync_session", session)
+    pending = sync_session.info.get(_PENDING_DERIVATIVES_KEY)
+    if pending is None:
+        pending = sync_session.info[_PENDING_DERIVATIVES_KEY] = []
+
+        def on_commit(_session) -> None:
+            jobs = pending[:]
+            pending.clear()
+            for job in jobs:
+                schedule_asset_derivatives(*job)
+
+        def on_rollback(_session) -> None:
+            pending.clear()
+
+        event.listen(sync_session, "after_commit", on_commit)
+        event.listen(sync_session, "after_rollback", on_rollback)
+
+    pending.append((asset_uuid, url))
@@ -0,0 +1,83 @@
+"""
+Incremental QA Gate.
+
+Runs the artifact checks of QAScorer while a package is still being
+generated: copy as soon as copywriting finishes, each image as soon as it
+is rendered. Blocking artifacts are regenerated (up to max_regenerations
+times) before image and video generation are paid for; copy that is still
+blocking afterwards stops the workflow when short_circuit is set. The
+full package review at the end of the workflow is unchanged.
+"""
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from app.application.services.qa_scoring import ArtifactCheck, QAScorer
+
+
+class QAGateError(RuntimeError):
+    """Raised when an artifact still has blocking issues after regeneration."""
+
+
+class IncrementalQA:
+    """
+    Policy and checks of the incremental QA gate.
+
+    Example:
+        gate = IncrementalQA(max_regenerations=1)
+        blocked = gate.blocked(gate.check_copy(analysis, copy_assets))
+    """
+
+    def __init__(
+        self,
+        scorer: Optional[QAScorer] = None,
+        max_regenerations: int = 1,
+        short_circuit: bool = True,
+    ):
+        """
+        Initialize the gate.
+
+        Args:
+            scorer: QA scoring engine (default: QAScorer())
+            max_regenerations: Extra attempts per blocking artifact
+            short_circuit: Fail the workflow when copy is still blocking
+        """
+        self.scorer = scorer or QAScorer()
+        self.max_regenerations = max(0, max_regenerations)
+        self.short_circuit = short_circuit
+
+    @classmethod
+    def from_settings(cls) -> Optional["IncrementalQA"]:
+        """Gate configured by settings.qa_incremental_*, or None when disabled."""
+        from app.core.config import settings
+
+        if not settings.qa_incremental_enabled:
+            return None
+        return cls(
+            max_regenerations=settings.qa_max_regenerations,
+            short_circuit=settings.qa_short_circuit,
+        )
+
+    def check_copy(
+        self,
+        analysis: Dict[str, Any],
+        copy_assets: Sequence[Dict[str, Any]],
+    ) -> List[ArtifactCheck]:
+        """Check copy variants (see QAScorer.check_copy)."""
+        return self.scorer.check_copy(analysis, copy_assets)
+
+    def image_check(self, analysis: Dict[str, Any]) -> Callable[[str, Dict[str, Any]], List[str]]:
+        """
+        Per-image check for ImageSubagent.
+
+        Args:
+            analysis: Product analysis
+
+        Returns:
+            Callable taking (scene, generation result) and returning the
+            blocking issues of that image
+        """
+        return lambda scene, artifact: self.scorer.check_image(analysis, scene, artifact).blocking
+
+    @staticmethod
+    def blocked(checks: Sequence[ArtifactCheck]) -> List[ArtifactCheck]:
+        """Checks with blocking issues."""
+        return [check for check in checks if not check.passed]
@@ -0,0 +1,193 @@
+"""
+QA Rescoring Job.
+
+Re-scores every package that has been through QA review with the current
+QAScorer rules. Packages whose report already carries the current
+QA_RULES_VERSION are skipped unless forced. Inputs come from the
+snapshot QAAgent saves in each workflow workspace; packages reviewed
+before snapshots existed are counted as missing and left untouched.
+
+Usage:
+    python -m app.application.services.qa_rescoring [--force] [--dry-run]
+"""
+import argparse
+import asyncio
+import json
+import logging
+from contextlib import AbstractAsyncContextManager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.services.qa_scoring import (
+    QA_INPUTS_PATH,
+    QA_RULES_VERSION,
+    QAPackage,
+    QAScorer,
+)
+from app.infrastructure.database.models import ProductPackageModel
+from app.infrastructure.repositories.product_package_repository import ProductPackageRepository
+
+
+logger = logging.getLogger(__name__)
+
+
+SessionFactory = Callable[[], AbstractAsyncContextManager[AsyncSession]]
+
+
+def load_qa_inputs(workspace: Path) -> Optional[QAPackage]:
+    """
+    Read the QA inputs snapshot of a workflow.
+
+    Args:
+        workspace: Workflow workspace directory
+
+    Returns:
+        QAPackage, or None if the workspace has no readable snapshot
+    """
+    path = workspace / QA_INPUTS_PATH
+    try:
+        with path.open(encoding="utf-8") as f:
+            return QAPackage.from_dict(json.load(f))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Unreadable QA inputs {path}: {e}")
+        return None
+
+
+class QARescoringJob:
+    """
+    Batch re-scoring of stored QA reports.
+
+    Packages are paged by ID, scored a page at a time with one
+    QAScorer.score_batch() call, and each page is committed in its own
+    session. Only qa_report changes; status and approval are left alone.
+
+    Example:
+        summary = await QARescoringJob(Path("backend/projects")).run(dry_run=True)
+    """
+
+    def __init__(
+        self,
+        workspace_root: Path,
+        scorer: Optional[QAScorer] = None,
+        session_factory: Optional[SessionFactory] = None,
+        batch_size: int = 500,
+    ):
+        """
+        Initialize the job.
+
+        Args:
+            workspace_root: Directory holding the workflow workspaces
+            scorer: QA scoring engine (default: QAScorer())
+            session_factory: Async context manager yielding a session that
+                commits on exit (default: get_session_context)
+            batch_size: Packages scored per batch
+        """
+        if session_factory is None:
+            from app.infrastructure.database.connection import get_session_context
+
+            session_factory = get_session_context
+        self.workspace_root = Path(workspace_root)
+        self.scorer = scorer or QAScorer()
+        self._session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+
+    async def run(self, force: bool = False, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Re-score the backlog.
+
+        Args:
+            force: Re-score reports already on the current rules version
+            dry_run: Compute new scores without saving them
+
+        Returns:
+            Summary: scanned, rescored, current (skipped), missing_inputs,
+            pass_flips (packages whose passed flag changed), mean_delta
+            (average score change) and rules_version
+        """
+        summary = {
+            "scanned": 0,
+            "rescored": 0,
+            "current": 0,
+            "missing_inputs": 0,
+            "pass_flips": 0,
+            "mean_delta": 0.0,
+            "rules_version": QA_RULES_VERSION,
+            "dry_run": dry_run,
+        }
+        total_delta = 0.0
+        after_id = None
+
+        while True:
+            async with self._session_factory() as session:
+                repository = ProductPackageRepository(session)
+                page = await repository.list_with_qa_report(after_id, self.batch_size)
+                if not page:
+                    break
+                after_id = page[-1].id
+                summary["scanned"] += len(page)
+
+                stale: List[Tuple[ProductPackageModel, QAPackage]] = []
+                for package in page:
+                    report = package.qa_report or {}
+                    if not force and report.get("rules_version") == QA_RULES_VERSION:
+                        summary["current"] += 1
+                        continue
+                    inputs = await asyncio.to_thread(
+                        load_qa_inputs, self.workspace_root / package.workflow_id
+                    )
+                    if inputs is None:
+                        summary["missing_inputs"] += 1
+                        continue
+                    stale.append((package, inputs))
+
+                if not stale:
+                    continue
+                reports = await asyncio.to_thread(
+                    self.scorer.score_batch, [inputs for _, inputs in stale]
+                )
+
+                for (package, _), report in zip(stale, reports):
+                    old = package.qa_report or {}
+                    total_delta += report["score"] - float(old.get("score") or 0.0)
+                    if bool(old.get("passed")) != report["passed"]:
+                        summary["pass_flips"] += 1
+                    if not dry_run:
+                        package.qa_report = report
+                summary["rescored"] += len(stale)
+
+            logger.info(f"QA rescoring: {summary['scanned']} scanned, {summary['rescored']} rescored")
+
+        if summary["rescored"]:
+            summary["mean_delta"] = round(total_delta / summary["rescored"], 4)
+        return summary
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Command-line entry point."""
+    from app.application.tools.filesystem_tools import FileSystemTools
+
+    parser = argparse.ArgumentParser(description="Re-score stored QA reports with the current rules.")
+    parser.add_argument("--force", action="store_true", help="also re-score reports on the current rules version")
+    parser.add_argument("--dry-run", action="store_true", help="report score changes without saving them")
+    parser.add_argument("--batch-size", type=int, default=500, help="packages scored per batch")
+    parser.add_argument(
+        "--workspace-root",
+        type=Path,
+        default=FileSystemTools().base_path,
+        help="directory holding workflow workspaces",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    job = QARescoringJob(args.workspace_root, batch_size=args.batch_size)
+    summary = asyncio.run(job.run(force=args.force, dry_run=args.dry_run))
+    print(json.dumps(summary, indent=2))
+    return summary
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,556 @@
+"""
+QA Scoring Engine.
+
+Scores generated product packages on keyword coverage, readability,
+per-channel length limits, originality against the merchant's earlier
+copy, image scene coverage and copy/image consistency. Text is
+tokenized once per asset; every score is then computed with NumPy over
+flat per-asset arrays grouped by package, so a batch of thousands of
+packages is scored in one pass (QARescoringJob uses this to re-score
+the backlog when the rules change).
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+# Bump whenever a rule, weight or threshold below changes; stored in each
+# report so the rescoring job knows which packages are stale
+QA_RULES_VERSION = "3"
+
+# QA inputs snapshot written by QAAgent, relative to the workflow workspace
+QA_INPUTS_PATH = "workspace/qa_inputs.json"
+
+# Overall score a package needs to pass
+PASS_THRESHOLD = 0.7
+
+CHECK_WEIGHTS = {
+    "copywriting": 0.3,
+    "images": 0.3,
+    "video": 0.2,
+    "consistency": 0.2,
+}
+
+REQUIRED_CHANNELS = ("product_page", "social_post", "ad_short")
+
+# (min, max) characters per copywriting channel
+CHANNEL_LENGTH_LIMITS = {
+    "product_page": (150, 2000),
+    "social_post": (50, 600),
+    "ad_short": (15, 150),
+}
+
+# Limits for copy in channels not listed above
+DEFAULT_LENGTH_LIMITS = (50, 2000)
+
+DEFAULT_SCENES = ("hero", "lifestyle", "detail")
+
+MIN_IMAGES = 3
+
+# Words per sentence above which readability starts to drop, and the
+# excess at which it reaches 0
+READABLE_SENTENCE_WORDS = 20
+UNREADABLE_EXCESS_WORDS = 25
+
+COPY_WEIGHTS = {"channels": 0.3, "length": 0.3, "readability": 0.2, "keywords": 0.2}
+IMAGE_WEIGHTS = {"scenes": 0.5, "count": 0.3, "urls": 0.2}
+CONSISTENCY_WEIGHTS = {"assets": 0.4, "labels": 0.3, "category": 0.3}
+
+FALLBACK_VIDEO_PENALTY = 0.3
+
+# Copy score lost when every variant near-duplicates earlier copy (assets
+# carry a non-empty "duplicates" list from CopyDuplicateIndex)
+DUPLICATE_COPY_PENALTY = 0.3
+
+# Artifact checks (check_copy / check_image) run while the package is
+# still being generated. Copy shorter than this share of its channel's
+# minimum length, or images without a URL or with a side below
+# MIN_IMAGE_SIDE pixels, are blocking: worth regenerating before
+# spending on downstream stages.
+BLOCKING_LENGTH_RATIO = 0.5
+MIN_IMAGE_SIDE = 512
+
+# Latin words, or single CJK characters (which carry a word's worth of meaning)
+_TOKEN_RE = re.compile(r"[A-Za-z0-9]+(?:'[A-Za-z]+)?|[\u3400-\u9fff]")
+_SENTENCE_RE = re.compile(r"[.!?。！？]+")
+
+
+@dataclass
+class QAPackage:
+    """Inputs of one package's QA review."""
+    analysis: Dict[str, Any] = field(default_factory=dict)
+    copy_assets: List[Dict[str, Any]] = field(default_factory=list)
+    image_assets: List[Dict[str, Any]] = field(default_factory=list)
+    video_asset: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "analysis": self.analysis,
+            "copy_assets": self.copy_assets,
+            "image_assets": self.image_assets,
+            "video_asset": self.video_asset,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QAPackage":
+        return cls(
+            analysis=data.get("analysis") or {},
+            copy_assets=list(data.get("copy_assets") or []),
+            image_assets=list(data.get("image_assets") or []),
+            video_asset=data.get("video_asset") or None,
+        )
+
+
+@dataclass
+class ArtifactCheck:
+    """QA result of one artifact, checked as soon as it is generated."""
+    artifact: str  # "copywriting" | "image"
+    key: str  # copy channel or image scene
+    blocking: List[str] = field(default_factory=list)
+    issues: List[str] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.blocking
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "artifact": self.artifact,
+            "key": self.key,
+            "passed": self.passed,
+            "blocking": self.blocking,
+            "issues": self.issues,
+        }
+
+
+def _text_stats(text: str):
+    """(characters, words, sentences) of a copy text."""
+    text = text.strip()
+    words = len(_TOKEN_RE.findall(text))
+    sentences = sum(1 for part in _SENTENCE_RE.split(text) if part.strip())
+    return len(text), words, max(sentences, 1 if text else 0)
+
+
+def _group_mean(values: "np.ndarray", groups: "np.ndarray", counts: "np.ndarray") -> "np.ndarray":
+    """Mean of values per group (0 for empty groups)."""
+    sums = np.bincount(groups, weights=values, minlength=len(counts))
+    return np.divide(sums, counts, out=np.zeros(len(counts)), where=counts > 0)
+
+
+class QAScorer:
+    """
+    Vectorized QA scoring.
+
+    score_batch() returns one report per package, in the shape QAAgent
+    has always produced:
+    {
+        "score": float, "passed": bool,
+        "checks": {name: {"score", "issues", "suggestions", "metrics"}},
+        "issues": [...], "suggestions": [...], "rules_version": str
+    }
+
+    Example:
+        reports = QAScorer().score_batch([QAPackage(analysis, copy, images, video)])
+    """
+
+    def __init__(self, pass_threshold: float = PASS_THRESHOLD):
+        """
+        Initialize the scorer.
+
+        Args:
+            pass_threshold: Overall score a package needs to pass
+        """
+        self.pass_threshold = pass_threshold
+        self._channels = list(REQUIRED_CHANNELS) + [
+            name for name in CHANNEL_LENGTH_LIMITS if name not in REQUIRED_CHANNELS
+        ]
+        self._channel_index = {name: i for i, name in enumerate(self._channels)}
+        limits = [CHANNEL_LENGTH_LIMITS.get(name, DEFAULT_LENGTH_LIMITS) for name in self._channels]
+        limits.append(DEFAULT_LENGTH_LIMITS)  # last row: unknown channels
+        self._limits = np.asarray(limits, dtype=np.float64)
+
+    def score(self, package: QAPackage) -> Dict[str, Any]:
+        """Score a single package (see score_batch)."""
+        return self.score_batch([package])[0]
+
+    def score_batch(self, packages: Sequence[QAPackage]) -> List[Dict[str, Any]]:
+        """
+        Score many packages at once.
+
+        Args:
+            packages: QA inputs
+
+        Returns:
+            One report per package, in order
+        """
+        if not packages:
+            return []
+        features = self._extract(packages)
+        checks = {
+            "copywriting": self._score_copy(features),
+            "images": self._score_images(features),
+            "video": self._score_video(features),
+            "consistency": self._score_consistency(features),
+        }
+        weights = np.asarray([CHECK_WEIGHTS[name] for name in checks])
+        matrix = np.stack([checks[name]["score"] for name in checks], axis=1)
+        overall = np.round(matrix @ weights, 2)
+        return [self._report(i, features, checks, float(overall[i])) for i in range(len(packages))]
+
+    # ------------------------------------------------------------------
+    # Artifact checks
+    # ------------------------------------------------------------------
+
+    def check_copy(
+        self,
+        analysis: Dict[str, Any],
+        copy_assets: Sequence[Dict[str, Any]],
+    ) -> List[ArtifactCheck]:
+        """
+        Check copy variants as soon as copywriting finishes.
+
+        Args:
+            analysis: Product analysis
+            copy_assets: Copy assets with "channel" and "content"
+
+        Returns:
+            One check per asset, plus one per required channel that is
+            missing (blocking)
+        """
+        checks = []
+        for asset in copy_assets:
+            channel = str(asset.get("channel") or "")
+            content = str(asset.get("content") or "")
+            chars, words, sentences = _text_stats(content)
+            lo, hi = CHANNEL_LENGTH_LIMITS.get(channel, DEFAULT_LENGTH_LIMITS)
+            check = ArtifactCheck("copywriting", channel)
+
+            if not content.strip():
+                check.blocking.append(f"{channel} copy is empty")
+            elif chars < lo * BLOCKING_LENGTH_RATIO:
+                check.blocking.append(f"{channel} copy is {chars} characters, far below the minimum of {lo}")
+            elif chars < lo:
+                check.issues.append(f"{channel} copy is below the minimum length of {lo}")
+            if chars > hi:
+                check.issues.append(f"{channel} copy is over the length limit of {hi}")
+            # Same cut-off as the report's readability issue (score < 0.8)
+            if sentences and words / sentences > READABLE_SENTENCE_WORDS + 0.2 * UNREADABLE_EXCESS_WORDS:
+                check.issues.append(f"{channel} copy has long sentences")
+            if asset.get("duplicates"):
+                check.issues.append(f"{channel} copy near-duplicates copy of other products")
+            checks.append(check)
+
+        present = {check.key for check in checks}
+        for channel in REQUIRED_CHANNELS:
+            if channel not in present:
+                checks.append(ArtifactCheck("copywriting", channel, blocking=[f"{channel} copy is missing"]))
+        return checks
+
+    def check_image(
+        self,
+        analysis: Dict[str, Any],
+        scene: str,
+        artifact: Dict[str, Any],
+    ) -> ArtifactCheck:
+        """
+        Check one generated image before it is saved.
+
+        Args:
+            analysis: Product analysis
+            scene: Scene the image was generated for
+            artifact: Generation result with "url", "width" and "height"
+
+        Returns:
+            ArtifactCheck for the scene
+        """
+        check = ArtifactCheck("image", scene)
+        if not artifact.get("url"):
+            check.blocking.append(f"{scene} image has no URL")
+        width, height = artifact.get("width"), artifact.get("height")
+        if width and height and min(width, height) < MIN_IMAGE_SIDE:
+            check.blocking.append(f"{scene} image is {width}x{height}, below {MIN_IMAGE_SIDE}px")
+        expected = analysis.get("suggested_scenes") or DEFAULT_SCENES
+        if scene not in expected:
+            check.issues.append(f"{scene} is not among the analysis scenes")
+        return check
+
+    # ------------------------------------------------------------------
+    # Feature extraction (the only per-asset Python loop)
+    # ------------------------------------------------------------------
+
+    def _extract(self, packages: Sequence[QAPackage]) -> Dict[str, Any]:
+        n = len(packages)
+        unknown = len(self._channels)
+
+        copy_pkg, copy_chan, copy_stats, copy_duplicate = [], [], [], []
+        image_pkg, image_has_url = [], []
+        scenes_expected = np.zeros(n)
+        scenes_covered = np.zeros(n)
+        label_count = np.zeros(n)
+        keywords_total = np.zeros(n)
+        keywords_found = np.zeros(n)
+        category_mentioned = np.zeros(n, dtype=bool)
+        video_present = np.zeros(n, dtype=bool)
+        video_has_url = np.zeros(n, dtype=bool)
+        video_fallback = np.zeros(n, dtype=bool)
+        missing_scenes: List[List[str]] = []
+        unexpected_labels: List[List[str]] = []
+
+        for p, package in enumerate(packages):
+            analysis = package.analysis or {}
+            texts = []
+            for asset in package.copy_assets:
+                content = str(asset.get("content") or "")
+                copy_pkg.append(p)
+                copy_chan.append(self._channel_index.get(asset.get("channel"), unknown))
+                copy_stats.append(_text_stats(content))
+                copy_duplicate.append(bool(asset.get("duplicates")))
+                texts.append(content.lower())
+            corpus = "\n".join(texts)
+
+            keywords = {str(k).strip().lower() for k in analysis.get("keywords") or [] if str(k).strip()}
+            keywords_total[p] = len(keywords)
+            keywords_found[p] = sum(1 for keyword in keywords if keyword in corpus)
+            category = str(analysis.get("category") or "").strip().lower()
+            category_mentioned[p] = bool(category) and category in corpus
+
+            expected = [str(s) for s in analysis.get("suggested_scenes") or DEFAULT_SCENES]
+            labels = set()
+            for asset in package.image_assets:
+                image_pkg.append(p)
+                image_has_url.append(bool(asset.get("url")))
+                label = asset.get("label") or asset.get("scene")
+                if label:
+                    labels.add(str(label))
+            scenes_expected[p] = len(set(expected))
+            scenes_covered[p] = len(labels & set(expected))
+            label_count[p] = len(labels)
+            missing_scenes.append([s for s in dict.fromkeys(expected) if s not in labels])
+            unexpected_labels.append(sorted(labels - set(expected)))
+
+            video = package.video_asset or {}
+            video_present[p] = bool(video)
+            video_has_url[p] = bool(video.get("url"))
+            video_fallback[p] = bool(video.get("is_fallback"))
+
+        stats = np.asarray(copy_stats, dtype=np.float64).reshape(-1, 3)
+        return {
+            "n": n,
+            "copy_pkg": np.asarray(copy_pkg, dtype=np.int64),
+            "copy_chan": np.asarray(copy_chan, dtype=np.int64),
+            "copy_chars": stats[:, 0],
+            "copy_words": stats[:, 1],
+            "copy_sentences": stats[:, 2],
+            "copy_duplicate": np.asarray(copy_duplicate, dtype=np.float64),
+            "image_pkg": np.asarray(image_pkg, dtype=np.int64),
+            "image_has_url": np.asarray(image_has_url, dtype=np.float64),
+            "scenes_expected": scenes_expected,
+            "scenes_covered": scenes_covered,
+            "label_count": label_count,
+            "keywords_total": keywords_total,
+            "keywords_found": keywords_found,
+            "category_mentioned": category_mentioned,
+            "video_present": video_present,
+            "video_has_url": video_has_url,
+            "video_fallback": video_fallback,
+            "missing_scenes": missing_scenes,
+            "unexpected_labels": unexpected_labels,
+        }
+
+    # ------------------------------------------------------------------
+    # Vectorized scoring
+    # ------------------------------------------------------------------
+
+    def _score_copy(self, f: Dict[str, Any]) -> Dict[str, Any]:
+        n, pkg, chan = f["n"], f["copy_pkg"], f["copy_chan"]
+        chars, words, sentences = f["copy_chars"], f["copy_words"], f["copy_sentences"]
+        counts = np.bincount(pkg, minlength=n).astype(np.float64)
+
+        # 1 inside the channel's limits, proportionally less outside them
+        lo, hi = self._limits[chan, 0], self._limits[chan, 1]
+        length = np.where(
+            chars < lo,
+            chars / lo,
+            np.where(chars > hi, hi / np.maximum(chars, 1.0), 1.0),
+        )
+        too_short = np.bincount(pkg, weights=chars < lo, minlength=n)
+        too_long = np.bincount(pkg, weights=chars > hi, minlength=n)
+
+        words_per_sentence = words / np.maximum(sentences, 1.0)
+        excess = np.maximum(words_per_sentence - READABLE_SENTENCE_WORDS, 0.0)
+        readability = np.clip(1.0 - excess / UNREADABLE_EXCESS_WORDS, 0.0, 1.0)
+
+        required = len(REQUIRED_CHANNELS)
+        present = np.zeros((n, required), dtype=bool)
+        is_required = chan < required
+        present[pkg[is_required], chan[is_required]] = True
+        channel_coverage = present.sum(axis=1) / required
+
+        keyword_coverage = np.divide(
+            f["keywords_found"], f["keywords_total"],
+            out=np.ones(n), where=f["keywords_total"] > 0,
+        )
+
+        metrics = {
+            "channels": channel_coverage,
+            "length": _group_mean(length, pkg, counts),
+            "readability": _group_mean(readability, pkg, counts),
+            "keywords": keyword_coverage,
+        }
+        duplicate_share = _group_mean(f["copy_duplicate"], pkg, counts)
+        metrics["originality"] = 1.0 - duplicate_share
+        score = sum(COPY_WEIGHTS[name] * metrics[name] for name in COPY_WEIGHTS)
+        score = score - DUPLICATE_COPY_PENALTY * duplicate_share
+        score = np.where(counts > 0, np.maximum(score, 0.0), 0.0)
+        return {
+            "score": score,
+            "metrics": metrics,
+            "count": counts,
+            "present": present,
+            "too_short": too_short,
+            "too_long": too_long,
+            "duplicates": np.bincount(pkg, weights=f["copy_duplicate"], minlength=n),
+            "words_per_sentence": _group_mean(words_per_sentence, pkg, counts),
+        }
+
+    def _score_images(self, f: Dict[str, Any]) -> Dict[str, Any]:
+        n, pkg = f["n"], f["image_pkg"]
+        counts = np.bincount(pkg, minlength=n).astype(np.float64)
+        metrics = {
+            "scenes": np.divide(
+                f["scenes_covered"], f["scenes_expected"],
+                out=np.ones(n), where=f["scenes_expected"] > 0,
+            ),
+            "count": np.minimum(counts / MIN_IMAGES, 1.0),
+            "urls": _group_mean(f["image_has_url"], pkg, counts),
+        }
+        score = sum(IMAGE_WEIGHTS[name] * metrics[name] for name in IMAGE_WEIGHTS)
+        return {"score": np.where(counts > 0, score, 0.0), "metrics": metrics, "count": counts}
+
+    def _score_video(self, f: Dict[str, Any]) -> Dict[str, Any]:
+        usable = f["video_present"] & f["video_has_url"]
+        score = np.where(usable, 1.0 - FALLBACK_VIDEO_PENALTY * f["video_fallback"], 0.0)
+        return {"score": score, "metrics": {"fallback": f["video_fallback"].astype(np.float64)}}
+
+    def _score_consistency(self, f: Dict[str, Any]) -> Dict[str, Any]:
+        n = f["n"]
+        has_copy = np.bincount(f["copy_pkg"], minlength=n) > 0
+        has_images = np.bincount(f["image_pkg"], minlength=n) > 0
+        has_video = f["video_present"] & f["video_has_url"]
+        metrics = {
+            "assets": (has_copy.astype(float) + has_images + has_video) / 3.0,
+            # Share of image labels that are scenes the analysis asked for
+            "labels": np.divide(
+                f["scenes_covered"], f["label_count"],
+                out=np.zeros(n), where=f["label_count"] > 0,
+            ),
+            "category": f["category_mentioned"].astype(np.float64),
+        }
+        score = sum(CONSISTENCY_WEIGHTS[name] * metrics[name] for name in CONSISTENCY_WEIGHTS)
+        return {"score": score, "metrics": metrics}
+
+    # ------------------------------------------------------------------
+    # Reports
+    # ------------------------------------------------------------------
+
+    def _report(
+        self,
+        i: int,
+        f: Dict[str, Any],
+        checks: Dict[str, Dict[str, Any]],
+        overall: float,
+    ) -> Dict[str, Any]:
+        copy, images, video, consistency = (
+            checks["copywriting"], checks["images"], checks["video"], checks["consistency"]
+        )
+
+        copy_issues, copy_suggestions = [], []
+        if copy["count"][i] == 0:
+            copy_issues.append("No copywriting generated")
+        else:
+            missing = [c for c, ok in zip(REQUIRED_CHANNELS, copy["present"][i]) if not ok]
+            if missing:
+                copy_issues.append(f"Missing copywriting channels: {', '.join(missing)}")
+            if copy["too_short"][i]:
+                copy_issues.append(f"{int(copy['too_short'][i])} copy variant(s) below the channel's minimum length")
+            if copy["too_long"][i]:
+                copy_issues.append(f"{int(copy['too_long'][i])} copy variant(s) over the channel's length limit")
+            if copy["metrics"]["readability"][i] < 0.8:
+                copy_issues.append(
+                    f"Long sentences ({copy['words_per_sentence'][i]:.0f} words on average) hurt readability"
+                )
+            if f["keywords_total"][i] and copy["metrics"]["keywords"][i] < 0.5:
+                copy_issues.append(
+                    f"Copy covers only {int(f['keywords_found'][i])} of "
+                    f"{int(f['keywords_total'][i])} product keywords"
+                )
+                copy_suggestions.append("Work more of the analysis keywords into the copy")
+            if copy["duplicates"][i]:
+                copy_issues.append(
+                    f"{int(copy['duplicates'][i])} copy variant(s) near-duplicate copy of other products"
+                )
+                copy_suggestions.append("Rewrite duplicated copy around what sets this product apart")
+        copy_suggestions.append("Consider A/B testing different copy variations")
+
+        image_issues, image_suggestions = [], []
+        if images["count"][i] == 0:
+            image_issues.append("No images generated")
+        else:
+            if f["missing_scenes"][i]:
+                image_issues.append(f"Missing image scenes: {', '.join(f['missing_scenes'][i])}")
+            if images["count"][i] < MIN_IMAGES:
+                image_issues.append("Insufficient number of images")
+            if images["metrics"]["urls"][i] < 1.0:
+                image_issues.append("Some images have no URL")
+        image_suggestions.append("Ensure images match brand color palette")
+
+        video_issues, video_suggestions = [], []
+        if not f["video_present"][i]:
+            video_issues.append("No video generated")
+        elif not f["video_has_url"][i]:
+            video_issues.append("Video URL missing")
+        elif f["video_fallback"][i]:
+            video_issues.append("Video generation used fallback (slideshow)")
+            video_suggestions.append("Consider improving product images for better video generation")
+
+        consistency_issues = []
+        if consistency["metrics"]["assets"][i] < 1.0:
+            consistency_issues.append("Missing assets for consistency check")
+        if f["unexpected_labels"][i]:
+            consistency_issues.append(
+                f"Image labels not among the analysis scenes: {', '.join(f['unexpected_labels'][i])}"
+            )
+        if not f["category_mentioned"][i] and copy["count"][i] > 0:
+            consistency_issues.append("Copy never mentions the analyzed product category")
+        if f["keywords_total"][i] == 0:
+            consistency_issues.append("No keywords found in analysis for consistency check")
+
+        def check(result, issues, suggestions):
+            return {
+                "score": round(float(result["score"][i]), 2),
+                "issues": issues,
+                "suggestions": suggestions,
+                "metrics": {
+                    name: round(float(values[i]), 3) for name, values in result["metrics"].items()
+                },
+            }
+
+        report_checks = {
+            "copywriting": check(copy, copy_issues, copy_suggestions),
+            "images": check(images, image_issues, image_suggestions),
+            "video": check(video, video_issues, video_suggestions),
+            "consistency": check(
+                consistency, consistency_issues,
+                ["Review all assets for brand voice consistency"],
+            ),
+        }
+        return {
+            "score": overall,
+            "passed": overall >= self.pass_threshold,
+            "checks": report_checks,
+            "issues": [issue for c in report_checks.values() for issue in c["issues"]],
+            "suggestions": [s for c in report_checks.values() for s in c["suggestions"]],
+            "rules_version": QA_RULES_VERSION,
+        }
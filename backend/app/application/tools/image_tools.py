@@ -4,9 +4,35 @@ Image Tools
 Provides image generation and management utilities.
 """
 
+import asyncio
 from typing import Dict, Any, Optional
 from uuid import UUID, uuid4
 
+from app.core.config import settings
+
+
+# Process-wide limit on concurrent image provider calls, shared by all workflows
+_provider_semaphore: Optional[asyncio.Semaphore] = None
+_provider_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_provider_semaphore() -> asyncio.Semaphore:
+    """
+    Get the global semaphore bounding concurrent image provider calls.
+
+    The semaphore is created lazily and recreated if the running event loop
+    changes (e.g. between test event loops).
+
+    Returns:
+        Shared asyncio.Semaphore sized by settings.image_provider_max_concurrency
+    """
+    global _provider_semaphore, _provider_semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _provider_semaphore is None or _provider_semaphore_loop is not loop:
+        _provider_semaphore = asyncio.Semaphore(max(1, settings.image_provider_max_concurrency))
+        _provider_semaphore_loop = loop
+    return _provider_semaphore
+
 
 class ImageTools:
     """
@@ -15,16 +41,29 @@ class ImageTools:
     Handles image generation through providers and asset persistence.
     """
 
-    def __init__(self, provider_factory=None, asset_repository=None):
+    def __init__(
+        self,
+        provider_factory=None,
+        asset_repository=None,
+        provider_semaphore: Optional[asyncio.Semaphore] = None,
+    ):
         """
         Initialize image tools.
 
         Args:
             provider_factory: Factory for creating image generation providers
             asset_repository: Repository for persisting image assets
+            provider_semaphore: Semaphore bounding concurrent provider calls
+                (defaults to the process-wide semaphore)
         """
         self.provider_factory = provider_factory
         self.asset_repository = asset_repository
+        self._provider_semaphore = provider_semaphore
+
+    @property
+    def provider_semaphore(self) -> asyncio.Semaphore:
+        """Semaphore guarding calls into the image provider."""
+        return self._provider_semaphore or get_provider_semaphore()
 
     async def generate_image(
         self,
@@ -61,11 +100,12 @@ class ImageTools:
 
         try:
             provider_instance = self.provider_factory.get_provider(provider)
-            result = await provider_instance.generate(
-                prompt=prompt,
-                width=width,
-                height=height,
-            )
+            async with self.provider_semaphore:
+                result = await provider_instance.generate(
+                    prompt=prompt,
+                    width=width,
+                    height=height,
+                )
             return result
         except Exception as e:
             raise RuntimeError(f"Image generation failed: {str(e)}")
@@ -92,10 +132,11 @@ class ImageTools:
 
         try:
             provider_instance = self.provider_factory.get_provider(provider)
-            result = await provider_instance.variation(
-                image=image_path,
-                prompt=prompt,
-            )
+            async with self.provider_semaphore:
+                result = await provider_instance.variation(
+                    image=image_path,
+                    prompt=prompt,
+                )
             return result
         except Exception as e:
             raise RuntimeError(f"Image variation failed: {str(e)}")
@@ -139,6 +180,9 @@ class ImageTools:
 
         try:
             # Create video asset record with asset_type='image'
+            from app.application.services.derivative_service import (
+                schedule_asset_derivatives_after_commit,
+            )
             from app.infrastructure.database.models import VideoAssetModel
             from datetime import datetime, timezone
 
@@ -156,6 +200,10 @@ class ImageTools:
             )
 
             saved = await self.asset_repository.create(asset)
+            # The caller owns the transaction; derivatives start once it commits
+            schedule_asset_derivatives_after_commit(
+                self.asset_repository.session, saved.asset_uuid, saved.url
+            )
 
             return {
                 "asset_id": str(saved.asset_uuid),
@@ -131,16 +131,31 @@ class ToolRegistry:
         # Register factories
         registry.register_factory("filesystem", lambda: FileSystemTools())
         registry.register_factory("text", lambda: TextTools(llm_client))
-        registry.register_factory("vision", lambda: VisionTools(llm_client))
+
+        def create_vision_tools() -> VisionTools:
+            from app.infrastructure.vision import create_feature_extractor
+
+            return VisionTools(llm_client, feature_extractor=create_feature_extractor())
+
+        registry.register_factory("vision", create_vision_tools)
         registry.register_factory("image", lambda: ImageTools(
             provider_factory=None,  # TODO: inject
             asset_repository=video_asset_repository,
         ))
-        registry.register_factory("video", lambda: VideoTools(
-            video_provider=None,  # TODO: inject
-            slideshow_provider=None,  # TODO: inject
-            asset_repository=video_asset_repository,
-        ))
+
+        def create_video_tools() -> VideoTools:
+            from app.core.config import settings
+            from app.infrastructure.video import create_slideshow_provider
+
+            return VideoTools(
+                video_provider=None,  # TODO: inject
+                slideshow_provider=create_slideshow_provider(),
+                asset_repository=video_asset_repository,
+                race_slideshow=settings.video_race_slideshow,
+                keep_slideshow=settings.video_keep_slideshow,
+            )
+
+        registry.register_factory("video", create_video_tools)
 
         # Storage will be registered with repository
         # registry.register("storage", StorageTools(repository))
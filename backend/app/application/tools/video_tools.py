@@ -5,18 +5,44 @@ Provides video generation and slideshow fallback utilities.
 """
 
 import asyncio
+import logging
+import time
 from typing import Dict, Any, List, Optional
 from uuid import UUID, uuid4
 
+logger = logging.getLogger(__name__)
+
+
+def _discard(task: asyncio.Task) -> None:
+    """Cancel a task whose result is not needed and retrieve its exception."""
+    if not task.done():
+        task.cancel()
+    task.add_done_callback(_consume_exception)
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    """Mark a discarded task's exception as retrieved so asyncio does not log it."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug(f"Discarded video task failed: {task.exception()!r}")
+
 
 class VideoTools:
     """
     Video generation and slideshow creation utilities.
 
     Implements primary video generation with automatic fallback to slideshow.
+    In racing mode the slideshow is rendered while the primary provider runs,
+    so a timed-out or failed provider costs no extra latency.
     """
 
-    def __init__(self, video_provider=None, slideshow_provider=None, asset_repository=None):
+    def __init__(
+        self,
+        video_provider=None,
+        slideshow_provider=None,
+        asset_repository=None,
+        race_slideshow: bool = False,
+        keep_slideshow: bool = True,
+    ):
         """
         Initialize video tools.
 
@@ -24,10 +50,17 @@ class VideoTools:
             video_provider: Primary video generation provider
             slideshow_provider: Fallback slideshow provider
             asset_repository: Repository for persisting video assets
+            race_slideshow: Render the slideshow in parallel with the primary
+                provider instead of only after it fails
+            keep_slideshow: When the primary provider wins a race, return an
+                already finished slideshow under "secondary"; the video agent
+                saves it as a secondary asset of the package
         """
         self.video_provider = video_provider
         self.slideshow_provider = slideshow_provider
         self.asset_repository = asset_repository
+        self.race_slideshow = race_slideshow
+        self.keep_slideshow = keep_slideshow
 
     async def generate_video(
         self,
@@ -35,6 +68,7 @@ class VideoTools:
         image_paths: List[str],
         duration_sec: int = 15,
         timeout_sec: int = 30,
+        race: Optional[bool] = None,
     ) -> Dict[str, Any]:
         """
         Generate a video with automatic fallback to slideshow.
@@ -44,11 +78,15 @@ class VideoTools:
         2. On timeout or exception, fallback to slideshow
         3. Always returns a valid video asset
 
+        When racing, step 2 starts together with step 1, so the stage takes
+        at most max(timeout_sec, slideshow render time) instead of their sum.
+
         Args:
             prompt: Video generation prompt
             image_paths: List of image paths/URLs to use
             duration_sec: Target duration in seconds
             timeout_sec: Timeout for primary generation attempt
+            race: Override race_slideshow for this call
 
         Returns:
             Dictionary with generation result:
@@ -58,9 +96,13 @@ class VideoTools:
                 "provider": "video|slideshow",
                 "duration": 15,
                 "is_fallback": false,
-                "metadata": {...}
+                "metadata": {...},
+                "secondary": {...}  # finished slideshow, racing mode only
             }
         """
+        if race is None:
+            race = self.race_slideshow
+
         if self.video_provider is None:
             # No provider configured, use slideshow directly
             result = await self.create_slideshow(
@@ -71,6 +113,9 @@ class VideoTools:
             result["is_fallback"] = True
             return result
 
+        if race:
+            return await self._race_slideshow(prompt, image_paths, duration_sec, timeout_sec)
+
         try:
             # Try primary video generation with timeout
             result = await asyncio.wait_for(
@@ -81,7 +126,7 @@ class VideoTools:
             return result
         except (asyncio.TimeoutError, Exception) as e:
             # Fallback to slideshow on any error
-            print(f"Video generation failed ({type(e).__name__}), falling back to slideshow")
+            logger.warning(f"Video generation failed ({type(e).__name__}), falling back to slideshow")
             result = await self.create_slideshow(
                 images=image_paths,
                 captions=[prompt] if prompt else [],
@@ -90,6 +135,75 @@ class VideoTools:
             result["is_fallback"] = True
             return result
 
+    async def _race_slideshow(
+        self,
+        prompt: str,
+        image_paths: List[str],
+        duration_sec: int,
+        timeout_sec: float,
+    ) -> Dict[str, Any]:
+        """
+        Run the primary provider and the slideshow concurrently.
+
+        The primary result wins if it arrives within timeout_sec. Otherwise
+        the primary call is cancelled and the slideshow, which has been
+        rendering since the start, is returned.
+
+        Args:
+            prompt: Generation prompt
+            image_paths: Source images
+            duration_sec: Target duration
+            timeout_sec: Deadline for the primary provider
+
+        Returns:
+            Video generation result (see generate_video)
+        """
+        started = time.perf_counter()
+        primary = asyncio.create_task(
+            self._call_video_provider(prompt, image_paths, duration_sec)
+        )
+        slideshow = asyncio.create_task(
+            self.create_slideshow(
+                images=image_paths,
+                captions=[prompt] if prompt else [],
+                duration_sec=duration_sec,
+            )
+        )
+
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=timeout_sec)
+            if primary in done and primary.exception() is None:
+                result = primary.result()
+                result["is_fallback"] = False
+                if self.keep_slideshow and slideshow.done() and not slideshow.cancelled() \
+                        and slideshow.exception() is None:
+                    result["secondary"] = slideshow.result()
+                else:
+                    _discard(slideshow)
+                logger.info(
+                    f"Primary video won race in {(time.perf_counter() - started) * 1000:.0f}ms "
+                    f"(slideshow {'kept' if 'secondary' in result else 'cancelled'})"
+                )
+                return result
+
+            if primary in done:
+                reason = type(primary.exception()).__name__
+            else:
+                _discard(primary)
+                reason = "TimeoutError"
+            logger.warning(f"Video generation failed ({reason}), using raced slideshow")
+
+            result = await slideshow
+            result["is_fallback"] = True
+            logger.info(
+                f"Slideshow returned after {(time.perf_counter() - started) * 1000:.0f}ms"
+            )
+            return result
+        finally:
+            # Never leak a render or provider call when the caller is cancelled
+            for task in (primary, slideshow):
+                _discard(task)
+
     async def _call_video_provider(
         self,
         prompt: str,
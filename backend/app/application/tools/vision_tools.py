@@ -5,31 +5,44 @@ Provides image analysis and understanding utilities.
 """
 
 import json
-from typing import Dict, Any
+import logging
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
 
 
 class VisionTools:
     """
     Image and vision analysis utilities.
 
-    Wraps vision model calls for product image analysis.
+    Wraps vision model calls for product image analysis. Measurable fields
+    (color palette, brightness, background) come from a local feature
+    extractor when one is configured, so the model only has to answer
+    semantic questions.
     """
 
-    def __init__(self, vision_client=None):
+    def __init__(self, vision_client=None, feature_extractor=None):
         """
         Initialize vision tools.
 
         Args:
             vision_client: Vision model client (e.g., GPT-4 Vision, Claude Vision)
+            feature_extractor: Local ImageFeatureExtractor (optional)
         """
         self.vision_client = vision_client
+        self.feature_extractor = feature_extractor
 
-    async def analyze_product_image(self, image_path: str) -> Dict[str, Any]:
+    async def analyze_product_image(
+        self,
+        image_path: str,
+        image_bytes: Optional[bytes] = None,
+    ) -> Dict[str, Any]:
         """
         Analyze a product image and extract key information.
 
         Args:
             image_path: Path or URL to product image
+            image_bytes: Already loaded image content (avoids refetching it)
 
         Returns:
             Dictionary with analysis results:
@@ -42,30 +55,62 @@ class VisionTools:
                 "color_palette": ["#hex", ...],
                 "target_audience": "...",
                 "price_range": "$$-$$$",
-                "keywords": ["..."]
+                "keywords": ["..."],
+                "image_features": {...}  # present when measured locally
             }
 
         Raises:
             RuntimeError: If vision client not configured or analysis fails
         """
+        features = await self.extract_features(image_path, image_bytes)
+
         if self.vision_client is None:
             # Return mock data for development
-            return self._mock_analysis(image_path)
+            return self._apply_features(self._mock_analysis(image_path), features)
 
         try:
-            analysis = await self._call_vision_model(image_path)
-            return self._normalize_analysis(analysis)
+            analysis = await self._call_vision_model(image_path, features)
+            return self._apply_features(self._normalize_analysis(analysis), features)
         except Exception as e:
             raise RuntimeError(f"Image analysis failed: {str(e)}")
 
-    async def _call_vision_model(self, image_path: str) -> Dict[str, Any]:
+    async def extract_features(
+        self,
+        image_path: str,
+        image_bytes: Optional[bytes] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Measure an image locally (no model call).
+
+        Args:
+            image_path: URL of the image
+            image_bytes: Already loaded image content (optional)
+
+        Returns:
+            Image features, or None if no extractor is configured or the
+            image could not be measured
+        """
+        if self.feature_extractor is None:
+            return None
+        features = await self.feature_extractor.extract(image_path, image_bytes)
+        if features is not None:
+            logger.info(f"Extracted image features in {features.get('extract_ms', 0)}ms")
+        return features
+
+    async def _call_vision_model(
+        self,
+        image_path: str,
+        features: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
         """
         Internal method to call vision model.
 
         This is a placeholder - implement based on actual vision client.
+        When features are given, the model need not be asked for colors.
 
         Args:
             image_path: Image to analyze
+            features: Locally measured image features
 
         Returns:
             Raw analysis results
@@ -74,6 +119,30 @@ class VisionTools:
         # For now, return mock data
         return self._mock_analysis(image_path)
 
+    def _apply_features(
+        self,
+        analysis: Dict[str, Any],
+        features: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Overwrite measurable fields with locally extracted features.
+
+        Args:
+            analysis: Normalized analysis
+            features: Image features, or None
+
+        Returns:
+            Analysis with the measured color palette and "image_features"
+        """
+        if not features:
+            return analysis
+        analysis = dict(analysis)
+        analysis["color_palette"] = list(features["color_palette"])
+        analysis["image_features"] = {
+            key: value for key, value in features.items() if key != "color_palette"
+        }
+        return analysis
+
     def _normalize_analysis(self, raw: Dict[str, Any]) -> Dict[str, Any]:
         """
         Normalize analysis results to standard structure.
@@ -67,6 +67,20 @@ class Settings(BaseSettings):
         description="Timeout in seconds for DeepSeek API calls"
     )
     
+    # Object Storage Backend
+    storage_backend: str = Field(
+        default="minio",
+        description="Object storage backend: 'minio' or 'local'"
+    )
+    local_storage_root: str = Field(
+        default="./data/storage",
+        description="Directory for objects when storage_backend is 'local'"
+    )
+    local_storage_base_url: str = Field(
+        default="http://localhost:8000/api/v1/files",
+        description="Public URL prefix of the local file route"
+    )
+    
     # MinIO Configuration
     minio_endpoint: str = Field(
         default="localhost:9000",
@@ -98,6 +112,34 @@ class Settings(BaseSettings):
         default="http://localhost:3000,http://localhost:8000",
         description="CORS allowed origins (comma-separated)"
     )
+    socketio_manager: str = Field(
+        default="local",
+        description="Socket.IO client manager: 'local' (single worker), 'redis' (fan-out across workers via REDIS_URL) or 'memory'"
+    )
+    socketio_channel: str = Field(
+        default="socketio",
+        description="Pub/sub channel shared by the Socket.IO workers of one deployment"
+    )
+    socketio_serializer: str = Field(
+        default="json",
+        description="Socket.IO packet serializer: 'json' or 'msgpack' (clients must use the msgpack parser)"
+    )
+    socketio_compiled_events: bool = Field(
+        default=True,
+        description="Encode JSON events with the precompiled serializers in ws.schemas instead of stdlib json"
+    )
+    socketio_replay_events: int = Field(
+        default=500,
+        description="Events per workflow kept for clients that resubscribe after reconnecting"
+    )
+    socketio_replay_ttl_seconds: int = Field(
+        default=600,
+        description="Seconds a workflow's replay buffer is kept after the workflow finishes"
+    )
+    socketio_replay_max_workflows: int = Field(
+        default=1000,
+        description="Maximum workflows with a replay buffer (LRU eviction)"
+    )
     
     # Logging
     log_level: str = Field(
@@ -118,6 +160,14 @@ class Settings(BaseSettings):
         default=False,
         description="Use Stdio mode instead of HTTP for MCP"
     )
+    mcp_image_stdio_command: str = Field(
+        default="",
+        description="Command line that starts the MCP image server in Stdio mode"
+    )
+    mcp_http_pool_size: int = Field(
+        default=20,
+        description="Maximum pooled keep-alive connections to the MCP HTTP server"
+    )
     mcp_image_timeout: int = Field(
         default=60,
         description="Request timeout in seconds for MCP image generation"
@@ -126,18 +176,258 @@ class Settings(BaseSettings):
         default="stable-diffusion-xl",
         description="Default model for image generation"
     )
+    mcp_batch_window_ms: float = Field(
+        default=0,
+        description="Window in ms for auto-batching concurrent MCP tool calls into one JSON-RPC batch (0, the default, disables; the server must accept batches)"
+    )
+    mcp_batch_max_size: int = Field(
+        default=16,
+        description="Maximum number of MCP tool calls per JSON-RPC batch request"
+    )
     image_generator_provider: str = Field(
         default="mock",
         description="Image generator provider: 'mock' or 'mcp'"
     )
+    image_provider_reuse: bool = Field(
+        default=True,
+        description="Reuse image generator instances (and their MCP transports) across requests"
+    )
+    image_scene_concurrency: int = Field(
+        default=3,
+        description="Maximum concurrent scene image generations per workflow"
+    )
+    image_provider_max_concurrency: int = Field(
+        default=8,
+        description="Maximum concurrent image provider calls across all workflows"
+    )
+    image_cache_enabled: bool = Field(
+        default=True,
+        description="Reuse previously generated images for identical requests"
+    )
+    image_cache_max_entries: int = Field(
+        default=1024,
+        description="Maximum entries in the image generation cache (LRU eviction)"
+    )
+    image_cache_ttl_seconds: int = Field(
+        default=86400,
+        description="Seconds before an image generation cache entry expires"
+    )
+    analysis_cache_enabled: bool = Field(
+        default=True,
+        description="Reuse product analyses for identical image content and background"
+    )
+    analysis_cache_max_entries: int = Field(
+        default=1024,
+        description="Maximum entries in the product analysis cache (LRU eviction)"
+    )
+    analysis_cache_ttl_seconds: int = Field(
+        default=604800,
+        description="Seconds before a product analysis cache entry expires"
+    )
+    analysis_cache_version: str = Field(
+        default="",
+        description="Extra version stamp for analysis cache keys; change to invalidate all entries"
+    )
+    input_image_max_mb: int = Field(
+        default=10,
+        description="Maximum size in MB of a workflow's input product image"
+    )
+    input_image_cache_entries: int = Field(
+        default=32,
+        description="Maximum input images kept in memory across workflows (LRU eviction)"
+    )
+    input_image_cache_mb: int = Field(
+        default=128,
+        description="Maximum total size in MB of input images kept in memory"
+    )
+    qa_incremental_enabled: bool = Field(
+        default=True,
+        description="Check copy and images as they are generated instead of only after the video"
+    )
+    qa_max_regenerations: int = Field(
+        default=1,
+        description="Times a copy channel or image with blocking QA issues is regenerated"
+    )
+    qa_short_circuit: bool = Field(
+        default=True,
+        description="Fail the workflow before image/video generation when copy stays blocking"
+    )
+    copy_dedup_enabled: bool = Field(
+        default=True,
+        description="Flag generated copy that near-duplicates the merchant's earlier copy"
+    )
+    copy_dedup_threshold: float = Field(
+        default=0.8,
+        description="Estimated Jaccard similarity at which two copy texts count as duplicates"
+    )
+    copy_dedup_num_perm: int = Field(
+        default=128,
+        description="MinHash signature length; changing it ignores previously stored signatures"
+    )
+    copy_dedup_max_users: int = Field(
+        default=256,
+        description="Maximum per-user duplicate indexes kept in memory (LRU eviction)"
+    )
+    image_derivatives_enabled: bool = Field(
+        default=True,
+        description="Generate thumbnail/medium renditions for new image assets"
+    )
+    image_derivative_workers: int = Field(
+        default=2,
+        description="Process pool size for rendering image derivatives"
+    )
+    image_thumbnail_size: int = Field(
+        default=320,
+        description="Maximum edge in pixels of thumbnail derivatives"
+    )
+    image_medium_size: int = Field(
+        default=1024,
+        description="Maximum edge in pixels of medium derivatives"
+    )
+    image_derivative_formats: str = Field(
+        default="webp,avif",
+        description="Comma-separated derivative formats (unsupported ones are skipped)"
+    )
+    slideshow_renderer: str = Field(
+        default="local",
+        description="Slideshow fallback renderer: 'local' (real video) or 'mock'"
+    )
+    slideshow_format: str = Field(
+        default="auto",
+        description="Slideshow output: 'mp4', 'webp', or 'auto' (mp4 when ffmpeg is installed)"
+    )
+    slideshow_width: int = Field(
+        default=1280,
+        description="Slideshow video width in pixels"
+    )
+    slideshow_height: int = Field(
+        default=720,
+        description="Slideshow video height in pixels"
+    )
+    slideshow_fps: int = Field(
+        default=24,
+        description="Slideshow frames per second"
+    )
+    slideshow_transition_seconds: float = Field(
+        default=0.5,
+        description="Length of slideshow fade transitions in seconds"
+    )
+    slideshow_workers: int = Field(
+        default=2,
+        description="Process pool size for rendering slideshow frames"
+    )
+    ffmpeg_path: str = Field(
+        default="ffmpeg",
+        description="ffmpeg executable used to encode MP4 slideshows"
+    )
+    vision_features_enabled: bool = Field(
+        default=True,
+        description="Measure colors, brightness and background locally before vision analysis"
+    )
+    vision_feature_sample_size: int = Field(
+        default=128,
+        description="Longest edge in pixels of the copy used for feature extraction"
+    )
+    vision_palette_size: int = Field(
+        default=5,
+        description="Number of dominant colors extracted per image"
+    )
+    vision_workers: int = Field(
+        default=2,
+        description="Process pool size for image feature extraction"
+    )
+    video_race_slideshow: bool = Field(
+        default=True,
+        description="Render the slideshow fallback in parallel with the primary video provider"
+    )
+    video_keep_slideshow: bool = Field(
+        default=True,
+        description="Attach a finished raced slideshow to the primary video as a secondary asset"
+    )
+    video_job_provider: str = Field(
+        default="none",
+        description="Submit/poll video provider: 'none' (render inline) or 'mock'"
+    )
+    video_job_mock_render_seconds: float = Field(
+        default=30.0,
+        description="Simulated render time of the mock video job provider"
+    )
+    video_job_poll_initial_seconds: float = Field(
+        default=5.0,
+        description="Delay before the first poll of a video job"
+    )
+    video_job_poll_max_seconds: float = Field(
+        default=60.0,
+        description="Upper bound on the delay between video job polls"
+    )
+    video_job_poll_multiplier: float = Field(
+        default=2.0,
+        description="Exponential backoff factor between video job polls"
+    )
+    video_job_poll_jitter: float = Field(
+        default=0.2,
+        description="Fraction of each poll delay that is randomized"
+    )
+    video_job_timeout_seconds: float = Field(
+        default=900.0,
+        description="Give up on a video job (and use the slideshow) after this long"
+    )
+    video_job_max_concurrent_polls: int = Field(
+        default=32,
+        description="Maximum simultaneous poll requests to the video provider"
+    )
+    video_job_webhook_base_url: str = Field(
+        default="",
+        description="Public URL of the video job webhook route; empty disables webhooks"
+    )
+    video_job_webhook_secret: str = Field(
+        default="",
+        description="Key for signing video job webhook tokens (default: SECRET_KEY)"
+    )
     minio_secure: bool = Field(
         default=False,
         description="Use HTTPS for MinIO connections"
     )
+    minio_region: str = Field(
+        default="us-east-1",
+        description="MinIO/S3 region (set so URL signing never needs a bucket-location lookup)"
+    )
     minio_max_size_mb: int = Field(
         default=10,
         description="Maximum upload size in MB for MinIO"
     )
+    minio_upload_workers: int = Field(
+        default=8,
+        description="Thread pool size for blocking MinIO SDK calls"
+    )
+    minio_part_size_mb: int = Field(
+        default=5,
+        description="Multipart upload part size in MB for MinIO (minimum 5)"
+    )
+    minio_content_addressed: bool = Field(
+        default=True,
+        description="Name uploads by SHA-256 of their content and skip re-uploading stored bytes"
+    )
+    minio_cache_control: str = Field(
+        default="public, max-age=31536000, immutable",
+        description="Cache-Control stored with uploaded objects (empty disables)"
+    )
+    minio_presign_enabled: bool = Field(
+        default=False,
+        description="Serve presigned GET URLs for bucket objects (required for private buckets)"
+    )
+    minio_presign_expiry_seconds: int = Field(
+        default=3600,
+        description="Minimum remaining validity in seconds of issued presigned URLs"
+    )
+    minio_presign_window_seconds: int = Field(
+        default=900,
+        description="Presigned URLs are reused within windows of this many seconds"
+    )
+    minio_presign_cache_size: int = Field(
+        default=4096,
+        description="Maximum presigned URLs kept in the in-process cache"
+    )
     mcp_allowed_domains: str = Field(
         default="localhost,127.0.0.1,minio",
         description="Comma-separated list of allowed domains for MCP URL validation (SSRF prevention)"
@@ -148,6 +438,11 @@ class Settings(BaseSettings):
         """Parse allowed domains string to set."""
         return {domain.strip() for domain in self.mcp_allowed_domains.split(",") if domain.strip()}
 
+    @property
+    def image_derivative_formats_list(self) -> list:
+        """Parse derivative formats string to an ordered list."""
+        return [fmt.strip().lower() for fmt in self.image_derivative_formats.split(",") if fmt.strip()]
+
     # LangSmith Configuration
     langchain_tracing_v2: bool = Field(
         default=False,
@@ -166,6 +461,42 @@ class Settings(BaseSettings):
         description="LangSmith API endpoint"
     )
     
+    @field_validator("storage_backend")
+    @classmethod
+    def validate_storage_backend(cls, v: str) -> str:
+        """Validate object storage backend."""
+        allowed = {"minio", "local"}
+        if v.lower() not in allowed:
+            raise ValueError(f"storage_backend must be one of: {allowed}")
+        return v.lower()
+    
+    @field_validator("video_job_provider")
+    @classmethod
+    def validate_video_job_provider(cls, v: str) -> str:
+        """Validate submit/poll video provider."""
+        allowed = {"none", "mock"}
+        if v.lower() not in allowed:
+            raise ValueError(f"video_job_provider must be one of: {allowed}")
+        return v.lower()
+    
+    @field_validator("socketio_manager")
+    @classmethod
+    def validate_socketio_manager(cls, v: str) -> str:
+        """Validate Socket.IO client manager."""
+        allowed = {"local", "redis", "memory"}
+        if v.lower() not in allowed:
+            raise ValueError(f"socketio_manager must be one of: {allowed}")
+        return v.lower()
+    
+    @field_validator("socketio_serializer")
+    @classmethod
+    def validate_socketio_serializer(cls, v: str) -> str:
+        """Validate Socket.IO serializer."""
+        allowed = {"json", "msgpack"}
+        if v.lower() not in allowed:
+            raise ValueError(f"socketio_serializer must be one of: {allowed}")
+        return v.lower()
+    
     @field_validator("app_env")
     @classmethod
     def validate_app_env(cls, v: str) -> str:
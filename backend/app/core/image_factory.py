@@ -4,6 +4,7 @@ Image Generator Factory Module.
 Manages registration and instantiation of image generation providers.
 """
 import logging
+import shlex
 from typing import Any, Callable, Dict, Optional
 
 from app.domain.interfaces.image_generator import IImageGenerator
@@ -23,9 +24,13 @@ class ImageProviderFactory:
     Factory for creating image generator instances.
     
     Supports lazy registration of providers to avoid circular imports
-    and unnecessary initialization.
+    and unnecessary initialization. When settings.image_provider_reuse is
+    enabled, instances are cached per (key, arguments) so their MCP
+    transports and storage clients live for the whole process; call
+    shutdown() to release them.
     """
     _registry: Dict[str, ImageGeneratorFactory] = {}
+    _instances: Dict[str, IImageGenerator] = {}
     _initialized: bool = False
 
     @classmethod
@@ -45,12 +50,21 @@ class ImageProviderFactory:
         logger.info(f"Registered image provider: {key}")
 
     @classmethod
-    def get_provider(cls, key: Optional[str] = None, **kwargs) -> IImageGenerator:
+    def get_provider(
+        cls,
+        key: Optional[str] = None,
+        use_cache: Optional[bool] = None,
+        **kwargs,
+    ) -> IImageGenerator:
         """
         Get an instance of an image generator by key.
         
+        Unless disabled, the generator is wrapped in CachedImageGenerator so
+        identical requests reuse previously generated images.
+        
         Args:
             key: Provider key. If None, uses settings.image_generator_provider
+            use_cache: Wrap in the generation cache (default: settings.image_cache_enabled)
             **kwargs: Additional arguments passed to factory
             
         Returns:
@@ -76,7 +90,33 @@ class ImageProviderFactory:
                 f"Unknown image provider '{key}'. Available: {valid_keys}"
             )
         
-        return factory(**kwargs)
+        if use_cache is None:
+            use_cache = settings.image_cache_enabled
+        
+        instance_key = None
+        if settings.image_provider_reuse:
+            instance_key = f"{key}:{use_cache}:{sorted(kwargs.items())!r}"
+            instance = cls._instances.get(instance_key)
+            if instance is not None:
+                return instance
+        
+        generator = factory(**kwargs)
+        
+        if use_cache:
+            from app.infrastructure.generators.image_cache import (
+                CachedImageGenerator,
+                image_generation_cache,
+            )
+            generator = CachedImageGenerator(
+                generator,
+                image_generation_cache,
+                model=getattr(generator, "model", key),
+            )
+        
+        if instance_key is not None:
+            cls._instances[instance_key] = generator
+        
+        return generator
 
     @classmethod
     def _initialize_providers(cls) -> None:
@@ -97,24 +137,34 @@ class ImageProviderFactory:
         
         # Register MCP provider
         def create_mcp_generator(**kwargs) -> IImageGenerator:
-            from app.infrastructure.mcp import MCPImageGenerator, MCPHttpClient
-            from app.infrastructure.storage import MinIOClient
-            
-            # Create MCP client
-            mcp_client = MCPHttpClient(
-                server_url=kwargs.get("server_url", settings.mcp_image_server_url),
-                timeout=kwargs.get("timeout", settings.mcp_image_timeout),
+            from app.infrastructure.mcp import (
+                MCPImageGenerator,
+                MCPHttpClient,
+                MCPStdioClient,
             )
+            from app.infrastructure.storage import get_storage_client
             
-            # Create MinIO client with size limit
-            minio_client = MinIOClient(
-                endpoint=settings.minio_endpoint,
-                access_key=settings.minio_access_key,
-                secret_key=settings.minio_secret_key,
-                bucket=settings.minio_bucket,
-                secure=settings.minio_secure,
-                max_size_bytes=settings.minio_max_size_mb * 1024 * 1024,
-            )
+            # Create MCP client; reused generators keep their transport open
+            if kwargs.get("use_stdio", settings.mcp_image_use_stdio):
+                mcp_client = MCPStdioClient(
+                    command=shlex.split(
+                        kwargs.get("command", settings.mcp_image_stdio_command)
+                    ),
+                    timeout=kwargs.get("timeout", settings.mcp_image_timeout),
+                    persistent=settings.image_provider_reuse,
+                )
+            else:
+                mcp_client = MCPHttpClient(
+                    server_url=kwargs.get("server_url", settings.mcp_image_server_url),
+                    timeout=kwargs.get("timeout", settings.mcp_image_timeout),
+                    batch_window_ms=kwargs.get("batch_window_ms", settings.mcp_batch_window_ms),
+                    max_batch_size=settings.mcp_batch_max_size,
+                    persistent=settings.image_provider_reuse,
+                    pool_size=settings.mcp_http_pool_size,
+                )
+            
+            # Shared object storage (MinIO or local disk) for Base64 uploads
+            minio_client = get_storage_client()
             
             return MCPImageGenerator(
                 mcp_client=mcp_client,
@@ -128,8 +178,23 @@ class ImageProviderFactory:
         cls._initialized = True
         logger.info("Image providers initialized")
 
+    @classmethod
+    async def shutdown(cls) -> None:
+        """Close reused generator instances and their transports."""
+        instances = list(cls._instances.values())
+        cls._instances.clear()
+        for instance in instances:
+            close = getattr(instance, "close", None)
+            if close is None:
+                continue
+            try:
+                await close()
+            except Exception as e:
+                logger.warning(f"Failed to close image provider: {e}")
+
     @classmethod
     def reset(cls) -> None:
         """Reset the factory (for testing purposes)."""
         cls._registry.clear()
+        cls._instances.clear()
         cls._initialized = False
@@ -21,6 +21,8 @@ class ImageGenerationRequest:
         negative_prompt: Optional text describing what to avoid
         num_inference_steps: Number of inference steps for generation
         guidance_scale: Guidance scale for prompt adherence
+        seed: Optional random seed for reproducible generation
+        use_cache: Whether a previously generated identical image may be reused
     """
     prompt: str
     width: int = 512
@@ -29,6 +31,8 @@ class ImageGenerationRequest:
     negative_prompt: Optional[str] = None
     num_inference_steps: int = 50
     guidance_scale: float = 7.5
+    seed: Optional[int] = None
+    use_cache: bool = True
     
     def to_dict(self) -> dict:
         """Convert request to dictionary."""
@@ -40,6 +44,8 @@ class ImageGenerationRequest:
             "negative_prompt": self.negative_prompt,
             "num_inference_steps": self.num_inference_steps,
             "guidance_scale": self.guidance_scale,
+            "seed": self.seed,
+            "use_cache": self.use_cache,
         }
     
     @classmethod
@@ -53,4 +59,6 @@ class ImageGenerationRequest:
             negative_prompt=data.get("negative_prompt"),
             num_inference_steps=data.get("num_inference_steps", 50),
             guidance_scale=data.get("guidance_scale", 7.5),
+            seed=data.get("seed"),
+            use_cache=data.get("use_cache", True),
         )
@@ -6,8 +6,8 @@ Contains abstract interfaces that define contracts for infrastructure implementa
 
 from .generator import IGenerator
 from .user_repository import IUserRepository
-from .image_generator import IImageGenerator
+from .image_generator import IImageGenerator, ImageProgressCallback
 
-__all__ = ["IUserRepository", "IGenerator", "IImageGenerator"]
+__all__ = ["IUserRepository", "IGenerator", "IImageGenerator", "ImageProgressCallback"]
 
 
@@ -4,7 +4,7 @@ Asset Repository Interface.
 Abstract interface defining the contract for asset persistence operations.
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from app.domain.entities.asset import Asset
@@ -68,6 +68,22 @@ class IAssetRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_many_for_user(
+        self, asset_uuids: List[UUID], user_id: UUID
+    ) -> List[Asset]:
+        """
+        Get several assets owned by a user in one query.
+
+        Args:
+            asset_uuids: Asset UUIDs
+            user_id: The user's UUID (other users' assets are omitted)
+
+        Returns:
+            Found assets in the order of asset_uuids
+        """
+        pass
+
     @abstractmethod
     async def get_by_uuid_for_user(
         self, asset_uuid: UUID, user_id: UUID
@@ -100,6 +116,22 @@ class IAssetRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def merge_metadata(
+        self, asset_uuid: UUID, updates: Dict[str, Any]
+    ) -> Optional[Asset]:
+        """
+        Merge keys into an asset's metadata.
+
+        Args:
+            asset_uuid: The asset's UUID
+            updates: Metadata keys to set (existing keys are overwritten)
+
+        Returns:
+            Updated Asset if found, None otherwise
+        """
+        pass
+
     @abstractmethod
     async def delete(self, asset_id: int) -> bool:
         """
@@ -4,12 +4,16 @@ Image Generator Interface.
 Defines the contract for image generation services.
 """
 from abc import ABC, abstractmethod
-from typing import Protocol, runtime_checkable
+from typing import Any, Awaitable, Callable, Dict, Optional, Protocol, runtime_checkable
 
 from app.domain.entities.image_artifact import ImageArtifact
 from app.domain.entities.image_request import ImageGenerationRequest
 
 
+# Receives {"progress", "total", "message", "preview_url"} updates during generation
+ImageProgressCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
 @runtime_checkable
 class IImageGenerator(Protocol):
     """Interface for image generation services.
@@ -18,11 +22,17 @@ class IImageGenerator(Protocol):
     (like MCP clients) must satisfy.
     """
     
-    async def generate(self, request: ImageGenerationRequest) -> ImageArtifact:
+    async def generate(
+        self,
+        request: ImageGenerationRequest,
+        on_progress: Optional[ImageProgressCallback] = None,
+    ) -> ImageArtifact:
         """Generate an image from a text prompt.
         
         Args:
             request: Image generation request containing prompt and parameters
+            on_progress: Optional callback for intermediate progress and
+                low-resolution previews, when the provider supports them
             
         Returns:
             ImageArtifact containing the generated image URL and metadata
@@ -8,7 +8,7 @@ from datetime import datetime, timezone
 from typing import Optional
 from uuid import uuid4
 
-from sqlalchemy import Boolean, DateTime, Integer, String, Text, JSON, text, Index, ForeignKey
+from sqlalchemy import Boolean, DateTime, Integer, LargeBinary, String, Text, JSON, text, Index, ForeignKey, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -329,3 +329,111 @@ class ProductPackageModel(Base):
     def __repr__(self) -> str:
         return f"<ProductPackage(id={self.id}, workflow_id={self.workflow_id}, status={self.status})>"
 
+
+
+class VideoJobModel(Base):
+    """异步视频生成任务 - 工作流在此挂起，任务完成后恢复"""
+    __tablename__ = "video_jobs"
+
+    __table_args__ = (
+        Index('ix_video_jobs_state', 'state'),
+    )
+
+    id: Mapped[str] = mapped_column(
+        String(36),
+        primary_key=True,
+    )
+    provider_job_id: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False,
+    )
+    workflow_id: Mapped[str] = mapped_column(
+        String(255),
+        index=True,
+        nullable=False,
+    )
+    state: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False,
+        default="pending",
+    )  # pending/succeeded/failed/timed_out
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+    submitted_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+    )
+    deadline_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+    )
+    completed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime,
+        nullable=True,
+    )
+
+    # 供应商返回结果 {url/provider/duration}
+    result: Mapped[Optional[dict]] = mapped_column(
+        JSON,
+        nullable=True,
+    )
+    error_message: Mapped[Optional[str]] = mapped_column(
+        Text,
+        nullable=True,
+    )
+
+    # 恢复工作流所需的检查点 {package_id/analysis/copy_assets/image_assets/request}
+    context: Mapped[dict] = mapped_column(
+        JSON,
+        default=lambda: {},
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<VideoJob(id={self.id}, workflow_id={self.workflow_id}, state={self.state})>"
+
+
+class CopySignatureModel(Base):
+    """文案 MinHash 签名 - 按商家检测跨商品的近似重复文案"""
+    __tablename__ = "copy_signatures"
+
+    __table_args__ = (
+        UniqueConstraint('workflow_id', 'channel', name='uq_copy_signatures_workflow_channel'),
+    )
+
+    id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid4,
+        server_default=text("gen_random_uuid()"),
+    )
+    user_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True),
+        nullable=False,
+        index=True,
+    )
+    workflow_id: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False,
+    )
+    channel: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False,
+    )  # product_page/social_post/ad_short
+
+    # num_perm 个小端 uint32 (默认 128 -> 512 字节)
+    signature: Mapped[bytes] = mapped_column(
+        LargeBinary,
+        nullable=False,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=lambda: datetime.utcnow(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<CopySignature(workflow_id={self.workflow_id}, channel={self.channel})>"
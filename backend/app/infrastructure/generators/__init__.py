@@ -5,5 +5,15 @@ This module provides implementations of AI content generators
 using various provider APIs (DeepSeek, OpenAI, etc.).
 """
 from app.infrastructure.generators.deepseek import DeepSeekGenerator
+from app.infrastructure.generators.image_cache import (
+    CachedImageGenerator,
+    ImageGenerationCache,
+    image_generation_cache,
+)
 
-__all__ = ["DeepSeekGenerator"]
+__all__ = [
+    "DeepSeekGenerator",
+    "CachedImageGenerator",
+    "ImageGenerationCache",
+    "image_generation_cache",
+]
@@ -0,0 +1,285 @@
+"""
+Image Generation Cache.
+
+Content-keyed cache that lets any IImageGenerator skip duplicate renders.
+Identical (prompt, width, height, model, seed) requests - e.g. from
+duplicated projects or retries after a socket disconnect - reuse the
+URL of the image generated the first time.
+"""
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+from app.core.config import settings
+from app.domain.entities.image_artifact import ImageArtifact
+from app.domain.entities.image_request import ImageGenerationRequest
+from app.domain.interfaces.image_generator import IImageGenerator, ImageProgressCallback
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedImage:
+    """A cached generation result."""
+    url: str
+    provider: str
+    width: int
+    height: int
+    expires_at: float
+
+
+class ImageGenerationCache:
+    """
+    In-memory LRU cache with TTL mapping generation keys to image URLs.
+
+    Tracks hits, misses, evictions and expirations for hit-rate metrics.
+
+    Attributes:
+        max_entries: Maximum number of cached entries (least recently used evicted)
+        ttl_seconds: Lifetime of an entry in seconds
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: int = 86400):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached entries
+            ttl_seconds: Lifetime of an entry in seconds
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, CachedImage]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(
+        prompt: str,
+        width: int,
+        height: int,
+        model: str,
+        seed: Optional[int] = None,
+        style: Optional[str] = None,
+        negative_prompt: Optional[str] = None,
+    ) -> str:
+        """
+        Build the content key for a generation request.
+
+        Every field forwarded to the provider is part of the key, so requests
+        that differ only in style or negative prompt are cached separately.
+
+        Returns:
+            Hex sha256 digest of the normalized request fields
+        """
+        payload = json.dumps(
+            [
+                prompt.strip(),
+                width,
+                height,
+                model,
+                seed,
+                style,
+                negative_prompt.strip() if negative_prompt else negative_prompt,
+            ],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedImage]:
+        """
+        Look up a cached image, counting the hit or miss.
+
+        Args:
+            key: Content key from make_key()
+
+        Returns:
+            CachedImage if present and not expired, None otherwise
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def set(self, key: str, artifact: ImageArtifact) -> None:
+        """
+        Store a generated artifact, evicting the least recently used entry if full.
+
+        Args:
+            key: Content key from make_key()
+            artifact: Generated image artifact
+        """
+        self._entries[key] = CachedImage(
+            url=artifact.url,
+            provider=artifact.provider,
+            width=artifact.width,
+            height=artifact.height,
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        """Remove a single entry."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries and reset metrics."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics.
+
+        Returns:
+            Dict with size, limits, hit/miss counts and hit_rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class CachedImageGenerator:
+    """
+    IImageGenerator decorator that serves repeated requests from a cache.
+
+    Wraps any image generator (mock or MCP). Requests with
+    ``use_cache=False`` always reach the wrapped generator, and only
+    http(s) URLs are cached (raw Base64 fallbacks are not).
+
+    Example:
+        generator = CachedImageGenerator(MockMCPImageGenerator(), image_generation_cache)
+        async with generator:
+            artifact = await generator.generate(request)
+    """
+
+    def __init__(
+        self,
+        generator: IImageGenerator,
+        cache: ImageGenerationCache,
+        model: Optional[str] = None,
+    ):
+        """
+        Initialize the caching wrapper.
+
+        Args:
+            generator: Wrapped image generator
+            cache: Shared generation cache
+            model: Model name used in the cache key (defaults to generator.model)
+        """
+        self.generator = generator
+        self.cache = cache
+        self.model = model or getattr(generator, "model", type(generator).__name__)
+
+    async def __aenter__(self) -> "CachedImageGenerator":
+        """Enter the wrapped generator's context."""
+        await self.generator.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Exit the wrapped generator's context."""
+        await self.generator.__aexit__(exc_type, exc_val, exc_tb)
+
+    async def close(self) -> None:
+        """Release the wrapped generator's long-lived resources, if any."""
+        close = getattr(self.generator, "close", None)
+        if close is not None:
+            await close()
+
+    async def generate(
+        self,
+        request: ImageGenerationRequest,
+        on_progress: Optional[ImageProgressCallback] = None,
+    ) -> ImageArtifact:
+        """
+        Generate an image, reusing a cached result for identical requests.
+
+        Args:
+            request: Image generation request
+            on_progress: Optional progress callback (only used on a miss)
+
+        Returns:
+            ImageArtifact (a fresh artifact pointing at the cached URL on a hit)
+        """
+        if not request.use_cache:
+            return await self._generate(request, on_progress)
+
+        key = self.cache.make_key(
+            request.prompt,
+            request.width,
+            request.height,
+            self.model,
+            request.seed,
+            request.style,
+            request.negative_prompt,
+        )
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info(f"Image cache hit for prompt: {request.prompt[:50]}...")
+            return ImageArtifact(
+                url=cached.url,
+                prompt=request.prompt,
+                original_prompt=request.prompt,
+                provider=cached.provider,
+                width=cached.width,
+                height=cached.height,
+                created_at=datetime.utcnow(),
+                id=uuid4(),
+            )
+
+        artifact = await self._generate(request, on_progress)
+        if artifact.url.startswith(("http://", "https://")):
+            self.cache.set(key, artifact)
+        return artifact
+
+    async def _generate(
+        self,
+        request: ImageGenerationRequest,
+        on_progress: Optional[ImageProgressCallback],
+    ) -> ImageArtifact:
+        """Call the wrapped generator, forwarding on_progress only when set."""
+        if on_progress is None:
+            return await self.generator.generate(request)
+        return await self.generator.generate(request, on_progress=on_progress)
+
+
+# Process-wide cache shared by all generator instances
+image_generation_cache = ImageGenerationCache(
+    max_entries=settings.image_cache_max_entries,
+    ttl_seconds=settings.image_cache_ttl_seconds,
+)
@@ -8,11 +8,13 @@ from .image_client import MockMCPImageGenerator
 from .base_client import (
     MCPBaseClient,
     MCPHttpClient,
+    MCPStdioClient,
     MCPError,
     MCPToolCallError,
     MCPTimeoutError,
     MCPConnectionError,
     MCPProtocolError,
+    ProgressCallback,
 )
 from .mcp_image_generator import (
     MCPImageGenerator,
@@ -26,7 +28,9 @@ __all__ = [
     # Real MCP clients
     "MCPBaseClient",
     "MCPHttpClient",
+    "MCPStdioClient",
     "MCPImageGenerator",
+    "ProgressCallback",
     # Exceptions
     "MCPError",
     "MCPToolCallError",
@@ -8,7 +8,7 @@ import asyncio
 import logging
 import json
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
 from uuid import uuid4
 
 import aiohttp
@@ -17,6 +17,24 @@ import aiohttp
 logger = logging.getLogger(__name__)
 
 
+# Receives the params of a notifications/progress message
+# ({"progressToken", "progress", "total"?, "message"?, ...})
+ProgressCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+async def _notify_progress(
+    on_progress: Optional[ProgressCallback],
+    params: Dict[str, Any],
+) -> None:
+    """Invoke a progress callback, never letting it fail the tool call."""
+    if on_progress is None:
+        return
+    try:
+        await on_progress(params)
+    except Exception as e:
+        logger.warning(f"MCP progress callback failed: {e}")
+
+
 # ============================================================================
 # Custom Exceptions
 # ============================================================================
@@ -71,12 +89,15 @@ class MCPBaseClient(ABC):
         self,
         tool_name: str,
         arguments: Dict[str, Any],
+        on_progress: Optional[ProgressCallback] = None,
     ) -> Dict[str, Any]:
         """Call an MCP tool.
         
         Args:
             tool_name: Name of the tool to call
             arguments: Tool arguments as a dictionary
+            on_progress: Optional callback for the server's progress
+                notifications (requests a progressToken)
             
         Returns:
             Parsed MCP result dictionary
@@ -88,6 +109,69 @@ class MCPBaseClient(ABC):
         """
         pass
     
+    def format_mcp_request(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        progress_token: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Format a request according to MCP JSON-RPC spec.
+        
+        Args:
+            tool_name: Name of the tool to call
+            arguments: Tool arguments
+            progress_token: Optional token asking the server for progress
+                notifications
+            
+        Returns:
+            MCP-compliant JSON-RPC request dictionary
+        """
+        params: Dict[str, Any] = {
+            "name": tool_name,
+            "arguments": arguments,
+        }
+        if progress_token is not None:
+            params["_meta"] = {"progressToken": progress_token}
+        
+        return {
+            "jsonrpc": "2.0",
+            "id": str(uuid4()),
+            "method": "tools/call",
+            "params": params,
+        }
+    
+    def parse_mcp_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse MCP JSON-RPC response.
+        
+        Args:
+            response: Raw response dictionary
+            
+        Returns:
+            The result portion of the response
+            
+        Raises:
+            MCPToolCallError: If response contains an error
+            MCPProtocolError: If response format is invalid
+        """
+        # Check for JSON-RPC error
+        if "error" in response:
+            error = response["error"]
+            raise MCPToolCallError(
+                message=error.get("message", "Unknown MCP error"),
+                code=error.get("code"),
+                tool_name=error.get("data", {}).get("tool_name"),
+            )
+        
+        # Validate response structure
+        if "result" not in response:
+            raise MCPProtocolError("Invalid MCP response: missing 'result' field")
+        
+        return response["result"]
+    
+    async def close(self) -> None:
+        """Release long-lived transport resources (no-op by default)."""
+        return None
+    
     @abstractmethod
     async def __aenter__(self) -> "MCPBaseClient":
         """Enter async context manager."""
@@ -108,6 +192,13 @@ class MCPHttpClient(MCPBaseClient):
     
     Implements MCP JSON-RPC over HTTP for tool invocations.
     
+    Multiple calls can be sent in one POST as a JSON-RPC batch, either
+    explicitly via call_tools_batch() or automatically by setting
+    batch_window_ms: concurrent call_tool() invocations arriving within
+    the window are coalesced into a single batch request. Auto-batching
+    is opt-in (off by default) because not every MCP server accepts
+    JSON-RPC batches.
+    
     Example:
         async with MCPHttpClient("http://localhost:3000") as client:
             result = await client.call_tool(
@@ -121,6 +212,10 @@ class MCPHttpClient(MCPBaseClient):
         server_url: str,
         timeout: int = 60,
         headers: Optional[Dict[str, str]] = None,
+        batch_window_ms: float = 0,
+        max_batch_size: int = 16,
+        persistent: bool = False,
+        pool_size: int = 100,
     ):
         """Initialize HTTP client.
         
@@ -128,110 +223,159 @@ class MCPHttpClient(MCPBaseClient):
             server_url: MCP server HTTP endpoint
             timeout: Request timeout in seconds
             headers: Optional HTTP headers
+            batch_window_ms: Auto-batching window in milliseconds (0 disables)
+            max_batch_size: Maximum number of calls per batch POST
+            persistent: Keep the pooled session open across context exits
+                (close it explicitly with close())
+            pool_size: Maximum number of pooled keep-alive connections
         """
         self.server_url = server_url.rstrip("/")
         self.timeout = timeout
         self.headers = headers or {}
+        self.batch_window_ms = batch_window_ms
+        self.max_batch_size = max(1, max_batch_size)
+        self.persistent = persistent
+        self.pool_size = pool_size
         self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_tasks: set = set()
     
     async def __aenter__(self) -> "MCPHttpClient":
         """Create HTTP session on context entry."""
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession(
-                headers=self.headers,
-                timeout=aiohttp.ClientTimeout(total=self.timeout),
-            )
+        self._ensure_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
-        """Close HTTP session on context exit."""
+        """Close HTTP session on context exit (kept open when persistent)."""
+        if not self.persistent:
+            await self.close()
+    
+    async def close(self) -> None:
+        """Close the pooled HTTP session."""
         if self._session and not self._session.closed:
             await self._session.close()
-            self._session = None
+        self._session = None
+        self._session_loop = None
     
-    def format_mcp_request(
-        self,
-        tool_name: str,
-        arguments: Dict[str, Any],
-    ) -> Dict[str, Any]:
-        """Format a request according to MCP JSON-RPC spec.
-        
-        Args:
-            tool_name: Name of the tool to call
-            arguments: Tool arguments
-            
-        Returns:
-            MCP-compliant JSON-RPC request dictionary
-        """
-        return {
-            "jsonrpc": "2.0",
-            "id": str(uuid4()),
-            "method": "tools/call",
-            "params": {
-                "name": tool_name,
-                "arguments": arguments,
-            },
-        }
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Return the pooled session, creating it for the running loop if needed."""
+        loop = asyncio.get_running_loop()
+        if (
+            self._session is None
+            or self._session.closed
+            or self._session_loop is not loop
+        ):
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+            )
+            self._session_loop = loop
+        return self._session
     
-    def parse_mcp_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
-        """Parse MCP JSON-RPC response.
+    async def _send_http_request(
+        self,
+        request: Union[Dict[str, Any], List[Dict[str, Any]]],
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """Send HTTP POST request to MCP server.
         
         Args:
-            response: Raw response dictionary
+            request: MCP JSON-RPC request, or a list of requests for a batch
             
         Returns:
-            The result portion of the response
+            Parsed JSON response (a list for batch requests)
             
         Raises:
-            MCPToolCallError: If response contains an error
-            MCPProtocolError: If response format is invalid
+            MCPConnectionError: If connection fails
+            MCPTimeoutError: If request times out
         """
-        # Check for JSON-RPC error
-        if "error" in response:
-            error = response["error"]
-            raise MCPToolCallError(
-                message=error.get("message", "Unknown MCP error"),
-                code=error.get("code"),
-                tool_name=error.get("data", {}).get("tool_name"),
-            )
-        
-        # Validate response structure
-        if "result" not in response:
-            raise MCPProtocolError("Invalid MCP response: missing 'result' field")
+        session = self._ensure_session()
         
-        return response["result"]
+        try:
+            async with session.post(
+                self.server_url,
+                json=request,
+                headers={"Content-Type": "application/json"},
+            ) as resp:
+                resp.raise_for_status()
+                return await resp.json()
+                
+        except asyncio.TimeoutError as e:
+            raise MCPTimeoutError(
+                f"Request timed out after {self.timeout} seconds"
+            ) from e
+        except aiohttp.ClientConnectionError as e:
+            raise MCPConnectionError(
+                f"Failed to connect to MCP server: {e}"
+            ) from e
+        except aiohttp.ClientError as e:
+            raise MCPConnectionError(
+                f"HTTP client error: {e}"
+            ) from e
     
-    async def _send_http_request(
+    async def _send_streaming_request(
         self,
         request: Dict[str, Any],
+        on_progress: ProgressCallback,
     ) -> Dict[str, Any]:
-        """Send HTTP POST request to MCP server.
+        """Send a request that may be answered with an SSE stream.
+        
+        Streamable HTTP servers reply with text/event-stream when they send
+        notifications before the final response. Progress notifications for
+        this request are passed to on_progress as they arrive.
         
         Args:
-            request: MCP JSON-RPC request
+            request: MCP JSON-RPC request with a progressToken
+            on_progress: Progress callback
             
         Returns:
-            Parsed JSON response
+            JSON-RPC response matching the request id
             
         Raises:
             MCPConnectionError: If connection fails
             MCPTimeoutError: If request times out
+            MCPProtocolError: If the stream ends without a response
         """
-        if self._session is None:
-            # Create session if not using context manager
-            self._session = aiohttp.ClientSession(
-                headers=self.headers,
-                timeout=aiohttp.ClientTimeout(total=self.timeout),
-            )
+        session = self._ensure_session()
+        token = request["params"]["_meta"]["progressToken"]
         
         try:
-            async with self._session.post(
+            async with session.post(
                 self.server_url,
                 json=request,
-                headers={"Content-Type": "application/json"},
+                headers={
+                    "Content-Type": "application/json",
+                    "Accept": "application/json, text/event-stream",
+                },
             ) as resp:
                 resp.raise_for_status()
-                return await resp.json()
+                if resp.content_type != "text/event-stream":
+                    return await resp.json()
+                
+                data_lines: List[str] = []
+                async for raw_line in resp.content:
+                    line = raw_line.decode("utf-8").rstrip("\r\n")
+                    if line.startswith("data:"):
+                        data_lines.append(line[5:].lstrip())
+                        continue
+                    if line or not data_lines:
+                        continue
+                    
+                    # Blank line terminates an SSE event
+                    message = json.loads("\n".join(data_lines))
+                    data_lines = []
+                    if message.get("id") == request["id"]:
+                        return message
+                    params = message.get("params") or {}
+                    if (
+                        message.get("method") == "notifications/progress"
+                        and params.get("progressToken") == token
+                    ):
+                        await _notify_progress(on_progress, params)
+                
+                raise MCPProtocolError("MCP event stream ended without a response")
                 
         except asyncio.TimeoutError as e:
             raise MCPTimeoutError(
@@ -250,23 +394,35 @@ class MCPHttpClient(MCPBaseClient):
         self,
         tool_name: str,
         arguments: Dict[str, Any],
+        on_progress: Optional[ProgressCallback] = None,
     ) -> Dict[str, Any]:
         """Call an MCP tool via HTTP.
         
+        Calls with an on_progress callback are sent on their own (never
+        auto-batched) so the server can stream notifications back.
+        
         Args:
             tool_name: Name of the tool to call
             arguments: Tool arguments
+            on_progress: Optional callback for progress notifications
             
         Returns:
             Parsed MCP result dictionary
         """
         logger.debug(f"Calling MCP tool '{tool_name}' with args: {arguments}")
         
-        request = self.format_mcp_request(tool_name, arguments)
+        progress_token = str(uuid4()) if on_progress is not None else None
+        request = self.format_mcp_request(tool_name, arguments, progress_token)
         
         try:
-            response = await self._send_http_request(request)
-            result = self.parse_mcp_response(response)
+            if on_progress is not None:
+                response = await self._send_streaming_request(request, on_progress)
+                result = self.parse_mcp_response(response)
+            elif self.batch_window_ms > 0:
+                result = await self._enqueue(request)
+            else:
+                response = await self._send_http_request(request)
+                result = self.parse_mcp_response(response)
             
             logger.debug(f"MCP tool '{tool_name}' returned successfully")
             return result
@@ -285,3 +441,431 @@ class MCPHttpClient(MCPBaseClient):
                 message=f"Unexpected error: {e}",
                 tool_name=tool_name,
             ) from e
+    
+    async def call_tools_batch(
+        self,
+        calls: Sequence[Tuple[str, Dict[str, Any]]],
+    ) -> List[Union[Dict[str, Any], MCPError]]:
+        """Call several MCP tools in a single JSON-RPC batch POST.
+        
+        Args:
+            calls: Sequence of (tool_name, arguments) pairs
+            
+        Returns:
+            Results in the same order as calls. A failed call yields its
+            MCPError instance instead of a result, so one bad item does
+            not fail the others.
+            
+        Raises:
+            MCPTimeoutError: If the batch request times out
+            MCPConnectionError: If connection fails
+            MCPProtocolError: If the batch response is not a JSON-RPC batch
+        """
+        if not calls:
+            return []
+        
+        requests = [self.format_mcp_request(name, args) for name, args in calls]
+        results: List[Union[Dict[str, Any], MCPError]] = []
+        
+        for start in range(0, len(requests), self.max_batch_size):
+            chunk = requests[start:start + self.max_batch_size]
+            logger.debug(f"Sending MCP batch of {len(chunk)} tool calls")
+            response = await self._send_http_request(chunk)
+            results.extend(self._route_batch_response(chunk, response))
+        
+        return results
+    
+    def _route_batch_response(
+        self,
+        requests: List[Dict[str, Any]],
+        response: Any,
+    ) -> List[Union[Dict[str, Any], MCPError]]:
+        """Match batch responses back to their requests by id.
+        
+        Args:
+            requests: Requests sent in the batch
+            response: Raw batch response
+            
+        Returns:
+            Result or MCPError per request, in request order
+            
+        Raises:
+            MCPProtocolError: If the response is not a batch array
+        """
+        if isinstance(response, dict) and len(requests) == 1:
+            response = [response]
+        if not isinstance(response, list):
+            raise MCPProtocolError("Invalid MCP batch response: expected a JSON array")
+        
+        by_id = {
+            item.get("id"): item
+            for item in response
+            if isinstance(item, dict)
+        }
+        
+        results: List[Union[Dict[str, Any], MCPError]] = []
+        for request in requests:
+            item = by_id.get(request["id"])
+            if item is None:
+                results.append(MCPProtocolError(
+                    f"Missing response for MCP request {request['id']}"
+                ))
+                continue
+            try:
+                results.append(self.parse_mcp_response(item))
+            except MCPError as e:
+                if isinstance(e, MCPToolCallError) and e.tool_name is None:
+                    e.tool_name = request["params"]["name"]
+                results.append(e)
+        return results
+    
+    async def _enqueue(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue a request for the next auto-batch flush and await its result.
+        
+        Args:
+            request: MCP JSON-RPC request
+            
+        Returns:
+            Parsed MCP result dictionary
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._pending.append((request, future))
+        
+        if len(self._pending) >= self.max_batch_size:
+            self._flush_pending()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(
+                self.batch_window_ms / 1000, self._flush_pending
+            )
+        
+        return await future
+    
+    def _flush_pending(self) -> None:
+        """Start sending everything queued so far as one batch."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        task = asyncio.get_running_loop().create_task(self._flush(pending))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+    
+    async def _flush(
+        self,
+        pending: List[Tuple[Dict[str, Any], asyncio.Future]],
+    ) -> None:
+        """Send queued requests as one batch and resolve their futures."""
+        if not pending:
+            return
+        
+        requests = [request for request, _ in pending]
+        try:
+            if len(requests) == 1:
+                response = await self._send_http_request(requests[0])
+            else:
+                logger.debug(f"Auto-batching {len(requests)} MCP tool calls")
+                response = await self._send_http_request(requests)
+            results = self._route_batch_response(requests, response)
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), result in zip(pending, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+# ============================================================================
+# Stdio Transport Client
+# ============================================================================
+
+class MCPStdioClient(MCPBaseClient):
+    """MCP client using stdio transport.
+    
+    Runs the MCP server as a long-lived subprocess and exchanges
+    newline-delimited JSON-RPC messages over its stdin/stdout. A background
+    reader task routes responses to waiting callers by id, so concurrent
+    call_tool() invocations share one process. If the process exits, pending
+    calls fail with MCPConnectionError and the next call restarts it.
+    
+    Example:
+        async with MCPStdioClient(["npx", "image-mcp-server"]) as client:
+            result = await client.call_tool("generate_image", {"prompt": "a cat"})
+    """
+    
+    PROTOCOL_VERSION = "2024-11-05"
+    
+    def __init__(
+        self,
+        command: Sequence[str],
+        timeout: int = 60,
+        env: Optional[Dict[str, str]] = None,
+        cwd: Optional[str] = None,
+        persistent: bool = False,
+        max_restarts: int = 3,
+        read_limit: int = 64 * 1024 * 1024,
+    ):
+        """Initialize stdio client.
+        
+        Args:
+            command: Server command and arguments
+            timeout: Request timeout in seconds
+            env: Optional environment for the subprocess
+            cwd: Optional working directory for the subprocess
+            persistent: Keep the subprocess running across context exits
+                (stop it explicitly with close())
+            max_restarts: Consecutive restarts allowed without a successful call
+            read_limit: Maximum size in bytes of a single response line
+        """
+        if not command:
+            raise ValueError("MCPStdioClient requires a command")
+        self.command = list(command)
+        self.timeout = timeout
+        self.env = env
+        self.cwd = cwd
+        self.persistent = persistent
+        self.max_restarts = max_restarts
+        self.read_limit = read_limit
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._progress_handlers: Dict[str, ProgressCallback] = {}
+        self._callback_tasks: set = set()
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._starts = 0
+        self._restarts = 0
+    
+    async def __aenter__(self) -> "MCPStdioClient":
+        """Start the server subprocess on context entry."""
+        await self._ensure_started()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Stop the subprocess on context exit (kept running when persistent)."""
+        if not self.persistent:
+            await self.close()
+    
+    @property
+    def is_running(self) -> bool:
+        """Whether the server subprocess is alive."""
+        return self._process is not None and self._process.returncode is None
+    
+    async def close(self) -> None:
+        """Stop the reader task and terminate the subprocess."""
+        process, self._process = self._process, None
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        if process is not None and process.returncode is None:
+            process.terminate()
+            try:
+                await asyncio.wait_for(process.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+        self._fail_pending(MCPConnectionError("MCP stdio client closed"))
+    
+    async def _kill_process(self) -> None:
+        """Kill the subprocess and stop its reader without waiting for a clean exit."""
+        process, self._process = self._process, None
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        if process is not None and process.returncode is None:
+            process.kill()
+            await process.wait()
+    
+    async def _ensure_started(self) -> None:
+        """Spawn (or respawn) the subprocess and run the initialize handshake."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Locks and the reader task are bound to the loop that created them
+            if self._loop is not None:
+                self._process = None
+                self._reader_task = None
+            self._loop = loop
+            self._start_lock = asyncio.Lock()
+            self._write_lock = asyncio.Lock()
+        
+        if self.is_running:
+            return
+        
+        async with self._start_lock:
+            if self.is_running:
+                return
+            
+            if self._starts > 0:
+                if self._restarts >= self.max_restarts:
+                    raise MCPConnectionError(
+                        f"MCP server process exited {self._restarts} times; giving up"
+                    )
+                self._restarts += 1
+                logger.warning(
+                    f"Restarting MCP stdio server (attempt {self._restarts}/{self.max_restarts})"
+                )
+            
+            try:
+                self._process = await asyncio.create_subprocess_exec(
+                    *self.command,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    env=self.env,
+                    cwd=self.cwd,
+                    limit=self.read_limit,
+                )
+            except OSError as e:
+                raise MCPConnectionError(
+                    f"Failed to start MCP server '{self.command[0]}': {e}"
+                ) from e
+            
+            self._starts += 1
+            self._reader_task = loop.create_task(self._read_loop(self._process))
+            
+            try:
+                await self._request({
+                    "jsonrpc": "2.0",
+                    "id": str(uuid4()),
+                    "method": "initialize",
+                    "params": {
+                        "protocolVersion": self.PROTOCOL_VERSION,
+                        "capabilities": {},
+                        "clientInfo": {"name": "e-business-backend", "version": "0.1.0"},
+                    },
+                })
+                await self._write({"jsonrpc": "2.0", "method": "notifications/initialized"})
+            except BaseException:
+                # A server that never finished the handshake must not look running
+                await self._kill_process()
+                raise
+            logger.info(f"MCP stdio server started: {' '.join(self.command)}")
+    
+    async def _read_loop(self, process: asyncio.subprocess.Process) -> None:
+        """Route response lines from stdout to pending futures by id."""
+        try:
+            while True:
+                line = await process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.debug(f"Ignoring non-JSON MCP output: {line[:200]!r}")
+                    continue
+                
+                for item in message if isinstance(message, list) else [message]:
+                    self._dispatch(item)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"MCP stdio reader failed: {e}")
+        
+        returncode = await process.wait()
+        logger.warning(f"MCP stdio server exited with code {returncode}")
+        if self._process is process:
+            self._process = None
+        self._fail_pending(
+            MCPConnectionError(f"MCP server process exited with code {returncode}")
+        )
+    
+    def _dispatch(self, message: Any) -> None:
+        """Resolve the future waiting for a response message."""
+        if not isinstance(message, dict):
+            return
+        if message.get("method") == "notifications/progress":
+            params = message.get("params") or {}
+            handler = self._progress_handlers.get(params.get("progressToken"))
+            if handler is not None:
+                # Run outside the reader so a slow callback cannot stall responses
+                task = asyncio.get_running_loop().create_task(
+                    _notify_progress(handler, params)
+                )
+                self._callback_tasks.add(task)
+                task.add_done_callback(self._callback_tasks.discard)
+            return
+        
+        future = self._pending.pop(message.get("id"), None)
+        if future is None:
+            if "method" in message:
+                logger.debug(f"MCP notification: {message.get('method')}")
+            return
+        if not future.done():
+            future.set_result(message)
+    
+    def _fail_pending(self, error: MCPError) -> None:
+        """Fail every in-flight request with the given error."""
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+    
+    async def _write(self, message: Dict[str, Any]) -> None:
+        """Write one JSON-RPC message line to the server's stdin."""
+        process = self._process
+        if process is None or process.stdin is None:
+            raise MCPConnectionError("MCP server process is not running")
+        data = json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+        try:
+            async with self._write_lock:
+                process.stdin.write(data)
+                await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise MCPConnectionError(f"MCP server stdin closed: {e}") from e
+    
+    async def _request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a request and wait for the response with the same id."""
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._pending[message["id"]] = future
+        try:
+            await self._write(message)
+            return await asyncio.wait_for(future, timeout=self.timeout)
+        except asyncio.TimeoutError as e:
+            raise MCPTimeoutError(
+                f"Request timed out after {self.timeout} seconds"
+            ) from e
+        finally:
+            self._pending.pop(message["id"], None)
+    
+    async def call_tool(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """Call an MCP tool via the stdio subprocess.
+        
+        Args:
+            tool_name: Name of the tool to call
+            arguments: Tool arguments
+            on_progress: Optional callback for progress notifications
+            
+        Returns:
+            Parsed MCP result dictionary
+        """
+        logger.debug(f"Calling MCP tool '{tool_name}' over stdio")
+        
+        await self._ensure_started()
+        
+        progress_token = None
+        if on_progress is not None:
+            progress_token = str(uuid4())
+            self._progress_handlers[progress_token] = on_progress
+        
+        try:
+            response = await self._request(
+                self.format_mcp_request(tool_name, arguments, progress_token)
+            )
+        finally:
+            if progress_token is not None:
+                self._progress_handlers.pop(progress_token, None)
+        
+        self._restarts = 0
+        return self.parse_mcp_response(response)
@@ -12,6 +12,7 @@ from uuid import uuid4
 
 from app.domain.entities.image_artifact import ImageArtifact
 from app.domain.entities.image_request import ImageGenerationRequest
+from app.domain.interfaces.image_generator import ImageProgressCallback
 
 
 logger = logging.getLogger(__name__)
@@ -59,7 +60,11 @@ class MockMCPImageGenerator:
         self._session_active = False
         logger.debug("MockMCPImageGenerator session closed")
     
-    async def generate(self, request: ImageGenerationRequest) -> ImageArtifact:
+    async def generate(
+        self,
+        request: ImageGenerationRequest,
+        on_progress: Optional[ImageProgressCallback] = None,
+    ) -> ImageArtifact:
         """Generate a mock image.
         
         Simulates image generation with a configurable delay and returns
@@ -67,6 +72,7 @@ class MockMCPImageGenerator:
         
         Args:
             request: Image generation request
+            on_progress: Optional callback, notified halfway through the delay
             
         Returns:
             ImageArtifact with placeholder image URL
@@ -74,7 +80,17 @@ class MockMCPImageGenerator:
         logger.info(f"Mock image generation started for prompt: {request.prompt[:50]}...")
         
         # Simulate generation delay
-        await asyncio.sleep(self.delay_seconds)
+        if on_progress is None:
+            await asyncio.sleep(self.delay_seconds)
+        else:
+            await asyncio.sleep(self.delay_seconds / 2)
+            await on_progress({
+                "progress": 1,
+                "total": 2,
+                "message": "Rendering",
+                "preview_url": None,
+            })
+            await asyncio.sleep(self.delay_seconds / 2)
         
         # Generate placeholder URL
         service_template = self.PLACEHOLDER_SERVICES[self.placeholder_service]
@@ -6,13 +6,14 @@ an image generation service via MCP protocol.
 """
 import logging
 import re
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 from datetime import datetime
 from urllib.parse import urlparse
 from uuid import uuid4
 
 from app.domain.entities.image_artifact import ImageArtifact
 from app.domain.entities.image_request import ImageGenerationRequest
+from app.domain.interfaces.image_generator import ImageProgressCallback
 from app.infrastructure.mcp.base_client import (
     MCPBaseClient,
     MCPHttpClient,
@@ -101,6 +102,10 @@ class MCPImageGenerator:
         self._session_active = False
         logger.debug("MCPImageGenerator session closed")
     
+    async def close(self) -> None:
+        """Release the underlying MCP transport (pooled session or subprocess)."""
+        await self.mcp_client.close()
+    
     def _build_tool_arguments(
         self,
         request: ImageGenerationRequest,
@@ -128,6 +133,9 @@ class MCPImageGenerator:
         if request.style:
             arguments["style"] = request.style
         
+        if request.seed is not None:
+            arguments["seed"] = request.seed
+        
         return arguments
     
     async def _parse_mcp_image_response(
@@ -256,14 +264,60 @@ class MCPImageGenerator:
         )
         return image_data
     
+    def _progress_relay(
+        self,
+        on_progress: Optional[ImageProgressCallback],
+    ) -> Optional[Callable[[Dict[str, Any]], Awaitable[None]]]:
+        """Adapt MCP progress notifications to image progress updates.
+        
+        Servers may attach a low-resolution ``preview`` (URL or Base64) to
+        a notification; URLs are validated and Base64 data is relayed as a
+        data URI.
+        
+        Args:
+            on_progress: Image progress callback
+            
+        Returns:
+            MCP progress callback, or None if on_progress is None
+        """
+        if on_progress is None:
+            return None
+        
+        async def relay(params: Dict[str, Any]) -> None:
+            preview = params.get("preview")
+            preview_url = None
+            if isinstance(preview, str) and preview:
+                if preview.startswith(("http://", "https://")):
+                    try:
+                        self._validate_url(preview)
+                        preview_url = preview
+                    except MCPInvalidURLError:
+                        logger.warning("Dropping preview with disallowed URL")
+                elif preview.startswith("data:"):
+                    preview_url = preview
+                else:
+                    mime_type = params.get("previewMimeType", "image/png")
+                    preview_url = f"data:{mime_type};base64,{preview}"
+            
+            await on_progress({
+                "progress": params.get("progress"),
+                "total": params.get("total"),
+                "message": params.get("message"),
+                "preview_url": preview_url,
+            })
+        
+        return relay
+    
     async def generate(
         self,
         request: ImageGenerationRequest,
+        on_progress: Optional[ImageProgressCallback] = None,
     ) -> ImageArtifact:
         """Generate an image using MCP protocol.
         
         Args:
             request: Image generation request
+            on_progress: Optional callback for MCP progress notifications
             
         Returns:
             ImageArtifact with generated image URL and metadata
@@ -281,6 +335,7 @@ class MCPImageGenerator:
             response = await self.mcp_client.call_tool(
                 self.tool_name,
                 arguments,
+                on_progress=self._progress_relay(on_progress),
             )
             
             # Parse response
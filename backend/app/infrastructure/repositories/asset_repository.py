@@ -5,7 +5,7 @@ SQLAlchemy-based implementation for persisting and retrieving assets.
 """
 import json
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
 from sqlalchemy import select, or_, func
@@ -149,6 +149,36 @@ class PostgresAssetRepository(IAssetRepository):
 
         return self._model_to_entity(model)
 
+    async def get_many_for_user(
+        self, asset_uuids: List[UUID], user_id: UUID
+    ) -> List[Asset]:
+        """
+        Retrieve several assets owned by a user in one query.
+
+        Args:
+            asset_uuids: Asset UUIDs
+            user_id: The user's UUID (other users' assets are omitted)
+
+        Returns:
+            Found assets in the order of asset_uuids
+        """
+        if not asset_uuids:
+            return []
+
+        result = await self._session.execute(
+            select(VideoAssetModel).where(
+                VideoAssetModel.asset_uuid.in_(asset_uuids),
+                VideoAssetModel.user_id == user_id,
+            )
+        )
+        by_uuid = {model.asset_uuid: model for model in result.scalars().all()}
+
+        return [
+            self._model_to_entity(by_uuid[asset_uuid])
+            for asset_uuid in asset_uuids
+            if asset_uuid in by_uuid
+        ]
+
     async def get_by_uuid_for_user(
         self, asset_uuid: UUID, user_id: UUID
     ) -> Optional[Asset]:
@@ -258,6 +288,42 @@ class PostgresAssetRepository(IAssetRepository):
 
         return self._model_to_entity(model)
 
+    async def merge_metadata(
+        self, asset_uuid: UUID, updates: Dict[str, Any]
+    ) -> Optional[Asset]:
+        """
+        Merge keys into an asset's metadata.
+
+        Args:
+            asset_uuid: The asset's UUID
+            updates: Metadata keys to set (existing keys are overwritten)
+
+        Returns:
+            Updated Asset if found, None otherwise
+        """
+        result = await self._session.execute(
+            select(VideoAssetModel).where(VideoAssetModel.asset_uuid == asset_uuid)
+        )
+        model = result.scalar_one_or_none()
+
+        if model is None:
+            return None
+
+        metadata: Dict[str, Any] = {}
+        if model.metadata_json:
+            try:
+                metadata = json.loads(model.metadata_json) if isinstance(model.metadata_json, str) else dict(model.metadata_json)
+            except (json.JSONDecodeError, TypeError, ValueError):
+                metadata = {}
+        metadata.update(updates)
+
+        model.metadata_json = json.dumps(metadata)
+        model.updated_at = datetime.utcnow()
+        await self._session.flush()
+        await self._session.refresh(model)
+
+        return self._model_to_entity(model)
+
     async def delete(self, asset_id: int) -> bool:
         """
         Delete an asset.
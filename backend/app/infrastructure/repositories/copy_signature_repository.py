@@ -0,0 +1,109 @@
+"""
+Copy Signature Repository Implementation
+
+Persists MinHash signatures of generated copy in the copy_signatures
+table. Each call opens its own short-lived session.
+"""
+
+from contextlib import AbstractAsyncContextManager
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database.models import CopySignatureModel
+from app.infrastructure.text.copy_index import CopySignature, CopySignatureStore
+
+
+SessionFactory = Callable[[], AbstractAsyncContextManager[AsyncSession]]
+
+
+def _to_datetime(epoch: float) -> datetime:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).replace(tzinfo=None)
+
+
+class CopySignatureRepository(CopySignatureStore):
+    """
+    Async repository for copy signatures.
+
+    Rows are keyed by (workflow_id, channel); saving a variant again
+    replaces its signature.
+    """
+
+    def __init__(self, session_factory: Optional[SessionFactory] = None):
+        """
+        Initialize repository.
+
+        Args:
+            session_factory: Async context manager yielding a session that
+                commits on exit (default: get_session_context)
+        """
+        if session_factory is None:
+            from app.infrastructure.database.connection import get_session_context
+
+            session_factory = get_session_context
+        self._session_factory = session_factory
+
+    async def save(self, signatures: List[CopySignature]) -> None:
+        """
+        Upsert signatures.
+
+        Args:
+            signatures: Signatures to persist
+        """
+        if not signatures:
+            return
+        rows = [
+            {
+                "user_id": UUID(signature.user_id),
+                "workflow_id": signature.workflow_id,
+                "channel": signature.channel,
+                "signature": signature.signature,
+                "created_at": _to_datetime(signature.created_at),
+            }
+            for signature in signatures
+        ]
+        statement = insert(CopySignatureModel).values(rows)
+        statement = statement.on_conflict_do_update(
+            constraint="uq_copy_signatures_workflow_channel",
+            set_={
+                "signature": statement.excluded.signature,
+                "created_at": statement.excluded.created_at,
+            },
+        )
+        async with self._session_factory() as session:
+            await session.execute(statement)
+
+    async def list_for_user(
+        self,
+        user_id: str,
+        since: Optional[float] = None,
+    ) -> List[CopySignature]:
+        """
+        Retrieve a user's signatures.
+
+        Args:
+            user_id: Owner UUID (string form)
+            since: Only signatures created at or after this epoch time
+
+        Returns:
+            Signatures, oldest first
+        """
+        query = select(CopySignatureModel).where(CopySignatureModel.user_id == UUID(user_id))
+        if since is not None:
+            query = query.where(CopySignatureModel.created_at >= _to_datetime(since))
+        async with self._session_factory() as session:
+            result = await session.execute(query.order_by(CopySignatureModel.created_at))
+            return [
+                CopySignature(
+                    user_id=str(model.user_id),
+                    workflow_id=model.workflow_id,
+                    channel=model.channel,
+                    signature=bytes(model.signature),
+                    created_at=model.created_at.replace(tzinfo=timezone.utc).timestamp(),
+                )
+                for model in result.scalars()
+            ]
@@ -4,7 +4,7 @@ Product Package Repository Implementation
 Async SQLAlchemy-based implementation for product package data access.
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from uuid import UUID
 
 from sqlalchemy import select
@@ -79,6 +79,29 @@ class ProductPackageRepository:
         )
         return result.scalar_one_or_none()
 
+    async def list_with_qa_report(
+        self,
+        after_id: Optional[UUID] = None,
+        limit: int = 500,
+    ) -> List[ProductPackageModel]:
+        """
+        Page through packages that have been through QA review, by ID.
+
+        Args:
+            after_id: Last ID of the previous page (None for the first page)
+            limit: Page size
+
+        Returns:
+            Up to limit packages with IDs greater than after_id
+        """
+        query = select(ProductPackageModel).where(ProductPackageModel.qa_report.is_not(None))
+        if after_id is not None:
+            query = query.where(ProductPackageModel.id > after_id)
+        result = await self._session.execute(
+            query.order_by(ProductPackageModel.id).limit(limit)
+        )
+        return list(result.scalars().all())
+
     async def update_status(
         self,
         package_id: UUID,
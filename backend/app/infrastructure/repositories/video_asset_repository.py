@@ -30,6 +30,11 @@ class VideoAssetRepository:
         """
         self._session = session
     
+    @property
+    def session(self) -> AsyncSession:
+        """Session the repository writes to; the caller commits it."""
+        return self._session
+    
     def _model_to_entity(self, model: VideoAssetModel) -> ImageArtifact:
         """Convert SQLAlchemy model to domain entity."""
         return ImageArtifact(
@@ -90,6 +95,30 @@ class VideoAssetRepository:
         
         return self._model_to_entity(model)
     
+    async def create_many(
+        self,
+        artifacts: List[ImageArtifact],
+        user_id: Optional[UUID] = None,
+    ) -> List[ImageArtifact]:
+        """
+        Create several asset records with a single flush.
+        
+        The caller controls the transaction, so all records are committed
+        (or rolled back) together.
+        
+        Args:
+            artifacts: ImageArtifact entities to persist
+            user_id: Optional user who created the assets
+            
+        Returns:
+            Persisted ImageArtifacts in input order
+        """
+        models = [self._entity_to_model(artifact, user_id) for artifact in artifacts]
+        self._session.add_all(models)
+        await self._session.flush()
+        
+        return [self._model_to_entity(model) for model in models]
+    
     async def get_by_id(self, asset_id: int) -> Optional[ImageArtifact]:
         """
         Retrieve an asset by its database ID.
@@ -0,0 +1,144 @@
+"""
+Video Job Repository Implementation
+
+Persists asynchronous video jobs in the video_jobs table. Each call opens
+its own short-lived session so parked workflows hold no connection while
+a render is in progress.
+"""
+
+from contextlib import AbstractAsyncContextManager
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database.models import VideoJobModel
+from app.infrastructure.video.jobs import TERMINAL_STATES, VideoJob, VideoJobStore
+
+
+SessionFactory = Callable[[], AbstractAsyncContextManager[AsyncSession]]
+
+
+def _to_datetime(epoch: Optional[float]) -> Optional[datetime]:
+    if epoch is None:
+        return None
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).replace(tzinfo=None)
+
+
+def _to_epoch(value: Optional[datetime]) -> Optional[float]:
+    if value is None:
+        return None
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class VideoJobRepository(VideoJobStore):
+    """
+    Async repository for video jobs.
+
+    Stores naive UTC datetimes like the other tables and converts them to
+    epoch seconds for VideoJobManager.
+    """
+
+    def __init__(self, session_factory: Optional[SessionFactory] = None):
+        """
+        Initialize repository.
+
+        Args:
+            session_factory: Async context manager yielding a session that
+                commits on exit (default: get_session_context)
+        """
+        if session_factory is None:
+            from app.infrastructure.database.connection import get_session_context
+
+            session_factory = get_session_context
+        self._session_factory = session_factory
+
+    async def save(self, job: VideoJob) -> bool:
+        """
+        Insert or update a job.
+
+        Updates are a single conditional UPDATE that only matches rows
+        still pending, so when several workers finish the same job the
+        database picks one winner.
+
+        Args:
+            job: Job to persist
+
+        Returns:
+            True if the job was written, False if it was already terminal
+        """
+        values = dict(
+            provider_job_id=job.provider_job_id,
+            workflow_id=job.workflow_id,
+            state=job.state,
+            attempts=job.attempts,
+            submitted_at=_to_datetime(job.submitted_at),
+            deadline_at=_to_datetime(job.deadline_at),
+            completed_at=_to_datetime(job.completed_at),
+            result=job.result,
+            error_message=job.error,
+            context=job.context,
+        )
+        async with self._session_factory() as session:
+            result = await session.execute(
+                update(VideoJobModel)
+                .where(
+                    VideoJobModel.id == job.job_id,
+                    VideoJobModel.state.not_in(TERMINAL_STATES),
+                )
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1:
+                return True
+            if await session.get(VideoJobModel, job.job_id) is not None:
+                return False
+            session.add(VideoJobModel(id=job.job_id, **values))
+            await session.flush()
+            return True
+
+    async def get(self, job_id: str) -> Optional[VideoJob]:
+        """
+        Retrieve a job by ID.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            VideoJob if found, None otherwise
+        """
+        async with self._session_factory() as session:
+            model = await session.get(VideoJobModel, job_id)
+            return self._to_job(model) if model is not None else None
+
+    async def list_active(self) -> List[VideoJob]:
+        """
+        Retrieve all jobs that are still pending.
+
+        Returns:
+            Unfinished jobs, oldest first
+        """
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(VideoJobModel)
+                .where(VideoJobModel.state.not_in(TERMINAL_STATES))
+                .order_by(VideoJobModel.submitted_at)
+            )
+            return [self._to_job(model) for model in result.scalars()]
+
+    @staticmethod
+    def _to_job(model: VideoJobModel) -> VideoJob:
+        return VideoJob(
+            job_id=model.id,
+            provider_job_id=model.provider_job_id,
+            workflow_id=model.workflow_id,
+            state=model.state,
+            attempts=model.attempts,
+            submitted_at=_to_epoch(model.submitted_at),
+            deadline_at=_to_epoch(model.deadline_at),
+            completed_at=_to_epoch(model.completed_at),
+            result=model.result,
+            error=model.error_message,
+            context=dict(model.context or {}),
+        )
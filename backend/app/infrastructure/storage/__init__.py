@@ -1,20 +1,62 @@
 """
 Storage Infrastructure Package.
 
-Contains clients for object storage services (MinIO).
+Contains clients for object storage services (MinIO, local disk).
 """
 from app.infrastructure.storage.minio_client import (
+    Base64StreamReader,
     MinIOClient,
     MinIOError,
     MinIOUploadError,
     MinIOConnectionError,
     MinIOSizeLimitError,
+    UploadMetrics,
+    get_upload_executor,
+    shutdown_upload_executor,
+    upload_metrics,
+)
+from app.infrastructure.storage.local_storage import LocalStorageClient
+from app.infrastructure.storage.factory import (
+    create_storage_client,
+    get_storage_client,
+    reset_storage_client,
+)
+from app.infrastructure.storage.input_image import (
+    InputImage,
+    InputImageCache,
+    InputImageError,
+    InputImageLoader,
+    get_input_image_loader,
+    reset_input_image_loader,
+    sniff_image_type,
+)
+from app.infrastructure.storage.url_signer import (
+    PresignedURLSigner,
+    get_url_signer,
 )
 
 __all__ = [
+    "Base64StreamReader",
+    "InputImage",
+    "InputImageCache",
+    "InputImageError",
+    "InputImageLoader",
+    "LocalStorageClient",
     "MinIOClient",
     "MinIOError",
     "MinIOUploadError",
     "MinIOConnectionError",
     "MinIOSizeLimitError",
+    "PresignedURLSigner",
+    "UploadMetrics",
+    "create_storage_client",
+    "get_storage_client",
+    "get_input_image_loader",
+    "get_upload_executor",
+    "get_url_signer",
+    "reset_input_image_loader",
+    "reset_storage_client",
+    "shutdown_upload_executor",
+    "sniff_image_type",
+    "upload_metrics",
 ]
@@ -0,0 +1,286 @@
+"""
+Responsive Image Derivatives.
+
+Renders thumbnail / medium renditions of generated images in WebP (and
+AVIF when the installed Pillow supports it) and stores them next to the
+original object in MinIO. Pillow work is CPU-bound, so it runs in a
+process pool rather than on the event loop.
+"""
+import asyncio
+import hashlib
+import io
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.infrastructure.storage.fetch import fetch_image_bytes
+
+try:
+    from PIL import Image, features
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+
+# Pillow save parameters per output format
+FORMAT_OPTIONS: Dict[str, Dict[str, object]] = {
+    "webp": {"format": "WEBP", "quality": 80, "method": 4},
+    "avif": {"format": "AVIF", "quality": 60},
+}
+
+FORMAT_MIME_TYPES = {
+    "webp": "image/webp",
+    "avif": "image/avif",
+}
+
+
+def available_formats(requested: Iterable[str]) -> Tuple[str, ...]:
+    """Filter requested derivative formats to those Pillow can encode.
+
+    Args:
+        requested: Format names, e.g. ("webp", "avif")
+
+    Returns:
+        Supported formats in request order
+    """
+    if not PIL_AVAILABLE:
+        return ()
+    return tuple(
+        fmt for fmt in requested
+        if fmt in FORMAT_OPTIONS and features.check(fmt)
+    )
+
+
+def render_derivatives(
+    image_bytes: bytes,
+    sizes: Dict[str, int],
+    formats: Tuple[str, ...],
+) -> Dict[str, Dict[str, bytes]]:
+    """Render resized renditions of an image.
+
+    Runs inside a worker process, so it must stay a picklable top-level
+    function. Images are never upscaled; aspect ratio is preserved.
+
+    Args:
+        image_bytes: Original encoded image
+        sizes: Rendition name -> maximum edge in pixels
+        formats: Output formats
+
+    Returns:
+        Rendition name -> format -> encoded bytes
+    """
+    with Image.open(io.BytesIO(image_bytes)) as original:
+        original.load()
+        if original.mode not in ("RGB", "RGBA"):
+            has_alpha = "A" in original.getbands() or "transparency" in original.info
+            original = original.convert("RGBA" if has_alpha else "RGB")
+
+        renditions: Dict[str, Dict[str, bytes]] = {}
+        for name, max_edge in sizes.items():
+            resized = original.copy()
+            resized.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+            renditions[name] = {}
+            for fmt in formats:
+                buffer = io.BytesIO()
+                resized.save(buffer, **FORMAT_OPTIONS[fmt])
+                renditions[name][fmt] = buffer.getvalue()
+        return renditions
+
+
+# ============================================================================
+# Process Pool
+# ============================================================================
+
+_derivative_executor: Optional[ProcessPoolExecutor] = None
+_derivative_executor_lock = threading.Lock()
+
+
+def get_derivative_executor() -> ProcessPoolExecutor:
+    """Get the shared process pool for image rendering.
+
+    Sized by settings.image_derivative_workers.
+
+    Returns:
+        Process-wide ProcessPoolExecutor
+    """
+    global _derivative_executor
+    if _derivative_executor is None:
+        with _derivative_executor_lock:
+            if _derivative_executor is None:
+                from app.core.config import settings
+                _derivative_executor = ProcessPoolExecutor(
+                    max_workers=settings.image_derivative_workers,
+                )
+    return _derivative_executor
+
+
+def shutdown_derivative_executor(wait: bool = True) -> None:
+    """Shut down the shared process pool (recreated on next use)."""
+    global _derivative_executor
+    with _derivative_executor_lock:
+        executor, _derivative_executor = _derivative_executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# ============================================================================
+# Derivative Generator
+# ============================================================================
+
+class ImageDerivativeGenerator:
+    """Create and store responsive renditions of an image.
+
+    Originals stored in the MinIO bucket are read through the SDK; other
+    URLs are downloaded only if their host is in allowed_domains.
+    Renditions are written next to the original as
+    ``<original path without extension>_<size>.<format>``; those of
+    external images go to ``derivatives/external/<sha256 of the bytes>``.
+
+    Example:
+        generator = ImageDerivativeGenerator(minio_client)
+        derivatives = await generator.create(asset_url)
+        # {"thumbnail": {"webp": "http://.../abc_thumbnail.webp", ...}, ...}
+    """
+
+    DEFAULT_SIZES = {"thumbnail": 320, "medium": 1024}
+    DEFAULT_FORMATS = ("webp", "avif")
+
+    def __init__(
+        self,
+        minio_client,
+        sizes: Optional[Dict[str, int]] = None,
+        formats: Iterable[str] = DEFAULT_FORMATS,
+        allowed_domains: Optional[Iterable[str]] = None,
+        executor: Optional[ProcessPoolExecutor] = None,
+        fetch_timeout: int = 30,
+    ):
+        """Initialize the generator.
+
+        Args:
+            minio_client: MinIOClient used to read originals and store renditions
+            sizes: Rendition name -> maximum edge in pixels
+            formats: Requested output formats (unsupported ones are skipped)
+            allowed_domains: Hosts external originals may be fetched from
+            executor: Process pool for rendering (default: shared pool)
+            fetch_timeout: Timeout in seconds for fetching external originals
+        """
+        self.minio_client = minio_client
+        self.sizes = dict(sizes or self.DEFAULT_SIZES)
+        self.formats = available_formats(formats)
+        self.allowed_domains = set(allowed_domains or ())
+        self._executor = executor
+        self.fetch_timeout = fetch_timeout
+
+    @property
+    def enabled(self) -> bool:
+        """Whether at least one output format can be produced."""
+        return bool(self.formats) and bool(self.sizes)
+
+    async def create(self, original_url: str) -> Dict[str, Dict[str, str]]:
+        """Render and upload all renditions of an image.
+
+        Args:
+            original_url: URL of the original image
+
+        Returns:
+            Rendition name -> format -> URL (empty if nothing was produced)
+        """
+        if not self.enabled:
+            return {}
+
+        object_name = self.minio_client.object_name_from_url(original_url)
+        if object_name is not None:
+            base_name = self._base_object_name(object_name)
+            # Only content-addressed originals have renditions that a later
+            # upload of the same name may reuse
+            if getattr(self.minio_client, "content_addressed", False):
+                existing = await self._existing_derivatives(base_name)
+                if existing is not None:
+                    logger.debug(f"Derivatives already stored for {base_name}")
+                    return existing
+
+        image_bytes = await self._fetch_original(original_url, object_name)
+        if image_bytes is None:
+            return {}
+
+        if object_name is None:
+            # External URLs share paths across hosts and query strings and
+            # their content may change; name renditions by the bytes instead
+            base_name = f"derivatives/external/{hashlib.sha256(image_bytes).hexdigest()}"
+            existing = await self._existing_derivatives(base_name)
+            if existing is not None:
+                logger.debug(f"Derivatives already stored for {base_name}")
+                return existing
+
+        loop = asyncio.get_running_loop()
+        renditions = await loop.run_in_executor(
+            self._executor or get_derivative_executor(),
+            render_derivatives,
+            image_bytes,
+            self.sizes,
+            self.formats,
+        )
+
+        derivatives: Dict[str, Dict[str, str]] = {}
+        for name, encoded in renditions.items():
+            derivatives[name] = {}
+            for fmt, data in encoded.items():
+                target = f"{base_name}_{name}.{fmt}"
+                await self.minio_client.upload_stream(
+                    io.BytesIO(data),
+                    object_name=target,
+                    content_type=FORMAT_MIME_TYPES[fmt],
+                    length=len(data),
+                )
+                derivatives[name][fmt] = self.minio_client.get_object_url(target)
+
+        logger.info(f"Created {sum(map(len, derivatives.values()))} derivatives for {base_name}")
+        return derivatives
+
+    async def _existing_derivatives(
+        self,
+        base_name: str,
+    ) -> Optional[Dict[str, Dict[str, str]]]:
+        """Return rendition URLs if every rendition is already stored.
+
+        Only call this for names derived from the image content, so that
+        stored renditions are known to match the original.
+        """
+        targets = {
+            (name, fmt): f"{base_name}_{name}.{fmt}"
+            for name in self.sizes
+            for fmt in self.formats
+        }
+        found = await asyncio.gather(
+            *(self.minio_client.object_exists(target) for target in targets.values())
+        )
+        if not all(found):
+            return None
+
+        derivatives: Dict[str, Dict[str, str]] = {}
+        for (name, fmt), target in targets.items():
+            derivatives.setdefault(name, {})[fmt] = self.minio_client.get_object_url(target)
+        return derivatives
+
+    async def _fetch_original(
+        self,
+        url: str,
+        object_name: Optional[str],
+    ) -> Optional[bytes]:
+        """Read the original image bytes, or None if it may not be fetched."""
+        return await fetch_image_bytes(
+            self.minio_client,
+            url,
+            allowed_domains=self.allowed_domains,
+            timeout=self.fetch_timeout,
+        )
+
+    @staticmethod
+    def _base_object_name(object_name: str) -> str:
+        """Object name prefix for renditions of a stored original."""
+        stem, dot, ext = object_name.rpartition(".")
+        return stem if dot and "/" not in ext else object_name
@@ -0,0 +1,71 @@
+"""
+Storage Client Factory.
+
+Builds the configured object storage client (MinIO or local disk) from
+settings so callers never construct backends themselves.
+"""
+import threading
+from typing import Optional
+
+from app.infrastructure.storage.minio_client import MinIOClient
+
+
+_storage_client: Optional[MinIOClient] = None
+_storage_client_lock = threading.Lock()
+
+
+def create_storage_client() -> MinIOClient:
+    """Create a storage client for settings.storage_backend.
+
+    Returns:
+        MinIOClient, or LocalStorageClient (same interface) for 'local'
+    """
+    from app.core.config import settings
+
+    max_size_bytes = settings.minio_max_size_mb * 1024 * 1024
+    cache_control = settings.minio_cache_control or None
+
+    if settings.storage_backend == "local":
+        from app.infrastructure.storage.local_storage import LocalStorageClient
+
+        return LocalStorageClient(
+            root_dir=settings.local_storage_root,
+            base_url=settings.local_storage_base_url,
+            max_size_bytes=max_size_bytes,
+            content_addressed=settings.minio_content_addressed,
+            cache_control=cache_control,
+        )
+
+    return MinIOClient(
+        endpoint=settings.minio_endpoint,
+        access_key=settings.minio_access_key,
+        secret_key=settings.minio_secret_key,
+        bucket=settings.minio_bucket,
+        secure=settings.minio_secure,
+        region=settings.minio_region,
+        max_size_bytes=max_size_bytes,
+        part_size_bytes=settings.minio_part_size_mb * 1024 * 1024,
+        content_addressed=settings.minio_content_addressed,
+        cache_control=cache_control,
+    )
+
+
+def get_storage_client() -> MinIOClient:
+    """Get the process-wide storage client (created on first use).
+
+    Returns:
+        Shared MinIOClient or LocalStorageClient
+    """
+    global _storage_client
+    if _storage_client is None:
+        with _storage_client_lock:
+            if _storage_client is None:
+                _storage_client = create_storage_client()
+    return _storage_client
+
+
+def reset_storage_client() -> None:
+    """Drop the shared client (e.g. after settings change in tests)."""
+    global _storage_client
+    with _storage_client_lock:
+        _storage_client = None
@@ -0,0 +1,77 @@
+"""
+Image Fetching.
+
+Reads image bytes for server-side processing (derivatives, slideshows):
+objects in our own storage are read through the storage client, other
+URLs are downloaded only from allowed hosts (SSRF prevention).
+"""
+import logging
+from typing import Iterable, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+
+logger = logging.getLogger(__name__)
+
+# Bytes read per chunk when downloading external images
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+
+async def fetch_image_bytes(
+    storage,
+    url: str,
+    allowed_domains: Iterable[str] = (),
+    timeout: int = 30,
+    max_bytes: Optional[int] = None,
+) -> Optional[bytes]:
+    """Fetch an image for processing.
+
+    Args:
+        storage: MinIOClient / LocalStorageClient holding our own objects
+        url: Image URL
+        allowed_domains: Hosts external images may be downloaded from
+        timeout: Download timeout in seconds
+        max_bytes: Size cap (default and upper bound: storage.max_size_bytes)
+
+    Returns:
+        Image bytes, or None if the URL may not be fetched or is too large
+
+    Raises:
+        MinIOError: If reading an object from storage fails
+        aiohttp.ClientError: If downloading an external image fails
+    """
+    if max_bytes is None:
+        max_bytes = storage.max_size_bytes
+    else:
+        max_bytes = min(max_bytes, storage.max_size_bytes)
+
+    object_name = storage.object_name_from_url(url)
+    if object_name is not None:
+        data = await storage.download_bytes(object_name)
+        if len(data) > max_bytes:
+            logger.warning(f"Image too large to process: {url}")
+            return None
+        return data
+
+    host = urlparse(url).hostname
+    if host is None or host not in set(allowed_domains):
+        logger.debug(f"Not fetching image from disallowed host: {url}")
+        return None
+
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    async with aiohttp.ClientSession(timeout=client_timeout) as session:
+        async with session.get(url) as resp:
+            resp.raise_for_status()
+            if resp.content_length is not None and resp.content_length > max_bytes:
+                logger.warning(f"Image too large to process: {url}")
+                return None
+            # content.read(n) returns what is buffered, not n bytes; read to EOF
+            data = bytearray()
+            async for chunk in resp.content.iter_chunked(DOWNLOAD_CHUNK_BYTES):
+                data.extend(chunk)
+                if len(data) > max_bytes:
+                    logger.warning(f"Image too large to process: {url}")
+                    return None
+    return bytes(data)
+
@@ -0,0 +1,366 @@
+"""
+Workflow Input Images.
+
+Every stage of a product package workflow works from the same product
+photo. InputImageLoader fetches it once - size-capped, with its type
+sniffed from the bytes rather than trusted from a header or extension -
+writes it into the workflow workspace and keeps it in a small
+process-wide LRU, so analysis, feature extraction and later stages read
+local bytes instead of downloading the image again.
+"""
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+from app.infrastructure.storage.fetch import fetch_image_bytes
+
+
+logger = logging.getLogger(__name__)
+
+
+# File name (without extension) of the input image inside <workspace>/input/
+INPUT_IMAGE_NAME = "product_image"
+
+# MIME type -> file extension of the image formats accepted as input
+IMAGE_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+}
+
+
+def sniff_image_type(data: bytes) -> Optional[str]:
+    """Detect an image format from its leading bytes.
+
+    Args:
+        data: File content
+
+    Returns:
+        MIME type, or None if the data is not a supported image
+    """
+    if data.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if data.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if len(data) >= 12 and data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+class InputImageError(Exception):
+    """Raised when the input image cannot be used."""
+
+
+@dataclass(frozen=True)
+class InputImage:
+    """A fetched and validated input image."""
+    url: str
+    data: bytes
+    content_type: str
+    digest: str  # hex SHA-256 of data
+    path: Optional[str] = None  # copy in the workflow workspace
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    @property
+    def extension(self) -> str:
+        return IMAGE_EXTENSIONS[self.content_type]
+
+
+class InputImageCache:
+    """
+    In-memory LRU of recently used input images, keyed by URL.
+
+    Bounded both by entry count and by total bytes, since a handful of
+    large photos would otherwise dominate memory.
+
+    Attributes:
+        max_entries: Maximum number of cached images
+        max_bytes: Maximum total size of cached images
+    """
+
+    def __init__(self, max_entries: int = 32, max_bytes: int = 128 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached images
+            max_bytes: Maximum total size of cached images in bytes
+        """
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, InputImage]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, url: str) -> Optional[InputImage]:
+        """Look up an image by URL, counting the hit or miss."""
+        with self._lock:
+            image = self._entries.get(url)
+            if image is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(url)
+            self.hits += 1
+            return image
+
+    def set(self, image: InputImage) -> None:
+        """Store an image, evicting least recently used ones to fit."""
+        if image.size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(image.url, None)
+            if previous is not None:
+                self.total_bytes -= previous.size
+            self._entries[image.url] = image
+            self.total_bytes += image.size
+
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= evicted.size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all images and reset metrics."""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics.
+
+        Returns:
+            Dict with size, byte usage, limits, hit/miss counts and hit_rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class InputImageLoader:
+    """
+    Fetch a workflow's input image once and serve it to every stage.
+
+    Lookup order: the in-memory LRU, then the copy in the workspace (e.g.
+    after a restart resumed a parked workflow), then the network.
+    Concurrent loads of the same URL share a single download.
+
+    Example:
+        loader = InputImageLoader(get_storage_client(), max_bytes=10 * 1024 * 1024)
+        image = await loader.load(request["image_url"], workspace)
+        image.digest, image.content_type, image.path
+    """
+
+    def __init__(
+        self,
+        storage,
+        allowed_domains: Iterable[str] = (),
+        max_bytes: int = 10 * 1024 * 1024,
+        cache: Optional[InputImageCache] = None,
+        fetch_timeout: int = 30,
+    ):
+        """
+        Initialize the loader.
+
+        Args:
+            storage: MinIOClient / LocalStorageClient holding uploaded images
+            allowed_domains: Hosts external images may be downloaded from
+            max_bytes: Largest accepted image in bytes
+            cache: Shared image LRU (default: a private cache)
+            fetch_timeout: Download timeout in seconds
+        """
+        self.storage = storage
+        self.allowed_domains = frozenset(allowed_domains)
+        self.max_bytes = max_bytes
+        self.cache = cache if cache is not None else InputImageCache()
+        self.fetch_timeout = fetch_timeout
+        self._pending: Dict[str, "asyncio.Task[InputImage]"] = {}
+        self.downloads = 0
+
+    async def load(self, url: str, workspace: Optional[str] = None) -> InputImage:
+        """
+        Get the input image, fetching it only if no local copy exists.
+
+        Args:
+            url: Image URL (our storage or an allowed host)
+            workspace: Workflow workspace to keep a copy in (optional)
+
+        Returns:
+            InputImage; path is set when a workspace copy exists
+
+        Raises:
+            InputImageError: If the URL is not http(s), may not be fetched,
+                is too large or is not a supported image
+        """
+        if urlparse(url).scheme not in ("http", "https"):
+            raise InputImageError(f"Unsupported input image URL: {url}")
+
+        image = self.cache.get(url)
+        if image is None and workspace is not None:
+            image = await asyncio.to_thread(self._read_workspace_copy, url, workspace)
+            if image is not None:
+                self.cache.set(image)
+        if image is None:
+            image = await self._download_shared(url)
+
+        if workspace is not None and image.path != str(self.workspace_path(workspace, image.content_type)):
+            image = await asyncio.to_thread(self._write_workspace_copy, image, workspace)
+        return image
+
+    def workspace_path(self, workspace: str, content_type: str) -> Path:
+        """Location of the input image inside a workspace."""
+        return Path(workspace) / "input" / f"{INPUT_IMAGE_NAME}{IMAGE_EXTENSIONS[content_type]}"
+
+    async def _download_shared(self, url: str) -> InputImage:
+        """Download an image, joining a download already in flight."""
+        task = self._pending.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._download(url))
+            self._pending[url] = task
+            task.add_done_callback(lambda done: self._finish_download(url, done))
+        # A cancelled caller must not cancel the download other stages await
+        return await asyncio.shield(task)
+
+    def _finish_download(self, url: str, task: "asyncio.Task[InputImage]") -> None:
+        self._pending.pop(url, None)
+        if not task.cancelled() and task.exception() is None:
+            self.cache.set(task.result())
+
+    async def _download(self, url: str) -> InputImage:
+        """Fetch and validate an image."""
+        try:
+            data = await fetch_image_bytes(
+                self.storage,
+                url,
+                self.allowed_domains,
+                timeout=self.fetch_timeout,
+                max_bytes=self.max_bytes,
+            )
+        except Exception as e:
+            raise InputImageError(f"Could not fetch input image {url}: {e}") from e
+        if data is None:
+            raise InputImageError(f"Input image is too large or from a disallowed host: {url}")
+        self.downloads += 1
+        return self._validate(url, data)
+
+    @staticmethod
+    def _validate(url: str, data: bytes, path: Optional[str] = None) -> InputImage:
+        content_type = sniff_image_type(data)
+        if content_type is None:
+            raise InputImageError(f"Input image is not a JPEG, PNG, GIF or WebP file: {url}")
+        return InputImage(
+            url=url,
+            data=data,
+            content_type=content_type,
+            digest=hashlib.sha256(data).hexdigest(),
+            path=path,
+        )
+
+    def _read_workspace_copy(self, url: str, workspace: str) -> Optional[InputImage]:
+        """Load the image a previous stage saved in the workspace."""
+        for content_type in IMAGE_EXTENSIONS:
+            path = self.workspace_path(workspace, content_type)
+            if not path.is_file():
+                continue
+            try:
+                data = path.read_bytes()
+                if len(data) > self.max_bytes:
+                    return None
+                return self._validate(url, data, str(path))
+            except (OSError, InputImageError) as e:
+                logger.warning(f"Ignoring unreadable workspace input image {path}: {e}")
+                return None
+        return None
+
+    def _write_workspace_copy(self, image: InputImage, workspace: str) -> InputImage:
+        """Save the image into the workspace (best-effort)."""
+        path = self.workspace_path(workspace, image.content_type)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if not path.is_file():
+                tmp = path.with_suffix(path.suffix + ".tmp")
+                tmp.write_bytes(image.data)
+                tmp.replace(path)
+        except OSError as e:
+            logger.warning(f"Could not save input image to workspace {workspace}: {e}")
+            return image
+        return InputImage(
+            url=image.url,
+            data=image.data,
+            content_type=image.content_type,
+            digest=image.digest,
+            path=str(path),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Download count plus cache metrics."""
+        return {"downloads": self.downloads, "cache": self.cache.stats()}
+
+
+# ============================================================================
+# Process-wide Loader
+# ============================================================================
+
+_input_image_loader: Optional[InputImageLoader] = None
+_input_image_loader_lock = threading.Lock()
+
+
+def get_input_image_loader() -> InputImageLoader:
+    """
+    Get the process-wide input image loader.
+
+    Sized by settings.input_image_*; uses the configured storage client.
+
+    Returns:
+        Shared InputImageLoader
+    """
+    global _input_image_loader
+    if _input_image_loader is None:
+        with _input_image_loader_lock:
+            if _input_image_loader is None:
+                from app.core.config import settings
+                from app.infrastructure.storage.factory import get_storage_client
+
+                _input_image_loader = InputImageLoader(
+                    get_storage_client(),
+                    allowed_domains=settings.mcp_allowed_domains_set,
+                    max_bytes=settings.input_image_max_mb * 1024 * 1024,
+                    cache=InputImageCache(
+                        max_entries=settings.input_image_cache_entries,
+                        max_bytes=settings.input_image_cache_mb * 1024 * 1024,
+                    ),
+                )
+    return _input_image_loader
+
+
+def reset_input_image_loader() -> None:
+    """Drop the shared loader (recreated on next use)."""
+    global _input_image_loader
+    with _input_image_loader_lock:
+        _input_image_loader = None
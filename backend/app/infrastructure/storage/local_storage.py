@@ -0,0 +1,353 @@
+"""
+Local Disk Storage.
+
+Drop-in replacement for MinIOClient for deployments without MinIO.
+Objects are written under a root directory and served by the
+/api/v1/files route (see app.interface.routes.files). Plain GETs are
+handed to the server with FileResponse; Range requests (video seeking),
+including those served in full because If-Range no longer matches, are
+streamed by the route in chunks through Python.
+
+Like MinIOClient, upload_stream does not cap object size: size limits
+apply to user uploads (upload_base64_image) and to downloads, not to
+objects the server produces itself, such as rendered videos.
+"""
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import BinaryIO, Optional, Tuple
+
+from app.infrastructure.storage.minio_client import (
+    MinIOClient,
+    MinIOConnectionError,
+    MinIOError,
+    MinIOSizeLimitError,
+    MinIOUploadError,
+    UploadMetrics,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# Content-addressed object names end in a hex SHA-256 (see content_object_name)
+_CONTENT_HASH_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+class LocalStorageClient(MinIOClient):
+    """Store objects on the local filesystem behind the MinIOClient API.
+
+    Uploads, deduplication and naming behave exactly like MinIOClient
+    (including its MinIOError exceptions), so generators and services
+    work unchanged. Files are written to a temporary name and renamed
+    into place, so readers never see partial objects.
+
+    Example:
+        storage = LocalStorageClient(
+            root_dir="./data/storage",
+            base_url="http://localhost:8000/api/v1/files",
+        )
+        url = await storage.upload_base64_image("iVBORw0KGgo...")
+    """
+
+    # Chunk size for copying upload streams to disk
+    COPY_CHUNK_BYTES = 1024 * 1024
+
+    # Cache-Control for objects whose names are not content-derived
+    REVALIDATE_CACHE_CONTROL = "no-cache"
+
+    def __init__(
+        self,
+        root_dir: str,
+        base_url: str,
+        max_size_bytes: Optional[int] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+        metrics: Optional[UploadMetrics] = None,
+        content_addressed: bool = True,
+        cache_control: Optional[str] = MinIOClient.IMMUTABLE_CACHE_CONTROL,
+        etag_cache_size: int = 4096,
+    ):
+        """Initialize local storage.
+
+        Args:
+            root_dir: Directory holding all objects (created if missing)
+            base_url: Public URL prefix of the file route
+            max_size_bytes: Maximum upload size in bytes (default: 10MB)
+            executor: Thread pool for file I/O (default: shared upload pool)
+            metrics: Upload metrics sink (default: shared upload_metrics)
+            content_addressed: Name uploads by SHA-256 of their content
+            cache_control: Cache-Control served for content-addressed objects
+            etag_cache_size: Hashes of non-content-addressed files to memoize
+        """
+        super().__init__(
+            endpoint="local",
+            access_key="",
+            secret_key="",
+            bucket="",
+            max_size_bytes=max_size_bytes,
+            executor=executor,
+            metrics=metrics,
+            content_addressed=content_addressed,
+            cache_control=cache_control,
+        )
+        self.root = Path(root_dir).resolve()
+        self.base_url = base_url.rstrip("/")
+        self.etag_cache_size = max(1, etag_cache_size)
+        self._etags: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self._etag_lock = threading.Lock()
+
+    def _get_minio_client(self):
+        """Local storage has no SDK client."""
+        raise MinIOConnectionError("LocalStorageClient does not use the MinIO SDK")
+
+    def resolve_path(self, object_name: str) -> Optional[Path]:
+        """Map an object name to its file path, rejecting escapes from root.
+
+        Args:
+            object_name: Object path relative to the storage root
+
+        Returns:
+            Absolute file path, or None if the name is invalid
+        """
+        if not object_name or "\x00" in object_name:
+            return None
+        path = (self.root / object_name).resolve()
+        if path == self.root or not path.is_relative_to(self.root):
+            return None
+        return path
+
+    def _require_path(self, object_name: str) -> Path:
+        """resolve_path() that raises for invalid names."""
+        path = self.resolve_path(object_name)
+        if path is None:
+            raise MinIOError(f"Invalid object name: {object_name!r}")
+        return path
+
+    def get_object_url(self, object_name: str) -> str:
+        """Build the URL under which the file route serves an object.
+
+        Args:
+            object_name: Object path relative to the storage root
+
+        Returns:
+            Object URL
+        """
+        return f"{self.base_url}/{object_name}"
+
+    def object_name_from_url(self, url: str) -> Optional[str]:
+        """Extract the object name from a URL built by get_object_url.
+
+        Args:
+            url: Object URL
+
+        Returns:
+            Object name, or None if the URL is not served by this storage
+        """
+        prefix = f"{self.base_url}/"
+        if url.startswith(prefix):
+            return url[len(prefix):].split("?", 1)[0] or None
+        return None
+
+    def presigned_get_url(
+        self,
+        object_name: str,
+        expires: timedelta,
+        request_date: Optional[datetime] = None,
+    ) -> str:
+        """Local files are served without signatures; returns the plain URL."""
+        return self.get_object_url(object_name)
+
+    async def object_exists(self, object_name: str) -> bool:
+        """Check whether an object file exists.
+
+        Args:
+            object_name: Object path relative to the storage root
+
+        Returns:
+            True if the object exists
+        """
+        path = self._require_path(object_name)
+        return await self._run(path.is_file)
+
+    async def download_bytes(self, object_name: str) -> bytes:
+        """Read an object, refusing objects larger than max_size_bytes.
+
+        Args:
+            object_name: Object path relative to the storage root
+
+        Returns:
+            Object content
+
+        Raises:
+            MinIOSizeLimitError: If the object exceeds max_size_bytes
+            MinIOError: If the object cannot be read
+        """
+        path = self._require_path(object_name)
+
+        def _read() -> bytes:
+            with open(path, "rb") as f:
+                data = f.read(self.max_size_bytes + 1)
+            if len(data) > self.max_size_bytes:
+                raise MinIOSizeLimitError(
+                    f"Object {object_name} exceeds limit of {self.max_size_bytes} bytes"
+                )
+            return data
+
+        try:
+            return await self._run(_read)
+        except MinIOError:
+            raise
+        except Exception as e:
+            raise MinIOError(f"Failed to read {object_name} from local storage: {e}") from e
+
+    async def upload_stream(
+        self,
+        data: BinaryIO,
+        object_name: str,
+        content_type: str = "application/octet-stream",
+        length: int = -1,
+    ) -> str:
+        """Write a stream to disk atomically.
+
+        Args:
+            data: Readable binary stream
+            object_name: Object path relative to the storage root
+            content_type: MIME type (derived from the extension when serving)
+            length: Size in bytes, or -1 if unknown
+
+        Returns:
+            The object name
+
+        Raises:
+            MinIOError: If reading the stream fails with a storage error
+                (e.g. a Base64StreamReader over its size limit)
+            MinIOUploadError: If writing fails
+        """
+        path = self._require_path(object_name)
+        started = time.perf_counter()
+
+        try:
+            size, digest = await self._run(self._write_file, data, path)
+        except MinIOError:
+            self.metrics.record(0, time.perf_counter() - started, success=False)
+            raise
+        except Exception as e:
+            self.metrics.record(0, time.perf_counter() - started, success=False)
+            raise MinIOUploadError(f"Failed to write {object_name} to local storage: {e}") from e
+
+        self._remember_etag(path, digest)
+        elapsed = time.perf_counter() - started
+        self.metrics.record(size, elapsed)
+        logger.info(
+            f"Stored object locally: {object_name} "
+            f"({size} bytes in {elapsed * 1000:.0f}ms)"
+        )
+        return object_name
+
+    def _write_file(self, data: BinaryIO, path: Path) -> Tuple[int, str]:
+        """Copy a stream into path via a temp file (runs in a worker)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".upload-")
+        sha256 = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while True:
+                    chunk = data.read(self.COPY_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    sha256.update(chunk)
+                    out.write(chunk)
+            os.chmod(tmp_name, 0o644)
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except FileNotFoundError:
+                pass
+            raise
+        return size, sha256.hexdigest()
+
+    async def ensure_bucket_exists(self) -> None:
+        """Create the storage root if missing."""
+        await self._run(self.root.mkdir, parents=True, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Serving helpers
+    # ------------------------------------------------------------------
+
+    def cache_control_for(self, object_name: str) -> str:
+        """Cache-Control for serving an object.
+
+        Content-addressed objects never change and may be cached forever;
+        everything else must be revalidated with its ETag.
+        """
+        if self.cache_control and self.is_content_addressed(object_name):
+            return self.cache_control
+        return self.REVALIDATE_CACHE_CONTROL
+
+    @staticmethod
+    def is_content_addressed(object_name: str) -> bool:
+        """Whether the object name is a content hash."""
+        stem = os.path.basename(object_name).split(".", 1)[0]
+        return bool(_CONTENT_HASH_RE.match(stem))
+
+    async def etag(self, path: Path, stat_result: os.stat_result) -> str:
+        """Strong ETag (quoted SHA-256) of a stored file.
+
+        Content-addressed names are their own hash. Other files are hashed
+        once per (size, mtime) and memoized.
+
+        Args:
+            path: File path from resolve_path()
+            stat_result: Current stat of the file
+
+        Returns:
+            Quoted ETag value
+        """
+        if self.is_content_addressed(path.name):
+            return f'"{path.name.split(".", 1)[0]}"'
+
+        key = (str(path), stat_result.st_size, stat_result.st_mtime_ns)
+        with self._etag_lock:
+            digest = self._etags.get(key)
+            if digest is not None:
+                self._etags.move_to_end(key)
+                return f'"{digest}"'
+
+        digest = await self._run(self._hash_file, path)
+        self._store_etag(key, digest)
+        return f'"{digest}"'
+
+    def _remember_etag(self, path: Path, digest: str) -> None:
+        """Memoize the hash computed while writing a file."""
+        try:
+            stat_result = path.stat()
+        except OSError:
+            return
+        self._store_etag((str(path), stat_result.st_size, stat_result.st_mtime_ns), digest)
+
+    def _store_etag(self, key: Tuple[str, int, int], digest: str) -> None:
+        with self._etag_lock:
+            self._etags[key] = digest
+            self._etags.move_to_end(key)
+            while len(self._etags) > self.etag_cache_size:
+                self._etags.popitem(last=False)
+
+    @classmethod
+    def _hash_file(cls, path: Path) -> str:
+        """SHA-256 of a file, read in chunks (runs in a worker)."""
+        sha256 = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(cls.COPY_CHUNK_BYTES), b""):
+                sha256.update(chunk)
+        return sha256.hexdigest()
@@ -4,12 +4,23 @@ MinIO Storage Client.
 Provides functionality for uploading images to MinIO object storage.
 Used for converting Base64 images from MCP responses to URLs.
 """
+import asyncio
 import base64
+import binascii
+import hashlib
 import io
 import logging
-from typing import Optional
+import re
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, BinaryIO, Callable, Dict, Optional, Tuple
 from uuid import uuid4
-from datetime import datetime
+from datetime import datetime, timedelta
 
 try:
     from minio import Minio
@@ -46,6 +57,254 @@ class MinIOSizeLimitError(MinIOError):
     pass
 
 
+# ============================================================================
+# Streaming Base64 Decoder
+# ============================================================================
+
+_WHITESPACE = re.compile(r"\s")
+
+
+class Base64StreamReader(io.RawIOBase):
+    """Readable binary stream that decodes a Base64 string chunk by chunk.
+    
+    Decoded bytes are produced on demand, so feeding this reader to a
+    (multipart) upload never materializes the whole image. Validation,
+    the size limit and a SHA-256 digest are all computed incrementally.
+    A ``data:<mime>;base64,`` prefix and embedded line breaks are accepted.
+    
+    Example:
+        reader = Base64StreamReader(b64_data, max_size_bytes=10 * 1024 * 1024)
+        client.put_object(bucket, name, reader, reader.length or -1, part_size=...)
+        digest = reader.hexdigest()
+    """
+    
+    # Base64 characters decoded per step (multiple of 4); 64K chars -> 48KB
+    DEFAULT_CHUNK_CHARS = 64 * 1024
+    
+    def __init__(
+        self,
+        data: str,
+        max_size_bytes: Optional[int] = None,
+        chunk_chars: int = DEFAULT_CHUNK_CHARS,
+    ):
+        """Initialize the reader and validate the first chunk eagerly.
+        
+        Args:
+            data: Base64 string, optionally with a data URL prefix
+            max_size_bytes: Maximum decoded size in bytes
+            chunk_chars: Base64 characters decoded per step
+            
+        Raises:
+            MinIOUploadError: If the first chunk is not valid Base64
+            MinIOSizeLimitError: If the decoded size is known to exceed the limit
+        """
+        super().__init__()
+        self._data = data
+        # Skip a data URL prefix without copying the payload
+        comma = data.find(",", 0, 256)
+        self._pos = comma + 1 if comma >= 0 else 0
+        self._chunk_chars = max(4, chunk_chars - chunk_chars % 4)
+        self.max_size_bytes = max_size_bytes
+        self._carry = ""
+        self._buffer = b""
+        self._offset = 0
+        self._sha256 = hashlib.sha256()
+        self.bytes_decoded = 0
+        
+        # Exact decoded length is cheap to compute when there is no whitespace
+        self.length: Optional[int] = None
+        if _WHITESPACE.search(data, self._pos) is None:
+            chars = len(data) - self._pos
+            padding = 2 if data.endswith("==") else 1 if data.endswith("=") else 0
+            self.length = chars // 4 * 3 - padding if chars % 4 == 0 else None
+        
+        if self.length is not None:
+            self._check_size(self.length)
+        self._fill()
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, b) -> int:
+        """Copy decoded bytes into b, decoding the next chunk when needed."""
+        if self._offset >= len(self._buffer):
+            self._fill()
+            if not self._buffer:
+                return 0
+        
+        n = min(len(b), len(self._buffer) - self._offset)
+        b[:n] = self._buffer[self._offset:self._offset + n]
+        self._offset += n
+        return n
+    
+    def tell(self) -> int:
+        """Number of decoded bytes handed out so far."""
+        return self.bytes_decoded - (len(self._buffer) - self._offset)
+    
+    def hexdigest(self) -> str:
+        """SHA-256 of the bytes decoded so far (the whole image once read)."""
+        return self._sha256.hexdigest()
+    
+    def _check_size(self, size: int) -> None:
+        """Raise if size exceeds the configured limit."""
+        if self.max_size_bytes is not None and size > self.max_size_bytes:
+            size_mb = size / (1024 * 1024)
+            limit_mb = self.max_size_bytes / (1024 * 1024)
+            raise MinIOSizeLimitError(
+                f"Image size ({size_mb:.2f}MB) exceeds limit ({limit_mb:.2f}MB)"
+            )
+    
+    def _fill(self) -> None:
+        """Decode the next chunk into the internal buffer."""
+        self._buffer = b""
+        self._offset = 0
+        
+        while not self._buffer and (self._pos < len(self._data) or self._carry):
+            raw = self._data[self._pos:self._pos + self._chunk_chars]
+            self._pos += len(raw)
+            if _WHITESPACE.search(raw):
+                raw = _WHITESPACE.sub("", raw)
+            
+            text = self._carry + raw
+            at_end = self._pos >= len(self._data)
+            usable = len(text) if at_end else len(text) - len(text) % 4
+            self._carry = text[usable:]
+            
+            try:
+                decoded = binascii.a2b_base64(text[:usable], strict_mode=True)
+            except binascii.Error as e:
+                raise MinIOUploadError(f"Failed to decode Base64 data: {e}") from e
+            
+            self.bytes_decoded += len(decoded)
+            self._check_size(self.bytes_decoded)
+            self._sha256.update(decoded)
+            self._buffer = decoded
+
+
+# ============================================================================
+# Upload Executor & Metrics
+# ============================================================================
+
+# The minio SDK is synchronous; all SDK calls run on this bounded pool so
+# they never block the event loop.
+_upload_executor: Optional[ThreadPoolExecutor] = None
+_upload_executor_lock = threading.Lock()
+
+
+def get_upload_executor() -> ThreadPoolExecutor:
+    """Get the shared thread pool used for MinIO SDK calls.
+    
+    Sized by settings.minio_upload_workers.
+    
+    Returns:
+        Process-wide ThreadPoolExecutor
+    """
+    global _upload_executor
+    if _upload_executor is None:
+        with _upload_executor_lock:
+            if _upload_executor is None:
+                from app.core.config import settings
+                _upload_executor = ThreadPoolExecutor(
+                    max_workers=settings.minio_upload_workers,
+                    thread_name_prefix="minio-upload",
+                )
+    return _upload_executor
+
+
+def shutdown_upload_executor(wait: bool = True) -> None:
+    """Shut down the shared upload thread pool (recreated on next use)."""
+    global _upload_executor
+    with _upload_executor_lock:
+        executor, _upload_executor = _upload_executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+class UploadMetrics:
+    """Latency and throughput counters for object uploads.
+    
+    Keeps totals plus a window of recent latencies for percentiles.
+    """
+    
+    def __init__(self, window: int = 256):
+        """Initialize metrics.
+        
+        Args:
+            window: Number of recent uploads kept for latency percentiles
+        """
+        self._latencies: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.uploads = 0
+        self.failures = 0
+        self.deduplicated = 0
+        self.bytes_uploaded = 0
+        self.seconds_uploading = 0.0
+    
+    def record_deduplicated(self) -> None:
+        """Record an upload skipped because the content was already stored."""
+        with self._lock:
+            self.deduplicated += 1
+    
+    def record(self, size_bytes: int, seconds: float, success: bool = True) -> None:
+        """Record one upload attempt."""
+        with self._lock:
+            if not success:
+                self.failures += 1
+                return
+            self.uploads += 1
+            self.bytes_uploaded += size_bytes
+            self.seconds_uploading += seconds
+            self._latencies.append(seconds)
+    
+    def reset(self) -> None:
+        """Clear all counters."""
+        with self._lock:
+            self._latencies.clear()
+            self.uploads = 0
+            self.failures = 0
+            self.deduplicated = 0
+            self.bytes_uploaded = 0
+            self.seconds_uploading = 0.0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get upload metrics.
+        
+        Returns:
+            Dict with counts, bytes, latency (avg/p50/p95 ms) and throughput
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            uploads = self.uploads
+            total_bytes = self.bytes_uploaded
+            total_seconds = self.seconds_uploading
+            failures = self.failures
+            deduplicated = self.deduplicated
+        
+        def percentile(fraction: float) -> float:
+            if not latencies:
+                return 0.0
+            index = min(len(latencies) - 1, int(fraction * len(latencies)))
+            return round(latencies[index] * 1000, 2)
+        
+        return {
+            "uploads": uploads,
+            "failures": failures,
+            "deduplicated": deduplicated,
+            "bytes_uploaded": total_bytes,
+            "avg_latency_ms": round(total_seconds / uploads * 1000, 2) if uploads else 0.0,
+            "p50_latency_ms": percentile(0.5),
+            "p95_latency_ms": percentile(0.95),
+            "throughput_mbps": (
+                round(total_bytes / total_seconds / (1024 * 1024), 3)
+                if total_seconds else 0.0
+            ),
+        }
+
+
+# Process-wide upload metrics shared by all clients
+upload_metrics = UploadMetrics()
+
+
 # ============================================================================
 # MinIO Client
 # ============================================================================
@@ -54,7 +313,11 @@ class MinIOClient:
     """Client for MinIO object storage.
     
     Handles uploading Base64-encoded images to MinIO and returning
-    accessible URLs.
+    accessible URLs. Blocking SDK calls run on a bounded thread pool
+    (see get_upload_executor), and objects larger than part_size are
+    sent as multipart uploads. With content_addressed enabled, uploads
+    are keyed by the SHA-256 of their bytes, so identical images share
+    one immutable object and are only uploaded once.
     
     Example:
         client = MinIOClient(
@@ -77,11 +340,22 @@ class MinIOClient:
         "image/gif": ".gif",
         "image/webp": ".webp",
         "image/bmp": ".bmp",
+        "image/avif": ".avif",
+        "video/mp4": ".mp4",
     }
     
     # Default maximum upload size (10MB)
     DEFAULT_MAX_SIZE_BYTES = 10 * 1024 * 1024
     
+    # Content-addressed objects never change, so they can be cached forever
+    IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+    
+    # Characters of a payload decoded by is_base64()
+    BASE64_SAMPLE_CHARS = 4096
+    
+    # Multipart part size; S3 requires at least 5MB per part
+    MIN_PART_SIZE_BYTES = 5 * 1024 * 1024
+    
     def __init__(
         self,
         endpoint: str,
@@ -90,6 +364,12 @@ class MinIOClient:
         bucket: str,
         secure: bool = False,
         max_size_bytes: Optional[int] = None,
+        part_size_bytes: Optional[int] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+        metrics: Optional[UploadMetrics] = None,
+        content_addressed: bool = True,
+        cache_control: Optional[str] = IMMUTABLE_CACHE_CONTROL,
+        region: Optional[str] = None,
     ):
         """Initialize MinIO client.
         
@@ -100,6 +380,14 @@ class MinIOClient:
             bucket: Bucket name for image storage
             secure: Use HTTPS connection
             max_size_bytes: Maximum upload size in bytes (default: 10MB)
+            part_size_bytes: Multipart part size (default and minimum: 5MB)
+            executor: Thread pool for SDK calls (default: shared upload pool)
+            metrics: Upload metrics sink (default: shared upload_metrics)
+            content_addressed: Name uploads by SHA-256 of their content and
+                skip uploading bytes that are already stored
+            cache_control: Cache-Control stored with uploaded objects
+            region: Bucket region; when set, URL signing is purely local
+                (no GetBucketLocation round trip)
         """
         self.endpoint = endpoint
         self.access_key = access_key
@@ -107,8 +395,32 @@ class MinIOClient:
         self.bucket = bucket
         self.secure = secure
         self.max_size_bytes = max_size_bytes or self.DEFAULT_MAX_SIZE_BYTES
+        self.part_size_bytes = max(
+            part_size_bytes or self.MIN_PART_SIZE_BYTES,
+            self.MIN_PART_SIZE_BYTES,
+        )
+        self._executor = executor
+        self.metrics = metrics or upload_metrics
+        self.content_addressed = content_addressed
+        self.cache_control = cache_control
+        self.region = region
         self._client: Optional["Minio"] = None
     
+    async def _run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking SDK call on the upload thread pool.
+        
+        Args:
+            func: Blocking callable
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+            
+        Returns:
+            The callable's return value
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._executor or get_upload_executor()
+        return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+    
     def _get_minio_client(self) -> "Minio":
         """Get or create MinIO client instance.
         
@@ -130,6 +442,7 @@ class MinIOClient:
                 access_key=self.access_key,
                 secret_key=self.secret_key,
                 secure=self.secure,
+                region=self.region,
             )
         
         return self._client
@@ -150,13 +463,16 @@ class MinIOClient:
         if data.startswith(("http://", "https://")):
             return False
         
-        # Try to decode it
+        # Only a bounded prefix is decoded here; the full payload is
+        # validated incrementally while it is streamed to storage.
+        comma = data.find(",", 0, 256)
+        start = comma + 1 if comma >= 0 else 0
+        sample = data[start:start + self.BASE64_SAMPLE_CHARS]
+        if start + len(sample) < len(data):
+            sample = sample[:len(sample) - len(sample) % 4]
+        
         try:
-            # Remove data URL prefix if present
-            if "," in data:
-                data = data.split(",", 1)[1]
-            
-            decoded = base64.b64decode(data, validate=True)
+            decoded = base64.b64decode(sample, validate=True)
             return len(decoded) > 0
         except Exception:
             return False
@@ -181,6 +497,80 @@ class MinIOClient:
         
         return f"{prefix}/{date_path}/{unique_id}{ext}"
     
+    def content_object_name(
+        self,
+        digest: str,
+        mime_type: str,
+        prefix: str = "images",
+    ) -> str:
+        """Build a content-addressed object name.
+        
+        Args:
+            digest: Hex SHA-256 of the object content
+            mime_type: MIME type of the object
+            prefix: Path prefix in the bucket
+            
+        Returns:
+            Object path like "images/ab/ab12...ef.png"
+        """
+        ext = self.MIME_EXTENSIONS.get(mime_type, ".png")
+        return f"{prefix}/{digest[:2]}/{digest}{ext}"
+    
+    async def object_exists(self, object_name: str) -> bool:
+        """Check whether an object is already stored.
+        
+        Args:
+            object_name: Object path in the bucket
+            
+        Returns:
+            True if the object exists
+            
+        Raises:
+            MinIOConnectionError: If the check fails for another reason
+        """
+        def _stat() -> bool:
+            client = self._get_minio_client()
+            try:
+                client.stat_object(self.bucket, object_name)
+                return True
+            except S3Error as e:
+                if e.code in ("NoSuchKey", "NoSuchObject", "ResourceNotFound"):
+                    return False
+                raise
+        
+        try:
+            return await self._run(_stat)
+        except MinIOError:
+            raise
+        except Exception as e:
+            raise MinIOConnectionError(
+                f"Failed to check object {object_name}: {e}"
+            ) from e
+    
+    @staticmethod
+    def _spool_base64(
+        base64_data: str,
+        max_size_bytes: int,
+        max_memory_bytes: int,
+    ) -> Tuple[BinaryIO, str, int]:
+        """Decode Base64 content once into a spooled buffer (runs in a worker).
+        
+        The buffer stays in memory up to max_memory_bytes and rolls over to
+        a temporary file beyond that.
+        
+        Returns:
+            (buffer rewound to the start, SHA-256 hex digest, size in bytes)
+        """
+        reader = Base64StreamReader(base64_data, max_size_bytes=max_size_bytes)
+        spool = tempfile.SpooledTemporaryFile(max_size=max_memory_bytes)
+        try:
+            shutil.copyfileobj(reader, spool, Base64StreamReader.DEFAULT_CHUNK_CHARS)
+            spool.seek(0)
+        except BaseException:
+            spool.close()
+            raise
+        return spool, reader.hexdigest(), reader.bytes_decoded
+    
     async def upload_base64_image(
         self,
         base64_data: str,
@@ -200,54 +590,195 @@ class MinIOClient:
         Raises:
             MinIOUploadError: If upload fails
         """
-        # Decode Base64 data
+        if not self.content_addressed:
+            # Decode lazily; peak memory stays at one chunk plus one upload part
+            reader = Base64StreamReader(base64_data, max_size_bytes=self.max_size_bytes)
+            object_name = self.generate_object_name(mime_type, prefix)
+            await self.upload_stream(
+                reader,
+                object_name=object_name,
+                content_type=mime_type,
+                length=reader.length if reader.length is not None else -1,
+            )
+            logger.debug(f"Uploaded {object_name} sha256={reader.hexdigest()}")
+            return self.get_object_url(object_name)
+        
+        # The key is the content hash, which is only known after decoding.
+        # Decode once into a spooled buffer (one upload part in memory, the
+        # rest on disk) and upload from it, instead of decoding twice.
+        spool, digest, size = await self._run(
+            self._spool_base64, base64_data, self.max_size_bytes, self.part_size_bytes
+        )
         try:
-            # Remove data URL prefix if present (e.g., "data:image/png;base64,")
-            if "," in base64_data:
-                base64_data = base64_data.split(",", 1)[1]
+            object_name = self.content_object_name(digest, mime_type, prefix)
+            if await self.object_exists(object_name):
+                self.metrics.record_deduplicated()
+                logger.info(f"Skipped upload, content already stored: {object_name}")
+                return self.get_object_url(object_name)
             
-            image_bytes = base64.b64decode(base64_data)
-        except Exception as e:
-            raise MinIOUploadError(f"Failed to decode Base64 data: {e}") from e
-        
-        # Check size limit
-        data_size = len(image_bytes)
-        if data_size > self.max_size_bytes:
-            size_mb = data_size / (1024 * 1024)
-            limit_mb = self.max_size_bytes / (1024 * 1024)
-            raise MinIOSizeLimitError(
-                f"Image size ({size_mb:.2f}MB) exceeds limit ({limit_mb:.2f}MB)"
+            await self.upload_stream(
+                spool,
+                object_name=object_name,
+                content_type=mime_type,
+                length=size,
             )
+        finally:
+            spool.close()
         
-        # Generate object name
-        object_name = self.generate_object_name(mime_type, prefix)
+        return self.get_object_url(object_name)
+    
+    def get_object_url(self, object_name: str) -> str:
+        """Build the public URL of an object in the bucket.
         
-        # Upload to MinIO
-        try:
+        Args:
+            object_name: Object path in the bucket
+            
+        Returns:
+            Object URL
+        """
+        protocol = "https" if self.secure else "http"
+        return f"{protocol}://{self.endpoint}/{self.bucket}/{object_name}"
+    
+    def presigned_get_url(
+        self,
+        object_name: str,
+        expires: timedelta,
+        request_date: Optional[datetime] = None,
+    ) -> str:
+        """Sign a GET URL for an object.
+        
+        Signing is an HMAC computed locally; with region set it never
+        touches the network, so it is safe to call on the event loop.
+        
+        Args:
+            object_name: Object path in the bucket
+            expires: Validity measured from request_date (max 7 days)
+            request_date: Signing timestamp (default: now); a fixed value
+                yields identical URLs, which keeps them cacheable
+            
+        Returns:
+            Presigned object URL
+        """
+        client = self._get_minio_client()
+        return client.presigned_get_object(
+            self.bucket,
+            object_name,
+            expires=expires,
+            request_date=request_date,
+        )
+    
+    def object_name_from_url(self, url: str) -> Optional[str]:
+        """Extract the object name from a URL built by get_object_url.
+        
+        Args:
+            url: Object URL
+            
+        Returns:
+            Object name, or None if the URL is not in this bucket
+        """
+        prefix = f"{self.endpoint}/{self.bucket}/"
+        for scheme in ("http://", "https://"):
+            if url.startswith(scheme + prefix):
+                return url[len(scheme + prefix):].split("?", 1)[0] or None
+        return None
+    
+    async def download_bytes(self, object_name: str) -> bytes:
+        """Download an object, refusing objects larger than max_size_bytes.
+        
+        Args:
+            object_name: Object path in the bucket
+            
+        Returns:
+            Object content
+            
+        Raises:
+            MinIOSizeLimitError: If the object exceeds max_size_bytes
+            MinIOError: If the download fails
+        """
+        def _download() -> bytes:
             client = self._get_minio_client()
+            response = client.get_object(self.bucket, object_name)
+            try:
+                data = response.read(self.max_size_bytes + 1)
+            finally:
+                response.close()
+                response.release_conn()
+            if len(data) > self.max_size_bytes:
+                raise MinIOSizeLimitError(
+                    f"Object {object_name} exceeds limit of {self.max_size_bytes} bytes"
+                )
+            return data
+        
+        try:
+            return await self._run(_download)
+        except MinIOError:
+            raise
+        except Exception as e:
+            raise MinIOError(f"Failed to download {object_name} from MinIO: {e}") from e
+    
+    async def upload_stream(
+        self,
+        data: BinaryIO,
+        object_name: str,
+        content_type: str = "application/octet-stream",
+        length: int = -1,
+    ) -> str:
+        """Upload a binary stream without blocking the event loop.
+        
+        Objects larger than part_size_bytes, or of unknown length (-1), are
+        sent as multipart uploads by the SDK.
+        
+        Args:
+            data: Readable binary stream
+            object_name: Object path in the bucket
+            content_type: MIME type of the object
+            length: Stream length in bytes, or -1 if unknown
             
-            # Create BytesIO stream from decoded data
-            data_stream = io.BytesIO(image_bytes)
-            data_length = len(image_bytes)
+        Returns:
+            Object name
             
-            client.put_object(
+        Raises:
+            MinIOUploadError: If upload fails
+        """
+        started = time.perf_counter()
+        try:
+            client = self._get_minio_client()
+            await self._run(
+                client.put_object,
                 bucket_name=self.bucket,
                 object_name=object_name,
-                data=data_stream,
-                length=data_length,
-                content_type=mime_type,
+                data=data,
+                length=length,
+                content_type=content_type,
+                part_size=self.part_size_bytes,
+                metadata=(
+                    {"Cache-Control": self.cache_control}
+                    if self.cache_control else None
+                ),
             )
-            
-            logger.info(f"Uploaded image to MinIO: {object_name}")
-            
         except Exception as e:
+            self.metrics.record(0, time.perf_counter() - started, success=False)
+            if isinstance(e, MinIOError):
+                # Decode / size-limit errors raised while streaming
+                raise
             raise MinIOUploadError(f"Failed to upload image to MinIO: {e}") from e
         
-        # Construct URL
-        protocol = "https" if self.secure else "http"
-        url = f"{protocol}://{self.endpoint}/{self.bucket}/{object_name}"
-        
-        return url
+        elapsed = time.perf_counter() - started
+        size = length if length >= 0 else self._stream_position(data)
+        self.metrics.record(size, elapsed)
+        logger.info(
+            f"Uploaded object to MinIO: {object_name} "
+            f"({size} bytes in {elapsed * 1000:.0f}ms)"
+        )
+        return object_name
+    
+    @staticmethod
+    def _stream_position(data: BinaryIO) -> int:
+        """Best-effort size of a stream uploaded with unknown length."""
+        try:
+            return int(data.tell())
+        except Exception:
+            return 0
     
     async def ensure_bucket_exists(self) -> None:
         """Ensure the configured bucket exists, create if not.
@@ -258,8 +789,8 @@ class MinIOClient:
         try:
             client = self._get_minio_client()
             
-            if not client.bucket_exists(self.bucket):
-                client.make_bucket(self.bucket)
+            if not await self._run(client.bucket_exists, self.bucket):
+                await self._run(client.make_bucket, self.bucket)
                 logger.info(f"Created MinIO bucket: {self.bucket}")
             else:
                 logger.debug(f"MinIO bucket exists: {self.bucket}")
@@ -0,0 +1,199 @@
+"""
+Presigned URL Signer.
+
+Turns the plain object URLs stored with assets into presigned GET URLs so
+responses work against private buckets. Signatures are computed locally
+(the region is configured, never looked up) and cached per object and
+time window: every URL issued within one window is byte-identical, which
+lets browsers and CDNs cache it, and listing pages only pay for objects
+not signed yet.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from app.infrastructure.storage.minio_client import MinIOClient
+
+
+logger = logging.getLogger(__name__)
+
+
+class PresignedURLSigner:
+    """Issue and cache presigned GET URLs for objects in a MinIO bucket.
+
+    Time is split into windows of window_seconds. All URLs for an object
+    within a window are signed with the window start as request date and
+    stay valid for expiry_seconds + window_seconds from it, so every URL
+    handed out remains usable for at least expiry_seconds. URLs that do
+    not point into the bucket (external images, data URIs) pass through
+    unchanged.
+
+    Example:
+        signer = PresignedURLSigner(minio_client)
+        urls = signer.sign_many([asset.url for asset in assets])
+    """
+
+    # S3 rejects presigned URLs valid for longer than seven days
+    MAX_VALIDITY_SECONDS = 7 * 24 * 3600
+
+    def __init__(
+        self,
+        minio_client: MinIOClient,
+        expiry_seconds: int = 3600,
+        window_seconds: int = 900,
+        max_entries: int = 4096,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the signer.
+
+        Args:
+            minio_client: Client for the bucket; its region must be set
+            expiry_seconds: Minimum remaining validity of issued URLs
+            window_seconds: Length of the URL reuse window
+            max_entries: Maximum cached URLs (least recently used evicted)
+            clock: Wall-clock source, overridable in tests
+
+        Raises:
+            ValueError: If the client has no region (the SDK would look
+                it up with a blocking request from the event loop)
+        """
+        if not minio_client.region:
+            raise ValueError("PresignedURLSigner requires a MinIO client with region set")
+
+        self.minio_client = minio_client
+        self.window_seconds = max(1, window_seconds)
+        self.expiry_seconds = max(
+            1, min(expiry_seconds, self.MAX_VALIDITY_SECONDS - self.window_seconds)
+        )
+        self.max_entries = max(1, max_entries)
+        self._clock = clock
+        self._entries: "OrderedDict[tuple[str, int], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def sign(self, url: Optional[str]) -> Optional[str]:
+        """Presign a single URL.
+
+        Args:
+            url: Stored object URL (None and foreign URLs pass through)
+
+        Returns:
+            Presigned URL, or the input unchanged
+        """
+        return self.sign_many([url])[0]
+
+    def sign_many(self, urls: Iterable[Optional[str]]) -> List[Optional[str]]:
+        """Presign many URLs in one pass.
+
+        Duplicates are signed once and cached URLs are reused, so a
+        gallery page costs at most one HMAC per distinct new object.
+
+        Args:
+            urls: Stored object URLs (None and foreign URLs pass through)
+
+        Returns:
+            URLs in input order
+        """
+        urls = list(urls)
+        window = int(self._clock() // self.window_seconds)
+        signed: Dict[str, Optional[str]] = {}
+
+        for url in urls:
+            if not url or url in signed:
+                continue
+            object_name = self.minio_client.object_name_from_url(url)
+            signed[url] = url if object_name is None else self._presign(object_name, window)
+
+        return [signed.get(url, url) if url else url for url in urls]
+
+    def _presign(self, object_name: str, window: int) -> str:
+        """Return the cached URL for (object, window), signing on a miss."""
+        key = (object_name, window)
+        with self._lock:
+            url = self._entries.get(key)
+            if url is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return url
+            self.misses += 1
+
+        url = self.minio_client.presigned_get_url(
+            object_name,
+            expires=timedelta(seconds=self.expiry_seconds + self.window_seconds),
+            request_date=datetime.fromtimestamp(window * self.window_seconds, timezone.utc),
+        )
+
+        with self._lock:
+            self._entries[key] = url
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return url
+
+    def clear(self) -> None:
+        """Drop cached URLs and reset metrics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get signer metrics.
+
+        Returns:
+            Dict with cache size, limits, hit/miss counts and hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "expiry_seconds": self.expiry_seconds,
+                "window_seconds": self.window_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+_url_signer: Optional[PresignedURLSigner] = None
+_url_signer_lock = threading.Lock()
+
+
+def get_url_signer() -> Optional[PresignedURLSigner]:
+    """Get the shared URL signer.
+
+    Returns:
+        PresignedURLSigner, or None if presigning is disabled (public
+        bucket) or objects are served from local disk
+    """
+    global _url_signer
+    from app.core.config import settings
+
+    if not settings.minio_presign_enabled or settings.storage_backend != "minio":
+        return None
+
+    if _url_signer is None:
+        with _url_signer_lock:
+            if _url_signer is None:
+                minio_client = MinIOClient(
+                    endpoint=settings.minio_endpoint,
+                    access_key=settings.minio_access_key,
+                    secret_key=settings.minio_secret_key,
+                    bucket=settings.minio_bucket,
+                    secure=settings.minio_secure,
+                    # An empty region would make the SDK fetch it on the event loop
+                    region=settings.minio_region or "us-east-1",
+                )
+                _url_signer = PresignedURLSigner(
+                    minio_client,
+                    expiry_seconds=settings.minio_presign_expiry_seconds,
+                    window_seconds=settings.minio_presign_window_seconds,
+                    max_entries=settings.minio_presign_cache_size,
+                )
+
+    return _url_signer
@@ -0,0 +1,27 @@
+"""
+Text Infrastructure Package.
+
+Contains MinHash/LSH near-duplicate detection for generated copy.
+"""
+from app.infrastructure.text.copy_index import (
+    CopyDuplicateIndex,
+    CopySignature,
+    CopySignatureStore,
+    InMemoryCopySignatureStore,
+    get_copy_duplicate_index,
+    reset_copy_duplicate_index,
+)
+from app.infrastructure.text.minhash import LSHIndex, MinHasher, lsh_params, shingles
+
+__all__ = [
+    "CopyDuplicateIndex",
+    "CopySignature",
+    "CopySignatureStore",
+    "InMemoryCopySignatureStore",
+    "get_copy_duplicate_index",
+    "reset_copy_duplicate_index",
+    "LSHIndex",
+    "MinHasher",
+    "lsh_params",
+    "shingles",
+]
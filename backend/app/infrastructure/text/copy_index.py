@@ -0,0 +1,375 @@
+"""
+Near-Duplicate Copy Index.
+
+Keeps one LSHIndex per merchant over the MinHash signatures of every copy
+variant their workflows produced, so a new variant is checked against the
+whole corpus by probing a few LSH buckets. Signatures are persisted
+through a CopySignatureStore; a merchant's index is rebuilt from the store
+the first time it is needed and kept in a bounded LRU afterwards. Every
+later use pulls in signatures saved since the last load, so copy
+registered by other workers is seen too.
+"""
+import asyncio
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.infrastructure.text.minhash import LSHIndex, MinHasher
+
+
+logger = logging.getLogger(__name__)
+
+
+# (workflow_id, channel) - one copy variant
+CopyKey = Tuple[str, str]
+
+# Signatures are re-read this far behind the newest one already loaded, so
+# rows stamped slightly earlier by another worker's clock (or committed
+# late) are not skipped. Re-inserting a key is a no-op replacement.
+_REFRESH_OVERLAP_SECONDS = 5.0
+
+
+@dataclass
+class CopySignature:
+    """Stored MinHash signature of one copy variant."""
+    user_id: str
+    workflow_id: str
+    channel: str
+    signature: bytes
+    created_at: float = field(default_factory=time.time)
+
+    @property
+    def key(self) -> CopyKey:
+        return (self.workflow_id, self.channel)
+
+
+class CopySignatureStore(ABC):
+    """Persistence for copy signatures, so indexes survive restarts."""
+
+    @abstractmethod
+    async def save(self, signatures: List[CopySignature]) -> None:
+        """Insert or replace signatures (keyed by workflow and channel)."""
+
+    @abstractmethod
+    async def list_for_user(
+        self,
+        user_id: str,
+        since: Optional[float] = None,
+    ) -> List[CopySignature]:
+        """Load a user's signatures, only those created at or after ``since`` if given."""
+
+
+class InMemoryCopySignatureStore(CopySignatureStore):
+    """Process-local store for development and tests."""
+
+    def __init__(self):
+        self._signatures: Dict[CopyKey, CopySignature] = {}
+
+    async def save(self, signatures: List[CopySignature]) -> None:
+        for signature in signatures:
+            self._signatures[signature.key] = signature
+
+    async def list_for_user(
+        self,
+        user_id: str,
+        since: Optional[float] = None,
+    ) -> List[CopySignature]:
+        return [
+            s for s in self._signatures.values()
+            if s.user_id == user_id and (since is None or s.created_at >= since)
+        ]
+
+
+@dataclass
+class _UserIndex:
+    """A user's LSH index and the newest stored signature loaded into it."""
+    index: LSHIndex
+    loaded_until: Optional[float] = None
+
+
+class CopyDuplicateIndex:
+    """
+    Flags near-duplicate copy across a merchant's catalog.
+
+    Variants of the same workflow are never compared with each other: the
+    channels of one package deliberately share a draft, and the index is
+    meant to catch copy repeated across SKUs.
+
+    Example:
+        index = CopyDuplicateIndex(CopySignatureRepository())
+        await index.check_and_register(user_id, workflow_id, copy_assets)
+        copy_assets[0]["duplicates"]  # [{"workflow_id", "channel", "similarity"}]
+    """
+
+    def __init__(
+        self,
+        store: CopySignatureStore,
+        threshold: float = 0.8,
+        num_perm: int = 128,
+        max_users: int = 256,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            store: Signature persistence
+            threshold: Estimated Jaccard similarity that counts as a duplicate
+            num_perm: MinHash signature length
+            max_users: Per-user indexes kept in memory
+        """
+        self.store = store
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm=num_perm)
+        self.max_users = max(1, max_users)
+        self._indexes: "OrderedDict[str, _UserIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def check_and_register(
+        self,
+        user_id: Any,
+        workflow_id: str,
+        copy_assets: List[Dict[str, Any]],
+    ) -> int:
+        """
+        Annotate copy assets with their near-duplicates, then index them.
+
+        Each asset gets a "duplicates" list (empty when the copy is
+        original). Store failures are logged and leave the assets
+        annotated from the in-memory index.
+
+        Args:
+            user_id: Owner of the copy
+            workflow_id: Workflow that produced the copy
+            copy_assets: Assets with "channel" and "content"
+
+        Returns:
+            Number of assets with at least one duplicate
+        """
+        user_id = str(user_id)
+        index = await self._index_for(user_id)
+        signed = await self._sign(copy_assets)
+        flagged = self._annotate(index, workflow_id, copy_assets, signed)
+        await self._register(index, user_id, workflow_id, copy_assets, signed)
+        return flagged
+
+    async def check(
+        self,
+        user_id: Any,
+        workflow_id: str,
+        copy_assets: List[Dict[str, Any]],
+    ) -> int:
+        """
+        Annotate copy assets with their near-duplicates without indexing them.
+
+        Used for drafts that may still be replaced; call register() once
+        the copy is final so discarded drafts never enter the index.
+
+        Args:
+            user_id: Owner of the copy
+            workflow_id: Workflow that produced the copy
+            copy_assets: Assets with "channel" and "content"
+
+        Returns:
+            Number of assets with at least one duplicate
+        """
+        index = await self._index_for(str(user_id))
+        return self._annotate(index, workflow_id, copy_assets, await self._sign(copy_assets))
+
+    async def register(
+        self,
+        user_id: Any,
+        workflow_id: str,
+        copy_assets: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Index final copy assets and persist their signatures.
+
+        Args:
+            user_id: Owner of the copy
+            workflow_id: Workflow that produced the copy
+            copy_assets: Assets with "channel" and "content"
+        """
+        user_id = str(user_id)
+        index = await self._index_for(user_id)
+        await self._register(index, user_id, workflow_id, copy_assets, await self._sign(copy_assets))
+
+    async def _sign(self, copy_assets: List[Dict[str, Any]]) -> List[Any]:
+        return await asyncio.to_thread(
+            lambda: [self.hasher.signature(str(asset.get("content") or "")) for asset in copy_assets]
+        )
+
+    @staticmethod
+    def _annotate(
+        index: LSHIndex,
+        workflow_id: str,
+        copy_assets: List[Dict[str, Any]],
+        signed: List[Any],
+    ) -> int:
+        own_keys = {(workflow_id, str(asset.get("channel", ""))) for asset in copy_assets}
+        flagged = 0
+        for asset, signature in zip(copy_assets, signed):
+            matches = index.query(signature, exclude=own_keys)
+            asset["duplicates"] = [
+                {"workflow_id": key[0], "channel": key[1], "similarity": similarity}
+                for key, similarity in matches
+            ]
+            flagged += bool(matches)
+        if flagged:
+            logger.info(f"[{workflow_id}] {flagged} copy variant(s) near-duplicate existing copy")
+        return flagged
+
+    async def _register(
+        self,
+        index: LSHIndex,
+        user_id: str,
+        workflow_id: str,
+        copy_assets: List[Dict[str, Any]],
+        signed: List[Any],
+    ) -> None:
+        records = [
+            CopySignature(
+                user_id=user_id,
+                workflow_id=workflow_id,
+                channel=str(asset.get("channel", "")),
+                signature=MinHasher.to_bytes(signature),
+            )
+            for asset, signature in zip(copy_assets, signed)
+        ]
+        for record, signature in zip(records, signed):
+            index.insert(record.key, signature)
+        try:
+            await self.store.save(records)
+        except Exception as e:
+            logger.warning(f"Could not persist copy signatures of workflow {workflow_id}: {e}")
+
+    async def clusters(self, user_id: Any) -> List[Dict[str, Any]]:
+        """
+        Group a user's copy into near-duplicate clusters.
+
+        Only clusters spanning two or more workflows are returned.
+
+        Args:
+            user_id: Owner of the copy
+
+        Returns:
+            Clusters, largest first:
+            [{"size": int, "workflow_ids": [...], "members": [{"workflow_id", "channel"}]}]
+        """
+        index = await self._index_for(str(user_id))
+        groups = await asyncio.to_thread(index.clusters)
+
+        result = []
+        for members in groups:
+            by_workflow: Dict[str, List[str]] = defaultdict(list)
+            for workflow_id, channel in members:
+                by_workflow[workflow_id].append(channel)
+            if len(by_workflow) < 2:
+                continue
+            result.append({
+                "size": len(members),
+                "workflow_ids": sorted(by_workflow),
+                "members": [
+                    {"workflow_id": workflow_id, "channel": channel}
+                    for workflow_id, channel in sorted(members)
+                ],
+            })
+        return result
+
+    async def _index_for(self, user_id: str) -> LSHIndex:
+        """Get a user's index, building it from the store on first use.
+
+        An index already in memory is topped up with the signatures saved
+        since it was last loaded, which includes copy registered by other
+        workers and processes.
+        """
+        with self._lock:
+            entry = self._indexes.get(user_id)
+            if entry is not None:
+                self._indexes.move_to_end(user_id)
+
+        if entry is None:
+            entry = _UserIndex(LSHIndex(num_perm=self.hasher.num_perm, threshold=self.threshold))
+        since = None
+        if entry.loaded_until is not None:
+            since = entry.loaded_until - _REFRESH_OVERLAP_SECONDS
+
+        try:
+            stored = await self.store.list_for_user(user_id, since=since)
+        except Exception as e:
+            logger.warning(f"Could not load copy signatures of user {user_id}: {e}")
+            stored = []
+        for record in stored:
+            signature = MinHasher.from_bytes(record.signature)
+            # Signatures from a different num_perm setting are not comparable
+            if len(signature) == self.hasher.num_perm:
+                entry.index.insert(record.key, signature)
+        if stored:
+            newest = max(record.created_at for record in stored)
+            if entry.loaded_until is None or newest > entry.loaded_until:
+                entry.loaded_until = newest
+
+        with self._lock:
+            # Another task may have built the index meanwhile; keep the first
+            entry = self._indexes.setdefault(user_id, entry)
+            self._indexes.move_to_end(user_id)
+            while len(self._indexes) > self.max_users:
+                self._indexes.popitem(last=False)
+        return entry.index
+
+    def stats(self) -> Dict[str, Any]:
+        """Loaded users and indexed signatures."""
+        with self._lock:
+            return {
+                "users": len(self._indexes),
+                "max_users": self.max_users,
+                "signatures": sum(len(entry.index) for entry in self._indexes.values()),
+                "threshold": self.threshold,
+                "num_perm": self.hasher.num_perm,
+            }
+
+
+# ============================================================================
+# Process-wide Index
+# ============================================================================
+
+_copy_duplicate_index: Optional[CopyDuplicateIndex] = None
+_copy_duplicate_index_lock = threading.Lock()
+
+
+def get_copy_duplicate_index() -> Optional[CopyDuplicateIndex]:
+    """
+    Get the process-wide duplicate index backed by the database.
+
+    Returns:
+        Shared CopyDuplicateIndex, or None when COPY_DEDUP_ENABLED is off
+    """
+    global _copy_duplicate_index
+    from app.core.config import settings
+
+    if not settings.copy_dedup_enabled:
+        return None
+    if _copy_duplicate_index is None:
+        with _copy_duplicate_index_lock:
+            if _copy_duplicate_index is None:
+                from app.infrastructure.repositories.copy_signature_repository import (
+                    CopySignatureRepository,
+                )
+
+                _copy_duplicate_index = CopyDuplicateIndex(
+                    CopySignatureRepository(),
+                    threshold=settings.copy_dedup_threshold,
+                    num_perm=settings.copy_dedup_num_perm,
+                    max_users=settings.copy_dedup_max_users,
+                )
+    return _copy_duplicate_index
+
+
+def reset_copy_duplicate_index() -> None:
+    """Drop the shared index (rebuilt from the store on next use)."""
+    global _copy_duplicate_index
+    with _copy_duplicate_index_lock:
+        _copy_duplicate_index = None
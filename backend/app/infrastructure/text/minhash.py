@@ -0,0 +1,283 @@
+"""
+MinHash Near-Duplicate Detection.
+
+MinHash signatures estimate the Jaccard similarity of two texts' shingle
+sets from a fixed number of hash minima; locality-sensitive hashing (LSH)
+splits each signature into bands so that only texts sharing a whole band
+are compared. Looking up a new text therefore touches a handful of
+buckets instead of the whole corpus.
+
+Signatures are num_perm unsigned 32-bit ints (512 bytes at the default
+128) and are stored as raw bytes.
+"""
+import re
+import threading
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+# Largest prime below 2**32; (a * x + b) % _PRIME never overflows uint64
+# for a, b, x < _PRIME
+_PRIME = np.uint64(4294967291)
+
+# Latin words, or single CJK characters
+_TOKEN_RE = re.compile(r"[a-z0-9]+|[\u3400-\u9fff]")
+
+
+def shingles(text: str, size: int = 3) -> Set[int]:
+    """Hashed word n-grams of a text.
+
+    Args:
+        text: Text to shingle (case and punctuation are ignored)
+        size: Tokens per shingle (texts shorter than this form one shingle)
+
+    Returns:
+        Set of 32-bit shingle hashes
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    if not tokens:
+        return set()
+    if len(tokens) < size:
+        return {zlib.crc32(" ".join(tokens).encode("utf-8"))}
+    return {
+        zlib.crc32(" ".join(tokens[i:i + size]).encode("utf-8"))
+        for i in range(len(tokens) - size + 1)
+    }
+
+
+def lsh_params(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """Choose (bands, rows) for an LSH index.
+
+    Pairs with similarity s collide in at least one band with probability
+    1 - (1 - s**rows)**bands, which rises steeply around
+    (1 / bands) ** (1 / rows). The split whose midpoint is closest to
+    (and at most) the threshold keeps false negatives rare.
+
+    Args:
+        num_perm: Signature length
+        threshold: Jaccard similarity that counts as a duplicate
+
+    Returns:
+        (bands, rows) with bands * rows <= num_perm
+    """
+    best = (num_perm, 1)
+    best_gap = None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        midpoint = (1.0 / bands) ** (1.0 / rows)
+        if midpoint > threshold:
+            break
+        gap = threshold - midpoint
+        if best_gap is None or gap < best_gap:
+            best, best_gap = (bands, rows), gap
+    return best
+
+
+class MinHasher:
+    """
+    Computes MinHash signatures with num_perm universal hash functions.
+
+    Hashers with the same num_perm and seed produce comparable signatures.
+
+    Example:
+        hasher = MinHasher()
+        a, b = hasher.signature("..."), hasher.signature("...")
+        MinHasher.similarity(a, b)  # ~ Jaccard similarity of the shingle sets
+    """
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        """
+        Initialize the hash functions.
+
+        Args:
+            num_perm: Signature length
+            shingle_size: Tokens per shingle
+            seed: RNG seed of the hash coefficients
+        """
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> "np.ndarray":
+        """
+        MinHash signature of a text.
+
+        Args:
+            text: Text to sign
+
+        Returns:
+            (num_perm,) uint32 array; all 0xFFFFFFFF for texts without tokens
+        """
+        hashes = np.fromiter(shingles(text, self.shingle_size), dtype=np.uint64)
+        if hashes.size == 0:
+            return np.full(self.num_perm, 0xFFFFFFFF, dtype=np.uint32)
+        hashes %= _PRIME
+        # (num_perm, n_shingles) in one broadcast, minimum per hash function
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+
+    @staticmethod
+    def similarity(a: "np.ndarray", b: "np.ndarray") -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        return float(np.count_nonzero(a == b)) / len(a)
+
+    @staticmethod
+    def to_bytes(signature: "np.ndarray") -> bytes:
+        """Compact storage form of a signature."""
+        return signature.astype("<u4").tobytes()
+
+    @staticmethod
+    def from_bytes(data: bytes) -> "np.ndarray":
+        """Inverse of to_bytes()."""
+        return np.frombuffer(data, dtype="<u4").astype(np.uint32)
+
+
+class LSHIndex:
+    """
+    Banded LSH index over MinHash signatures.
+
+    Each band of rows signature values is one bucket key, so near-duplicate
+    lookups compare a new signature only with entries sharing a bucket.
+    Thread-safe.
+
+    Attributes:
+        threshold: Estimated similarity at or above which entries match
+        bands: Number of bands
+        rows: Signature values per band
+    """
+
+    def __init__(self, num_perm: int = 128, threshold: float = 0.8):
+        """
+        Initialize an empty index.
+
+        Args:
+            num_perm: Signature length
+            threshold: Similarity that counts as a near-duplicate
+        """
+        self.num_perm = num_perm
+        self.threshold = threshold
+        self.bands, self.rows = lsh_params(num_perm, threshold)
+        self._buckets: List[Dict[bytes, Set[Hashable]]] = [defaultdict(set) for _ in range(self.bands)]
+        self._signatures: Dict[Hashable, "np.ndarray"] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._signatures
+
+    def _band_keys(self, signature: "np.ndarray") -> List[bytes]:
+        rows = self.rows
+        return [signature[i * rows:(i + 1) * rows].tobytes() for i in range(self.bands)]
+
+    def insert(self, key: Hashable, signature: "np.ndarray") -> None:
+        """Add (or replace) an entry."""
+        if len(signature) != self.num_perm:
+            raise ValueError(f"Signature has {len(signature)} values, expected {self.num_perm}")
+        with self._lock:
+            self._remove(key)
+            self._signatures[key] = signature
+            for band, band_key in zip(self._buckets, self._band_keys(signature)):
+                band[band_key].add(key)
+
+    def remove(self, key: Hashable) -> None:
+        """Remove an entry if present."""
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: Hashable) -> None:
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket = band.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del band[band_key]
+
+    def query(
+        self,
+        signature: "np.ndarray",
+        exclude: Iterable[Hashable] = (),
+    ) -> List[Tuple[Hashable, float]]:
+        """
+        Find near-duplicates of a signature.
+
+        Args:
+            signature: MinHash signature
+            exclude: Keys to leave out (e.g. the entry itself)
+
+        Returns:
+            (key, estimated similarity) pairs at or above the threshold,
+            most similar first
+        """
+        excluded = set(exclude)
+        with self._lock:
+            candidates: Set[Hashable] = set()
+            for band, band_key in zip(self._buckets, self._band_keys(signature)):
+                candidates |= band.get(band_key, set())
+            candidates -= excluded
+            if not candidates:
+                return []
+            keys = list(candidates)
+            stacked = np.stack([self._signatures[key] for key in keys])
+
+        similarities = (stacked == signature).mean(axis=1)
+        matches = [
+            (key, round(float(s), 3)) for key, s in zip(keys, similarities) if s >= self.threshold
+        ]
+        matches.sort(key=lambda match: -match[1])
+        return matches
+
+    def clusters(self) -> List[List[Hashable]]:
+        """
+        Group entries into near-duplicate clusters.
+
+        Candidate pairs come from shared buckets and are verified against
+        the threshold; clusters are the connected components (union-find).
+
+        Returns:
+            Clusters of two or more keys, largest first
+        """
+        with self._lock:
+            signatures = dict(self._signatures)
+            buckets = [list(bucket) for band in self._buckets for bucket in band.values() if len(bucket) > 1]
+
+        parent: Dict[Hashable, Hashable] = {}
+
+        def find(key: Hashable) -> Hashable:
+            root = key
+            while parent[root] != root:
+                root = parent[root]
+            while key != root:
+                parent[key], key = root, parent[key]
+            return root
+
+        for bucket in buckets:
+            stacked = np.stack([signatures[key] for key in bucket])
+            for i in range(len(bucket) - 1):
+                # One row of the bucket's pairwise similarity matrix at a time
+                similar = (stacked[i + 1:] == stacked[i]).mean(axis=1) >= self.threshold
+                for j in np.nonzero(similar)[0]:
+                    a, b = bucket[i], bucket[i + 1 + j]
+                    parent.setdefault(a, a)
+                    parent.setdefault(b, b)
+                    root_a, root_b = find(a), find(b)
+                    if root_a != root_b:
+                        parent[root_a] = root_b
+
+        groups: Dict[Hashable, List[Hashable]] = defaultdict(list)
+        for key in parent:
+            groups[find(key)].append(key)
+        return sorted((g for g in groups.values() if len(g) > 1), key=len, reverse=True)
+
+    def signature_of(self, key: Hashable) -> Optional["np.ndarray"]:
+        """Stored signature of an entry, or None."""
+        return self._signatures.get(key)
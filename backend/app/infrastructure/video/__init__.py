@@ -0,0 +1,43 @@
+"""
+Video Infrastructure Package.
+
+Contains local video rendering (slideshow fallback) and tracking of
+asynchronous jobs on hosted video APIs.
+"""
+from app.infrastructure.video.jobs import (
+    InMemoryVideoJobStore,
+    VideoJob,
+    VideoJobError,
+    VideoJobManager,
+    VideoJobProvider,
+    VideoJobStatus,
+    VideoJobStore,
+    get_video_job_manager,
+    init_video_job_manager,
+    shutdown_video_job_manager,
+)
+from app.infrastructure.video.slideshow import (
+    LocalSlideshowProvider,
+    SlideshowRenderError,
+    create_slideshow_provider,
+    get_slideshow_executor,
+    shutdown_slideshow_executor,
+)
+
+__all__ = [
+    "InMemoryVideoJobStore",
+    "VideoJob",
+    "VideoJobError",
+    "VideoJobManager",
+    "VideoJobProvider",
+    "VideoJobStatus",
+    "VideoJobStore",
+    "get_video_job_manager",
+    "init_video_job_manager",
+    "shutdown_video_job_manager",
+    "LocalSlideshowProvider",
+    "SlideshowRenderError",
+    "create_slideshow_provider",
+    "get_slideshow_executor",
+    "shutdown_slideshow_executor",
+]
@@ -0,0 +1,668 @@
+"""
+Asynchronous Video Jobs.
+
+Hosted video APIs are submit-then-poll and can take minutes per render.
+Instead of holding a coroutine (and its DB session) open for the whole
+render, a workflow submits a job and parks. A single VideoJobManager
+drives every outstanding job from one scheduler loop: polls are spaced
+with exponential backoff plus jitter, providers may short-circuit the wait
+through a webhook, and the manager calls back into the orchestrator once
+the job reaches a terminal state.
+"""
+import asyncio
+import hashlib
+import heapq
+import hmac
+import itertools
+import logging
+import random
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, replace
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Job states. Providers report pending/succeeded/failed; timed_out is ours.
+JOB_PENDING = "pending"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_TIMED_OUT = "timed_out"
+TERMINAL_STATES = frozenset({JOB_SUCCEEDED, JOB_FAILED, JOB_TIMED_OUT})
+
+# Provider status strings accepted in poll responses and webhooks
+_STATE_ALIASES = {
+    "queued": JOB_PENDING,
+    "pending": JOB_PENDING,
+    "running": JOB_PENDING,
+    "processing": JOB_PENDING,
+    "in_progress": JOB_PENDING,
+    "succeeded": JOB_SUCCEEDED,
+    "success": JOB_SUCCEEDED,
+    "completed": JOB_SUCCEEDED,
+    "done": JOB_SUCCEEDED,
+    "failed": JOB_FAILED,
+    "error": JOB_FAILED,
+    "cancelled": JOB_FAILED,
+    "canceled": JOB_FAILED,
+}
+
+
+class VideoJobError(Exception):
+    """Raised when a video job cannot be submitted or tracked."""
+    pass
+
+
+def normalize_state(value: Optional[str]) -> str:
+    """Map a provider status string onto a job state.
+
+    Args:
+        value: Provider status (case-insensitive)
+
+    Returns:
+        One of the JOB_* states
+
+    Raises:
+        VideoJobError: If the status is unknown
+    """
+    state = _STATE_ALIASES.get(str(value or "").strip().lower())
+    if state is None:
+        raise VideoJobError(f"Unknown video job status: {value!r}")
+    return state
+
+
+@dataclass
+class VideoJobStatus:
+    """Provider-reported status of a job."""
+
+    state: str
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.state in TERMINAL_STATES
+
+
+@dataclass
+class VideoJob:
+    """A submitted video render and the workflow parked on it.
+
+    Attributes:
+        job_id: Our identifier (also used in webhook URLs)
+        provider_job_id: Identifier returned by the provider's submit call
+        workflow_id: Workflow waiting for the video
+        state: One of the JOB_* states
+        submitted_at: Epoch seconds of submission
+        deadline_at: Epoch seconds after which the job times out
+        attempts: Polls made so far
+        result: Provider result (url, provider, duration, ...) on success
+        error: Failure reason
+        context: Checkpoint the orchestrator needs to resume the workflow
+    """
+
+    job_id: str
+    provider_job_id: str
+    workflow_id: str
+    submitted_at: float
+    deadline_at: float
+    state: str = JOB_PENDING
+    attempts: int = 0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    context: Dict[str, Any] = field(default_factory=dict)
+    completed_at: Optional[float] = None
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.state in TERMINAL_STATES
+
+
+class VideoJobProvider(ABC):
+    """A video API with submit/poll semantics."""
+
+    name = "video"
+
+    @abstractmethod
+    async def submit(
+        self,
+        prompt: str,
+        images: List[str],
+        duration: int,
+        callback_url: Optional[str] = None,
+    ) -> str:
+        """Start a render.
+
+        Args:
+            prompt: Generation prompt
+            images: Source image URLs
+            duration: Target duration in seconds
+            callback_url: Webhook the provider should call on completion
+
+        Returns:
+            Provider job identifier
+        """
+
+    @abstractmethod
+    async def poll(self, provider_job_id: str) -> VideoJobStatus:
+        """Fetch the current status of a render."""
+
+    def parse_webhook(self, payload: Dict[str, Any]) -> VideoJobStatus:
+        """Translate a webhook body into a status.
+
+        The default accepts ``{"status": ..., "result": {...}, "error": ...}``
+        and also takes a top-level ``url`` as the result. Providers with
+        other payloads override this.
+
+        Raises:
+            VideoJobError: If the payload carries no recognizable status
+        """
+        state = normalize_state(payload.get("status") or payload.get("state"))
+        result = payload.get("result") or payload.get("output")
+        if result is None and payload.get("url"):
+            result = {"url": payload["url"]}
+        if isinstance(result, dict):
+            result = {"provider": self.name, **result}
+        return VideoJobStatus(state=state, result=result, error=payload.get("error"))
+
+
+def compute_backoff(
+    attempt: int,
+    initial: float,
+    maximum: float,
+    multiplier: float = 2.0,
+    jitter: float = 0.2,
+    rand: Callable[[], float] = random.random,
+) -> float:
+    """Delay before the next poll.
+
+    Exponential growth capped at ``maximum``, then reduced by up to
+    ``jitter`` (a fraction) so jobs submitted together do not poll in
+    lockstep.
+
+    Args:
+        attempt: Polls already made (0 for the first poll)
+        initial: Delay before the first poll in seconds
+        maximum: Upper bound on the delay in seconds
+        multiplier: Growth factor per attempt
+        jitter: Fraction of the delay to randomize, 0..1
+        rand: Source of uniform [0, 1) numbers
+
+    Returns:
+        Delay in seconds
+    """
+    base = min(maximum, initial * (multiplier ** attempt))
+    return base * (1.0 - min(max(jitter, 0.0), 1.0) * rand())
+
+
+class VideoJobStore(ABC):
+    """Persistence for jobs, so parked workflows survive restarts."""
+
+    @abstractmethod
+    async def save(self, job: VideoJob) -> bool:
+        """Insert or update a job.
+
+        Writes are a compare-and-set on the stored state: a job that is
+        already terminal in the store is never overwritten. Several workers
+        may track the same job, and only the one whose save moves it to a
+        terminal state gets True back, so exactly one of them resumes the
+        workflow.
+
+        Returns:
+            True if the job was written, False if it had already finished
+        """
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[VideoJob]:
+        """Load a job by id."""
+
+    @abstractmethod
+    async def list_active(self) -> List[VideoJob]:
+        """Load all jobs that have not reached a terminal state."""
+
+
+class InMemoryVideoJobStore(VideoJobStore):
+    """Process-local store for development and tests.
+
+    Keeps copies, like a database would, so managers sharing one store do
+    not see each other's in-memory updates.
+    """
+
+    def __init__(self):
+        self._jobs: Dict[str, VideoJob] = {}
+
+    async def save(self, job: VideoJob) -> bool:
+        stored = self._jobs.get(job.job_id)
+        if stored is not None and stored.is_terminal:
+            return False
+        self._jobs[job.job_id] = replace(job, context=dict(job.context))
+        return True
+
+    async def get(self, job_id: str) -> Optional[VideoJob]:
+        job = self._jobs.get(job_id)
+        return replace(job, context=dict(job.context)) if job is not None else None
+
+    async def list_active(self) -> List[VideoJob]:
+        return [
+            replace(job, context=dict(job.context))
+            for job in self._jobs.values()
+            if not job.is_terminal
+        ]
+
+
+OnJobComplete = Callable[[VideoJob], Awaitable[None]]
+
+
+class VideoJobManager:
+    """Submit video jobs and drive them to completion.
+
+    All pending jobs share one scheduler task ordered by next poll time,
+    so a worker can track hundreds of renders with a handful of in-flight
+    HTTP calls (bounded by max_concurrent_polls). Completion, whether
+    observed by polling, a webhook or the deadline, is recorded once and
+    handed to ``on_complete``.
+
+    Example:
+        manager = VideoJobManager(provider, store, on_complete=resume)
+        await manager.start()
+        job = await manager.submit("prompt", images, 15, workflow_id, context)
+    """
+
+    def __init__(
+        self,
+        provider: VideoJobProvider,
+        store: VideoJobStore,
+        on_complete: Optional[OnJobComplete] = None,
+        poll_initial_seconds: float = 5.0,
+        poll_max_seconds: float = 60.0,
+        poll_multiplier: float = 2.0,
+        poll_jitter: float = 0.2,
+        job_timeout_seconds: float = 900.0,
+        max_concurrent_polls: int = 32,
+        webhook_base_url: Optional[str] = None,
+        webhook_secret: str = "",
+        clock: Callable[[], float] = time.time,
+        rand: Callable[[], float] = random.random,
+    ):
+        """Initialize the manager.
+
+        Args:
+            provider: Video API client
+            store: Job persistence
+            on_complete: Coroutine called with each job that finishes
+            poll_initial_seconds: Delay before the first poll
+            poll_max_seconds: Cap on the delay between polls
+            poll_multiplier: Backoff growth factor
+            poll_jitter: Fraction of each delay to randomize
+            job_timeout_seconds: Time after which a job is given up
+            max_concurrent_polls: Upper bound on simultaneous poll calls
+            webhook_base_url: Public URL of the webhook route; None disables
+                webhooks and relies on polling alone
+            webhook_secret: Key used to sign webhook tokens
+            clock: Time source in epoch seconds
+            rand: Source of uniform [0, 1) numbers for jitter
+        """
+        self.provider = provider
+        self.store = store
+        self.on_complete = on_complete
+        self.poll_initial_seconds = poll_initial_seconds
+        self.poll_max_seconds = poll_max_seconds
+        self.poll_multiplier = poll_multiplier
+        self.poll_jitter = poll_jitter
+        self.job_timeout_seconds = job_timeout_seconds
+        self.webhook_base_url = webhook_base_url.rstrip("/") if webhook_base_url else None
+        self._webhook_key = webhook_secret.encode("utf-8")
+        self._clock = clock
+        self._rand = rand
+
+        self._jobs: Dict[str, VideoJob] = {}
+        self._schedule: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._poll_slots = asyncio.Semaphore(max(1, max_concurrent_polls))
+        self._tasks: Set[asyncio.Task] = set()
+        self._scheduler: Optional[asyncio.Task] = None
+
+        self._polls = 0
+        self._poll_errors = 0
+        self._webhooks = 0
+        self._completed = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Reload unfinished jobs and start the scheduler."""
+        if self._scheduler is not None:
+            return
+        for job in await self.store.list_active():
+            self._jobs[job.job_id] = job
+            self._schedule_poll(job)
+        if self._jobs:
+            logger.info(f"Resumed tracking {len(self._jobs)} video jobs")
+        self._scheduler = asyncio.create_task(self._run_scheduler())
+
+    async def stop(self) -> None:
+        """Stop polling. Unfinished jobs stay in the store for next start."""
+        tasks = list(self._tasks)
+        if self._scheduler is not None:
+            tasks.append(self._scheduler)
+            self._scheduler = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def submit(
+        self,
+        prompt: str,
+        images: List[str],
+        duration: int,
+        workflow_id: str,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> VideoJob:
+        """Submit a render and start tracking it.
+
+        Args:
+            prompt: Generation prompt
+            images: Source image URLs
+            duration: Target duration in seconds
+            workflow_id: Workflow to resume on completion
+            context: JSON-serializable checkpoint passed back on completion
+
+        Returns:
+            The tracked job
+
+        Raises:
+            VideoJobError: If the provider rejects the submission
+        """
+        job_id = str(uuid.uuid4())
+        try:
+            provider_job_id = await self.provider.submit(
+                prompt=prompt,
+                images=images,
+                duration=duration,
+                callback_url=self.callback_url(job_id),
+            )
+        except Exception as e:
+            raise VideoJobError(f"Failed to submit video job: {e}") from e
+
+        now = self._clock()
+        job = VideoJob(
+            job_id=job_id,
+            provider_job_id=provider_job_id,
+            workflow_id=workflow_id,
+            submitted_at=now,
+            deadline_at=now + self.job_timeout_seconds,
+            context=context or {},
+        )
+        await self.store.save(job)
+        self._jobs[job_id] = job
+        self._schedule_poll(job)
+        logger.info(
+            f"[{workflow_id}] Submitted video job {job_id} "
+            f"(provider job {provider_job_id})"
+        )
+        return job
+
+    async def get(self, job_id: str) -> Optional[VideoJob]:
+        """Look up a job, tracked or persisted."""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        return await self.store.get(job_id)
+
+    def callback_url(self, job_id: str) -> Optional[str]:
+        """Webhook URL handed to the provider for a job."""
+        if not self.webhook_base_url:
+            return None
+        return f"{self.webhook_base_url}/{job_id}/webhook?token={self.webhook_token(job_id)}"
+
+    def webhook_token(self, job_id: str) -> str:
+        """HMAC token that authenticates webhook calls for one job."""
+        return hmac.new(self._webhook_key, job_id.encode("utf-8"), hashlib.sha256).hexdigest()
+
+    def verify_webhook_token(self, job_id: str, token: Optional[str]) -> bool:
+        """Constant-time check of a webhook token."""
+        return bool(token) and hmac.compare_digest(self.webhook_token(job_id), token)
+
+    async def handle_webhook(self, job_id: str, payload: Dict[str, Any]) -> Optional[VideoJob]:
+        """Apply a provider webhook.
+
+        Non-terminal statuses are acknowledged and otherwise ignored;
+        polling continues. Repeated deliveries of a finished job are no-ops.
+
+        Args:
+            job_id: Job the webhook belongs to
+            payload: Parsed webhook body
+
+        Returns:
+            The job, or None if it is unknown
+
+        Raises:
+            VideoJobError: If the payload cannot be parsed
+        """
+        job = await self.get(job_id)
+        if job is None:
+            return None
+        self._webhooks += 1
+        status = self.provider.parse_webhook(payload)
+        if status.is_terminal and not job.is_terminal:
+            await self._finish(job, status)
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring."""
+        return {
+            "tracked": sum(1 for job in self._jobs.values() if not job.is_terminal),
+            "polls": self._polls,
+            "poll_errors": self._poll_errors,
+            "webhooks": self._webhooks,
+            "completed": self._completed,
+        }
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def _schedule_poll(self, job: VideoJob) -> None:
+        delay = compute_backoff(
+            job.attempts,
+            self.poll_initial_seconds,
+            self.poll_max_seconds,
+            self.poll_multiplier,
+            self.poll_jitter,
+            self._rand,
+        )
+        due = min(self._clock() + delay, job.deadline_at)
+        heapq.heappush(self._schedule, (due, next(self._seq), job.job_id))
+        self._wakeup.set()
+
+    async def _run_scheduler(self) -> None:
+        while True:
+            self._wakeup.clear()
+            now = self._clock()
+            while self._schedule and self._schedule[0][0] <= now:
+                _, _, job_id = heapq.heappop(self._schedule)
+                job = self._jobs.get(job_id)
+                if job is not None and not job.is_terminal:
+                    self._spawn(self._poll(job))
+
+            timeout = self._schedule[0][0] - now if self._schedule else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _spawn(self, coro: Awaitable[None]) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _poll(self, job: VideoJob) -> None:
+        async with self._poll_slots:
+            if job.is_terminal:
+                return
+            self._polls += 1
+            job.attempts += 1
+            try:
+                status = await self.provider.poll(job.provider_job_id)
+            except Exception as e:
+                # Transient provider errors are retried on the backoff schedule
+                self._poll_errors += 1
+                logger.warning(f"Polling video job {job.job_id} failed: {e}")
+                status = VideoJobStatus(state=JOB_PENDING)
+
+        if job.is_terminal:
+            return
+        if status.is_terminal:
+            await self._finish(job, status)
+        elif self._clock() >= job.deadline_at:
+            await self._finish(
+                job,
+                VideoJobStatus(
+                    state=JOB_TIMED_OUT,
+                    error=f"No result after {self.job_timeout_seconds:.0f}s",
+                ),
+            )
+        elif await self._save_attempts(job):
+            self._schedule_poll(job)
+
+    async def _save_attempts(self, job: VideoJob) -> bool:
+        """Persist the poll count so backoff resumes where it was after a restart.
+
+        Returns:
+            False if another worker already finished the job, which this
+            worker then stops tracking
+        """
+        try:
+            saved = await self.store.save(job)
+        except Exception as e:
+            logger.warning(f"Failed to persist attempts of video job {job.job_id}: {e}")
+            return True
+        if not saved:
+            self._jobs.pop(job.job_id, None)
+            logger.info(
+                f"[{job.workflow_id}] Video job {job.job_id} was already "
+                f"completed by another worker"
+            )
+        return saved
+
+    async def _finish(self, job: VideoJob, status: VideoJobStatus) -> None:
+        """Record a terminal state once and hand the job to on_complete.
+
+        The store save is the claim: when another worker (or a webhook
+        delivered to another process) finished the job first, this one
+        stops tracking it without resuming the workflow again.
+        """
+        if job.is_terminal:
+            return
+        job.state = status.state
+        job.result = status.result
+        job.error = status.error
+        job.completed_at = self._clock()
+        self._jobs.pop(job.job_id, None)
+
+        try:
+            claimed = await self.store.save(job)
+        except Exception as e:
+            # Resume anyway; the workflow should not hang on a store outage
+            logger.error(f"Failed to persist video job {job.job_id}: {e}", exc_info=True)
+            claimed = True
+        if not claimed:
+            logger.info(
+                f"[{job.workflow_id}] Video job {job.job_id} was already "
+                f"completed by another worker"
+            )
+            return
+
+        self._completed += 1
+        logger.info(
+            f"[{job.workflow_id}] Video job {job.job_id} {job.state} "
+            f"after {job.attempts} polls ({job.completed_at - job.submitted_at:.0f}s)"
+        )
+        if self.on_complete is not None:
+            self._spawn(self._notify(job))
+
+    async def _notify(self, job: VideoJob) -> None:
+        try:
+            await self.on_complete(job)
+        except Exception as e:
+            logger.error(
+                f"[{job.workflow_id}] Resuming after video job {job.job_id} failed: {e}",
+                exc_info=True,
+            )
+
+
+# ---------------------------------------------------------------------------
+# Module singleton
+# ---------------------------------------------------------------------------
+
+_manager: Optional[VideoJobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_video_job_manager() -> Optional[VideoJobManager]:
+    """The running job manager, or None when async video jobs are disabled."""
+    return _manager
+
+
+def init_video_job_manager(
+    provider: Optional[VideoJobProvider],
+    on_complete: OnJobComplete,
+    store: Optional[VideoJobStore] = None,
+) -> Optional[VideoJobManager]:
+    """Create the shared manager from settings.
+
+    Args:
+        provider: Video API client; None leaves async jobs disabled
+        on_complete: Coroutine resuming the workflow of a finished job
+        store: Job persistence (default: the video_jobs table)
+
+    Returns:
+        The manager (not yet started), or None if disabled
+    """
+    global _manager
+    if provider is None:
+        return None
+
+    from app.core.config import settings
+
+    if store is None:
+        from app.infrastructure.repositories.video_job_repository import VideoJobRepository
+
+        store = VideoJobRepository()
+
+    with _manager_lock:
+        if _manager is None:
+            _manager = VideoJobManager(
+                provider=provider,
+                store=store,
+                on_complete=on_complete,
+                poll_initial_seconds=settings.video_job_poll_initial_seconds,
+                poll_max_seconds=settings.video_job_poll_max_seconds,
+                poll_multiplier=settings.video_job_poll_multiplier,
+                poll_jitter=settings.video_job_poll_jitter,
+                job_timeout_seconds=settings.video_job_timeout_seconds,
+                max_concurrent_polls=settings.video_job_max_concurrent_polls,
+                webhook_base_url=settings.video_job_webhook_base_url or None,
+                webhook_secret=settings.video_job_webhook_secret or settings.secret_key,
+            )
+        return _manager
+
+
+async def shutdown_video_job_manager() -> None:
+    """Stop the shared manager."""
+    global _manager
+    with _manager_lock:
+        manager, _manager = _manager, None
+    if manager is not None:
+        await manager.stop()
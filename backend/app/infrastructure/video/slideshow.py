@@ -0,0 +1,603 @@
+"""
+Local Slideshow Renderer.
+
+CPU-only fallback video: composes package images into an MP4 (via an
+ffmpeg binary, when installed) or an animated WebP (Pillow only) with
+fade transitions and caption overlays, plus a JPEG poster frame.
+
+Slides and fade frames are rendered with Pillow/NumPy in a process pool.
+For MP4, raw frames are streamed to ffmpeg's stdin as they are produced,
+so at most one slide and a couple of transitions are held in memory.
+Pillow's WebP encoder takes every frame up front, so the WebP fallback is
+capped instead: at most WEBP_MAX_FRAMES frames (fades get fewer, longer
+steps) no larger than WEBP_MAX_EDGE pixels, about 100 MB of frames.
+"""
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import shutil
+import tempfile
+import textwrap
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from PIL import Image, ImageDraw, ImageFont, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from app.infrastructure.storage.fetch import fetch_image_bytes
+
+
+logger = logging.getLogger(__name__)
+
+
+Size = Tuple[int, int]
+
+# Slide background when an image cannot be loaded (title card)
+BACKGROUND_RGB = (24, 24, 27)
+
+# Bounds on the animated WebP fallback, whose frames are all held in memory
+WEBP_MAX_FRAMES = 48
+WEBP_MAX_EDGE = 960
+
+
+# ============================================================================
+# Frame Rendering (runs in worker processes; keep top-level and picklable)
+# ============================================================================
+
+def _load_font(size: int):
+    """Scalable default font, falling back to the bitmap font."""
+    try:
+        return ImageFont.load_default(size=size)
+    except (TypeError, OSError):
+        return ImageFont.load_default()
+
+
+def _draw_caption(image: "Image.Image", caption: str) -> None:
+    """Draw a caption on a translucent band at the bottom of the image."""
+    width, height = image.size
+    font_size = max(14, height // 22)
+    font = _load_font(font_size)
+    chars_per_line = max(10, int(width * 0.9 / (font_size * 0.55)))
+    lines = textwrap.wrap(caption, width=chars_per_line, max_lines=2, placeholder="...")
+    if not lines:
+        return
+
+    line_height = int(font_size * 1.3)
+    padding = font_size // 2
+    band_top = height - len(lines) * line_height - 2 * padding
+
+    overlay = Image.new("RGBA", image.size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(overlay)
+    draw.rectangle((0, band_top, width, height), fill=(0, 0, 0, 140))
+    for index, line in enumerate(lines):
+        draw.text(
+            (width // 2, band_top + padding + index * line_height),
+            line,
+            font=font,
+            fill=(255, 255, 255, 255),
+            anchor="ma",
+        )
+    image.paste(overlay, (0, 0), overlay)
+
+
+def render_slide(image_bytes: Optional[bytes], size: Size, caption: str = "") -> bytes:
+    """Render one slide as raw RGB24.
+
+    The image is scaled to cover the frame and center-cropped. Without an
+    image, a plain title card is rendered.
+
+    Args:
+        image_bytes: Encoded source image, or None for a title card
+        size: (width, height) of the video
+        caption: Caption overlay text (empty for none)
+
+    Returns:
+        width * height * 3 bytes of RGB24 pixels
+    """
+    if image_bytes is None:
+        slide = Image.new("RGB", size, BACKGROUND_RGB)
+    else:
+        with Image.open(io.BytesIO(image_bytes)) as source:
+            source = ImageOps.exif_transpose(source).convert("RGB")
+            slide = ImageOps.fit(source, size, Image.Resampling.LANCZOS)
+    if caption:
+        _draw_caption(slide, caption)
+    return slide.tobytes()
+
+
+def render_fade(current: bytes, following: bytes, size: Size, steps: int) -> List[bytes]:
+    """Render the intermediate frames of a cross-fade.
+
+    Args:
+        current: Outgoing slide (raw RGB24)
+        following: Incoming slide (raw RGB24)
+        size: (width, height)
+        steps: Number of intermediate frames
+
+    Returns:
+        Raw RGB24 frames, excluding both end slides
+    """
+    frames = []
+    if NUMPY_AVAILABLE:
+        a = np.frombuffer(current, dtype=np.uint8).astype(np.uint16)
+        b = np.frombuffer(following, dtype=np.uint8).astype(np.uint16)
+        for step in range(1, steps + 1):
+            weight = (256 * step) // (steps + 1)
+            frames.append(((a * (256 - weight) + b * weight) >> 8).astype(np.uint8).tobytes())
+    else:
+        a = Image.frombytes("RGB", size, current)
+        b = Image.frombytes("RGB", size, following)
+        for step in range(1, steps + 1):
+            frames.append(Image.blend(a, b, step / (steps + 1)).tobytes())
+    return frames
+
+
+def encode_poster(frame: bytes, size: Size, quality: int = 85) -> bytes:
+    """Encode a raw RGB24 frame as a JPEG poster."""
+    buffer = io.BytesIO()
+    Image.frombytes("RGB", size, frame).save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def webp_fade_steps(slide_count: int, fade_steps: int, max_frames: int = WEBP_MAX_FRAMES) -> int:
+    """Fade frames per transition that keep an animated WebP within max_frames.
+
+    Args:
+        slide_count: Number of slides
+        fade_steps: Requested intermediate frames per transition
+        max_frames: Upper bound on held slides plus fade frames
+
+    Returns:
+        Fade frames per transition (0 for hard cuts)
+    """
+    if slide_count < 2:
+        return 0
+    return max(0, min(fade_steps, (max_frames - slide_count) // (slide_count - 1)))
+
+
+def webp_size(size: Size, max_edge: int = WEBP_MAX_EDGE) -> Size:
+    """Scale (width, height) down so the longer edge is at most max_edge."""
+    width, height = size
+    scale = min(1.0, max_edge / max(width, height))
+    return max(2, int(width * scale) // 2 * 2), max(2, int(height * scale) // 2 * 2)
+
+
+def encode_webp_animation(
+    slides: List[bytes],
+    size: Size,
+    hold_ms: int,
+    fade_steps: int,
+    frame_ms: int,
+    quality: int = 75,
+) -> bytes:
+    """Encode slides with cross-fades as an animated WebP.
+
+    Held slides are a single frame with a long duration, so only one
+    frame per slide plus the fade frames are kept. Fades are thinned to
+    webp_fade_steps() frames, each shown longer, since every frame is in
+    memory until the encoder runs.
+
+    Args:
+        slides: Raw RGB24 slides
+        size: (width, height)
+        hold_ms: Display time of each slide
+        fade_steps: Intermediate frames per transition (0 for hard cuts)
+        frame_ms: Duration of each fade frame
+
+    Returns:
+        Encoded animated WebP
+    """
+    capped = webp_fade_steps(len(slides), fade_steps)
+    if capped:
+        frame_ms = frame_ms * fade_steps // capped
+    fade_steps = capped
+
+    frames: List["Image.Image"] = []
+    durations: List[int] = []
+    for index, slide in enumerate(slides):
+        frames.append(Image.frombytes("RGB", size, slide))
+        durations.append(hold_ms)
+        if fade_steps and index + 1 < len(slides):
+            for frame in render_fade(slide, slides[index + 1], size, fade_steps):
+                frames.append(Image.frombytes("RGB", size, frame))
+                durations.append(frame_ms)
+
+    buffer = io.BytesIO()
+    frames[0].save(
+        buffer,
+        format="WEBP",
+        save_all=True,
+        append_images=frames[1:],
+        duration=durations,
+        loop=0,
+        quality=quality,
+        method=4,
+    )
+    return buffer.getvalue()
+
+
+# ============================================================================
+# Process Pool
+# ============================================================================
+
+_slideshow_executor: Optional[ProcessPoolExecutor] = None
+_slideshow_executor_lock = threading.Lock()
+
+
+def get_slideshow_executor() -> ProcessPoolExecutor:
+    """Get the shared process pool for slideshow rendering.
+
+    Sized by settings.slideshow_workers.
+
+    Returns:
+        Process-wide ProcessPoolExecutor
+    """
+    global _slideshow_executor
+    if _slideshow_executor is None:
+        with _slideshow_executor_lock:
+            if _slideshow_executor is None:
+                from app.core.config import settings
+                _slideshow_executor = ProcessPoolExecutor(
+                    max_workers=settings.slideshow_workers,
+                )
+    return _slideshow_executor
+
+
+def shutdown_slideshow_executor(wait: bool = True) -> None:
+    """Shut down the shared process pool (recreated on next use)."""
+    global _slideshow_executor
+    with _slideshow_executor_lock:
+        executor, _slideshow_executor = _slideshow_executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# ============================================================================
+# Slideshow Provider
+# ============================================================================
+
+class SlideshowRenderError(Exception):
+    """Raised when a slideshow cannot be rendered or stored."""
+    pass
+
+
+class LocalSlideshowProvider:
+    """Render slideshow videos locally and store them in object storage.
+
+    Implements the slideshow provider contract used by VideoTools
+    (``create(images, captions, duration, transition)``).
+
+    Example:
+        provider = LocalSlideshowProvider(storage)
+        result = await provider.create(image_urls, ["Summer sale"], duration=15)
+        # {"url": ".../videos/ab/ab12...mp4", "poster_url": "...", ...}
+    """
+
+    FORMAT_MIME_TYPES = {"mp4": "video/mp4", "webp": "image/webp"}
+
+    # Fade frames rendered ahead of the encoder
+    PREFETCH_TRANSITIONS = 2
+
+    def __init__(
+        self,
+        storage,
+        width: int = 1280,
+        height: int = 720,
+        fps: int = 24,
+        transition_seconds: float = 0.5,
+        output_format: str = "auto",
+        ffmpeg_path: str = "ffmpeg",
+        allowed_domains: Optional[Iterable[str]] = None,
+        executor: Optional[ProcessPoolExecutor] = None,
+        fetch_timeout: int = 30,
+    ):
+        """Initialize the provider.
+
+        Args:
+            storage: MinIOClient / LocalStorageClient for sources and output
+            width: Video width in pixels (rounded down to even)
+            height: Video height in pixels (rounded down to even)
+            fps: Frames per second
+            transition_seconds: Length of each fade
+            output_format: 'mp4', 'webp', or 'auto' (mp4 when ffmpeg exists)
+            ffmpeg_path: ffmpeg executable name or path
+            allowed_domains: Hosts external images may be fetched from
+            executor: Process pool for rendering (default: shared pool)
+            fetch_timeout: Timeout in seconds for fetching external images
+        """
+        self.storage = storage
+        self.size: Size = (max(2, width - width % 2), max(2, height - height % 2))
+        self.fps = max(1, fps)
+        self.transition_seconds = max(0.0, transition_seconds)
+        self.output_format = output_format
+        self.ffmpeg_path = ffmpeg_path
+        self.allowed_domains = set(allowed_domains or ())
+        self._executor = executor
+        self.fetch_timeout = fetch_timeout
+
+    @property
+    def format(self) -> str:
+        """Resolved output format ('mp4' or 'webp')."""
+        if self.output_format in self.FORMAT_MIME_TYPES:
+            return self.output_format
+        return "mp4" if shutil.which(self.ffmpeg_path) else "webp"
+
+    async def create(
+        self,
+        images: List[str],
+        captions: List[str],
+        duration: int,
+        transition: str = "fade",
+    ) -> Dict[str, Any]:
+        """Render, encode and store a slideshow.
+
+        Args:
+            images: Image URLs (unfetchable ones are skipped)
+            captions: One caption per image, or a single caption for all
+            duration: Total duration in seconds
+            transition: 'fade' for cross-fades; anything else cuts
+
+        Returns:
+            Slideshow result with url, poster_url and render metadata
+
+        Raises:
+            SlideshowRenderError: If encoding or storing fails
+        """
+        if not PIL_AVAILABLE:
+            raise SlideshowRenderError("Pillow is required for slideshow rendering")
+
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        executor = self._executor or get_slideshow_executor()
+        fmt = self.format
+        size = self.size if fmt == "mp4" else webp_size(self.size)
+
+        sources = await asyncio.gather(*(self._fetch(url) for url in images))
+        loaded = [data for data in sources if data is not None]
+        slide_captions = self._captions_for(captions, max(1, len(loaded)))
+
+        # Render slides in parallel; an empty package still gets a title card
+        slides = await asyncio.gather(*(
+            loop.run_in_executor(executor, render_slide, data, size, caption)
+            for data, caption in zip(loaded or [None], slide_captions)
+        ))
+
+        fade_steps = int(round(self.transition_seconds * self.fps)) if transition == "fade" else 0
+        if len(slides) < 2:
+            fade_steps = 0
+        total_frames = max(len(slides), int(duration * self.fps))
+        hold_frames = max(1, (total_frames - fade_steps * (len(slides) - 1)) // len(slides))
+
+        with tempfile.TemporaryDirectory(prefix="slideshow-") as workdir:
+            output_path = os.path.join(workdir, f"slideshow.{fmt}")
+            if fmt == "mp4":
+                frame_count = await self._encode_mp4(
+                    slides, hold_frames, fade_steps, output_path, executor
+                )
+            else:
+                data = await loop.run_in_executor(
+                    executor,
+                    encode_webp_animation,
+                    slides,
+                    size,
+                    hold_frames * 1000 // self.fps,
+                    fade_steps,
+                    max(1, 1000 // self.fps),
+                )
+                with open(output_path, "wb") as f:
+                    f.write(data)
+                frame_count = len(slides) + webp_fade_steps(len(slides), fade_steps) * (len(slides) - 1)
+
+            poster = await loop.run_in_executor(executor, encode_poster, slides[0], size)
+            video_url = await self._store_file(output_path, self.FORMAT_MIME_TYPES[fmt])
+            poster_url = await self._store_bytes(poster, "image/jpeg")
+
+        render_ms = int((time.perf_counter() - started) * 1000)
+        logger.info(
+            f"Rendered {fmt} slideshow: {len(slides)} slides, "
+            f"{frame_count} frames in {render_ms}ms"
+        )
+
+        return {
+            "url": video_url,
+            "poster_url": poster_url,
+            "provider": "slideshow",
+            "duration": duration,
+            "images_count": len(loaded),
+            "transition": transition,
+            "width": size[0],
+            "height": size[1],
+            "metadata": {
+                "format": fmt,
+                "fps": self.fps,
+                "frames": frame_count,
+                "poster_url": poster_url,
+                "images": images,
+                "captions": captions,
+                "render_ms": render_ms,
+            },
+        }
+
+    async def _fetch(self, url: str) -> Optional[bytes]:
+        """Fetch a source image, or None if it cannot be used."""
+        try:
+            return await fetch_image_bytes(
+                self.storage,
+                url,
+                allowed_domains=self.allowed_domains,
+                timeout=self.fetch_timeout,
+            )
+        except Exception as e:
+            logger.warning(f"Skipping slideshow image {url}: {e}")
+            return None
+
+    @staticmethod
+    def _captions_for(captions: List[str], count: int) -> List[str]:
+        """One caption per slide (a single caption applies to every slide)."""
+        if len(captions) == count:
+            return list(captions)
+        if len(captions) == 1:
+            return [captions[0]] * count
+        return (list(captions) + [""] * count)[:count]
+
+    async def _encode_mp4(
+        self,
+        slides: List[bytes],
+        hold_frames: int,
+        fade_steps: int,
+        output_path: str,
+        executor: ProcessPoolExecutor,
+    ) -> int:
+        """Stream raw frames into ffmpeg, rendering fades ahead in the pool.
+
+        Returns:
+            Number of frames written
+        """
+        width, height = self.size
+        process = await asyncio.create_subprocess_exec(
+            self.ffmpeg_path,
+            "-hide_banner", "-loglevel", "error", "-y",
+            "-f", "rawvideo", "-pix_fmt", "rgb24",
+            "-s", f"{width}x{height}", "-r", str(self.fps),
+            "-i", "-",
+            "-c:v", "libx264", "-preset", "veryfast",
+            "-pix_fmt", "yuv420p", "-movflags", "+faststart",
+            output_path,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stderr_task = asyncio.ensure_future(process.stderr.read())
+
+        loop = asyncio.get_running_loop()
+        pending: deque = deque()
+        next_transition = 0
+
+        def schedule_fades() -> None:
+            nonlocal next_transition
+            while (
+                fade_steps
+                and next_transition < len(slides) - 1
+                and len(pending) < self.PREFETCH_TRANSITIONS
+            ):
+                pending.append(loop.run_in_executor(
+                    executor,
+                    render_fade,
+                    slides[next_transition],
+                    slides[next_transition + 1],
+                    self.size,
+                    fade_steps,
+                ))
+                next_transition += 1
+
+        frames_written = 0
+        try:
+            for index, slide in enumerate(slides):
+                schedule_fades()
+                for _ in range(hold_frames):
+                    process.stdin.write(slide)
+                    await process.stdin.drain()
+                    frames_written += 1
+                if pending:
+                    for frame in await pending.popleft():
+                        process.stdin.write(frame)
+                        await process.stdin.drain()
+                        frames_written += 1
+            process.stdin.close()
+            returncode = await process.wait()
+        except (BrokenPipeError, ConnectionResetError):
+            returncode = await process.wait()
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            stderr_task.cancel()
+            raise
+
+        stderr = (await stderr_task).decode(errors="replace").strip()
+        if returncode != 0:
+            raise SlideshowRenderError(f"ffmpeg exited with {returncode}: {stderr[-500:]}")
+        return frames_written
+
+    async def _store_file(self, path: str, content_type: str) -> str:
+        """Store a rendered file under its content hash."""
+        digest = await asyncio.to_thread(self._hash_file, path)
+        prefix = "videos" if content_type.startswith("video/") else "slideshows"
+        object_name = self.storage.content_object_name(digest, content_type, prefix)
+        if await self.storage.object_exists(object_name):
+            return self.storage.get_object_url(object_name)
+
+        try:
+            with open(path, "rb") as f:
+                await self.storage.upload_stream(
+                    f,
+                    object_name=object_name,
+                    content_type=content_type,
+                    length=os.path.getsize(path),
+                )
+        except Exception as e:
+            raise SlideshowRenderError(f"Failed to store slideshow: {e}") from e
+        return self.storage.get_object_url(object_name)
+
+    async def _store_bytes(self, data: bytes, content_type: str) -> str:
+        """Store a small rendered artifact (poster) under its content hash."""
+        digest = hashlib.sha256(data).hexdigest()
+        object_name = self.storage.content_object_name(digest, content_type, "posters")
+        if not await self.storage.object_exists(object_name):
+            await self.storage.upload_stream(
+                io.BytesIO(data),
+                object_name=object_name,
+                content_type=content_type,
+                length=len(data),
+            )
+        return self.storage.get_object_url(object_name)
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        """SHA-256 of a file, read in chunks."""
+        sha256 = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
+
+def create_slideshow_provider() -> Optional[LocalSlideshowProvider]:
+    """Build the configured slideshow provider.
+
+    Returns:
+        LocalSlideshowProvider, or None for the mock renderer
+    """
+    from app.core.config import settings
+
+    if settings.slideshow_renderer != "local":
+        return None
+
+    from app.infrastructure.storage import get_storage_client
+
+    return LocalSlideshowProvider(
+        get_storage_client(),
+        width=settings.slideshow_width,
+        height=settings.slideshow_height,
+        fps=settings.slideshow_fps,
+        transition_seconds=settings.slideshow_transition_seconds,
+        output_format=settings.slideshow_format,
+        ffmpeg_path=settings.ffmpeg_path,
+        allowed_domains=settings.mcp_allowed_domains_set,
+    )
@@ -0,0 +1,20 @@
+"""
+Vision Infrastructure Package.
+
+Contains local (model-free) image feature extraction.
+"""
+from app.infrastructure.vision.features import (
+    ImageFeatureExtractor,
+    create_feature_extractor,
+    extract_image_features,
+    get_vision_executor,
+    shutdown_vision_executor,
+)
+
+__all__ = [
+    "ImageFeatureExtractor",
+    "create_feature_extractor",
+    "extract_image_features",
+    "get_vision_executor",
+    "shutdown_vision_executor",
+]
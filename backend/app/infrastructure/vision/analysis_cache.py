@@ -0,0 +1,158 @@
+"""
+Product Analysis Cache.
+
+Content-keyed cache that lets ProductAnalysisAgent skip re-analyzing a
+product photo it has already seen - e.g. the same image reused across
+campaigns, regenerations or duplicated projects. Keys combine the SHA-256
+of the image bytes, the background text and a version stamp of the
+analysis prompt/model, so changing either invalidates old entries.
+"""
+import copy
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedAnalysis:
+    """A cached analysis result."""
+    analysis: Dict[str, Any]
+    expires_at: float
+
+
+class AnalysisCache:
+    """
+    In-memory LRU cache with TTL mapping image/background keys to analyses.
+
+    Tracks hits, misses, evictions and expirations for hit-rate metrics.
+    Analyses are deep-copied in and out so callers may mutate them.
+
+    Attributes:
+        max_entries: Maximum number of cached entries (least recently used evicted)
+        ttl_seconds: Lifetime of an entry in seconds
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: int = 604800):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached entries
+            ttl_seconds: Lifetime of an entry in seconds
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, CachedAnalysis]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(image_digest: str, background: str, version: str) -> str:
+        """
+        Build the content key for an analysis.
+
+        Args:
+            image_digest: Hex SHA-256 of the image bytes
+            background: User-provided background text
+            version: Version stamp of the analysis prompt/model
+
+        Returns:
+            Hex sha256 digest of the normalized fields
+        """
+        payload = json.dumps(
+            [image_digest, " ".join((background or "").split()), version],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached analysis, counting the hit or miss.
+
+        Args:
+            key: Content key from make_key()
+
+        Returns:
+            Copy of the analysis if present and not expired, None otherwise
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(entry.analysis)
+
+    def set(self, key: str, analysis: Dict[str, Any]) -> None:
+        """
+        Store an analysis, evicting the least recently used entry if full.
+
+        Args:
+            key: Content key from make_key() (which encodes the version)
+            analysis: Analysis dict
+        """
+        self._entries[key] = CachedAnalysis(
+            analysis=copy.deepcopy(analysis),
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        """Remove a single entry."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries and reset metrics."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics.
+
+        Returns:
+            Dict with size, limits, hit/miss counts and hit_rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Process-wide cache shared by all analysis agents
+product_analysis_cache = AnalysisCache(
+    max_entries=settings.analysis_cache_max_entries,
+    ttl_seconds=settings.analysis_cache_ttl_seconds,
+)
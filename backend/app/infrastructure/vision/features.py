@@ -0,0 +1,372 @@
+"""
+Local Image Feature Extraction.
+
+CPU-only measurements of a product image that need no vision model:
+dominant colors (k-means on a downsampled copy), brightness, contrast,
+aspect ratio and how uniform the background is. The work runs in a
+process pool and takes a few milliseconds per image, so VisionTools can
+fill these analysis fields itself and leave only semantic questions
+(category, materials, audience) to a model.
+"""
+import asyncio
+import io
+import logging
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from app.infrastructure.storage.fetch import fetch_image_bytes
+
+
+logger = logging.getLogger(__name__)
+
+
+# Rec. 601 luma weights
+_LUMA = (0.299, 0.587, 0.114)
+
+# Share of the shorter edge treated as the image border (background sample)
+BORDER_FRACTION = 0.08
+
+# Mean RGB distance from the border's median color at which uniformity is 0
+_UNIFORMITY_SCALE = 100.0
+
+# Uniformity above which the background counts as plain (studio shot)
+PLAIN_BACKGROUND_THRESHOLD = 0.85
+
+# Clusters smaller than this share of pixels (edge blur, noise) are dropped
+MIN_COLOR_SHARE = 0.01
+
+
+# ============================================================================
+# Feature Extraction (runs in worker processes; keep top-level and picklable)
+# ============================================================================
+
+def _to_hex(rgb) -> str:
+    r, g, b = (int(round(float(c))) for c in rgb)
+    return f"#{r:02X}{g:02X}{b:02X}"
+
+
+def _load_rgb(image_bytes: bytes, sample_size: int) -> Tuple[Tuple[int, int], "np.ndarray"]:
+    """Decode, flatten transparency onto white and downsample.
+
+    Returns:
+        Original (width, height) and an (h, w, 3) float32 array
+    """
+    with Image.open(io.BytesIO(image_bytes)) as img:
+        size = img.size
+        # JPEG decoders can scale by 1/2..1/8 while decoding
+        img.draft("RGB", (sample_size, sample_size))
+        if img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info):
+            rgba = img.convert("RGBA")
+            flat = Image.new("RGB", rgba.size, (255, 255, 255))
+            flat.paste(rgba, mask=rgba.getchannel("A"))
+        else:
+            flat = img.convert("RGB")
+        flat.thumbnail((sample_size, sample_size), Image.Resampling.BILINEAR)
+        return size, np.asarray(flat, dtype=np.float32)
+
+
+def kmeans_colors(
+    pixels: "np.ndarray",
+    k: int,
+    iterations: int = 12,
+    seed: int = 0,
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Cluster pixels into k colors.
+
+    k-means++ seeding, then Lloyd iterations with all distances computed
+    in one matrix product per step.
+
+    Args:
+        pixels: (n, 3) float32 RGB values
+        k: Number of clusters (reduced if there are fewer distinct colors)
+        iterations: Maximum Lloyd iterations
+        seed: RNG seed, so the same image always yields the same palette
+
+    Returns:
+        (centers, counts) with centers as (k', 3) and counts as (k',)
+    """
+    rng = np.random.default_rng(seed)
+    n = len(pixels)
+    k = max(1, min(k, n))
+
+    centers = np.empty((k, 3), dtype=np.float32)
+    centers[0] = pixels[rng.integers(n)]
+    nearest = ((pixels - centers[0]) ** 2).sum(axis=1)
+    for i in range(1, k):
+        total = float(nearest.sum())
+        if total <= 0.0:
+            # Fewer distinct colors than clusters
+            k = i
+            centers = centers[:k]
+            break
+        centers[i] = pixels[rng.choice(n, p=nearest / total)]
+        nearest = np.minimum(nearest, ((pixels - centers[i]) ** 2).sum(axis=1))
+
+    pixel_sq = (pixels ** 2).sum(axis=1, keepdims=True)
+    for _ in range(iterations):
+        distances = pixel_sq - 2.0 * pixels @ centers.T + (centers ** 2).sum(axis=1)
+        labels = distances.argmin(axis=1)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.stack(
+            [np.bincount(labels, weights=pixels[:, c], minlength=k) for c in range(3)],
+            axis=1,
+        )
+        updated = np.where(
+            counts[:, None] > 0,
+            sums / np.maximum(counts, 1)[:, None],
+            centers,
+        ).astype(np.float32)
+        converged = np.abs(updated - centers).max() < 0.5
+        centers = updated
+        if converged:
+            break
+
+    distances = pixel_sq - 2.0 * pixels @ centers.T + (centers ** 2).sum(axis=1)
+    counts = np.bincount(distances.argmin(axis=1), minlength=k)
+    keep = counts > 0
+    return centers[keep], counts[keep]
+
+
+def _border_pixels(rgb: "np.ndarray") -> "np.ndarray":
+    """Pixels within BORDER_FRACTION of the image edges, as (n, 3)."""
+    h, w, _ = rgb.shape
+    band = max(1, int(round(min(h, w) * BORDER_FRACTION)))
+    if 2 * band >= min(h, w):
+        return rgb.reshape(-1, 3)
+    return np.concatenate([
+        rgb[:band].reshape(-1, 3),
+        rgb[-band:].reshape(-1, 3),
+        rgb[band:-band, :band].reshape(-1, 3),
+        rgb[band:-band, -band:].reshape(-1, 3),
+    ])
+
+
+def extract_image_features(
+    image_bytes: bytes,
+    sample_size: int = 128,
+    palette_size: int = 5,
+) -> Dict[str, Any]:
+    """Measure an image.
+
+    Args:
+        image_bytes: Encoded image
+        sample_size: Longest edge of the downsampled copy that is analyzed
+        palette_size: Number of dominant colors to return
+
+    Returns:
+        {
+            "color_palette": ["#RRGGBB", ...],  # most common first
+            "color_weights": [0.42, ...],       # pixel share per color
+            "brightness": 0.0-1.0,              # mean luma
+            "contrast": 0.0-1.0,                # RMS contrast of luma
+            "width": int, "height": int,
+            "aspect_ratio": float,              # width / height
+            "orientation": "landscape" | "portrait" | "square",
+            "background": {
+                "color": "#RRGGBB",             # median border color
+                "uniformity": 0.0-1.0,
+                "plain": bool
+            }
+        }
+    """
+    (width, height), rgb = _load_rgb(image_bytes, sample_size)
+    pixels = rgb.reshape(-1, 3)
+
+    centers, counts = kmeans_colors(pixels, palette_size)
+    order = np.argsort(-counts, kind="stable")
+    shares = counts[order] / counts.sum()
+    significant = max(1, int((shares >= MIN_COLOR_SHARE).sum()))
+    order, shares = order[:significant], shares[:significant]
+
+    luma = pixels @ np.asarray(_LUMA, dtype=np.float32)
+    border = _border_pixels(rgb)
+    border_color = np.median(border, axis=0)
+    spread = np.sqrt(((border - border_color) ** 2).sum(axis=1)).mean()
+    uniformity = max(0.0, 1.0 - float(spread) / _UNIFORMITY_SCALE)
+
+    aspect_ratio = width / height if height else 0.0
+    if abs(aspect_ratio - 1.0) <= 0.05:
+        orientation = "square"
+    elif aspect_ratio > 1.0:
+        orientation = "landscape"
+    else:
+        orientation = "portrait"
+
+    return {
+        "color_palette": [_to_hex(centers[i]) for i in order],
+        "color_weights": [round(float(s), 3) for s in shares],
+        "brightness": round(float(luma.mean()) / 255.0, 3),
+        "contrast": round(float(luma.std()) / 127.5, 3),
+        "width": width,
+        "height": height,
+        "aspect_ratio": round(aspect_ratio, 3),
+        "orientation": orientation,
+        "background": {
+            "color": _to_hex(border_color),
+            "uniformity": round(uniformity, 3),
+            "plain": uniformity >= PLAIN_BACKGROUND_THRESHOLD,
+        },
+    }
+
+
+# ============================================================================
+# Process Pool
+# ============================================================================
+
+_vision_executor: Optional[ProcessPoolExecutor] = None
+_vision_executor_lock = threading.Lock()
+
+
+def get_vision_executor() -> ProcessPoolExecutor:
+    """Get the shared process pool for image feature extraction.
+
+    Sized by settings.vision_workers.
+
+    Returns:
+        Process-wide ProcessPoolExecutor
+    """
+    global _vision_executor
+    if _vision_executor is None:
+        with _vision_executor_lock:
+            if _vision_executor is None:
+                from app.core.config import settings
+                _vision_executor = ProcessPoolExecutor(
+                    max_workers=settings.vision_workers,
+                )
+    return _vision_executor
+
+
+def shutdown_vision_executor(wait: bool = True) -> None:
+    """Shut down the shared process pool (recreated on next use)."""
+    global _vision_executor
+    with _vision_executor_lock:
+        executor, _vision_executor = _vision_executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# ============================================================================
+# Extractor
+# ============================================================================
+
+class ImageFeatureExtractor:
+    """Fetch an image and measure it in the vision process pool.
+
+    Extraction is best-effort: unreachable images, disallowed hosts and
+    undecodable data yield None so analysis can continue without features.
+
+    Example:
+        extractor = ImageFeatureExtractor(get_storage_client())
+        features = await extractor.extract("https://cdn.example.com/p.jpg")
+        features["color_palette"]  # ["#F4F4F2", "#1B2A4A", ...]
+    """
+
+    def __init__(
+        self,
+        storage,
+        allowed_domains: Iterable[str] = (),
+        sample_size: int = 128,
+        palette_size: int = 5,
+        executor: Optional[ProcessPoolExecutor] = None,
+        fetch_timeout: int = 10,
+    ):
+        """Initialize the extractor.
+
+        Args:
+            storage: MinIOClient / LocalStorageClient holding uploaded images
+            allowed_domains: Hosts external images may be downloaded from
+            sample_size: Longest edge analyzed, in pixels
+            palette_size: Number of dominant colors
+            executor: Process pool (default: shared vision pool)
+            fetch_timeout: Download timeout in seconds
+        """
+        self.storage = storage
+        self.allowed_domains = frozenset(allowed_domains)
+        self.sample_size = sample_size
+        self.palette_size = palette_size
+        self._executor = executor
+        self.fetch_timeout = fetch_timeout
+
+    async def extract(
+        self,
+        image_source: str,
+        image_bytes: Optional[bytes] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Measure the image at a URL.
+
+        Args:
+            image_source: Image URL (our storage or an allowed host)
+            image_bytes: Already fetched content of image_source (skips the download)
+
+        Returns:
+            Features (see extract_image_features) plus "extract_ms", or
+            None if the image cannot be fetched or decoded
+        """
+        if not (PIL_AVAILABLE and NUMPY_AVAILABLE):
+            return None
+        if image_bytes is None and urlparse(image_source).scheme not in ("http", "https"):
+            return None
+
+        started = time.perf_counter()
+        try:
+            data = image_bytes
+            if data is None:
+                data = await fetch_image_bytes(
+                    self.storage,
+                    image_source,
+                    self.allowed_domains,
+                    timeout=self.fetch_timeout,
+                )
+            if data is None:
+                return None
+
+            loop = asyncio.get_running_loop()
+            features = await loop.run_in_executor(
+                self._executor or get_vision_executor(),
+                extract_image_features,
+                data,
+                self.sample_size,
+                self.palette_size,
+            )
+        except Exception as e:
+            logger.warning(f"Image feature extraction failed for {image_source}: {e}")
+            return None
+
+        features["extract_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return features
+
+
+def create_feature_extractor() -> Optional[ImageFeatureExtractor]:
+    """Build the configured feature extractor.
+
+    Returns:
+        ImageFeatureExtractor, or None when disabled or Pillow/NumPy are missing
+    """
+    from app.core.config import settings
+
+    if not settings.vision_features_enabled or not (PIL_AVAILABLE and NUMPY_AVAILABLE):
+        return None
+
+    from app.infrastructure.storage import get_storage_client
+
+    return ImageFeatureExtractor(
+        get_storage_client(),
+        allowed_domains=settings.mcp_allowed_domains_set,
+        sample_size=settings.vision_feature_sample_size,
+        palette_size=settings.vision_palette_size,
+    )
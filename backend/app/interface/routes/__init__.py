@@ -11,6 +11,8 @@ from .product_packages import router as product_packages_router
 from .assets import router as assets_router
 from .insights import router as insights_router
 from .user_settings import router as user_settings_router
+from .files import router as files_router
+from .video_jobs import router as video_jobs_router
 
 __all__ = [
     "auth_router",
@@ -20,5 +22,7 @@ __all__ = [
     "assets_router",
     "insights_router",
     "user_settings_router",
+    "files_router",
+    "video_jobs_router",
 ]
 
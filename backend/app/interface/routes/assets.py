@@ -20,6 +20,7 @@ from app.interface.dependencies.auth import get_current_user
 from app.domain.entities.user import User
 from app.infrastructure.database.connection import get_async_session
 from app.infrastructure.repositories.asset_repository import PostgresAssetRepository
+from app.infrastructure.storage.url_signer import get_url_signer
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +32,7 @@ async def get_asset_service(
 ) -> AssetService:
     """Get AssetService instance with dependencies."""
     repository = PostgresAssetRepository(session)
-    return AssetService(repository)
+    return AssetService(repository, url_signer=get_url_signer())
 
 
 @router.get("", response_model=AssetListResponseDTO)
@@ -45,3 +45,70 @@ async def check_langsmith_env():
         "LANGCHAIN_ENDPOINT": os.getenv("LANGCHAIN_ENDPOINT", "not set"),
         "LANGCHAIN_SESSION_SAMPLING_RATE": os.getenv("LANGCHAIN_SESSION_SAMPLING_RATE", "not set"),
     }
+
+
+@router.get("/image-cache")
+async def image_cache_stats():
+    """
+    查看图像生成缓存的命中率等指标。
+    """
+    from app.infrastructure.generators.image_cache import image_generation_cache
+
+    return image_generation_cache.stats()
+
+
+@router.get("/analysis-cache")
+async def analysis_cache_stats():
+    """
+    查看商品分析缓存的命中率等指标。
+    """
+    from app.infrastructure.vision.analysis_cache import product_analysis_cache
+
+    return product_analysis_cache.stats()
+
+
+@router.get("/input-images")
+async def input_image_stats():
+    """
+    查看输入商品图的下载次数与内存 LRU 命中率。
+    """
+    from app.infrastructure.storage.input_image import get_input_image_loader
+
+    return get_input_image_loader().stats()
+
+
+@router.get("/copy-duplicates")
+async def copy_duplicate_stats():
+    """
+    查看文案查重索引已加载的商家数与签名数。
+    """
+    from app.infrastructure.text.copy_index import get_copy_duplicate_index
+
+    index = get_copy_duplicate_index()
+    return index.stats() if index is not None else {"enabled": False}
+
+
+@router.get("/storage")
+async def storage_upload_stats():
+    """
+    查看对象存储上传的延迟与吞吐量指标，以及预签名 URL 缓存命中率。
+    """
+    from app.infrastructure.storage.minio_client import upload_metrics
+    from app.infrastructure.storage.url_signer import get_url_signer
+
+    signer = get_url_signer()
+    return {
+        **upload_metrics.stats(),
+        "presign": signer.stats() if signer is not None else None,
+    }
+
+
+@router.get("/video-jobs")
+async def video_job_stats():
+    """
+    查看异步视频任务的跟踪数量、轮询次数与 Webhook 次数。
+    """
+    from app.infrastructure.video.jobs import get_video_job_manager
+
+    manager = get_video_job_manager()
+    return manager.stats() if manager is not None else {"enabled": False}
@@ -0,0 +1,273 @@
+"""
+Local File Routes
+
+Serves objects stored by LocalStorageClient when STORAGE_BACKEND=local.
+Whole files are sent with FileResponse (zero-copy pathsend where the server
+supports it). Range, If-Range, If-None-Match and If-Modified-Since are
+handled here rather than left to FileResponse, which only supports ranges
+from Starlette 0.39 on.
+"""
+import logging
+import mimetypes
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Tuple
+from uuid import uuid4
+
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
+
+from app.core.config import settings
+from app.infrastructure.storage import LocalStorageClient, get_storage_client
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/files", tags=["Files"])
+
+# Not known to mimetypes on every supported Python version
+mimetypes.add_type("image/webp", ".webp")
+mimetypes.add_type("image/avif", ".avif")
+
+
+def get_local_storage() -> LocalStorageClient:
+    """Get the local storage backend, or 404 when objects live in MinIO."""
+    storage = get_storage_client() if settings.storage_backend == "local" else None
+    if not isinstance(storage, LocalStorageClient):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    return storage
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def _not_modified_since(if_modified_since: str, mtime: float) -> bool:
+    """Whether a file is unchanged since an If-Modified-Since date."""
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since is None:
+        return False
+    return int(mtime) <= since.timestamp()
+
+
+# Read size for streamed (ranged) bodies
+CHUNK_SIZE = 64 * 1024
+
+# More ranges than this in one request are served as the whole file
+MAX_RANGES = 16
+
+
+def _parse_range(range_header: str, size: int) -> Optional[List[Tuple[int, int]]]:
+    """
+    Parse a bytes Range header (RFC 9110 14.1.2).
+
+    Args:
+        range_header: Range header value
+        size: File size in bytes
+
+    Returns:
+        Sorted, merged (start, end) pairs with end exclusive; an empty list
+        if no range is satisfiable; None if the header should be ignored
+        (not bytes, malformed or too many ranges)
+    """
+    unit, _, specs = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or not specs.strip():
+        return None
+
+    ranges: List[Tuple[int, int]] = []
+    for spec in specs.split(","):
+        first, dash, last = spec.strip().partition("-")
+        if not dash:
+            return None
+        try:
+            if first:
+                start = int(first)
+                end = int(last) + 1 if last else size
+                if start < 0 or (last and end <= start):
+                    return None
+            else:
+                suffix = int(last)
+                if suffix < 0:
+                    return None
+                start, end = max(size - suffix, 0), size
+        except ValueError:
+            return None
+        end = min(end, size)
+        if start < end:
+            ranges.append((start, end))
+
+    if len(ranges) > MAX_RANGES:
+        return None
+
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _if_range_matches(if_range: str, etag: str, mtime: float) -> bool:
+    """Whether an If-Range validator still matches the file (strong comparison)."""
+    if_range = if_range.strip()
+    if if_range.startswith(("W/", '"')):
+        return if_range == etag
+    try:
+        since = parsedate_to_datetime(if_range)
+    except (TypeError, ValueError):
+        return False
+    return since is not None and int(mtime) == since.timestamp()
+
+
+async def _read_range(path: Path, start: int, end: int) -> AsyncIterator[bytes]:
+    """Yield bytes [start, end) of a file in chunks."""
+    async with await anyio.open_file(path, "rb") as f:
+        await f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = await f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _multipart_ranges(
+    path: Path,
+    ranges: List[Tuple[int, int]],
+    size: int,
+    media_type: str,
+) -> Tuple[AsyncIterator[bytes], str, int]:
+    """
+    Build a multipart/byteranges body.
+
+    Returns:
+        (body iterator, boundary, content length)
+    """
+    boundary = uuid4().hex
+    parts = [
+        (
+            f"--{boundary}\r\nContent-Type: {media_type}\r\n"
+            f"Content-Range: bytes {start}-{end - 1}/{size}\r\n\r\n"
+        ).encode("latin-1")
+        for start, end in ranges
+    ]
+    closing = f"\r\n--{boundary}--\r\n".encode("latin-1")
+    length = sum(len(part) + end - start for part, (start, end) in zip(parts, ranges))
+    length += 2 * (len(ranges) - 1) + len(closing)
+
+    async def body() -> AsyncIterator[bytes]:
+        for index, (part, (start, end)) in enumerate(zip(parts, ranges)):
+            yield (b"\r\n" if index else b"") + part
+            async for chunk in _read_range(path, start, end):
+                yield chunk
+        yield closing
+
+    return body(), boundary, length
+
+
+@router.api_route("/{object_name:path}", methods=["GET", "HEAD"])
+async def get_file(
+    object_name: str,
+    request: Request,
+    storage: LocalStorageClient = Depends(get_local_storage),
+):
+    """
+    Serve a stored object.
+
+    Returns 304 when the client's cached copy is current, 206 for Range
+    requests (multipart/byteranges for several ranges), 416 when no range
+    is satisfiable and the full file otherwise. A Range header is ignored
+    when its If-Range validator no longer matches. ETags are the SHA-256
+    of the content, so they stay valid across restarts and hosts.
+    """
+    path = storage.resolve_path(object_name)
+    stat_result: Optional[os.stat_result] = None
+    if path is not None:
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            stat_result = None
+    if stat_result is None or not os.path.isfile(path):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+
+    etag = await storage.etag(path, stat_result)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "Cache-Control": storage.cache_control_for(object_name),
+        "Accept-Ranges": "bytes",
+    }
+
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2)
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    elif if_modified_since is not None:
+        not_modified = _not_modified_since(if_modified_since, stat_result.st_mtime)
+    else:
+        not_modified = False
+    if not_modified:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    size = stat_result.st_size
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    ranges = None
+    if range_header is not None and (
+        if_range is None or _if_range_matches(if_range, etag, stat_result.st_mtime)
+    ):
+        ranges = _parse_range(range_header, size)
+
+    if ranges is None:
+        if range_header is None:
+            return FileResponse(
+                path,
+                media_type=media_type,
+                headers=headers,
+                stat_result=stat_result,
+            )
+        # Newer FileResponse versions would apply the ignored Range header themselves
+        return StreamingResponse(
+            _read_range(path, 0, size),
+            media_type=media_type,
+            headers={**headers, "Content-Length": str(size)},
+        )
+
+    if not ranges:
+        return Response(
+            status_code=416,  # constant renamed across Starlette versions
+            headers={**headers, "Content-Range": f"bytes */{size}"},
+        )
+
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        return StreamingResponse(
+            _read_range(path, start, end),
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+            media_type=media_type,
+            headers={
+                **headers,
+                "Content-Range": f"bytes {start}-{end - 1}/{size}",
+                "Content-Length": str(end - start),
+            },
+        )
+
+    body, boundary, length = _multipart_ranges(path, ranges, size, media_type)
+    return StreamingResponse(
+        body,
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=f"multipart/byteranges; boundary={boundary}",
+        headers={**headers, "Content-Length": str(length)},
+    )
@@ -10,6 +10,8 @@ from fastapi import APIRouter, HTTPException, status
 
 from app.application.agents.image_agent import ImageAgent
 from app.application.dtos.images import (
+    ImageBatchGenerationAPIRequest,
+    ImageBatchGenerationAPIResponse,
     ImageGenerationAPIRequest,
     ImageGenerationAPIResponse,
     ImageStatusResponse,
@@ -89,6 +91,62 @@ async def generate_image(
         )
 
 
+@router.post(
+    "/generate-batch",
+    response_model=ImageBatchGenerationAPIResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Generate Image Batch",
+    description="Start one async workflow that generates several images"
+)
+async def generate_image_batch(
+    request: ImageBatchGenerationAPIRequest,
+) -> ImageBatchGenerationAPIResponse:
+    """
+    Generate many prompts, or N variants of one prompt, in a single workflow.
+    
+    The workflow runs asynchronously:
+    1. DeepSeek optimizes all distinct prompts in one call
+    2. MCP ImageGenerator renders items with bounded concurrency
+    3. All image metadata is persisted in one transaction
+    
+    Socket.io events share the returned workflow ID; per-item results
+    arrive as agent:result with stage item_generated / item_failed, and
+    a final agent:result with stage completed lists every item.
+    
+    Args:
+        request: Batch request with prompts or prompt + variants
+        
+    Returns:
+        Batch workflow ID for tracking via status endpoint or Socket.io
+    """
+    prompts = request.expanded_prompts()
+    logger.info(f"Received batch image generation request: {len(prompts)} items")
+    
+    try:
+        agent = get_agent()
+        workflow_id = await agent.run_batch_async(
+            prompts=prompts,
+            width=request.width,
+            height=request.height,
+        )
+        
+        logger.info(f"Started batch image workflow: {workflow_id}")
+        
+        return ImageBatchGenerationAPIResponse(
+            workflow_id=workflow_id,
+            status="starting",
+            item_count=len(prompts),
+            message="Batch image generation workflow started. Connect to Socket.io for updates."
+        )
+        
+    except Exception as e:
+        logger.error(f"Failed to start batch image generation: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to start batch image generation: {str(e)}"
+        )
+
+
 @router.get(
     "/status/{workflow_id}",
     response_model=ImageStatusResponse,
@@ -123,6 +181,7 @@ async def get_workflow_status(workflow_id: str) -> ImageStatusResponse:
         optimized_prompt=state.get("optimized_prompt") if state.get("optimized_prompt") else None,
         asset_id=state.get("asset_id"),
         error=status_data.get("error"),
+        items=status_data.get("items"),
     )
 
 
@@ -6,7 +6,7 @@ API endpoints for product package generation and management.
 
 import logging
 import uuid
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -16,18 +16,26 @@ from app.application.dtos.product_packages import (
     ProductPackageGenerateResponse,
     ProductPackageStatusResponse,
     ProductPackageResponse,
+    ImageArtifact,
+    VideoArtifact,
     RegenerateRequest,
     RegenerateResponse,
     ApproveRequest,
     ApproveResponse,
+    DuplicateCopyClustersResponse,
 )
 from app.application.orchestration.deep_orchestrator import DeepOrchestrator
+from app.application.services.qa_gate import IncrementalQA
 from app.application.orchestration.hitl import HITLManager
 from app.application.tools import ToolRegistry
 from app.interface.dependencies.auth import get_current_user
 from app.domain.entities.user import User
-from app.infrastructure.database.connection import get_async_session
+from app.infrastructure.database.connection import get_async_session, get_session_context
+from app.infrastructure.repositories.asset_repository import PostgresAssetRepository
 from app.infrastructure.repositories.product_package_repository import ProductPackageRepository
+from app.infrastructure.storage.url_signer import get_url_signer
+from app.infrastructure.text.copy_index import get_copy_duplicate_index
+from app.infrastructure.video.jobs import VideoJob, get_video_job_manager
 
 logger = logging.getLogger(__name__)
 
@@ -35,11 +43,9 @@ router = APIRouter(prefix="/product-packages", tags=["Product Packages"])
 
 
 # Dependency injection
-async def get_orchestrator(
-    session: AsyncSession = Depends(get_async_session),
-) -> DeepOrchestrator:
+def build_orchestrator(session: AsyncSession) -> DeepOrchestrator:
     """
-    Get DeepOrchestrator instance.
+    Build a DeepOrchestrator bound to a database session.
 
     In production, this would be a singleton or managed by a container.
     """
@@ -68,11 +74,53 @@ async def get_orchestrator(
         repository=repository,
         copywriting_agent=copywriting_agent,
         image_agent=image_agent,
+        video_jobs=get_video_job_manager(),
+        copy_duplicates=get_copy_duplicate_index(),
+        incremental_qa=IncrementalQA.from_settings(),
     )
 
     return orchestrator
 
 
+async def get_orchestrator(
+    session: AsyncSession = Depends(get_async_session),
+) -> DeepOrchestrator:
+    """Get DeepOrchestrator instance."""
+    return build_orchestrator(session)
+
+
+async def resume_parked_workflow(job: VideoJob) -> None:
+    """
+    Resume a workflow whose video job finished.
+
+    Called by the VideoJobManager outside any request, so it opens its own
+    session for the remaining stages. If they fail, that session is rolled
+    back together with the failed status the orchestrator wrote to it, so
+    the failure is recorded again in a session of its own.
+    """
+    try:
+        async with get_session_context() as session:
+            await build_orchestrator(session).resume_video_job(job)
+    except Exception as e:
+        await _mark_workflow_failed(job.workflow_id, str(e))
+
+
+async def _mark_workflow_failed(workflow_id: str, error_message: str) -> None:
+    """Set a workflow's package to failed in a separately committed session."""
+    try:
+        async with get_session_context() as session:
+            repository = ProductPackageRepository(session)
+            package = await repository.get_by_workflow_id(workflow_id)
+            if package is not None:
+                await repository.update_status(
+                    package_id=package.id,
+                    status="failed",
+                    error_message=error_message,
+                )
+    except Exception as e:
+        logger.error(f"[{workflow_id}] Could not record workflow failure: {e}", exc_info=True)
+
+
 async def get_hitl_manager(
     session: AsyncSession = Depends(get_async_session),
 ) -> HITLManager:
@@ -184,6 +232,89 @@ async def get_package_status(
         )
 
 
+@router.get("/duplicate-clusters", response_model=DuplicateCopyClustersResponse)
+async def get_duplicate_copy_clusters(
+    current_user: User = Depends(get_current_user),
+):
+    """
+    List clusters of near-duplicate copy across the user's packages.
+
+    Each cluster groups copy variants from two or more workflows whose
+    MinHash similarity reaches COPY_DEDUP_THRESHOLD.
+    """
+    index = get_copy_duplicate_index()
+    if index is None:
+        return DuplicateCopyClustersResponse(enabled=False)
+
+    try:
+        clusters = await index.clusters(current_user.id)
+        return DuplicateCopyClustersResponse(enabled=True, clusters=clusters)
+    except Exception as e:
+        logger.error(f"Failed to list duplicate copy clusters: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to list duplicate copy clusters: {str(e)}",
+        )
+
+
+def _artifact_uuids(artifacts: Dict[str, Any], artifact_type: str) -> List[uuid.UUID]:
+    """Parse the asset UUIDs linked to a package under artifact_type."""
+    refs = artifacts.get(artifact_type) or []
+    if not isinstance(refs, list):
+        refs = [refs]
+
+    uuids = []
+    for ref in refs:
+        try:
+            uuids.append(uuid.UUID(str(ref)))
+        except ValueError:
+            continue
+    return uuids
+
+
+async def _load_package_media(
+    repository: PostgresAssetRepository,
+    artifacts: Dict[str, Any],
+    user_id: uuid.UUID,
+) -> tuple[List[ImageArtifact], Optional[VideoArtifact]]:
+    """
+    Load the image and video assets linked to a package.
+
+    Assets are fetched in one query and their URLs presigned in one bulk
+    pass when the bucket is private.
+    """
+    image_ids = _artifact_uuids(artifacts, "images")
+    video_ids = _artifact_uuids(artifacts, "video")
+    assets = await repository.get_many_for_user(image_ids + video_ids, user_id)
+
+    signer = get_url_signer()
+    urls = [asset.url for asset in assets]
+    if signer is not None:
+        urls = signer.sign_many(urls)
+
+    images: List[ImageArtifact] = []
+    video: Optional[VideoArtifact] = None
+    for asset, url in zip(assets, urls):
+        metadata = asset.metadata or {}
+        if asset.asset_type == "video":
+            duration = metadata.get("duration")
+            video = VideoArtifact(
+                asset_id=str(asset.id),
+                url=url,
+                label=asset.title,
+                is_fallback=bool(metadata.get("is_fallback", False)),
+                duration=int(duration) if isinstance(duration, (int, float)) else None,
+            )
+        else:
+            images.append(ImageArtifact(
+                asset_id=str(asset.id),
+                url=url,
+                label=asset.title,
+                scene=metadata.get("scene") or metadata.get("label") or "image",
+            ))
+    return images, video
+
+
 @router.get("/{package_id}", response_model=ProductPackageResponse)
 async def get_package_detail(
     package_id: uuid.UUID,
@@ -224,8 +355,13 @@ async def get_package_detail(
                 detail="Package requires approval before accessing details",
             )
 
-        # TODO: Fetch actual artifacts from database
-        # For now, return placeholder structure
+        images, video = await _load_package_media(
+            PostgresAssetRepository(session),
+            package.artifacts or {},
+            current_user.id,
+        )
+
+        # TODO: Fetch copywriting artifacts from database
         return ProductPackageResponse(
             package_id=package.id,
             workflow_id=package.workflow_id,
@@ -233,8 +369,8 @@ async def get_package_detail(
             stage=package.stage,
             analysis=package.analysis_data,
             copywriting_versions=[],
-            images=[],
-            video=None,
+            images=images,
+            video=video,
             qa_report=package.qa_report,
         )
 
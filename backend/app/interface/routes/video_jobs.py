@@ -0,0 +1,54 @@
+"""
+Video Job Routes
+
+Webhook endpoint through which video providers report finished renders.
+Polling already drives every job to completion; a webhook only makes the
+parked workflow resume sooner.
+"""
+import logging
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
+
+from app.infrastructure.video.jobs import VideoJobError, VideoJobManager, get_video_job_manager
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/video-jobs", tags=["Video Jobs"])
+
+
+def require_video_job_manager() -> VideoJobManager:
+    """Get the job manager, or 404 when asynchronous video jobs are disabled."""
+    manager = get_video_job_manager()
+    if manager is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    return manager
+
+
+@router.post("/{job_id}/webhook")
+async def video_job_webhook(
+    job_id: str,
+    payload: Dict[str, Any] = Body(...),
+    token: Optional[str] = Query(None),
+    manager: VideoJobManager = Depends(require_video_job_manager),
+):
+    """
+    Receive a provider callback for a video job.
+
+    The token is the HMAC from the callback URL handed to the provider at
+    submission. Deliveries are idempotent; only the first terminal status
+    resumes the workflow.
+    """
+    if not manager.verify_webhook_token(job_id, token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid token")
+
+    try:
+        job = await manager.handle_webhook(job_id, payload)
+    except VideoJobError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Video job not found")
+
+    logger.info(f"Webhook for video job {job_id}: {job.state}")
+    return {"job_id": job.job_id, "state": job.state}
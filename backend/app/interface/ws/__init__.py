@@ -6,6 +6,24 @@ Provides real-time WebSocket communication for agent events.
 
 from app.interface.ws.socket_manager import socket_manager, SocketManager
 from app.interface.ws.rate_limiter import connection_rate_limiter, ConnectionRateLimiter
+from app.interface.ws.client_manager import (
+    InProcessBus,
+    InProcessPubSubManager,
+    RedisPubSubManager,
+    create_client_manager,
+)
+from app.interface.ws.event_buffer import BufferedEvent, EventReplayBuffer
 
-__all__ = ["socket_manager", "SocketManager", "connection_rate_limiter", "ConnectionRateLimiter"]
+__all__ = [
+    "socket_manager",
+    "SocketManager",
+    "connection_rate_limiter",
+    "ConnectionRateLimiter",
+    "InProcessBus",
+    "InProcessPubSubManager",
+    "RedisPubSubManager",
+    "create_client_manager",
+    "BufferedEvent",
+    "EventReplayBuffer",
+]
 
@@ -0,0 +1,205 @@
+"""
+Socket.IO Client Managers
+
+The client manager keeps track of which connections are in which rooms.
+socketio's default AsyncManager only sees the connections of its own
+process, so with several uvicorn workers or pods an event emitted by a
+workflow running in worker A never reaches a client connected to worker B.
+
+A pub/sub manager delivers each emit locally and also publishes it on a
+message queue. Every other worker then delivers it to its own members of
+the target rooms. Backends (SOCKETIO_MANAGER):
+
+    local   single process, socketio.AsyncManager (default)
+    redis   RedisPubSubManager (socketio.AsyncRedisManager) on REDIS_URL, for multi-worker deployments
+    memory  InProcessPubSubManager; several servers in one process share a
+            bus (tests and benchmarks)
+
+Workers can observe the emits of the others through remote_emit_listener
+(SocketManager uses it to buffer events for replay). The pub/sub managers
+only share emits. Each worker still knows only its
+own connections, so the engine.io transport needs sticky sessions when
+long-polling is enabled (see docs/DEPLOYMENT_GUIDE.md).
+"""
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+import socketio
+from socketio.async_pubsub_manager import AsyncPubSubManager
+
+try:
+    import redis.asyncio  # noqa: F401  (required by socketio.AsyncRedisManager)
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class InProcessBus:
+    """
+    Message bus shared by InProcessPubSubManager instances.
+
+    Every published message is queued for every subscriber, including the
+    publisher (pub/sub managers skip their own messages by host ID), just
+    like a Redis channel.
+    """
+
+    def __init__(self):
+        self._subscribers: List[asyncio.Queue] = []
+
+    def subscribe(self) -> asyncio.Queue:
+        """Start receiving messages."""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Stop receiving messages."""
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    def publish(self, message: Any) -> int:
+        """
+        Queue a message for every subscriber.
+
+        Returns:
+            Number of subscribers that received it
+        """
+        for queue in self._subscribers:
+            queue.put_nowait(message)
+        return len(self._subscribers)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+
+# Bus of managers created without an explicit one
+_default_bus = InProcessBus()
+
+
+class RemoteEmitMixin:
+    """Passes every emit published by another worker to remote_emit_listener."""
+
+    remote_emit_listener: Optional[Callable[[Dict[str, Any]], None]] = None
+
+    async def _handle_emit(self, message: Dict[str, Any]) -> None:
+        if self.remote_emit_listener is not None and message.get("host_id") != self.host_id:
+            try:
+                self.remote_emit_listener(message)
+            except Exception:
+                logger.exception("Remote emit listener failed")
+        await super()._handle_emit(message)
+
+
+class RedisPubSubManager(RemoteEmitMixin, socketio.AsyncRedisManager):
+    """socketio.AsyncRedisManager with remote_emit_listener."""
+
+
+class InProcessPubSubManager(RemoteEmitMixin, AsyncPubSubManager):
+    """
+    Pub/sub client manager over an InProcessBus.
+
+    Stands in for AsyncRedisManager in tests and benchmarks: each
+    AsyncServer on the same bus behaves like a separate worker. Messages are
+    JSON-encoded on the way through, as they are on Redis.
+
+    Example:
+        bus = InProcessBus()
+        worker_a = SocketManager(client_manager=InProcessPubSubManager(bus=bus))
+        worker_b = SocketManager(client_manager=InProcessPubSubManager(bus=bus))
+    """
+
+    name = "inprocesspubsub"
+
+    def __init__(
+        self,
+        channel: str = "socketio",
+        write_only: bool = False,
+        logger: Optional[logging.Logger] = None,
+        json: Any = None,
+        bus: Optional[InProcessBus] = None,
+    ):
+        """
+        Initialize the manager.
+
+        Args:
+            channel: Channel name (informational; the bus is the channel)
+            write_only: Only publish, never listen
+            logger: Logger (default: the server's)
+            json: JSON module for write-only managers
+            bus: Shared bus (default: the process-wide bus)
+        """
+        super().__init__(channel=channel, write_only=write_only, logger=logger, json=json)
+        self.bus = bus if bus is not None else _default_bus
+        self._queue: Optional[asyncio.Queue] = None
+
+    def initialize(self) -> None:
+        # Subscribe before the listener task first runs so no message
+        # published in between is lost
+        if not self.write_only and self._queue is None:
+            self._queue = self.bus.subscribe()
+        super().initialize()
+
+    async def _publish(self, data: Any) -> int:
+        return self.bus.publish(self.json.dumps(data))
+
+    async def _listen(self) -> AsyncIterator[Any]:
+        if self._queue is None:
+            self._queue = self.bus.subscribe()
+        while True:
+            yield await self._queue.get()
+
+    async def close(self) -> None:
+        """Stop listening and leave the bus."""
+        thread = getattr(self, "thread", None)
+        if thread is not None:
+            thread.cancel()
+            try:
+                await thread
+            except asyncio.CancelledError:
+                pass
+            self.thread = None
+        if self._queue is not None:
+            self.bus.unsubscribe(self._queue)
+            self._queue = None
+
+
+def create_client_manager(
+    backend: str,
+    redis_url: str,
+    channel: str = "socketio",
+) -> Optional[socketio.AsyncManager]:
+    """
+    Build the client manager of a backend.
+
+    A Redis backend without the redis package falls back to the local
+    manager with a warning, so a missing optional dependency degrades
+    multi-worker delivery instead of stopping the server.
+
+    Args:
+        backend: "local", "redis" or "memory"
+        redis_url: Redis URL for the redis backend
+        channel: Pub/sub channel shared by all workers
+
+    Returns:
+        Client manager, or None for the default local manager
+    """
+    backend = backend.lower()
+    if backend == "redis":
+        if not REDIS_AVAILABLE:
+            logger.warning(
+                "SOCKETIO_MANAGER=redis but the redis package is not installed; "
+                "events will only reach clients of this worker"
+            )
+            return None
+        logger.info(f"Socket.IO events fan out through Redis channel '{channel}'")
+        return RedisPubSubManager(redis_url, channel=channel)
+    if backend == "memory":
+        return InProcessPubSubManager(channel=channel)
+    if backend != "local":
+        raise ValueError(f"Unknown Socket.IO client manager: {backend}")
+    return None
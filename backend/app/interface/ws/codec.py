@@ -0,0 +1,82 @@
+"""
+Socket.IO Event Encoding
+
+EventJSON is the JSON module handed to the Socket.IO server. Event packets
+([event name, payload]) of the known agent events are encoded with the
+serializers compiled in schemas.EVENT_ADAPTERS; everything else goes
+through pydantic-core's schema-less encoder. Both are native code and emit
+UTF-8 instead of \\u escapes, which keeps Chinese copy at 3 bytes a
+character instead of 6.
+
+Clients that bundle the msgpack parser can instead be served binary
+msgpack packets (SOCKETIO_SERIALIZER=msgpack). Socket.IO fixes the parser
+per server, so client and server are switched together.
+"""
+
+import json
+import logging
+from typing import Any
+
+import pydantic_core
+
+from app.interface.ws.schemas import EVENT_ADAPTERS
+
+try:
+    import msgpack  # noqa: F401  (required by socketio's msgpack serializer)
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+_EVENT_SERIALIZERS = {event: adapter.serializer for event, adapter in EVENT_ADAPTERS.items()}
+
+
+class EventJSON:
+    """
+    JSON module (dumps/loads) for socketio and engineio.
+
+    Output is compact JSON, equivalent to json.dumps(obj, separators=(",", ":"),
+    ensure_ascii=False).
+    """
+
+    @staticmethod
+    def dumps(obj: Any, **kwargs: Any) -> str:
+        if type(obj) is list and len(obj) == 2 and type(obj[0]) is str:
+            serializer = _EVENT_SERIALIZERS.get(obj[0])
+            if serializer is not None:
+                encoded = b"".join((
+                    b"[",
+                    pydantic_core.to_json(obj[0]),
+                    b",",
+                    serializer.to_json(obj[1], warnings=False),
+                    b"]",
+                ))
+                return encoded.decode("utf-8")
+        return pydantic_core.to_json(obj).decode("utf-8")
+
+    @staticmethod
+    def loads(s: Any, **kwargs: Any) -> Any:
+        return json.loads(s, **kwargs)
+
+
+def resolve_serializer(name: str) -> str:
+    """
+    Socket.IO serializer to use for a configured name.
+
+    msgpack without the msgpack package falls back to JSON with a warning.
+
+    Args:
+        name: "json" or "msgpack"
+
+    Returns:
+        serializer argument of socketio.AsyncServer ("default" is JSON)
+    """
+    if name == "msgpack":
+        if MSGPACK_AVAILABLE:
+            return "msgpack"
+        logger.warning(
+            "SOCKETIO_SERIALIZER=msgpack but the msgpack package is not installed; using JSON"
+        )
+    return "default"
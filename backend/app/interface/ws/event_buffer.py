@@ -0,0 +1,242 @@
+"""
+Event Replay Buffer
+
+Keeps the most recent events of each workflow so that a client which
+reconnects mid-workflow can catch up on what it missed instead of polling
+the status endpoint. Every workflow event gets a sequence number that
+increases by one per event; a client remembers the last one it saw and
+sends it when it (re)subscribes.
+
+Buffers are bounded per workflow (oldest events dropped first) and across
+workflows (least recently used dropped first), and expire a while after
+the workflow reaches a terminal state.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+# Minimum seconds between scans for expired buffers
+PRUNE_INTERVAL_SECONDS = 1.0
+
+# Orchestrator progress stages after which a workflow emits nothing more
+TERMINAL_STAGES = ("done", "failed")
+
+
+def is_terminal_event(event: str, payload: Dict[str, Any]) -> bool:
+    """
+    Whether an event ends its workflow.
+
+    Agent results and errors end the agent's workflow; orchestrated
+    workflows end with a progress event at a terminal stage.
+
+    Args:
+        event: Socket.IO event name
+        payload: Event payload
+
+    Returns:
+        True for terminal events
+    """
+    if event in ("agent:result", "agent:error"):
+        return True
+    if event == "agent:progress":
+        return (payload.get("data") or {}).get("stage") in TERMINAL_STAGES
+    return False
+
+
+@dataclass
+class BufferedEvent:
+    """One buffered workflow event."""
+    seq: int
+    event: str
+    payload: Dict[str, Any]
+    namespace: str = "/"
+
+
+@dataclass
+class _WorkflowBuffer:
+    events: Deque[BufferedEvent]
+    last_seq: int = 0
+    expires_at: Optional[float] = None
+
+
+class EventReplayBuffer:
+    """
+    Per-workflow ring buffers of sequenced events. Thread-safe.
+
+    Example:
+        buffer = EventReplayBuffer(max_events=500, ttl_seconds=600)
+        seq = buffer.append("wf-1", "agent:thought", payload)
+        missed, truncated = buffer.since("wf-1", last_seq=seq - 3)
+    """
+
+    def __init__(
+        self,
+        max_events: int = 500,
+        ttl_seconds: float = 600.0,
+        max_workflows: int = 1000,
+    ):
+        """
+        Initialize the buffer.
+
+        Args:
+            max_events: Events kept per workflow
+            ttl_seconds: Seconds a workflow's events are kept after its
+                terminal event
+            max_workflows: Workflows buffered at once (LRU eviction)
+        """
+        self.max_events = max(1, max_events)
+        self.ttl_seconds = ttl_seconds
+        self.max_workflows = max(1, max_workflows)
+        self._buffers: "OrderedDict[str, _WorkflowBuffer]" = OrderedDict()
+        self._next_prune = 0.0
+        self._lock = threading.Lock()
+
+    def append(
+        self,
+        workflow_id: str,
+        event: str,
+        payload: Dict[str, Any],
+        namespace: str = "/",
+    ) -> int:
+        """
+        Buffer a new event under the workflow's next sequence number.
+
+        Args:
+            workflow_id: Workflow the event belongs to
+            event: Socket.IO event name
+            payload: Event payload (its "seq" should carry the returned number)
+            namespace: Namespace the event is emitted on
+
+        Returns:
+            Sequence number of the event
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            buffer = self._buffer_for(workflow_id)
+            buffer.last_seq += 1
+            self._add(buffer, BufferedEvent(buffer.last_seq, event, payload, namespace), now)
+            return buffer.last_seq
+
+    def record(
+        self,
+        workflow_id: str,
+        seq: int,
+        event: str,
+        payload: Dict[str, Any],
+        namespace: str = "/",
+    ) -> bool:
+        """
+        Buffer an event numbered elsewhere (by the worker running the workflow).
+
+        Events at or below the workflow's latest sequence number are
+        ignored, so replays and repeats are never buffered twice.
+
+        Returns:
+            True if the event was buffered
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            buffer = self._buffer_for(workflow_id)
+            if seq <= buffer.last_seq:
+                return False
+            buffer.last_seq = seq
+            self._add(buffer, BufferedEvent(seq, event, payload, namespace), now)
+            return True
+
+    def since(
+        self,
+        workflow_id: str,
+        last_seq: int,
+        namespace: Optional[str] = None,
+    ) -> Tuple[List[BufferedEvent], bool]:
+        """
+        Events after a sequence number, oldest first.
+
+        Args:
+            workflow_id: Workflow ID
+            last_seq: Last sequence number the client saw (0 for everything)
+            namespace: Only events emitted on this namespace (default: all)
+
+        Returns:
+            (events, truncated) - truncated is True when events after
+            last_seq were already dropped, so the client missed some for good.
+            That includes a client ahead of the buffer (a missing buffer,
+            or one whose numbering restarted after a restart or eviction):
+            its last_seq belongs to the old numbering and nothing can be
+            replayed against it.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            buffer = self._buffers.get(workflow_id)
+            if buffer is None:
+                return [], last_seq > 0
+            self._buffers.move_to_end(workflow_id)
+            if last_seq > buffer.last_seq:
+                return [], True
+            events = [
+                e for e in buffer.events
+                if e.seq > last_seq and (namespace is None or e.namespace == namespace)
+            ]
+            oldest = buffer.events[0].seq if buffer.events else buffer.last_seq + 1
+            truncated = last_seq < buffer.last_seq and oldest > last_seq + 1
+            return events, truncated
+
+    def last_seq(self, workflow_id: str) -> int:
+        """Latest sequence number of a workflow (0 if none is buffered)."""
+        with self._lock:
+            buffer = self._buffers.get(workflow_id)
+            return buffer.last_seq if buffer is not None else 0
+
+    def expire(self, workflow_id: str, ttl_seconds: Optional[float] = None) -> None:
+        """Schedule a workflow's buffer for removal (after ttl_seconds)."""
+        with self._lock:
+            buffer = self._buffers.get(workflow_id)
+            if buffer is not None:
+                ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+                buffer.expires_at = time.monotonic() + ttl
+                self._next_prune = 0.0
+
+    def _buffer_for(self, workflow_id: str) -> _WorkflowBuffer:
+        buffer = self._buffers.get(workflow_id)
+        if buffer is None:
+            buffer = _WorkflowBuffer(events=deque(maxlen=self.max_events))
+            self._buffers[workflow_id] = buffer
+            while len(self._buffers) > self.max_workflows:
+                self._buffers.popitem(last=False)
+        else:
+            self._buffers.move_to_end(workflow_id)
+        return buffer
+
+    def _add(self, buffer: _WorkflowBuffer, event: BufferedEvent, now: float) -> None:
+        buffer.events.append(event)
+        if is_terminal_event(event.event, event.payload):
+            buffer.expires_at = now + self.ttl_seconds
+
+    def _prune(self, now: float) -> None:
+        if now < self._next_prune:
+            return
+        self._next_prune = now + PRUNE_INTERVAL_SECONDS
+        expired = [
+            workflow_id for workflow_id, buffer in self._buffers.items()
+            if buffer.expires_at is not None and buffer.expires_at <= now
+        ]
+        for workflow_id in expired:
+            del self._buffers[workflow_id]
+
+    def stats(self) -> Dict[str, Any]:
+        """Buffered workflows and events."""
+        with self._lock:
+            return {
+                "workflows": len(self._buffers),
+                "max_workflows": self.max_workflows,
+                "events": sum(len(b.events) for b in self._buffers.values()),
+                "max_events": self.max_events,
+                "ttl_seconds": self.ttl_seconds,
+            }
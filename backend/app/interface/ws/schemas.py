@@ -1,13 +1,15 @@
 """
 Socket.IO Event Payload Schemas
 
-Defines Pydantic models for real-time event payloads.
+Defines Pydantic models for real-time event payloads, and the wire structs
+whose serializers are compiled once at import and used on every emit.
 """
 
 from datetime import datetime, timezone
 from typing import Any, Dict, Literal
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing_extensions import NotRequired, TypedDict
 
 
 class BaseEventPayload(BaseModel):
@@ -117,3 +119,97 @@ class AgentErrorEvent(BaseEventPayload):
             }
         }
     }
+
+
+# ============================================================================
+# Wire Structs
+# ============================================================================
+# Shapes of the payloads as SocketManager and the orchestrator emit them
+# (camelCase workflowId, ISO timestamp string, optional replay seq). Extra
+# keys are allowed so that the compiled serializers never drop data.
+
+_WIRE_CONFIG = ConfigDict(extra="allow")
+
+
+class ThoughtData(TypedDict):
+    __pydantic_config__ = _WIRE_CONFIG
+    content: str
+    node_name: NotRequired[str]
+
+
+class ToolCallData(TypedDict):
+    __pydantic_config__ = _WIRE_CONFIG
+    tool_name: str
+    status: str
+    message: str
+    progress: NotRequired[Dict[str, Any]]
+
+
+class ErrorData(TypedDict):
+    __pydantic_config__ = _WIRE_CONFIG
+    code: str
+    message: str
+    details: Dict[str, Any]
+
+
+class ProgressData(TypedDict):
+    __pydantic_config__ = _WIRE_CONFIG
+    stage: str
+    percentage: int
+    current_step: str
+
+
+class ArtifactData(TypedDict):
+    __pydantic_config__ = _WIRE_CONFIG
+    artifact_type: str
+    artifact_id: str
+    url: str
+    label: str
+
+
+class WireEvent(TypedDict):
+    __pydantic_config__ = _WIRE_CONFIG
+    workflowId: str
+    timestamp: str
+    seq: NotRequired[int]
+
+
+class ThoughtWireEvent(WireEvent):
+    type: Literal["thought"]
+    data: ThoughtData
+
+
+class ToolCallWireEvent(WireEvent):
+    type: Literal["tool_call"]
+    data: ToolCallData
+
+
+class ResultWireEvent(WireEvent):
+    type: Literal["result"]
+    data: Dict[str, Any]
+
+
+class ErrorWireEvent(WireEvent):
+    type: Literal["error"]
+    data: ErrorData
+
+
+class ProgressWireEvent(WireEvent):
+    type: Literal["progress"]
+    data: ProgressData
+
+
+class ArtifactWireEvent(WireEvent):
+    type: Literal["artifact"]
+    data: ArtifactData
+
+
+# Event name -> compiled adapter of its payload
+EVENT_ADAPTERS: Dict[str, TypeAdapter] = {
+    "agent:thought": TypeAdapter(ThoughtWireEvent),
+    "agent:tool_call": TypeAdapter(ToolCallWireEvent),
+    "agent:result": TypeAdapter(ResultWireEvent),
+    "agent:error": TypeAdapter(ErrorWireEvent),
+    "agent:progress": TypeAdapter(ProgressWireEvent),
+    "agent:artifact": TypeAdapter(ArtifactWireEvent),
+}
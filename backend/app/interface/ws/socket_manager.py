@@ -2,31 +2,114 @@
 Socket.IO Manager
 
 Provides Socket.IO server with JWT authentication for real-time agent events.
+
+Events are delivered to rooms rather than broadcast to every connection:
+each client joins ``user:<user_id>`` (from the JWT ``sub``) when it
+connects and ``workflow:<workflow_id>`` when it sends a ``subscribe``
+event. An event for a workflow goes to that workflow's room and, when the
+workflow's owner is known, to the owner's user room, so fan-out grows with
+the number of interested clients instead of the total connection count.
+
+Workflow events carry a per-workflow ``seq`` and are kept in an
+EventReplayBuffer; a client that reconnects sends the last ``seq`` it saw
+with ``subscribe`` and is sent what it missed before it joins the room.
+
+With several workers, SOCKETIO_MANAGER=redis shares emits between them
+through a Redis pub/sub channel (see client_manager); every worker also
+buffers the events it receives from the others, so replay works wherever
+the client reconnects. Connections, room memberships and registered
+workflow owners stay local to each worker; a subscribe for a workflow
+this worker has not seen checks the owner of its product package in the
+database instead.
 """
 
+import json
 import logging
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
 import socketio
 
 from app.core.config import get_settings
 from app.core.security import decode_access_token
+from app.interface.ws.client_manager import create_client_manager
+from app.interface.ws.codec import EventJSON, resolve_serializer
+from app.interface.ws.event_buffer import EventReplayBuffer
 from app.interface.ws.rate_limiter import connection_rate_limiter
 
 logger = logging.getLogger(__name__)
 
 
+# Namespaces clients may connect to (emit_* use "/", orchestrator events "/agents")
+AGENT_NAMESPACES = ("/", "/agents")
+
+# Workflow owners remembered for routing (oldest forgotten first)
+MAX_TRACKED_WORKFLOWS = 10000
+
+
+# Resolves the owner of a workflow this worker did not register
+OwnerLookup = Callable[[str], Awaitable[Optional[str]]]
+
+
+async def lookup_package_owner(workflow_id: str) -> Optional[str]:
+    """
+    Owner of the product package a workflow created, from the database.
+
+    Args:
+        workflow_id: Workflow ID
+
+    Returns:
+        Owner's user ID, or None if no package has that workflow ID
+    """
+    from app.infrastructure.database.connection import get_session_context
+    from app.infrastructure.repositories.product_package_repository import ProductPackageRepository
+
+    async with get_session_context() as session:
+        package = await ProductPackageRepository(session).get_by_workflow_id(workflow_id)
+    if package is None or package.user_id is None:
+        return None
+    return str(package.user_id)
+
+
+def user_room(user_id: Any) -> str:
+    """Room every connection of a user joins."""
+    return f"user:{user_id}"
+
+
+def workflow_room(workflow_id: str) -> str:
+    """Room of the clients subscribed to a workflow."""
+    return f"workflow:{workflow_id}"
+
+
 class SocketManager:
     """
     Socket.IO Manager for handling WebSocket connections with JWT authentication.
     
     Provides methods for:
-    - Authenticated connection handling
+    - Authenticated connection handling (joins the user's room)
+    - Workflow subscriptions (subscribe / unsubscribe events)
     - Event emission (agent:thought, agent:tool_call, agent:result, agent:error)
+      to a workflow's room and its owner's room
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        client_manager: Optional[socketio.AsyncManager] = None,
+        replay: Optional[EventReplayBuffer] = None,
+        owner_lookup: Optional[OwnerLookup] = None,
+    ):
+        """
+        Initialize the Socket.IO server.
+
+        Args:
+            client_manager: Room/connection manager (default: built from
+                settings.socketio_manager)
+            replay: Event replay buffer (default: sized by
+                settings.socketio_replay_*)
+            owner_lookup: Resolves owners of workflows registered on other
+                workers (default: lookup_package_owner)
+        """
         # Get CORS origins from settings (filter empty strings)
         settings = get_settings()  # CRITICAL FIX: Call get_settings() dynamically
         cors_origins = [
@@ -34,8 +117,18 @@ class SocketManager:
             if origin  # Filter empty strings
         ]
         
+        if client_manager is None:
+            client_manager = create_client_manager(
+                settings.socketio_manager,
+                settings.redis_url,
+                settings.socketio_channel,
+            )
+
         # Create async Socket.IO server
         self.sio = socketio.AsyncServer(
+            client_manager=client_manager,
+            serializer=resolve_serializer(settings.socketio_serializer),
+            json=EventJSON if settings.socketio_compiled_events else json,
             async_mode="asgi",
             cors_allowed_origins=cors_origins,
             cors_credentials=True,
@@ -43,8 +136,21 @@ class SocketManager:
             engineio_logger=False,
         )
         
+        if hasattr(self.sio.manager, "remote_emit_listener"):
+            self.sio.manager.remote_emit_listener = self._record_remote_event
+
+        self.replay = replay or EventReplayBuffer(
+            max_events=settings.socketio_replay_events,
+            ttl_seconds=settings.socketio_replay_ttl_seconds,
+            max_workflows=settings.socketio_replay_max_workflows,
+        )
+
         # Store connected users: {sid: user_id}
         self._connected_users: Dict[str, str] = {}
+
+        # Owner of each workflow started by an authenticated user: {workflow_id: user_id}
+        self._workflow_owners: "OrderedDict[str, str]" = OrderedDict()
+        self._owner_lookup = owner_lookup or lookup_package_owner
         
         # Register event handlers
         self._register_handlers()
@@ -58,70 +164,291 @@ class SocketManager:
         return socketio.ASGIApp(self.sio, other_asgi_app=other_app)
     
     def _register_handlers(self) -> None:
-        """Register Socket.IO event handlers."""
-        
-        @self.sio.event
+        """Register Socket.IO event handlers on every agent namespace."""
+        for namespace in AGENT_NAMESPACES:
+            self._register_namespace(namespace)
+
+    def _register_namespace(self, namespace: str) -> None:
+        """Register the handlers of one namespace."""
+
         async def connect(sid: str, environ: dict, auth: Optional[dict] = None) -> bool:
-            """
-            Handle client connection with JWT authentication and rate limiting.
-            
-            Args:
-                sid: Socket ID
-                environ: WSGI environ dict
-                auth: Authentication data from client handshake
-                
-            Returns:
-                True if connection accepted, False to reject
-            """
-            # Extract client IP for rate limiting
-            # Try different headers for reverse proxy scenarios
-            client_ip = (
-                environ.get("HTTP_X_FORWARDED_FOR", "").split(",")[0].strip() or
-                environ.get("HTTP_X_REAL_IP", "") or
-                environ.get("REMOTE_ADDR", "unknown")
+            return await self._on_connect(sid, environ, auth, namespace)
+
+        async def disconnect(sid: str, *args) -> None:
+            await self._on_disconnect(sid)
+
+        async def subscribe(sid: str, data: Optional[dict] = None) -> Dict[str, Any]:
+            return await self._on_subscribe(sid, data, namespace)
+
+        async def unsubscribe(sid: str, data: Optional[dict] = None) -> Dict[str, Any]:
+            return await self._on_unsubscribe(sid, data, namespace)
+
+        self.sio.on("connect", connect, namespace=namespace)
+        self.sio.on("disconnect", disconnect, namespace=namespace)
+        self.sio.on("subscribe", subscribe, namespace=namespace)
+        self.sio.on("unsubscribe", unsubscribe, namespace=namespace)
+
+    async def _on_connect(
+        self,
+        sid: str,
+        environ: dict,
+        auth: Optional[dict] = None,
+        namespace: str = "/",
+    ) -> bool:
+        """
+        Handle client connection with JWT authentication and rate limiting.
+
+        Args:
+            sid: Socket ID
+            environ: WSGI environ dict
+            auth: Authentication data from client handshake
+            namespace: Namespace the client connects to
+
+        Returns:
+            True if connection accepted, False to reject
+        """
+        # Extract client IP for rate limiting
+        # Try different headers for reverse proxy scenarios
+        client_ip = (
+            environ.get("HTTP_X_FORWARDED_FOR", "").split(",")[0].strip() or
+            environ.get("HTTP_X_REAL_IP", "") or
+            environ.get("REMOTE_ADDR", "unknown")
+        )
+
+        logger.info(f"Connection attempt from sid={sid}, ip={client_ip}")
+
+        # Check rate limit before processing authentication
+        if not connection_rate_limiter.record_connection(client_ip):
+            retry_after = connection_rate_limiter.get_retry_after(client_ip)
+            logger.warning(f"Connection rejected: Rate limit exceeded (ip={client_ip}, retry_after={retry_after}s)")
+            raise socketio.exceptions.ConnectionRefusedError(
+                f"Rate limit exceeded. Try again in {retry_after} seconds."
             )
-            
-            logger.info(f"Connection attempt from sid={sid}, ip={client_ip}")
-            
-            # Check rate limit before processing authentication
-            if not connection_rate_limiter.record_connection(client_ip):
-                retry_after = connection_rate_limiter.get_retry_after(client_ip)
-                logger.warning(f"Connection rejected: Rate limit exceeded (ip={client_ip}, retry_after={retry_after}s)")
-                raise socketio.exceptions.ConnectionRefusedError(
-                    f"Rate limit exceeded. Try again in {retry_after} seconds."
+
+        # Check for auth token
+        if not auth or "token" not in auth:
+            logger.warning(f"Connection rejected: No token provided (sid={sid})")
+            raise socketio.exceptions.ConnectionRefusedError("Authentication required")
+
+        token = auth.get("token", "")
+
+        # Validate JWT token
+        payload = decode_access_token(token)
+        if payload is None:
+            logger.warning(f"Connection rejected: Invalid token (sid={sid})")
+            raise socketio.exceptions.ConnectionRefusedError("Invalid or expired token")
+
+        # Extract user ID from token
+        user_id = payload.get("sub")
+        if not user_id:
+            logger.warning(f"Connection rejected: No user ID in token (sid={sid})")
+            raise socketio.exceptions.ConnectionRefusedError("Invalid token payload")
+
+        # Store user mapping and join the user's room
+        self._connected_users[sid] = user_id
+        await self.sio.enter_room(sid, user_room(user_id), namespace=namespace)
+
+        logger.info(f"Connection accepted: sid={sid}, user_id={user_id}")
+        return True
+
+    async def _on_disconnect(self, sid: str) -> None:
+        """Handle client disconnection (rooms are left automatically)."""
+        user_id = self._connected_users.pop(sid, None)
+        logger.info(f"Client disconnected: sid={sid}, user_id={user_id}")
+
+    async def _on_subscribe(
+        self,
+        sid: str,
+        data: Optional[dict],
+        namespace: str = "/",
+    ) -> Dict[str, Any]:
+        """
+        Join a workflow's room.
+
+        Workflows with an owner may only be joined by that owner; other
+        workflow IDs are random UUIDs handed out by the API and are
+        joinable by any authenticated client that knows them. When this
+        worker has not registered the workflow (it ran on another worker,
+        or before a restart), the owner is looked up in the database, and
+        the subscription is denied if the lookup fails.
+
+        With lastSeq, the buffered events after it are sent to the client
+        first, then it joins the room.
+
+        Args:
+            sid: Socket ID
+            data: {"workflowId": str, "lastSeq"?: int}
+            namespace: Namespace of the connection
+
+        Returns:
+            Acknowledgement {"ok": bool, "workflowId": str, "error"?: str};
+            with lastSeq also "lastSeq" (latest sequence number), "replayed"
+            (events sent), "truncated" (some missed events were dropped
+            from the buffer; fetch the workflow status instead) and "reset"
+            (lastSeq is ahead of the buffer, whose numbering restarted; the
+            client should forget the sequence numbers it has seen and
+            subscribe again from 0)
+        """
+        workflow_id = (data or {}).get("workflowId")
+        if not workflow_id or not isinstance(workflow_id, str):
+            return {"ok": False, "error": "workflowId is required"}
+        last_seq = (data or {}).get("lastSeq")
+        if last_seq is not None and (not isinstance(last_seq, int) or isinstance(last_seq, bool) or last_seq < 0):
+            return {"ok": False, "workflowId": workflow_id, "error": "lastSeq must be a non-negative integer"}
+
+        user_id = self._connected_users.get(sid)
+        owner = self._workflow_owners.get(workflow_id)
+        if user_id is not None and owner is None:
+            try:
+                owner = await self._owner_lookup(workflow_id)
+            except Exception as e:
+                logger.warning(f"Could not look up owner of workflow {workflow_id}: {e}")
+                return {"ok": False, "workflowId": workflow_id, "error": "Access denied"}
+            # Also routes the workflow's events to the owner's room from now on
+            self.register_workflow(workflow_id, owner)
+        if user_id is None or (owner is not None and owner != user_id):
+            logger.warning(f"Subscription denied: sid={sid}, workflow_id={workflow_id}")
+            return {"ok": False, "workflowId": workflow_id, "error": "Access denied"}
+
+        if last_seq is None:
+            await self.sio.enter_room(sid, workflow_room(workflow_id), namespace=namespace)
+            logger.debug(f"Subscribed sid={sid} to workflow {workflow_id}")
+            return {"ok": True, "workflowId": workflow_id}
+
+        reset = last_seq > self.replay.last_seq(workflow_id)
+        replayed, truncated = await self._replay(sid, workflow_id, last_seq, namespace)
+        logger.debug(f"Subscribed sid={sid} to workflow {workflow_id}, replayed {replayed} event(s)")
+        return {
+            "ok": True,
+            "workflowId": workflow_id,
+            "lastSeq": self.replay.last_seq(workflow_id),
+            "replayed": replayed,
+            "truncated": truncated,
+            "reset": reset,
+        }
+
+    async def _replay(
+        self,
+        sid: str,
+        workflow_id: str,
+        last_seq: int,
+        namespace: str,
+    ) -> Tuple[int, bool]:
+        """
+        Send a client the events it missed, then join it to the workflow room.
+
+        Events emitted while the replay is being sent are picked up by the
+        next pass, and the room is joined only once a pass finds nothing
+        new, so no event falls between the replay and the live stream.
+
+        Returns:
+            (events sent, whether missed events had been dropped)
+        """
+        replayed = 0
+        events, truncated = self.replay.since(workflow_id, last_seq, namespace)
+        while events:
+            for buffered in events:
+                # The client is connected to this worker; skip the message queue
+                await self.sio.emit(
+                    buffered.event, buffered.payload, to=sid, namespace=namespace, ignore_queue=True
                 )
-            
-            # Check for auth token
-            if not auth or "token" not in auth:
-                logger.warning(f"Connection rejected: No token provided (sid={sid})")
-                raise socketio.exceptions.ConnectionRefusedError("Authentication required")
-            
-            token = auth.get("token", "")
-            
-            # Validate JWT token
-            payload = decode_access_token(token)
-            if payload is None:
-                logger.warning(f"Connection rejected: Invalid token (sid={sid})")
-                raise socketio.exceptions.ConnectionRefusedError("Invalid or expired token")
-            
-            # Extract user ID from token
-            user_id = payload.get("sub")
-            if not user_id:
-                logger.warning(f"Connection rejected: No user ID in token (sid={sid})")
-                raise socketio.exceptions.ConnectionRefusedError("Invalid token payload")
-            
-            # Store user mapping
-            self._connected_users[sid] = user_id
-            
-            logger.info(f"Connection accepted: sid={sid}, user_id={user_id}")
-            return True
-        
-        @self.sio.event
-        async def disconnect(sid: str) -> None:
-            """Handle client disconnection."""
-            user_id = self._connected_users.pop(sid, None)
-            logger.info(f"Client disconnected: sid={sid}, user_id={user_id}")
-    
+            replayed += len(events)
+            last_seq = events[-1].seq
+            events, _ = self.replay.since(workflow_id, last_seq, namespace)
+        # No await suspends between the last check and joining the room
+        await self.sio.enter_room(sid, workflow_room(workflow_id), namespace=namespace)
+        return replayed, truncated
+
+    async def _on_unsubscribe(
+        self,
+        sid: str,
+        data: Optional[dict],
+        namespace: str = "/",
+    ) -> Dict[str, Any]:
+        """Leave a workflow's room."""
+        workflow_id = (data or {}).get("workflowId")
+        if not workflow_id or not isinstance(workflow_id, str):
+            return {"ok": False, "error": "workflowId is required"}
+        await self.sio.leave_room(sid, workflow_room(workflow_id), namespace=namespace)
+        return {"ok": True, "workflowId": workflow_id}
+
+    def register_workflow(self, workflow_id: str, user_id: Any) -> None:
+        """
+        Record the owner of a workflow.
+
+        The owner's connections then receive the workflow's events without
+        subscribing, and nobody else may subscribe to it.
+
+        Args:
+            workflow_id: Workflow ID
+            user_id: Owner's user ID
+        """
+        if user_id is None:
+            return
+        self._workflow_owners[workflow_id] = str(user_id)
+        self._workflow_owners.move_to_end(workflow_id)
+        while len(self._workflow_owners) > MAX_TRACKED_WORKFLOWS:
+            self._workflow_owners.popitem(last=False)
+
+    def get_workflow_owner(self, workflow_id: str) -> Optional[str]:
+        """Get the registered owner of a workflow."""
+        return self._workflow_owners.get(workflow_id)
+
+    def _targets(self, workflow_id: Optional[str], sid: Optional[str] = None) -> Union[str, List[str], None]:
+        """
+        Rooms an event is delivered to.
+
+        Args:
+            workflow_id: Workflow the event belongs to
+            sid: Specific socket ID (overrides the rooms)
+
+        Returns:
+            The sid, or the workflow room plus the owner's room; None only
+            when there is neither
+        """
+        if sid is not None:
+            return sid
+        if not workflow_id:
+            return None
+        rooms = [workflow_room(workflow_id)]
+        owner = self._workflow_owners.get(workflow_id)
+        if owner is not None:
+            rooms.append(user_room(owner))
+        return rooms
+
+    async def _emit(
+        self,
+        event: str,
+        payload: Dict[str, Any],
+        workflow_id: Optional[str],
+        sid: Optional[str] = None,
+        namespace: str = "/",
+    ) -> None:
+        """
+        Emit an event to the rooms of a workflow.
+
+        Workflow events (not those addressed to a single sid) get the
+        workflow's next "seq" and are buffered for replay.
+        """
+        room = self._targets(workflow_id, sid)
+        if room is None:
+            logger.debug(f"Dropped {event}: no workflow ID or socket ID to deliver to")
+            return
+        if sid is None:
+            payload = {**payload}
+            payload["seq"] = self.replay.append(workflow_id, event, payload, namespace)
+        await self.sio.emit(event, payload, room=room, namespace=namespace)
+
+    def _record_remote_event(self, message: Dict[str, Any]) -> None:
+        """Buffer a workflow event emitted by another worker."""
+        data = message.get("data")
+        payload = data[0] if isinstance(data, list) and data else data
+        if not isinstance(payload, dict):
+            return
+        workflow_id, seq = payload.get("workflowId"), payload.get("seq")
+        if isinstance(workflow_id, str) and isinstance(seq, int):
+            self.replay.record(workflow_id, seq, message.get("event", ""), payload, message.get("namespace") or "/")
+
     async def emit_thought(
         self,
         workflow_id: str,
@@ -136,7 +463,7 @@ class SocketManager:
             workflow_id: Workflow/conversation ID
             content: Thought content
             node_name: Optional node name (plan, draft, critique, finalize)
-            sid: Optional specific socket ID (broadcasts if None)
+            sid: Optional specific socket ID (workflow and owner rooms if None)
         """
         # Build data payload - conditionally include node_name
         data = {"content": content}
@@ -151,7 +478,7 @@ class SocketManager:
         }
         
         try:
-            await self.sio.emit("agent:thought", payload, room=sid)
+            await self._emit("agent:thought", payload, workflow_id, sid)
             logger.debug(f"Emitted agent:thought: workflow_id={workflow_id}, node={node_name}")
         except Exception as e:
             logger.error(f"Failed to emit agent:thought: {e}")
@@ -162,7 +489,8 @@ class SocketManager:
         tool_name: str,
         status: str,
         message: str,
-        sid: Optional[str] = None
+        sid: Optional[str] = None,
+        progress: Optional[Dict[str, Any]] = None
     ) -> None:
         """
         Emit agent:tool_call event.
@@ -173,20 +501,25 @@ class SocketManager:
             status: Status (e.g., "in_progress", "completed")
             message: Status message
             sid: Optional specific socket ID
+            progress: Optional progress details (progress, total, preview_url)
         """
+        data = {
+            "tool_name": tool_name,
+            "status": status,
+            "message": message
+        }
+        if progress is not None:
+            data["progress"] = progress
+        
         payload = {
             "type": "tool_call",
             "workflowId": workflow_id,
-            "data": {
-                "tool_name": tool_name,
-                "status": status,
-                "message": message
-            },
+            "data": data,
             "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
         }
         
         try:
-            await self.sio.emit("agent:tool_call", payload, room=sid)
+            await self._emit("agent:tool_call", payload, workflow_id, sid)
             logger.debug(f"Emitted agent:tool_call: workflow_id={workflow_id}, tool={tool_name}")
         except Exception as e:
             logger.error(f"Failed to emit agent:tool_call: {e}")
@@ -213,7 +546,7 @@ class SocketManager:
         }
         
         try:
-            await self.sio.emit("agent:result", payload, room=sid)
+            await self._emit("agent:result", payload, workflow_id, sid)
             logger.info(f"Emitted agent:result: workflow_id={workflow_id}")
         except Exception as e:
             logger.error(f"Failed to emit agent:result: {e}")
@@ -248,7 +581,7 @@ class SocketManager:
         }
         
         try:
-            await self.sio.emit("agent:error", payload, room=sid)
+            await self._emit("agent:error", payload, workflow_id, sid)
             logger.warning(f"Emitted agent:error: workflow_id={workflow_id}, code={error_code}")
         except Exception as e:
             logger.error(f"Failed to emit agent:error: {e}")
@@ -261,13 +594,13 @@ class SocketManager:
         """Get number of connected clients."""
         return len(self._connected_users)
 
-    async def broadcast(
+    async def emit_event(
         self,
         payload: Dict[str, Any],
         namespace: str = "/agents",
     ) -> None:
         """
-        Broadcast a generic event payload to all connected clients.
+        Emit a generic event payload to the clients of its workflow.
 
         Args:
             payload: Event payload with type, workflowId, data, timestamp
@@ -277,10 +610,10 @@ class SocketManager:
             event_type = payload.get("type")
             if event_type:
                 event_name = f"agent:{event_type}"
-                await self.sio.emit(event_name, payload, namespace=namespace)
-                logger.debug(f"Broadcasted {event_name}: workflow_id={payload.get('workflowId')}")
+                await self._emit(event_name, payload, payload.get("workflowId"), namespace=namespace)
+                logger.debug(f"Emitted {event_name}: workflow_id={payload.get('workflowId')}")
         except Exception as e:
-            logger.error(f"Failed to broadcast event: {e}")
+            logger.error(f"Failed to emit event: {e}")
 
 
 # Singleton instance
@@ -15,10 +15,21 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import get_settings
 from app.core.factory import ProviderFactory
+from app.core.image_factory import ImageProviderFactory
 from app.core.langchain_init import init_langsmith, get_langsmith_config
 from app.infrastructure.database import close_db, init_db
 from app.infrastructure.generators import DeepSeekGenerator
-from app.interface.routes import auth_router, copywriting_router, images_router, product_packages_router, assets_router, insights_router, user_settings_router
+from app.infrastructure.storage import shutdown_upload_executor
+from app.infrastructure.storage.derivatives import shutdown_derivative_executor
+from app.application.orchestration.backends import create_video_job_provider
+from app.infrastructure.video import (
+    init_video_job_manager,
+    shutdown_slideshow_executor,
+    shutdown_video_job_manager,
+)
+from app.infrastructure.vision import shutdown_vision_executor
+from app.interface.routes import auth_router, copywriting_router, images_router, product_packages_router, assets_router, insights_router, user_settings_router, files_router, video_jobs_router
+from app.interface.routes.product_packages import resume_parked_workflow
 from app.interface.routes.projects import router as projects_router
 from app.interface.routes.debug import router as debug_router
 from app.interface.ws import socket_manager
@@ -114,9 +125,20 @@ async def lifespan(app: FastAPI):
 
     await init_db()
     _ensure_provider_registration()
+
+    # Track asynchronous video jobs (reloads jobs left pending by a restart)
+    video_jobs = init_video_job_manager(create_video_job_provider(), resume_parked_workflow)
+    if video_jobs is not None:
+        await video_jobs.start()
     
     yield
     # Shutdown
+    await shutdown_video_job_manager()
+    await ImageProviderFactory.shutdown()
+    shutdown_upload_executor(wait=False)
+    shutdown_derivative_executor(wait=False)
+    shutdown_slideshow_executor(wait=False)
+    shutdown_vision_executor(wait=False)
     await close_db()
 
 
@@ -150,6 +172,8 @@ fastapi_app.include_router(projects_router, prefix="/api/v1")
 fastapi_app.include_router(assets_router, prefix="/api/v1")
 fastapi_app.include_router(insights_router, prefix="/api/v1")
 fastapi_app.include_router(user_settings_router, prefix="/api/v1")
+fastapi_app.include_router(files_router, prefix="/api/v1")
+fastapi_app.include_router(video_jobs_router, prefix="/api/v1")
 fastapi_app.include_router(debug_router, prefix="/api/v1")
 
 
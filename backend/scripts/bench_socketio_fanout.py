@@ -0,0 +1,183 @@
+"""
+Socket.IO 跨 worker 投递延迟基准测试
+
+在一个进程内启动多个 SocketManager 模拟多个 worker，通过指定的客户端管理器
+(memory: 进程内总线, redis: AsyncRedisManager) 共享事件。worker 0 发出事件，
+测量每个事件到达本 worker 客户端 (local) 与其他 worker 客户端 (remote) 的延迟。
+
+客户端连接不经过网络：测量从 emit 到服务端把数据包交给 engine.io 传输层为止，
+也就是消息队列 + 各 worker 房间投递的开销。
+
+Usage:
+    python scripts/bench_socketio_fanout.py --backend memory
+    python scripts/bench_socketio_fanout.py --backend redis --redis-url redis://localhost:6379/0
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import socketio
+
+from app.core.config import settings
+from app.interface.ws.client_manager import (
+    REDIS_AVAILABLE,
+    InProcessBus,
+    InProcessPubSubManager,
+    RedisPubSubManager,
+)
+from app.interface.ws.socket_manager import SocketManager, user_room
+
+OWNER = "bench-user"
+WORKFLOW_ID = "bench-workflow"
+
+
+def percentiles(samples: List[float]) -> Dict[str, Optional[float]]:
+    """p50/p95/p99/max of latency samples, in ms."""
+    if not samples:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    ordered = sorted(samples)
+
+    def at(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+
+    return {"p50": at(0.50), "p95": at(0.95), "p99": at(0.99), "max": round(ordered[-1] * 1000, 3)}
+
+
+class Worker:
+    """One simulated worker with fake connections in the owner's room."""
+
+    def __init__(self, index: int, client_manager: socketio.AsyncManager, recorder: "Recorder"):
+        self.index = index
+        self.manager = SocketManager(client_manager=client_manager)
+        self.recorder = recorder
+        sio = self.manager.sio
+
+        async def send_eio_packet(eio_sid: str, eio_pkt: Any) -> None:
+            received_at = time.perf_counter()
+            pkt = sio.packet_class(encoded_packet=eio_pkt.data)
+            recorder.record(self.index, pkt.data[1], received_at)
+
+        sio._send_eio_packet = send_eio_packet
+        sio.manager_initialized = True
+        sio.manager.initialize()
+
+    async def connect_clients(self, count: int) -> None:
+        for i in range(count):
+            sid = await self.manager.sio.manager.connect(f"eio-{self.index}-{i}", "/")
+            await self.manager.sio.enter_room(sid, user_room(OWNER), namespace="/")
+
+    async def close(self) -> None:
+        close = getattr(self.manager.sio.manager, "close", None)
+        if close is not None:
+            await close()
+        thread = getattr(self.manager.sio.manager, "thread", None)
+        if thread is not None and not thread.done():
+            thread.cancel()
+
+
+class Recorder:
+    """Collects delivery latencies and signals when an event reached every client."""
+
+    def __init__(self, expected: int):
+        self.expected = expected
+        self.local: List[float] = []
+        self.remote: List[float] = []
+        self.event_latencies: List[float] = []
+        self._pending = 0
+        self._done = asyncio.Event()
+
+    def start(self) -> Dict[str, Any]:
+        self._pending = self.expected
+        self._done.clear()
+        return {"sentAt": time.perf_counter()}
+
+    def record(self, worker: int, payload: Dict[str, Any], received_at: float) -> None:
+        latency = received_at - payload["data"]["sentAt"]
+        (self.local if worker == 0 else self.remote).append(latency)
+        self._pending -= 1
+        if self._pending == 0:
+            self.event_latencies.append(latency)
+            self._done.set()
+
+    async def wait(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._done.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+def build_client_manager(backend: str, redis_url: str, channel: str, bus: InProcessBus) -> socketio.AsyncManager:
+    if backend == "redis":
+        if not REDIS_AVAILABLE:
+            raise SystemExit("The redis backend needs the redis package (pip install redis)")
+        return RedisPubSubManager(redis_url, channel=channel)
+    return InProcessPubSubManager(channel=channel, bus=bus)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    bus = InProcessBus()
+    channel = f"socketio-bench-{uuid.uuid4().hex[:8]}"
+    recorder = Recorder(expected=args.workers * args.clients)
+    workers = [
+        Worker(i, build_client_manager(args.backend, args.redis_url, channel, bus), recorder)
+        for i in range(args.workers)
+    ]
+    for worker in workers:
+        await worker.connect_clients(args.clients)
+    workers[0].manager.register_workflow(WORKFLOW_ID, OWNER)
+    # Let the Redis listeners subscribe before the first event
+    await asyncio.sleep(0.5 if args.backend == "redis" else 0)
+
+    lost = 0
+    started = time.perf_counter()
+    try:
+        for _ in range(args.events):
+            await workers[0].manager.emit_event(
+                {"type": "progress", "workflowId": WORKFLOW_ID, "data": recorder.start()},
+                namespace="/",
+            )
+            if not await recorder.wait(args.timeout):
+                lost += 1
+        elapsed = time.perf_counter() - started
+    finally:
+        for worker in workers:
+            await worker.close()
+
+    return {
+        "backend": args.backend,
+        "workers": args.workers,
+        "clients_per_worker": args.clients,
+        "events": args.events,
+        "incomplete_events": lost,
+        "events_per_second": round(args.events / elapsed, 1),
+        "local_delivery_ms": percentiles(recorder.local),
+        "remote_delivery_ms": percentiles(recorder.remote),
+        "event_complete_ms": percentiles(recorder.event_latencies),
+        "mean_remote_ms": round(statistics.mean(recorder.remote) * 1000, 3) if recorder.remote else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Measure cross-worker Socket.IO delivery latency.")
+    parser.add_argument("--backend", choices=["memory", "redis"], default="memory", help="client manager")
+    parser.add_argument("--redis-url", default=settings.redis_url, help="Redis URL for --backend redis")
+    parser.add_argument("--workers", type=int, default=2, help="simulated workers")
+    parser.add_argument("--clients", type=int, default=10, help="connections per worker in the owner's room")
+    parser.add_argument("--events", type=int, default=1000, help="events emitted one after another")
+    parser.add_argument("--timeout", type=float, default=2.0, help="seconds to wait for each event")
+    args = parser.parse_args(argv)
+
+    summary = asyncio.run(run(args))
+    print(json.dumps(summary, indent=2))
+    return summary
+
+
+if __name__ == "__main__":
+    main()
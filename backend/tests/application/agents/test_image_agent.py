@@ -160,6 +160,87 @@ class TestGenerateImageNode:
         assert result["current_stage"] == "generate_image"
         assert "picsum" in result["image_url"] or "placeholder" in result["image_url"]
 
+    
+    @pytest.mark.asyncio
+    async def test_progress_emitter_throttles_but_keeps_previews(self):
+        """Rapid progress updates are throttled; previews are always relayed."""
+        agent = ImageAgent()
+        emit_progress = agent._make_progress_emitter("wf-1")
+        
+        with patch("app.interface.ws.socket_manager.socket_manager.emit_tool_call", new_callable=AsyncMock) as emit_tool_call:
+            await emit_progress({"progress": 1, "total": 4, "message": None, "preview_url": None})
+            await emit_progress({"progress": 2, "total": 4, "message": None, "preview_url": None})
+            await emit_progress({"progress": 3, "total": 4, "message": None, "preview_url": "data:image/png;base64,AA"})
+        
+        assert emit_tool_call.await_count == 2
+        first = emit_tool_call.await_args_list[0].kwargs
+        assert first["status"] == "in_progress"
+        assert first["message"] == "Generating image (1/4)"
+        assert emit_tool_call.await_args_list[1].kwargs["progress"]["preview_url"].startswith("data:")
+    
+    @pytest.mark.asyncio
+    async def test_progress_emitter_always_sends_final_update(self):
+        """The update that completes the generation is never throttled."""
+        agent = ImageAgent()
+        emit_progress = agent._make_progress_emitter("wf-1")
+        
+        with patch("app.interface.ws.socket_manager.socket_manager.emit_tool_call", new_callable=AsyncMock) as emit_tool_call:
+            for step in range(1, 11):
+                await emit_progress({"progress": step, "total": 10, "message": None, "preview_url": None})
+        
+        messages = [call.kwargs["message"] for call in emit_tool_call.await_args_list]
+        assert messages == ["Generating image (1/10)", "Generating image (10/10)"]
+
+
+class TestImageAgentBatch:
+    """Tests for batch image generation."""
+    
+    def test_parse_batch_optimized_json(self):
+        """JSON array output maps to prompts in order."""
+        content = 'Here you go:\n["opt A", "opt B"]'
+        
+        assert ImageAgent._parse_batch_optimized(content, ["A", "B"]) == ["opt A", "opt B"]
+    
+    def test_parse_batch_optimized_falls_back(self):
+        """Malformed or mis-sized output keeps original prompts."""
+        assert ImageAgent._parse_batch_optimized("not json", ["A", "B"]) == ["A", "B"]
+        assert ImageAgent._parse_batch_optimized('["only one"]', ["A", "B"]) == ["A", "B"]
+    
+    @pytest.mark.asyncio
+    async def test_run_batch_optimizes_once_and_keeps_partial_results(self):
+        """Distinct prompts are optimized in one call; failed items do not abort the batch."""
+        calls = {"count": 0}
+        
+        class FlakyGenerator:
+            async def __aenter__(self):
+                return self
+            
+            async def __aexit__(self, *args):
+                return None
+            
+            async def generate(self, request):
+                calls["count"] += 1
+                if request.prompt == "opt B":
+                    raise RuntimeError("provider down")
+                return ImageArtifact(url=f"https://img/{calls['count']}.png", prompt=request.prompt)
+        
+        agent = ImageAgent(image_generator=FlakyGenerator())
+        optimize = AsyncMock(return_value=["opt A", "opt B"])
+        persist = AsyncMock()
+        
+        with patch.object(agent, "optimize_prompts_batch", optimize), \
+             patch.object(agent, "_persist_batch", persist), \
+             patch("app.interface.ws.socket_manager.socket_manager.emit_thought", new_callable=AsyncMock), \
+             patch("app.interface.ws.socket_manager.socket_manager.emit_result", new_callable=AsyncMock) as emit_result:
+            result = await agent.run_batch(prompts=["A", "A", "B"], workflow_id=str(uuid4()))
+        
+        optimize.assert_awaited_once_with(["A", "B"], 512, 512)
+        assert [item["status"] for item in result["items"]] == ["generated", "generated", "failed"]
+        assert result["items"][0]["optimized_prompt"] == "opt A"
+        persist.assert_awaited_once()
+        # Three per-item events plus the final completed event
+        assert emit_result.await_count == 4
+
 
 class TestMockMCPImageGenerator:
     """Tests for MockMCPImageGenerator."""
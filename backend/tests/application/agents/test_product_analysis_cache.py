@@ -0,0 +1,149 @@
+"""
+Unit tests for ProductAnalysisAgent analysis caching.
+"""
+import io
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.application.agents.product_analysis_agent import ProductAnalysisAgent
+from app.infrastructure.storage.input_image import InputImageLoader
+from app.infrastructure.storage.local_storage import LocalStorageClient
+from app.infrastructure.storage.minio_client import UploadMetrics
+from app.infrastructure.vision.analysis_cache import AnalysisCache
+
+
+IMAGE = b"\x89PNG\r\n\x1a\n fake product photo"
+
+
+@pytest.fixture
+async def storage(tmp_path):
+    storage = LocalStorageClient(
+        root_dir=str(tmp_path),
+        base_url="http://test/api/v1/files",
+        metrics=UploadMetrics(),
+    )
+    await storage.upload_stream(io.BytesIO(IMAGE), "uploads/photo.png", "image/png")
+    await storage.upload_stream(io.BytesIO(IMAGE), "uploads/copy-of-photo.png", "image/png")
+    return storage
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    return str(tmp_path / "wf-1")
+
+
+@pytest.fixture
+def make_agent(storage):
+    def make(cache):
+        vision = SimpleNamespace(
+            vision_client=None,
+            analyze_product_image=AsyncMock(
+                side_effect=lambda url, image_bytes=None: {"category": "shoes", "source": url}
+            ),
+        )
+        tools = SimpleNamespace(vision=vision, filesystem=MagicMock())
+        return ProductAnalysisAgent(tools, cache=cache, image_loader=InputImageLoader(storage))
+
+    return make
+
+
+def request(url, background="summer", **options):
+    return {"image_url": url, "background": background, "options": options}
+
+
+@pytest.mark.asyncio
+class TestProductAnalysisCache:
+    async def test_same_content_hits_across_urls(self, make_agent, workspace):
+        cache = AnalysisCache()
+        agent = make_agent(cache)
+
+        first = await agent.run(request("http://test/api/v1/files/uploads/photo.png"), workspace)
+        second = await agent.run(request("http://test/api/v1/files/uploads/copy-of-photo.png"), workspace)
+
+        assert agent.tools.vision.analyze_product_image.await_count == 1
+        assert second == first
+        assert cache.stats()["hits"] == 1
+        # The report is still written on a hit
+        assert agent.tools.filesystem.write_file.call_count == 2
+
+    async def test_input_image_is_loaded_once_into_workspace(self, make_agent, workspace):
+        agent = make_agent(AnalysisCache())
+        url = "http://test/api/v1/files/uploads/photo.png"
+
+        await agent.run(request(url, use_analysis_cache=False), workspace)
+        await agent.run(request(url, use_analysis_cache=False), workspace)
+
+        calls = agent.tools.vision.analyze_product_image.await_args_list
+        assert [call.kwargs["image_bytes"] for call in calls] == [IMAGE, IMAGE]
+        assert agent.image_loader.downloads == 1
+        with open(f"{workspace}/input/product_image.png", "rb") as f:
+            assert f.read() == IMAGE
+
+    async def test_background_changes_key(self, make_agent, workspace):
+        agent = make_agent(AnalysisCache())
+        url = "http://test/api/v1/files/uploads/photo.png"
+
+        await agent.run(request(url, "summer"), workspace)
+        await agent.run(request(url, "winter"), workspace)
+        await agent.run(request(url, "  summer "), workspace)
+
+        assert agent.tools.vision.analyze_product_image.await_count == 2
+
+    async def test_bypass_option(self, make_agent, workspace):
+        cache = AnalysisCache()
+        agent = make_agent(cache)
+        url = "http://test/api/v1/files/uploads/photo.png"
+
+        await agent.run(request(url), workspace)
+        await agent.run(request(url, use_analysis_cache=False), workspace)
+
+        assert agent.tools.vision.analyze_product_image.await_count == 2
+        assert cache.stats()["hits"] == 0
+
+    async def test_version_change_misses(self, make_agent, workspace):
+        cache = AnalysisCache()
+        agent = make_agent(cache)
+        url = "http://test/api/v1/files/uploads/photo.png"
+
+        await agent.run(request(url), workspace)
+        agent.ANALYSIS_VERSION = "2"
+        await agent.run(request(url), workspace)
+
+        assert agent.tools.vision.analyze_product_image.await_count == 2
+
+    async def test_hit_returns_independent_copy(self, make_agent, workspace):
+        agent = make_agent(AnalysisCache())
+        url = "http://test/api/v1/files/uploads/photo.png"
+
+        first = await agent.run(request(url), workspace)
+        first["category"] = "mutated"
+        second = await agent.run(request(url), workspace)
+
+        assert second["category"] == "shoes"
+
+    async def test_unhashable_source_is_not_cached(self, make_agent, workspace):
+        cache = AnalysisCache()
+        agent = make_agent(cache)
+
+        await agent.run({"image_asset_id": "1234", "background": "x"}, workspace)
+        await agent.run({"image_asset_id": "1234", "background": "x"}, workspace)
+
+        assert agent.tools.vision.analyze_product_image.await_count == 2
+        assert cache.stats()["size"] == 0
+
+
+class TestAnalysisCache:
+    def test_ttl_and_lru(self):
+        cache = AnalysisCache(max_entries=2, ttl_seconds=0)
+        cache.set("a", {"x": 1})
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+
+        cache = AnalysisCache(max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.set(key, {"key": key})
+        assert cache.get("a") is None
+        assert cache.get("c") == {"key": "c"}
+        assert cache.stats()["evictions"] == 1
@@ -0,0 +1,189 @@
+"""
+Unit tests for ImageSubagent concurrent scene generation.
+"""
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.application.agents.subagents import ImageSubagent
+from app.application.tools.image_tools import ImageTools
+
+
+class FakeImageTools:
+    """Records concurrency and optionally fails selected scenes."""
+
+    def __init__(self, delays=None, fail_prompts=()):
+        self.delays = delays or {}
+        self.fail_prompts = set(fail_prompts)
+        self.active = 0
+        self.peak = 0
+
+    async def generate_image(self, prompt, width, height):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(prompt, 0.02))
+            if prompt in self.fail_prompts:
+                raise RuntimeError(f"provider failed for {prompt}")
+            return {"url": f"https://img/{prompt}.png", "prompt": prompt}
+        finally:
+            self.active -= 1
+
+    async def save_asset(self, artifact, user_id, workflow_id, label):
+        return {
+            "asset_id": str(uuid4()),
+            "asset_type": "image",
+            "url": artifact["url"],
+            "label": label,
+        }
+
+
+def make_tools(image_tools):
+    reports = {}
+    return SimpleNamespace(
+        image=image_tools,
+        vision=SimpleNamespace(
+            build_image_generation_prompt=lambda scene, analysis, background: scene
+        ),
+        filesystem=SimpleNamespace(
+            write_json=lambda path, payload: reports.__setitem__(path, payload)
+        ),
+        reports=reports,
+    )
+
+
+def make_request(**options):
+    return {
+        "user_id": str(uuid4()),
+        "workflow_id": str(uuid4()),
+        "background": "test",
+        "options": {"image_variants": 3, **options},
+    }
+
+
+ANALYSIS = {"suggested_scenes": ["hero", "lifestyle", "detail"]}
+
+
+class TestImageSubagentConcurrency:
+    """Tests for concurrent scene generation."""
+
+    @pytest.mark.asyncio
+    async def test_scenes_run_concurrently_and_keep_order(self):
+        """Slow first scene must not reorder results."""
+        image = FakeImageTools(delays={"hero": 0.1, "lifestyle": 0.01, "detail": 0.05})
+        tools = make_tools(image)
+        subagent = ImageSubagent(agent=None, tools=tools, max_concurrency=3)
+
+        results = await subagent.run(ANALYSIS, make_request(), "/ws")
+
+        assert [r["scene"] for r in results] == ["hero", "lifestyle", "detail"]
+        assert image.peak == 3
+        assert all("duration_ms" in r for r in results)
+
+    @pytest.mark.asyncio
+    async def test_per_workflow_concurrency_option(self):
+        """image_concurrency option bounds in-flight scenes."""
+        image = FakeImageTools()
+        subagent = ImageSubagent(agent=None, tools=make_tools(image), max_concurrency=3)
+
+        await subagent.run(ANALYSIS, make_request(image_concurrency=1), "/ws")
+
+        assert image.peak == 1
+
+    @pytest.mark.asyncio
+    async def test_partial_failure_keeps_successful_scenes(self):
+        """One failing scene is reported but others are returned."""
+        image = FakeImageTools(fail_prompts={"lifestyle"})
+        tools = make_tools(image)
+        subagent = ImageSubagent(agent=None, tools=tools)
+
+        results = await subagent.run(ANALYSIS, make_request(), "/ws")
+
+        assert [r["scene"] for r in results] == ["hero", "detail"]
+        report = tools.reports["/ws/logs/image_generation.json"]
+        statuses = {s["scene"]: s["status"] for s in report["scenes"]}
+        assert statuses == {"hero": "completed", "lifestyle": "failed", "detail": "completed"}
+
+    @pytest.mark.asyncio
+    async def test_all_scenes_failing_raises(self):
+        """Raise when no scene could be generated."""
+        image = FakeImageTools(fail_prompts={"hero", "lifestyle", "detail"})
+        subagent = ImageSubagent(agent=None, tools=make_tools(image))
+
+        with pytest.raises(RuntimeError, match="All scenes failed"):
+            await subagent.run(ANALYSIS, make_request(), "/ws")
+
+
+class SmallFirstImageTools(FakeImageTools):
+    """Renders a thumbnail-sized image on the first call per scene."""
+
+    def __init__(self, small_scenes):
+        super().__init__()
+        self.small_scenes = set(small_scenes)
+        self.calls = {}
+
+    async def generate_image(self, prompt, width, height):
+        artifact = await super().generate_image(prompt, width, height)
+        self.calls[prompt] = self.calls.get(prompt, 0) + 1
+        small = prompt in self.small_scenes and self.calls[prompt] == 1
+        return {**artifact, "width": 256 if small else width, "height": 256 if small else height}
+
+
+def size_check(scene, artifact):
+    return ["too small"] if artifact["width"] < 512 else []
+
+
+class TestImageSubagentQA:
+    """Tests for per-image QA checks."""
+
+    @pytest.mark.asyncio
+    async def test_blocking_image_is_regenerated(self):
+        image = SmallFirstImageTools(small_scenes={"lifestyle"})
+        tools = make_tools(image)
+        subagent = ImageSubagent(agent=None, tools=tools)
+
+        results = await subagent.run(ANALYSIS, make_request(), "/ws", check=size_check, max_regenerations=1)
+
+        assert [r["scene"] for r in results] == ["hero", "lifestyle", "detail"]
+        assert image.calls == {"hero": 1, "lifestyle": 2, "detail": 1}
+        attempts = {s["scene"]: s["attempts"] for s in tools.reports["/ws/logs/image_generation.json"]["scenes"]}
+        assert attempts["lifestyle"] == 2
+
+    @pytest.mark.asyncio
+    async def test_image_still_blocking_counts_as_failed(self):
+        image = SmallFirstImageTools(small_scenes={"detail"})
+        tools = make_tools(image)
+        subagent = ImageSubagent(agent=None, tools=tools)
+
+        results = await subagent.run(ANALYSIS, make_request(), "/ws", check=size_check, max_regenerations=0)
+
+        assert [r["scene"] for r in results] == ["hero", "lifestyle"]
+        scenes = {s["scene"]: s for s in tools.reports["/ws/logs/image_generation.json"]["scenes"]}
+        assert scenes["detail"]["status"] == "failed"
+        assert scenes["detail"]["error"] == "QA: too small"
+
+
+class TestImageToolsProviderSemaphore:
+    """Tests for the global provider semaphore in ImageTools."""
+
+    @pytest.mark.asyncio
+    async def test_provider_calls_bounded_by_semaphore(self):
+        """Concurrent generate_image calls respect the provider semaphore."""
+        state = {"active": 0, "peak": 0}
+
+        class Provider:
+            async def generate(self, prompt, width, height):
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+                await asyncio.sleep(0.01)
+                state["active"] -= 1
+                return {"url": "u", "prompt": prompt}
+
+        factory = SimpleNamespace(get_provider=lambda name: Provider())
+        tools = ImageTools(provider_factory=factory, provider_semaphore=asyncio.Semaphore(2))
+
+        await asyncio.gather(*[tools.generate_image(prompt=str(i)) for i in range(6)])
+
+        assert state["peak"] == 2
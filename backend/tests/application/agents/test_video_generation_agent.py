@@ -0,0 +1,61 @@
+"""
+Tests for saving videos in VideoGenerationAgent.
+"""
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.application.agents.video_generation_agent import VideoGenerationAgent
+
+
+REQUEST = {"user_id": str(uuid4()), "workflow_id": "wf-1", "options": {"video_duration_sec": 10}}
+
+PRIMARY = {
+    "url": "https://cdn/video.mp4",
+    "provider": "video",
+    "is_fallback": False,
+    "secondary": {"url": "https://cdn/slideshow.webp", "provider": "slideshow", "metadata": {"images": []}},
+}
+
+
+@pytest.fixture
+def agent():
+    tools = MagicMock()
+    tools.video.save_asset = AsyncMock(side_effect=lambda artifact, user_id, workflow_id: {
+        "asset_id": artifact["provider"],
+        "asset_type": "video",
+        "url": artifact["url"],
+        "is_fallback": artifact["is_fallback"],
+    })
+    tools.video.generate_video = AsyncMock(side_effect=lambda **kwargs: {
+        **PRIMARY, "secondary": dict(PRIMARY["secondary"]),
+    })
+    return VideoGenerationAgent(tools)
+
+
+class TestSecondarySlideshow:
+    async def test_kept_slideshow_is_saved_as_secondary_asset(self, agent):
+        saved = await agent.run({}, [], REQUEST, "/tmp/ws")
+
+        assert saved["asset_id"] == "video"
+        assert saved["secondary"]["asset_id"] == "slideshow"
+        primary, secondary = (call.kwargs["artifact"] for call in agent.tools.video.save_asset.await_args_list)
+        assert "secondary" not in primary
+        assert secondary["is_fallback"] is True
+        assert secondary["metadata"]["role"] == "secondary"
+
+    async def test_secondary_save_failure_keeps_primary(self, agent):
+        save = agent.tools.video.save_asset.side_effect
+
+        def save_primary_only(artifact, user_id, workflow_id):
+            if artifact["provider"] != "video":
+                raise RuntimeError("Failed to save video asset: db down")
+            return save(artifact, user_id, workflow_id)
+
+        agent.tools.video.save_asset.side_effect = save_primary_only
+
+        saved = await agent.run({}, [], REQUEST, "/tmp/ws")
+
+        assert saved["asset_id"] == "video"
+        assert "secondary" not in saved
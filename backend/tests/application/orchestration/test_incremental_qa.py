@@ -0,0 +1,146 @@
+"""
+DeepOrchestrator tests for incremental QA while artifacts are generated.
+"""
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.application.orchestration.deep_orchestrator import DeepOrchestrator
+from app.application.services.qa_gate import IncrementalQA, QAGateError
+from app.infrastructure.text.copy_index import CopyDuplicateIndex, InMemoryCopySignatureStore
+from app.infrastructure.text.minhash import MinHasher
+
+
+PACKAGE_ID = uuid4()
+
+ANALYSIS = {"category": "backpack", "keywords": [], "suggested_scenes": ["hero"]}
+
+LONG_COPY = (
+    "This waterproof backpack keeps your laptop dry on any commute. "
+    "The lightweight frame weighs under a kilo, and padded straps make it "
+    "the commuter bag you will carry every day."
+)
+
+
+def copy_asset(channel, content):
+    return {"channel": channel, "content": content, "asset_id": f"copy_{channel}", "path": ""}
+
+
+def make_orchestrator(gate, copy_runs, copy_duplicates=None):
+    tools = MagicMock()
+    tools.filesystem.create_workspace.return_value = "/tmp/ws"
+    tools.filesystem.get_workspace_path.return_value = "/tmp/ws"
+    tools.storage.create_package = AsyncMock(return_value={"package_id": PACKAGE_ID})
+    tools.storage.update_package_status = AsyncMock()
+    tools.storage.update_analysis = AsyncMock()
+    tools.storage.update_qa_report = AsyncMock()
+    tools.storage.link_asset = AsyncMock()
+
+    orchestrator = DeepOrchestrator(
+        tools=tools,
+        repository=MagicMock(get_by_workflow_id=AsyncMock(return_value=None)),
+        copywriting_agent=MagicMock(),
+        image_agent=MagicMock(),
+        incremental_qa=gate,
+        copy_duplicates=copy_duplicates,
+    )
+    orchestrator.analysis_agent.run = AsyncMock(return_value=ANALYSIS)
+    orchestrator.copywriting_subagent.run = AsyncMock(side_effect=copy_runs)
+    orchestrator.image_subagent.run = AsyncMock(return_value=[{"asset_id": "i1", "url": "https://cdn/i1.png"}])
+    orchestrator.video_agent.run = AsyncMock(return_value={"asset_id": "v1", "url": "https://cdn/v.mp4"})
+    orchestrator.qa_agent.run = AsyncMock(return_value={"score": 0.9})
+    return orchestrator
+
+
+REQUEST = {"background": "summer sale", "options": {"require_approval": False}}
+
+
+@pytest.mark.asyncio
+@patch("app.application.orchestration.deep_orchestrator.socket_manager")
+class TestIncrementalQA:
+    async def test_blocking_channel_is_regenerated_alone(self, socket_manager):
+        socket_manager.emit_event = AsyncMock()
+        first = [
+            copy_asset("product_page", LONG_COPY),
+            copy_asset("social_post", "Too short."),
+            copy_asset("ad_short", "Waterproof. Lightweight."),
+        ]
+        retry = [copy_asset("social_post", LONG_COPY)]
+        orchestrator = make_orchestrator(IncrementalQA(max_regenerations=1), [first, retry])
+
+        result = await orchestrator.run(dict(REQUEST), user_id=uuid4())
+
+        assert result["status"] == "completed"
+        second_call = orchestrator.copywriting_subagent.run.await_args_list[1]
+        assert second_call.kwargs["channels"] == ["social_post"]
+        assert second_call.kwargs["version"] == 2
+        copy_assets = orchestrator.qa_agent.run.await_args.kwargs["copy_assets"]
+        assert [a["channel"] for a in copy_assets] == ["product_page", "social_post", "ad_short"]
+        assert copy_assets[1]["content"] == LONG_COPY
+
+    async def test_persistent_blocking_copy_skips_downstream_stages(self, socket_manager):
+        socket_manager.emit_event = AsyncMock()
+        broken = [copy_asset(channel, "") for channel in ("product_page", "social_post", "ad_short")]
+        orchestrator = make_orchestrator(IncrementalQA(max_regenerations=1), [broken, broken])
+
+        with pytest.raises(QAGateError, match="product_page copy is empty"):
+            await orchestrator.run(dict(REQUEST), user_id=uuid4())
+
+        assert orchestrator.copywriting_subagent.run.await_count == 2
+        orchestrator.image_subagent.run.assert_not_called()
+        orchestrator.video_agent.run.assert_not_called()
+
+    async def test_without_short_circuit_workflow_continues(self, socket_manager):
+        socket_manager.emit_event = AsyncMock()
+        broken = [copy_asset("product_page", "")]
+        gate = IncrementalQA(max_regenerations=0, short_circuit=False)
+        orchestrator = make_orchestrator(gate, [broken])
+
+        result = await orchestrator.run(dict(REQUEST), user_id=uuid4())
+
+        assert result["status"] == "completed"
+        assert orchestrator.copywriting_subagent.run.await_count == 1
+
+    async def test_image_check_is_passed_to_subagent(self, socket_manager):
+        socket_manager.emit_event = AsyncMock()
+        copy = [copy_asset(channel, LONG_COPY) for channel in ("product_page", "social_post", "ad_short")]
+        orchestrator = make_orchestrator(IncrementalQA(max_regenerations=2), [copy])
+
+        await orchestrator.run(dict(REQUEST), user_id=uuid4())
+
+        kwargs = orchestrator.image_subagent.run.await_args.kwargs
+        assert kwargs["max_regenerations"] == 2
+        assert kwargs["check"]("hero", {"url": ""}) == ["hero image has no URL"]
+
+    async def test_gate_sees_duplicates_and_only_final_copy_is_indexed(self, socket_manager):
+        socket_manager.emit_event = AsyncMock()
+        user_id = uuid4()
+        store = InMemoryCopySignatureStore()
+        index = CopyDuplicateIndex(store)
+        await index.register(user_id, "earlier-wf", [copy_asset("product_page", LONG_COPY)])
+
+        first = [
+            copy_asset("product_page", LONG_COPY),
+            copy_asset("social_post", "Too short."),
+            copy_asset("ad_short", "Waterproof. Lightweight."),
+        ]
+        retry = [copy_asset("social_post", LONG_COPY)]
+        orchestrator = make_orchestrator(IncrementalQA(max_regenerations=1), [first, retry], index)
+
+        result = await orchestrator.run(dict(REQUEST), user_id=user_id)
+
+        # The gate log records the duplicate issue on both attempts
+        history = next(
+            call.args[1] for call in orchestrator.tools.filesystem.write_json.call_args_list
+            if call.args[0].endswith("qa_copy_gate.json")
+        )
+        issues = [issue for attempt in history for check in attempt["checks"] for issue in check["issues"]]
+        assert "product_page copy near-duplicates copy of other products" in issues
+        assert "social_post copy near-duplicates copy of other products" in issues
+
+        # The blocked draft is not left in the index; the regenerated copy replaced it
+        workflow_id = result["workflow_id"]
+        stored = {s.channel: s for s in await store.list_for_user(str(user_id)) if s.workflow_id == workflow_id}
+        assert set(stored) == {"product_page", "social_post", "ad_short"}
+        assert stored["social_post"].signature == MinHasher.to_bytes(index.hasher.signature(LONG_COPY))
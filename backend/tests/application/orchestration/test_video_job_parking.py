@@ -0,0 +1,207 @@
+"""
+DeepOrchestrator tests for parking workflows on asynchronous video jobs.
+"""
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.application.orchestration.deep_orchestrator import DeepOrchestrator
+from app.infrastructure.video.jobs import (
+    JOB_SUCCEEDED,
+    JOB_TIMED_OUT,
+    InMemoryVideoJobStore,
+    VideoJobManager,
+    VideoJobProvider,
+    VideoJobStatus,
+)
+from app.interface.routes import product_packages
+
+
+PACKAGE_ID = uuid4()
+
+
+def make_tools():
+    """ToolRegistry stand-in with async storage/video tools."""
+    tools = MagicMock()
+    tools.filesystem.create_workspace.return_value = "/tmp/ws"
+    tools.filesystem.get_workspace_path.return_value = "/tmp/ws"
+    tools.storage.create_package = AsyncMock(return_value={"package_id": PACKAGE_ID})
+    tools.storage.update_package_status = AsyncMock()
+    tools.storage.update_analysis = AsyncMock()
+    tools.storage.update_qa_report = AsyncMock()
+    tools.storage.link_asset = AsyncMock()
+    tools.video.save_asset = AsyncMock()
+    tools.video.create_slideshow = AsyncMock(
+        return_value={"url": "https://cdn/slideshow.webp", "provider": "slideshow"}
+    )
+    return tools
+
+
+def make_orchestrator(tools, video_jobs):
+    orchestrator = DeepOrchestrator(
+        tools=tools,
+        repository=MagicMock(),
+        copywriting_agent=MagicMock(),
+        image_agent=MagicMock(),
+        video_jobs=video_jobs,
+    )
+    orchestrator.analysis_agent.run = AsyncMock(return_value={"category": "shoes", "key_features": []})
+    orchestrator.copywriting_subagent.run = AsyncMock(return_value=[{"asset_id": "c1"}])
+    orchestrator.image_subagent.run = AsyncMock(
+        return_value=[{"asset_id": "i1", "url": "https://cdn/i1.png"}]
+    )
+    orchestrator.qa_agent.run = AsyncMock(return_value={"score": 0.9})
+    return orchestrator
+
+
+def make_manager(provider):
+    return VideoJobManager(provider=provider, store=InMemoryVideoJobStore(), poll_initial_seconds=60)
+
+
+class FakeProvider(VideoJobProvider):
+    """Provider that never finishes on its own."""
+
+    name = "fake"
+
+    def __init__(self):
+        self.submit = AsyncMock(return_value="provider-job")
+
+    async def submit(self, prompt, images, duration, callback_url=None):
+        raise NotImplementedError
+
+    async def poll(self, provider_job_id):
+        return VideoJobStatus(state="pending")
+
+
+def make_provider():
+    return FakeProvider()
+
+
+REQUEST = {"background": "summer sale", "options": {"require_approval": False, "video_duration_sec": 10}}
+
+
+@pytest.mark.asyncio
+@patch("app.application.orchestration.deep_orchestrator.socket_manager")
+class TestVideoJobParking:
+    async def test_run_parks_on_submitted_job(self, socket_manager):
+        socket_manager.emit_event = AsyncMock()
+        provider = make_provider()
+        manager = make_manager(provider)
+        orchestrator = make_orchestrator(make_tools(), manager)
+
+        result = await orchestrator.run(dict(REQUEST, user_id=uuid4()), user_id=uuid4())
+
+        assert result["status"] == "running"
+        assert result["stage"] == "video_generation"
+        orchestrator.qa_agent.run.assert_not_called()
+
+        job = (await manager.store.list_active())[0]
+        assert job.workflow_id == result["workflow_id"]
+        assert job.context["package_id"] == str(PACKAGE_ID)
+        assert job.context["image_assets"] == [{"asset_id": "i1", "url": "https://cdn/i1.png"}]
+        assert job.context["video"]["images"] == ["https://cdn/i1.png"]
+        assert job.context["video"]["duration"] == 10
+
+    async def test_submit_failure_generates_inline(self, socket_manager):
+        socket_manager.emit_event = AsyncMock()
+        provider = make_provider()
+        provider.submit.side_effect = ConnectionError("down")
+        tools = make_tools()
+        orchestrator = make_orchestrator(tools, make_manager(provider))
+        orchestrator.video_agent.run = AsyncMock(return_value={"asset_id": "v1", "url": "u"})
+
+        result = await orchestrator.run(dict(REQUEST), user_id=uuid4())
+
+        assert result["status"] == "completed"
+        orchestrator.video_agent.run.assert_awaited_once()
+
+    async def test_inline_video_links_secondary_slideshow(self, socket_manager):
+        socket_manager.emit_event = AsyncMock()
+        tools = make_tools()
+        orchestrator = make_orchestrator(tools, None)
+        orchestrator.video_agent.run = AsyncMock(return_value={
+            "asset_id": "v1", "url": "u", "secondary": {"asset_id": "s1", "url": "s"},
+        })
+
+        await orchestrator.run(dict(REQUEST), user_id=uuid4())
+
+        tools.storage.link_asset.assert_any_await(package_id=PACKAGE_ID, artifact_type="video", artifact_id="v1")
+        tools.storage.link_asset.assert_any_await(
+            package_id=PACKAGE_ID, artifact_type="video_secondary", artifact_id="s1"
+        )
+
+    async def test_resume_links_video_and_completes(self, socket_manager):
+        socket_manager.emit_event = AsyncMock()
+        provider = make_provider()
+        manager = make_manager(provider)
+        tools = make_tools()
+        orchestrator = make_orchestrator(tools, manager)
+        await orchestrator.run(dict(REQUEST), user_id=uuid4())
+        job_id = (await manager.store.list_active())[0].job_id
+
+        job = await manager.handle_webhook(job_id, {"status": "succeeded", "url": "https://cdn/v.mp4"})
+        assert job.state == JOB_SUCCEEDED
+
+        # A fresh orchestrator (new session) resumes from the checkpoint
+        resumed = make_orchestrator(tools, manager)
+        with patch.object(resumed.video_agent, "_save", AsyncMock(side_effect=lambda a, r, w: {"asset_id": "v1", **a})) as save:
+            result = await resumed.resume_video_job(job)
+
+        artifact = save.await_args.args[0]
+        assert artifact["url"] == "https://cdn/v.mp4"
+        assert artifact["is_fallback"] is False
+        assert result["status"] == "completed"
+        assert result["package_id"] == PACKAGE_ID
+        tools.storage.link_asset.assert_any_await(package_id=PACKAGE_ID, artifact_type="video", artifact_id="v1")
+        qa_kwargs = resumed.qa_agent.run.await_args.kwargs
+        assert qa_kwargs["copy_assets"] == [{"asset_id": "c1"}]
+
+    async def test_resume_after_timeout_uses_slideshow(self, socket_manager):
+        socket_manager.emit_event = AsyncMock()
+        manager = make_manager(make_provider())
+        tools = make_tools()
+        orchestrator = make_orchestrator(tools, manager)
+        await orchestrator.run(dict(REQUEST), user_id=uuid4())
+        job = (await manager.store.list_active())[0]
+        job.state = JOB_TIMED_OUT
+
+        with patch.object(orchestrator.video_agent, "_save", AsyncMock(side_effect=lambda a, r, w: {"asset_id": "v1", **a})) as save:
+            await orchestrator.resume_video_job(job)
+
+        artifact = save.await_args.args[0]
+        assert artifact["provider"] == "slideshow"
+        assert artifact["is_fallback"] is True
+        assert tools.video.create_slideshow.await_args.kwargs["images"] == ["https://cdn/i1.png"]
+
+
+@pytest.mark.asyncio
+class TestResumeParkedWorkflow:
+    async def test_failure_is_recorded_in_its_own_session(self):
+        sessions = []
+
+        @asynccontextmanager
+        async def session_context():
+            # Like get_session_context: commit on exit, roll back on error
+            session = MagicMock(committed=False)
+            sessions.append(session)
+            yield session
+            session.committed = True
+
+        orchestrator = MagicMock(resume_video_job=AsyncMock(side_effect=RuntimeError("QA crashed")))
+        repository = MagicMock()
+        repository.get_by_workflow_id = AsyncMock(return_value=MagicMock(id=PACKAGE_ID))
+        repository.update_status = AsyncMock()
+        job = MagicMock(workflow_id="wf-1")
+
+        with patch.object(product_packages, "get_session_context", session_context), \
+                patch.object(product_packages, "build_orchestrator", return_value=orchestrator), \
+                patch.object(product_packages, "ProductPackageRepository", return_value=repository) as repo_cls:
+            await product_packages.resume_parked_workflow(job)
+
+        assert [s.committed for s in sessions] == [False, True]
+        repo_cls.assert_called_once_with(sessions[1])
+        repository.update_status.assert_awaited_once_with(
+            package_id=PACKAGE_ID, status="failed", error_message="QA crashed"
+        )
@@ -0,0 +1,59 @@
+"""
+Tests for scheduling asset derivatives after the creating transaction commits.
+"""
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.application.services import derivative_service
+from app.application.services.derivative_service import schedule_asset_derivatives_after_commit
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with AsyncSession(engine) as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def scheduled():
+    with patch.object(derivative_service, "schedule_asset_derivatives") as schedule:
+        yield schedule
+
+
+class TestScheduleAfterCommit:
+    async def test_scheduled_only_after_commit(self, session, scheduled):
+        asset_uuid = uuid4()
+        await session.execute(text("SELECT 1"))
+
+        schedule_asset_derivatives_after_commit(session, asset_uuid, "https://img/a.png")
+        assert not scheduled.called
+
+        await session.commit()
+
+        scheduled.assert_called_once_with(asset_uuid, "https://img/a.png")
+
+    async def test_rollback_drops_the_job(self, session, scheduled):
+        await session.execute(text("SELECT 1"))
+        schedule_asset_derivatives_after_commit(session, uuid4(), "https://img/a.png")
+
+        await session.rollback()
+        await session.execute(text("SELECT 1"))
+        await session.commit()
+
+        assert not scheduled.called
+
+    async def test_later_commits_do_not_reschedule(self, session, scheduled):
+        await session.execute(text("SELECT 1"))
+        schedule_asset_derivatives_after_commit(session, uuid4(), "https://img/a.png")
+        await session.commit()
+
+        await session.execute(text("SELECT 1"))
+        await session.commit()
+
+        assert scheduled.call_count == 1
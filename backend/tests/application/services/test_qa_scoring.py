@@ -0,0 +1,237 @@
+"""
+Tests for the QA scoring engine and the rescoring job.
+"""
+import json
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.application.agents.qa_agent import QAAgent
+from app.application.services.qa_rescoring import QARescoringJob
+from app.application.services.qa_scoring import (
+    QA_INPUTS_PATH,
+    QA_RULES_VERSION,
+    QAPackage,
+    QAScorer,
+)
+
+
+ANALYSIS = {
+    "category": "backpack",
+    "keywords": ["waterproof", "lightweight", "commuter"],
+    "suggested_scenes": ["hero", "lifestyle", "detail"],
+}
+
+GOOD_COPY = [
+    {
+        "channel": "product_page",
+        "content": (
+            "This waterproof backpack keeps your laptop dry on any commute. "
+            "The lightweight frame weighs under a kilo. "
+            "Padded straps make it the commuter bag you will carry every day."
+        ),
+    },
+    {"channel": "social_post", "content": "Rain or shine, the lightweight commuter backpack has you covered."},
+    {"channel": "ad_short", "content": "Waterproof. Lightweight. Ready."},
+]
+
+IMAGES = [{"label": scene, "url": f"https://cdn/{scene}.png"} for scene in ("hero", "lifestyle", "detail")]
+VIDEO = {"url": "https://cdn/video.mp4", "is_fallback": False}
+
+
+def package(**overrides):
+    fields = dict(analysis=ANALYSIS, copy_assets=GOOD_COPY, image_assets=IMAGES, video_asset=VIDEO)
+    fields.update(overrides)
+    return QAPackage(**fields)
+
+
+class TestQAScorer:
+    def test_complete_package_passes(self):
+        report = QAScorer().score(package())
+
+        assert report["passed"] is True
+        assert report["score"] == 1.0
+        assert report["issues"] == []
+        assert report["rules_version"] == QA_RULES_VERSION
+        assert report["checks"]["copywriting"]["metrics"]["keywords"] == 1.0
+
+    def test_keyword_coverage(self):
+        copy = [dict(asset, content="A bag. " * 30) for asset in GOOD_COPY]
+        report = QAScorer().score(package(copy_assets=copy))
+
+        assert report["checks"]["copywriting"]["metrics"]["keywords"] == 0.0
+        assert "Copy covers only 0 of 3 product keywords" in report["issues"]
+        assert "Copy never mentions the analyzed product category" in report["issues"]
+
+    def test_channel_length_limits(self):
+        copy = [
+            dict(GOOD_COPY[0], content="Waterproof backpack."),
+            GOOD_COPY[1],
+            dict(GOOD_COPY[2], content="Waterproof lightweight backpack. " * 10),
+        ]
+        copy_check = QAScorer().score(package(copy_assets=copy))["checks"]["copywriting"]
+
+        assert copy_check["metrics"]["length"] < 0.7
+        assert "1 copy variant(s) below the channel's minimum length" in copy_check["issues"]
+        assert "1 copy variant(s) over the channel's length limit" in copy_check["issues"]
+
+    def test_run_on_sentences_lower_readability(self):
+        rambling = " ".join(["waterproof lightweight commuter backpack"] * 20) + "."
+        copy = [dict(asset, content=rambling) for asset in GOOD_COPY]
+        copy_check = QAScorer().score(package(copy_assets=copy))["checks"]["copywriting"]
+
+        assert copy_check["metrics"]["readability"] == 0.0
+
+    def test_cjk_copy_is_tokenized(self):
+        copy = [dict(asset, content="这款背包防水又轻便。通勤路上的好伙伴！") for asset in GOOD_COPY]
+        report = QAScorer().score(package(copy_assets=copy))
+
+        assert report["checks"]["copywriting"]["metrics"]["readability"] == 1.0
+
+    def test_image_labels_must_match_scenes(self):
+        images = [dict(IMAGES[0]), dict(IMAGES[1], label="banner")]
+        report = QAScorer().score(package(image_assets=images))
+
+        assert "Missing image scenes: lifestyle, detail" in report["issues"]
+        assert "Image labels not among the analysis scenes: banner" in report["issues"]
+        assert report["checks"]["consistency"]["metrics"]["labels"] == 0.5
+
+    def test_fallback_and_missing_video(self):
+        scorer = QAScorer()
+        fallback = scorer.score(package(video_asset={"url": "u", "is_fallback": True}))
+        missing = scorer.score(package(video_asset=None))
+
+        assert fallback["checks"]["video"]["score"] == 0.7
+        assert missing["checks"]["video"]["score"] == 0.0
+        assert "No video generated" in missing["issues"]
+
+    def test_duplicate_copy_is_penalized(self):
+        duplicate = [{"workflow_id": "wf-other", "channel": "product_page", "similarity": 0.95}]
+        copy = [dict(GOOD_COPY[0], duplicates=duplicate), GOOD_COPY[1], dict(GOOD_COPY[2], duplicates=[])]
+        copy_check = QAScorer().score(package(copy_assets=copy))["checks"]["copywriting"]
+
+        assert copy_check["metrics"]["originality"] == pytest.approx(0.667)
+        assert copy_check["score"] == 0.9
+        assert "1 copy variant(s) near-duplicate copy of other products" in copy_check["issues"]
+
+    def test_check_copy_flags_blocking_channels(self):
+        copy = [dict(GOOD_COPY[0], content="Backpack."), dict(GOOD_COPY[2], content="Waterproof. " * 20)]
+        checks = {check.key: check for check in QAScorer().check_copy(ANALYSIS, copy)}
+
+        assert checks["product_page"].blocking == [
+            "product_page copy is 9 characters, far below the minimum of 150"
+        ]
+        assert checks["ad_short"].passed
+        assert checks["ad_short"].issues == ["ad_short copy is over the length limit of 150"]
+        assert checks["social_post"].blocking == ["social_post copy is missing"]
+        assert all(check.passed for check in QAScorer().check_copy(ANALYSIS, GOOD_COPY))
+
+    def test_check_image(self):
+        scorer = QAScorer()
+
+        assert scorer.check_image(ANALYSIS, "hero", {"url": "u", "width": 1024, "height": 1024}).passed
+        assert scorer.check_image(ANALYSIS, "hero", {"url": ""}).blocking == ["hero image has no URL"]
+        small = scorer.check_image(ANALYSIS, "banner", {"url": "u", "width": 1024, "height": 256})
+        assert small.blocking == ["banner image is 1024x256, below 512px"]
+        assert small.issues == ["banner is not among the analysis scenes"]
+
+    def test_empty_package(self):
+        report = QAScorer().score(QAPackage())
+
+        assert report["score"] == 0.0
+        assert report["passed"] is False
+
+    def test_batch_matches_individual_scores(self):
+        scorer = QAScorer()
+        packages = [
+            package(),
+            QAPackage(),
+            package(video_asset=None),
+            package(copy_assets=GOOD_COPY[:1], image_assets=IMAGES[:1]),
+        ]
+        assert scorer.score_batch(packages) == [scorer.score(p) for p in packages]
+
+
+@pytest.mark.asyncio
+class TestQAAgent:
+    async def test_saves_json_safe_inputs_snapshot(self, tmp_path):
+        from app.application.tools.filesystem_tools import FileSystemTools
+
+        tools = SimpleNamespace(filesystem=FileSystemTools(str(tmp_path)))
+        workspace = tools.filesystem.create_workspace("wf-1")
+        video = dict(VIDEO, asset_id=uuid4())
+
+        report = await QAAgent(tools).run(ANALYSIS, GOOD_COPY, IMAGES, video, workspace)
+
+        with open(f"{workspace}/{QA_INPUTS_PATH}", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        assert snapshot["video_asset"]["asset_id"] == str(video["asset_id"])
+        assert QAScorer().score(QAPackage.from_dict(snapshot)) == report
+
+
+def stored_package(workspace_root, report, inputs=None):
+    workflow_id = str(uuid4())
+    if inputs is not None:
+        path = workspace_root / workflow_id / QA_INPUTS_PATH
+        path.parent.mkdir(parents=True)
+        path.write_text(json.dumps(inputs.to_dict()), encoding="utf-8")
+    return SimpleNamespace(id=uuid4(), workflow_id=workflow_id, qa_report=report)
+
+
+class FakeRepository:
+    """Pages through an in-memory list of packages sorted by ID."""
+
+    packages = []
+
+    def __init__(self, session):
+        pass
+
+    async def list_with_qa_report(self, after_id=None, limit=500):
+        ordered = sorted(self.packages, key=lambda p: p.id)
+        if after_id is not None:
+            ordered = [p for p in ordered if p.id > after_id]
+        return ordered[:limit]
+
+
+@asynccontextmanager
+async def fake_session():
+    yield MagicMock()
+
+
+@pytest.mark.asyncio
+class TestQARescoringJob:
+    async def run_job(self, tmp_path, packages, **kwargs):
+        FakeRepository.packages = packages
+        job = QARescoringJob(tmp_path, session_factory=fake_session, batch_size=2)
+        with patch("app.application.services.qa_rescoring.ProductPackageRepository", FakeRepository):
+            return await job.run(**kwargs)
+
+    async def test_rescores_stale_reports(self, tmp_path):
+        stale = stored_package(tmp_path, {"score": 0.5, "passed": False}, package())
+        current = stored_package(tmp_path, {"score": 0.9, "passed": True, "rules_version": QA_RULES_VERSION}, package())
+        legacy = stored_package(tmp_path, {"score": 0.8, "passed": True})
+
+        summary = await self.run_job(tmp_path, [stale, current, legacy])
+
+        assert summary["scanned"] == 3
+        assert summary["rescored"] == 1
+        assert summary["current"] == 1
+        assert summary["missing_inputs"] == 1
+        assert summary["pass_flips"] == 1
+        assert summary["mean_delta"] == 0.5
+        assert stale.qa_report["rules_version"] == QA_RULES_VERSION
+        assert current.qa_report["score"] == 0.9
+        assert legacy.qa_report == {"score": 0.8, "passed": True}
+
+    async def test_dry_run_and_force(self, tmp_path):
+        old = {"score": 0.9, "passed": True, "rules_version": QA_RULES_VERSION}
+        item = stored_package(tmp_path, dict(old), package(video_asset=None))
+
+        summary = await self.run_job(tmp_path, [item], force=True, dry_run=True)
+
+        assert summary["rescored"] == 1
+        assert summary["mean_delta"] < 0
+        assert item.qa_report == old
@@ -0,0 +1,159 @@
+"""
+Video Tools Unit Tests
+
+Covers the primary/slideshow race in VideoTools.generate_video.
+"""
+
+import asyncio
+import gc
+import time
+
+from app.application.tools.video_tools import VideoTools
+
+
+class FakeVideoProvider:
+    """Primary provider that answers after a delay (or fails)."""
+
+    def __init__(self, delay: float, error: Exception = None):
+        self.delay = delay
+        self.error = error
+        self.cancelled = False
+
+    async def generate(self, prompt, images, duration):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return {"url": "https://cdn.example.com/video.mp4", "provider": "video", "duration": duration}
+
+
+class FakeSlideshowProvider:
+    """Slideshow renderer that takes a fixed time."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.started = None
+        self.cancelled = False
+
+    async def create(self, images, captions, duration, transition="fade"):
+        self.started = time.perf_counter()
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return {"url": "https://cdn.example.com/slideshow.webp", "provider": "slideshow", "duration": duration}
+
+
+class CrashOnCancelSlideshowProvider(FakeSlideshowProvider):
+    """Slideshow renderer whose cleanup fails when it is cancelled."""
+
+    async def create(self, images, captions, duration, transition="fade"):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            raise OSError("renderer crashed during cleanup")
+        return {"url": "https://cdn.example.com/slideshow.webp", "provider": "slideshow", "duration": duration}
+
+
+def make_tools(video_delay, slideshow_delay, error=None, keep_slideshow=True):
+    return VideoTools(
+        video_provider=FakeVideoProvider(video_delay, error),
+        slideshow_provider=FakeSlideshowProvider(slideshow_delay),
+        race_slideshow=True,
+        keep_slideshow=keep_slideshow,
+    )
+
+
+class TestVideoRace:
+    """测试主视频与幻灯片并行竞速"""
+
+    async def test_primary_wins_and_slideshow_cancelled(self):
+        tools = make_tools(video_delay=0.01, slideshow_delay=1.0)
+
+        result = await tools.generate_video("prompt", ["a.png"], timeout_sec=0.5)
+
+        assert result["provider"] == "video"
+        assert result["is_fallback"] is False
+        assert "secondary" not in result
+        await asyncio.sleep(0)
+        assert tools.slideshow_provider.cancelled
+
+    async def test_finished_slideshow_kept_as_secondary(self):
+        tools = make_tools(video_delay=0.05, slideshow_delay=0.0)
+
+        result = await tools.generate_video("prompt", ["a.png"], timeout_sec=0.5)
+
+        assert result["provider"] == "video"
+        assert result["secondary"]["provider"] == "slideshow"
+
+    async def test_finished_slideshow_dropped_when_not_kept(self):
+        tools = make_tools(video_delay=0.05, slideshow_delay=0.0, keep_slideshow=False)
+
+        result = await tools.generate_video("prompt", ["a.png"], timeout_sec=0.5)
+
+        assert "secondary" not in result
+
+    async def test_timeout_returns_slideshow_at_deadline(self):
+        tools = make_tools(video_delay=5.0, slideshow_delay=0.05)
+
+        started = time.perf_counter()
+        result = await tools.generate_video("prompt", ["a.png"], timeout_sec=0.2)
+        elapsed = time.perf_counter() - started
+
+        assert result["provider"] == "slideshow"
+        assert result["is_fallback"] is True
+        # Slideshow rendered during the wait, so only the deadline is paid
+        assert elapsed < 0.2 + 0.05
+        await asyncio.sleep(0)
+        assert tools.video_provider.cancelled
+
+    async def test_primary_error_falls_back_without_waiting_for_deadline(self):
+        tools = make_tools(video_delay=0.0, slideshow_delay=0.05, error=ValueError("boom"))
+
+        started = time.perf_counter()
+        result = await tools.generate_video("prompt", ["a.png"], timeout_sec=5.0)
+
+        assert result["provider"] == "slideshow"
+        assert result["is_fallback"] is True
+        assert time.perf_counter() - started < 1.0
+
+    async def test_slideshow_starts_with_primary(self):
+        tools = make_tools(video_delay=0.2, slideshow_delay=0.0)
+
+        started = time.perf_counter()
+        await tools.generate_video("prompt", ["a.png"], timeout_sec=1.0)
+
+        assert tools.slideshow_provider.started - started < 0.1
+
+    async def test_sequential_mode_waits_for_deadline_first(self):
+        tools = make_tools(video_delay=5.0, slideshow_delay=0.0)
+
+        result = await tools.generate_video("prompt", ["a.png"], timeout_sec=0.1, race=False)
+
+        assert result["is_fallback"] is True
+        assert tools.slideshow_provider.started is not None
+
+    async def test_discarded_slideshow_exception_is_retrieved(self):
+        """A cancelled slideshow that fails on the way out is not reported as never retrieved."""
+        unhandled = []
+        loop = asyncio.get_running_loop()
+        loop.set_exception_handler(lambda _loop, context: unhandled.append(context))
+        try:
+            tools = VideoTools(
+                video_provider=FakeVideoProvider(0.01),
+                slideshow_provider=CrashOnCancelSlideshowProvider(1.0),
+                race_slideshow=True,
+            )
+
+            result = await tools.generate_video("prompt", ["a.png"], timeout_sec=0.5)
+            await asyncio.sleep(0.01)
+            gc.collect()
+        finally:
+            loop.set_exception_handler(None)
+
+        assert result["provider"] == "video"
+        assert unhandled == []
@@ -0,0 +1,57 @@
+"""
+Vision Tools Unit Tests
+"""
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.application.tools.vision_tools import VisionTools
+
+
+FEATURES = {
+    "color_palette": ["#FFFFFF", "#142878"],
+    "color_weights": [0.75, 0.25],
+    "brightness": 0.78,
+    "contrast": 0.6,
+    "background": {"color": "#FFFFFF", "uniformity": 1.0, "plain": True},
+    "extract_ms": 4.2,
+}
+
+
+@pytest.mark.asyncio
+class TestVisionToolsFeatures:
+    """测试本地图像特征合并到分析结果"""
+
+    async def test_measured_palette_replaces_model_palette(self):
+        extractor = AsyncMock()
+        extractor.extract.return_value = dict(FEATURES)
+        tools = VisionTools(feature_extractor=extractor)
+
+        analysis = await tools.analyze_product_image("https://cdn.example.com/p.png")
+
+        assert analysis["color_palette"] == ["#FFFFFF", "#142878"]
+        assert analysis["image_features"]["background"]["plain"] is True
+        assert "color_palette" not in analysis["image_features"]
+        assert analysis["category"] == "electronics"
+
+    async def test_features_passed_to_vision_model(self):
+        extractor = AsyncMock()
+        extractor.extract.return_value = dict(FEATURES)
+        tools = VisionTools(vision_client=object(), feature_extractor=extractor)
+        tools._call_vision_model = AsyncMock(return_value={"category": "shoes", "color_palette": ["#000000"]})
+
+        analysis = await tools.analyze_product_image("https://cdn.example.com/p.png")
+
+        assert tools._call_vision_model.await_args.args[1]["brightness"] == 0.78
+        assert analysis["category"] == "shoes"
+        assert analysis["color_palette"] == ["#FFFFFF", "#142878"]
+
+    async def test_without_features_analysis_is_unchanged(self):
+        extractor = AsyncMock()
+        extractor.extract.return_value = None
+
+        with_extractor = await VisionTools(feature_extractor=extractor).analyze_product_image("x")
+        without = await VisionTools().analyze_product_image("x")
+
+        assert with_extractor == without
+        assert "image_features" not in without
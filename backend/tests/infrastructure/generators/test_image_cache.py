@@ -0,0 +1,148 @@
+"""
+Tests for the image generation cache.
+"""
+import pytest
+
+from app.domain.entities.image_artifact import ImageArtifact
+from app.domain.entities.image_request import ImageGenerationRequest
+from app.infrastructure.generators.image_cache import (
+    CachedImageGenerator,
+    ImageGenerationCache,
+)
+
+
+class CountingGenerator:
+    """Generator stub that counts provider calls."""
+
+    model = "test-model"
+
+    def __init__(self, url="https://img/{n}.png"):
+        self.url = url
+        self.calls = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+    async def generate(self, request):
+        self.calls += 1
+        return ImageArtifact(
+            url=self.url.format(n=self.calls),
+            prompt=request.prompt,
+            provider="test",
+            width=request.width,
+            height=request.height,
+        )
+
+
+class TestImageGenerationCache:
+    """Tests for ImageGenerationCache."""
+
+    def test_key_depends_on_all_fields(self):
+        """Changing any field changes the key."""
+        base = ImageGenerationCache.make_key("A cat", 512, 512, "m", None)
+
+        assert base == ImageGenerationCache.make_key("A cat ", 512, 512, "m", None)
+        assert base != ImageGenerationCache.make_key("A cat", 1024, 512, "m", None)
+        assert base != ImageGenerationCache.make_key("A cat", 512, 512, "other", None)
+        assert base != ImageGenerationCache.make_key("A cat", 512, 512, "m", 42)
+
+    def test_key_depends_on_style(self):
+        """Requests differing only in style get different keys."""
+        base = ImageGenerationCache.make_key("A cat", 512, 512, "m", None)
+
+        assert base != ImageGenerationCache.make_key("A cat", 512, 512, "m", None, style="cartoon")
+        assert ImageGenerationCache.make_key("A cat", 512, 512, "m", None, style="cartoon") != (
+            ImageGenerationCache.make_key("A cat", 512, 512, "m", None, style="photorealistic")
+        )
+
+    def test_key_depends_on_negative_prompt(self):
+        """Requests differing only in negative prompt get different keys."""
+        base = ImageGenerationCache.make_key("A cat", 512, 512, "m", None)
+
+        assert base != ImageGenerationCache.make_key("A cat", 512, 512, "m", None, negative_prompt="blurry")
+        assert ImageGenerationCache.make_key("A cat", 512, 512, "m", None, negative_prompt="blurry") == (
+            ImageGenerationCache.make_key("A cat", 512, 512, "m", None, negative_prompt="blurry ")
+        )
+
+    def test_lru_eviction(self):
+        """Least recently used entry is evicted when full."""
+        cache = ImageGenerationCache(max_entries=2)
+        artifact = ImageArtifact(url="https://img/a.png", prompt="p")
+
+        cache.set("a", artifact)
+        cache.set("b", artifact)
+        cache.get("a")
+        cache.set("c", artifact)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiration(self):
+        """Expired entries count as misses."""
+        cache = ImageGenerationCache(ttl_seconds=0)
+        cache.set("a", ImageArtifact(url="https://img/a.png", prompt="p"))
+
+        assert cache.get("a") is None
+        stats = cache.stats()
+        assert stats["expirations"] == 1
+        assert stats["size"] == 0
+
+
+class TestCachedImageGenerator:
+    """Tests for the caching generator wrapper."""
+
+    @pytest.mark.asyncio
+    async def test_identical_requests_hit_cache(self):
+        """Second identical request is served without calling the provider."""
+        inner = CountingGenerator()
+        cache = ImageGenerationCache()
+        generator = CachedImageGenerator(inner, cache)
+
+        async with generator:
+            first = await generator.generate(ImageGenerationRequest(prompt="A cat"))
+            second = await generator.generate(ImageGenerationRequest(prompt="A cat"))
+
+        assert inner.calls == 1
+        assert second.url == first.url
+        assert second.id != first.id
+        assert cache.stats()["hit_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_opt_out_and_seed(self):
+        """use_cache=False bypasses the cache and seeds key separately."""
+        inner = CountingGenerator()
+        generator = CachedImageGenerator(inner, ImageGenerationCache())
+
+        await generator.generate(ImageGenerationRequest(prompt="A cat"))
+        await generator.generate(ImageGenerationRequest(prompt="A cat", use_cache=False))
+        await generator.generate(ImageGenerationRequest(prompt="A cat", seed=7))
+
+        assert inner.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_style_and_negative_prompt_miss_cache(self):
+        """Style and negative prompt are forwarded to the provider, so they key separately."""
+        inner = CountingGenerator()
+        generator = CachedImageGenerator(inner, ImageGenerationCache())
+
+        await generator.generate(ImageGenerationRequest(prompt="A cat"))
+        await generator.generate(ImageGenerationRequest(prompt="A cat", style="cartoon"))
+        await generator.generate(ImageGenerationRequest(prompt="A cat", negative_prompt="blurry"))
+        await generator.generate(ImageGenerationRequest(prompt="A cat", style="cartoon"))
+
+        assert inner.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_base64_results_not_cached(self):
+        """Inline data URLs are not stored."""
+        inner = CountingGenerator(url="data:image/png;base64,AAAA")
+        generator = CachedImageGenerator(inner, ImageGenerationCache())
+
+        await generator.generate(ImageGenerationRequest(prompt="A cat"))
+        await generator.generate(ImageGenerationRequest(prompt="A cat"))
+
+        assert inner.calls == 2
@@ -5,8 +5,7 @@ Tests the HTTP and Stdio communication patterns for MCP protocol.
 Following TDD: RED phase - write failing tests first.
 """
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
-from uuid import uuid4
+from unittest.mock import AsyncMock, patch
 import asyncio
 import json
 
@@ -174,6 +173,160 @@ class TestMCPHttpClient:
         
         # After exit, session should be closed
         assert client._session is None or client._session.closed
+    
+    @pytest.mark.asyncio
+    async def test_persistent_client_keeps_session(self):
+        """Persistent clients reuse one pooled session across contexts."""
+        client = MCPHttpClient(server_url="http://localhost:3000", persistent=True)
+        
+        async with client:
+            session = client._session
+        async with client:
+            assert client._session is session
+        
+        assert not session.closed
+        await client.close()
+        assert session.closed
+
+
+def _echo_batch(requests):
+    """Fake server: answer a batch in reverse order, failing 'bad' prompts."""
+    if isinstance(requests, dict):
+        requests = [requests]
+    responses = []
+    for request in reversed(requests):
+        prompt = request["params"]["arguments"]["prompt"]
+        if prompt == "bad":
+            responses.append({
+                "jsonrpc": "2.0",
+                "id": request["id"],
+                "error": {"code": -32000, "message": "generation failed"},
+            })
+        else:
+            responses.append({
+                "jsonrpc": "2.0",
+                "id": request["id"],
+                "result": {"prompt": prompt},
+            })
+    return responses
+
+
+class TestMCPHttpClientBatch:
+    """Test JSON-RPC batch support in MCPHttpClient."""
+    
+    @pytest.mark.asyncio
+    async def test_call_tools_batch_routes_by_id(self):
+        """Batch results keep request order and isolate per-item errors."""
+        client = MCPHttpClient(server_url="http://localhost:3000")
+        
+        with patch.object(client, '_send_http_request', new_callable=AsyncMock) as mock_send:
+            mock_send.side_effect = _echo_batch
+            
+            results = await client.call_tools_batch([
+                ("generate_image", {"prompt": "a"}),
+                ("generate_image", {"prompt": "bad"}),
+                ("generate_image", {"prompt": "c"}),
+            ])
+        
+        mock_send.assert_called_once()
+        assert len(mock_send.call_args.args[0]) == 3
+        assert results[0] == {"prompt": "a"}
+        assert isinstance(results[1], MCPToolCallError)
+        assert results[1].tool_name == "generate_image"
+        assert results[2] == {"prompt": "c"}
+    
+    @pytest.mark.asyncio
+    async def test_call_tools_batch_respects_max_size(self):
+        """Large batches are split into max_batch_size chunks."""
+        client = MCPHttpClient(server_url="http://localhost:3000", max_batch_size=2)
+        
+        with patch.object(client, '_send_http_request', new_callable=AsyncMock) as mock_send:
+            mock_send.side_effect = _echo_batch
+            
+            results = await client.call_tools_batch(
+                [("generate_image", {"prompt": str(i)}) for i in range(5)]
+            )
+        
+        assert mock_send.call_count == 3
+        assert [r["prompt"] for r in results] == ["0", "1", "2", "3", "4"]
+    
+    @pytest.mark.asyncio
+    async def test_auto_batching_coalesces_concurrent_calls(self):
+        """Concurrent call_tool invocations share one POST within the window."""
+        client = MCPHttpClient(server_url="http://localhost:3000", batch_window_ms=5)
+        
+        with patch.object(client, '_send_http_request', new_callable=AsyncMock) as mock_send:
+            mock_send.side_effect = _echo_batch
+            
+            results = await asyncio.gather(
+                client.call_tool("generate_image", {"prompt": "a"}),
+                client.call_tool("generate_image", {"prompt": "bad"}),
+                client.call_tool("generate_image", {"prompt": "c"}),
+                return_exceptions=True,
+            )
+        
+        mock_send.assert_called_once()
+        assert results[0] == {"prompt": "a"}
+        assert isinstance(results[1], MCPToolCallError)
+        assert results[2] == {"prompt": "c"}
+    
+    @pytest.mark.asyncio
+    async def test_auto_batching_transport_error_fails_all(self):
+        """A failed batch POST propagates to every waiting caller."""
+        client = MCPHttpClient(server_url="http://localhost:3000", batch_window_ms=5)
+        
+        with patch.object(client, '_send_http_request', new_callable=AsyncMock) as mock_send:
+            mock_send.side_effect = MCPConnectionError("down")
+            
+            results = await asyncio.gather(
+                client.call_tool("generate_image", {"prompt": "a"}),
+                client.call_tool("generate_image", {"prompt": "b"}),
+                return_exceptions=True,
+            )
+        
+        assert all(isinstance(r, MCPConnectionError) for r in results)
+
+
+class TestMCPHttpClientProgress:
+    """Test streamed progress notifications over HTTP."""
+    
+    @pytest.mark.asyncio
+    async def test_sse_progress_is_relayed(self):
+        """SSE notifications reach on_progress before the final response."""
+        from aiohttp import web
+        from aiohttp.test_utils import TestServer
+        
+        async def handler(request):
+            body = await request.json()
+            token = body["params"]["_meta"]["progressToken"]
+            resp = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+            await resp.prepare(request)
+            for step in (1, 2):
+                note = {
+                    "jsonrpc": "2.0",
+                    "method": "notifications/progress",
+                    "params": {"progressToken": token, "progress": step, "total": 2},
+                }
+                await resp.write(f"data: {json.dumps(note)}\n\n".encode())
+            final = {"jsonrpc": "2.0", "id": body["id"], "result": {"ok": True}}
+            await resp.write(f"event: message\ndata: {json.dumps(final)}\n\n".encode())
+            return resp
+        
+        app = web.Application()
+        app.router.add_post("/", handler)
+        updates = []
+        
+        async def on_progress(params):
+            updates.append(params["progress"])
+        
+        async with TestServer(app) as server:
+            async with MCPHttpClient(server_url=str(server.make_url("/"))) as client:
+                result = await client.call_tool(
+                    "generate_image", {"prompt": "a"}, on_progress=on_progress
+                )
+        
+        assert result == {"ok": True}
+        assert updates == [1, 2]
 
 
 class TestMCPExceptions:
@@ -322,3 +322,66 @@ class TestMCPImageGeneratorURLValidation:
         )
         assert url == "http://any-domain.com/image.png"
 
+
+
+class TestMCPImageGeneratorProgress:
+    """Test progress relaying in MCPImageGenerator."""
+    
+    @pytest.mark.asyncio
+    async def test_progress_and_preview_are_relayed(self):
+        """MCP progress params are normalized, Base64 previews become data URIs."""
+        mcp_client = AsyncMock(spec=MCPHttpClient)
+        
+        async def call_tool(tool_name, arguments, on_progress=None):
+            await on_progress({"progressToken": "t", "progress": 1, "total": 4})
+            await on_progress({
+                "progressToken": "t",
+                "progress": 2,
+                "total": 4,
+                "preview": "aGVsbG8=",
+                "previewMimeType": "image/jpeg",
+            })
+            await on_progress({"progress": 3, "preview": "http://evil.com/x.png"})
+            return {"content": [{"type": "image", "data": "http://localhost/img.png"}]}
+        
+        mcp_client.call_tool = call_tool
+        generator = MCPImageGenerator(mcp_client=mcp_client)
+        updates = []
+        
+        async def on_progress(update):
+            updates.append(update)
+        
+        artifact = await generator.generate(
+            ImageGenerationRequest(prompt="a cat"), on_progress=on_progress
+        )
+        
+        assert artifact.url == "http://localhost/img.png"
+        assert updates[0] == {"progress": 1, "total": 4, "message": None, "preview_url": None}
+        assert updates[1]["preview_url"] == "data:image/jpeg;base64,aGVsbG8="
+        assert updates[2]["preview_url"] is None
+
+
+class TestImageProviderFactoryReuse:
+    """Test generator instance reuse in ImageProviderFactory."""
+    
+    @pytest.mark.asyncio
+    async def test_mcp_provider_is_reused_and_shut_down(self):
+        """Repeated get_provider calls share one generator and transport."""
+        from app.core.image_factory import ImageProviderFactory
+        
+        ImageProviderFactory.reset()
+        try:
+            first = ImageProviderFactory.get_provider("mcp", use_cache=False)
+            second = ImageProviderFactory.get_provider("mcp", use_cache=False)
+            
+            assert first is second
+            assert isinstance(first, MCPImageGenerator)
+            assert first.mcp_client.persistent is True
+            
+            with patch.object(first.mcp_client, "close", new_callable=AsyncMock) as close:
+                await ImageProviderFactory.shutdown()
+            
+            close.assert_awaited_once()
+            assert ImageProviderFactory.get_provider("mcp", use_cache=False) is not first
+        finally:
+            ImageProviderFactory.reset()
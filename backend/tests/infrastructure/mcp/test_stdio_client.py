@@ -0,0 +1,168 @@
+"""
+Tests for MCP Stdio Client.
+
+Runs a small fake MCP server as a real subprocess.
+"""
+import asyncio
+import sys
+import textwrap
+
+import pytest
+
+from app.infrastructure.mcp.base_client import (
+    MCPConnectionError,
+    MCPStdioClient,
+    MCPTimeoutError,
+    MCPToolCallError,
+)
+
+
+FAKE_SERVER = textwrap.dedent('''
+    import asyncio, json, sys
+
+    async def handle(message, write):
+        if "id" not in message:
+            return
+        if message["method"] == "initialize":
+            write({"jsonrpc": "2.0", "id": message["id"], "result": {"capabilities": {}}})
+            return
+        args = message["params"]["arguments"]
+        if args.get("crash"):
+            sys.exit(1)
+        token = message["params"].get("_meta", {}).get("progressToken")
+        for step in range(args.get("steps", 0)):
+            write({"jsonrpc": "2.0", "method": "notifications/progress",
+                   "params": {"progressToken": token, "progress": step + 1,
+                              "total": args["steps"]}})
+        await asyncio.sleep(args.get("delay", 0))
+        if args.get("fail"):
+            write({"jsonrpc": "2.0", "id": message["id"],
+                   "error": {"code": -32000, "message": "boom"}})
+        else:
+            write({"jsonrpc": "2.0", "id": message["id"],
+                   "result": {"echo": args["prompt"]}})
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+        def write(obj):
+            sys.stdout.write(json.dumps(obj) + "\\n")
+            sys.stdout.flush()
+
+        tasks = set()
+        while line := await reader.readline():
+            task = asyncio.create_task(handle(json.loads(line), write))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+    asyncio.run(main())
+''')
+
+
+# Reads requests but never answers the initialize handshake
+SILENT_SERVER = "import sys\nfor line in sys.stdin:\n    pass\n"
+
+
+@pytest.fixture
+async def client():
+    """Stdio client running the fake server."""
+    client = MCPStdioClient([sys.executable, "-c", FAKE_SERVER], timeout=10)
+    yield client
+    await client.close()
+
+
+class TestMCPStdioClient:
+    """Test MCPStdioClient multiplexing and restart behaviour."""
+    
+    def test_requires_command(self):
+        """An empty command is rejected."""
+        with pytest.raises(ValueError):
+            MCPStdioClient([])
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_are_multiplexed(self, client):
+        """Out-of-order responses are routed to the right caller."""
+        async with client:
+            results = await asyncio.gather(
+                client.call_tool("generate_image", {"prompt": "slow", "delay": 0.2}),
+                client.call_tool("generate_image", {"prompt": "fast"}),
+            )
+        
+        assert [r["echo"] for r in results] == ["slow", "fast"]
+    
+    @pytest.mark.asyncio
+    async def test_tool_error_does_not_affect_others(self, client):
+        """A JSON-RPC error only fails its own call."""
+        results = await asyncio.gather(
+            client.call_tool("generate_image", {"prompt": "a", "fail": True}),
+            client.call_tool("generate_image", {"prompt": "b"}),
+            return_exceptions=True,
+        )
+        
+        assert isinstance(results[0], MCPToolCallError)
+        assert results[1] == {"echo": "b"}
+    
+    @pytest.mark.asyncio
+    async def test_restarts_after_crash(self, client):
+        """Pending calls fail on crash and the next call respawns the server."""
+        await client.call_tool("generate_image", {"prompt": "a"})
+        
+        with pytest.raises(MCPConnectionError):
+            await client.call_tool("generate_image", {"prompt": "x", "crash": True})
+        
+        result = await client.call_tool("generate_image", {"prompt": "again"})
+        
+        assert result == {"echo": "again"}
+        assert client.is_running
+    
+    @pytest.mark.asyncio
+    async def test_persistent_client_survives_context_exit(self):
+        """Persistent clients keep the subprocess between sessions."""
+        client = MCPStdioClient(
+            [sys.executable, "-c", FAKE_SERVER], timeout=10, persistent=True
+        )
+        try:
+            async with client:
+                pass
+            assert client.is_running
+        finally:
+            await client.close()
+        
+        assert not client.is_running
+    
+    @pytest.mark.asyncio
+    async def test_progress_notifications_reach_callback(self, client):
+        """Progress notifications are routed by progressToken."""
+        updates = []
+        
+        async def on_progress(params):
+            updates.append((params["progress"], params["total"]))
+        
+        result = await client.call_tool(
+            "generate_image",
+            {"prompt": "a", "steps": 3, "delay": 0.05},
+            on_progress=on_progress,
+        )
+        
+        assert result == {"echo": "a"}
+        assert updates == [(1, 3), (2, 3), (3, 3)]
+    
+    @pytest.mark.asyncio
+    async def test_failed_handshake_kills_process(self):
+        """A server that times out during initialize is not left running."""
+        client = MCPStdioClient([sys.executable, "-c", SILENT_SERVER], timeout=0.2)
+        try:
+            with pytest.raises(MCPTimeoutError):
+                await client.call_tool("generate_image", {"prompt": "a"})
+            
+            assert not client.is_running
+            assert client._reader_task is None
+            
+            # The next call starts over with a new handshake instead of skipping it
+            with pytest.raises(MCPTimeoutError):
+                await client.call_tool("generate_image", {"prompt": "a"})
+            assert client._starts == 2
+        finally:
+            await client.close()
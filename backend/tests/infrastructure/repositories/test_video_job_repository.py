@@ -0,0 +1,69 @@
+"""
+Tests for the video_jobs repository against SQLite.
+"""
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.infrastructure.database.models import VideoJobModel
+from app.infrastructure.repositories.video_job_repository import VideoJobRepository
+from app.infrastructure.video.jobs import JOB_FAILED, JOB_PENDING, JOB_SUCCEEDED, VideoJob
+
+
+@pytest.fixture
+async def repository():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(VideoJobModel.__table__.create)
+
+    @asynccontextmanager
+    async def session_factory():
+        async with AsyncSession(engine) as session:
+            yield session
+            await session.commit()
+
+    yield VideoJobRepository(session_factory)
+    await engine.dispose()
+
+
+def make_job(**kwargs):
+    options = dict(
+        job_id="job-1",
+        provider_job_id="p1",
+        workflow_id="wf-1",
+        submitted_at=1_700_000_000.0,
+        deadline_at=1_700_000_900.0,
+        context={"package_id": "x"},
+    )
+    options.update(kwargs)
+    return VideoJob(**options)
+
+
+class TestVideoJobRepository:
+    async def test_insert_then_update_pending(self, repository):
+        assert await repository.save(make_job()) is True
+        assert await repository.save(make_job(attempts=3)) is True
+
+        stored = await repository.get("job-1")
+        assert stored.state == JOB_PENDING
+        assert stored.attempts == 3
+        assert stored.context == {"package_id": "x"}
+        assert [job.job_id for job in await repository.list_active()] == ["job-1"]
+
+    async def test_only_first_terminal_save_wins(self, repository):
+        await repository.save(make_job())
+
+        won = await repository.save(
+            make_job(state=JOB_SUCCEEDED, result={"url": "https://cdn/a.mp4"}, completed_at=1_700_000_100.0)
+        )
+        lost = await repository.save(
+            make_job(state=JOB_FAILED, error="render failed", completed_at=1_700_000_200.0)
+        )
+
+        assert (won, lost) == (True, False)
+        stored = await repository.get("job-1")
+        assert stored.state == JOB_SUCCEEDED
+        assert stored.result == {"url": "https://cdn/a.mp4"}
+        assert stored.error is None
+        assert await repository.list_active() == []
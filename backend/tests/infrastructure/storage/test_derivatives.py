@@ -0,0 +1,155 @@
+"""
+Tests for responsive image derivatives.
+"""
+import hashlib
+import io
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+PIL = pytest.importorskip("PIL")
+from PIL import Image
+
+from app.infrastructure.storage.derivatives import (
+    ImageDerivativeGenerator,
+    render_derivatives,
+)
+from app.infrastructure.storage.minio_client import MinIOClient, UploadMetrics
+
+
+def make_png(width, height, mode="RGB"):
+    """Encode a solid test image as PNG."""
+    buffer = io.BytesIO()
+    Image.new(mode, (width, height), "red").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class TestRenderDerivatives:
+    """Test Pillow rendering."""
+
+    def test_resizes_preserving_aspect_ratio(self):
+        """Renditions fit the max edge and keep the aspect ratio."""
+        renditions = render_derivatives(
+            make_png(2000, 1000), {"thumbnail": 200, "medium": 800}, ("webp",)
+        )
+
+        thumb = Image.open(io.BytesIO(renditions["thumbnail"]["webp"]))
+        medium = Image.open(io.BytesIO(renditions["medium"]["webp"]))
+        assert thumb.format == "WEBP"
+        assert thumb.size == (200, 100)
+        assert medium.size == (800, 400)
+
+    def test_never_upscales(self):
+        """Small originals keep their size."""
+        renditions = render_derivatives(make_png(100, 50), {"medium": 800}, ("webp",))
+
+        assert Image.open(io.BytesIO(renditions["medium"]["webp"])).size == (100, 50)
+
+    def test_palette_images_are_converted(self):
+        """Palette PNGs are converted before encoding."""
+        renditions = render_derivatives(make_png(64, 64, mode="P"), {"thumbnail": 32}, ("webp",))
+
+        assert Image.open(io.BytesIO(renditions["thumbnail"]["webp"])).size == (32, 32)
+
+
+class TestImageDerivativeGenerator:
+    """Test derivative storage."""
+
+    @pytest.fixture
+    def minio_client(self):
+        """MinIO client with SDK calls mocked."""
+        client = MinIOClient(
+            endpoint="localhost:9000",
+            access_key="a",
+            secret_key="s",
+            bucket="bucket",
+            metrics=UploadMetrics(),
+        )
+        client.download_bytes = AsyncMock(return_value=make_png(1200, 600))
+        client.upload_stream = AsyncMock(side_effect=lambda data, object_name, **kw: object_name)
+        client.object_exists = AsyncMock(return_value=False)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_derivatives_stored_next_to_original(self, minio_client):
+        """Renditions are written beside the original object."""
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            generator = ImageDerivativeGenerator(
+                minio_client,
+                sizes={"thumbnail": 100},
+                formats=("webp", "unknown"),
+                executor=executor,
+            )
+            derivatives = await generator.create(
+                "http://localhost:9000/bucket/images/2026-01-01/abc.png"
+            )
+
+        minio_client.download_bytes.assert_awaited_once_with("images/2026-01-01/abc.png")
+        assert derivatives == {
+            "thumbnail": {
+                "webp": "http://localhost:9000/bucket/images/2026-01-01/abc_thumbnail.webp"
+            }
+        }
+        kwargs = minio_client.upload_stream.await_args.kwargs
+        assert kwargs["content_type"] == "image/webp"
+
+    @pytest.mark.asyncio
+    async def test_external_hosts_not_allowed_are_skipped(self, minio_client):
+        """Originals outside the bucket and allowed domains are not fetched."""
+        generator = ImageDerivativeGenerator(minio_client, formats=("webp",))
+
+        derivatives = await generator.create("https://picsum.photos/512/512")
+
+        assert derivatives == {}
+        minio_client.download_bytes.assert_not_awaited()
+        minio_client.upload_stream.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_existing_renditions_are_reused(self, minio_client):
+        """Renditions of an already stored original are not rendered again."""
+        minio_client.object_exists = AsyncMock(return_value=True)
+        generator = ImageDerivativeGenerator(
+            minio_client,
+            sizes={"thumbnail": 100},
+            formats=("webp",),
+        )
+
+        derivatives = await generator.create(
+            "http://localhost:9000/bucket/images/ab/abcdef.png"
+        )
+
+        assert derivatives == {
+            "thumbnail": {
+                "webp": "http://localhost:9000/bucket/images/ab/abcdef_thumbnail.webp"
+            }
+        }
+        minio_client.object_exists.assert_awaited_once_with("images/ab/abcdef_thumbnail.webp")
+        minio_client.download_bytes.assert_not_awaited()
+        minio_client.upload_stream.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_external_renditions_are_named_by_content(self, minio_client):
+        """Same-path external images on different hosts never share renditions."""
+        images = {
+            "https://a.example.com/photo.png": make_png(300, 300),
+            "https://b.example.com/photo.png": make_png(200, 200),
+        }
+        generator = ImageDerivativeGenerator(
+            minio_client,
+            sizes={"thumbnail": 100},
+            formats=("webp",),
+            allowed_domains=["a.example.com", "b.example.com"],
+        )
+
+        with patch(
+            "app.infrastructure.storage.derivatives.fetch_image_bytes",
+            AsyncMock(side_effect=lambda storage, url, **kw: images[url]),
+        ):
+            first = await generator.create("https://a.example.com/photo.png")
+            second = await generator.create("https://b.example.com/photo.png")
+
+        first_url, second_url = first["thumbnail"]["webp"], second["thumbnail"]["webp"]
+        digest = hashlib.sha256(images["https://a.example.com/photo.png"]).hexdigest()
+        assert first_url.endswith(f"/derivatives/external/{digest}_thumbnail.webp")
+        assert first_url != second_url
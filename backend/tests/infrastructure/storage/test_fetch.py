@@ -0,0 +1,66 @@
+"""
+Tests for fetching external images.
+"""
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.infrastructure.storage.fetch import fetch_image_bytes
+
+
+BODY = bytes(range(256)) * 12_000  # ~3 MB, arrives in many chunks
+
+
+async def stream_body(request):
+    response = web.StreamResponse()
+    await response.prepare(request)
+    for offset in range(0, len(BODY), 50_000):
+        await response.write(BODY[offset:offset + 50_000])
+    await response.write_eof()
+    return response
+
+
+async def sized_body(request):
+    return web.Response(body=BODY)
+
+
+@pytest.fixture
+async def server():
+    app = web.Application()
+    app.router.add_get("/stream.png", stream_body)
+    app.router.add_get("/sized.png", sized_body)
+    server = TestServer(app, host="127.0.0.1")
+    await server.start_server()
+    yield server
+    await server.close()
+
+
+def storage(max_size_bytes=10 * 1024 * 1024):
+    return SimpleNamespace(max_size_bytes=max_size_bytes, object_name_from_url=lambda url: None)
+
+
+class TestFetchImageBytes:
+    async def test_reads_whole_streamed_body(self, server):
+        url = str(server.make_url("/stream.png"))
+
+        data = await fetch_image_bytes(storage(), url, allowed_domains=["127.0.0.1"])
+
+        assert data == BODY
+
+    async def test_oversized_streamed_body_is_rejected(self, server):
+        url = str(server.make_url("/stream.png"))
+
+        assert await fetch_image_bytes(storage(), url, ["127.0.0.1"], max_bytes=len(BODY) - 1) is None
+
+    async def test_oversized_content_length_is_rejected(self, server):
+        url = str(server.make_url("/sized.png"))
+
+        assert await fetch_image_bytes(storage(len(BODY) - 1), url, ["127.0.0.1"]) is None
+        assert await fetch_image_bytes(storage(), url, ["127.0.0.1"]) == BODY
+
+    async def test_disallowed_host_is_not_fetched(self, server):
+        url = str(server.make_url("/stream.png"))
+
+        assert await fetch_image_bytes(storage(), url, ["cdn.example.com"]) is None
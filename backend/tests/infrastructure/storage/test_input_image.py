@@ -0,0 +1,120 @@
+"""
+Tests for the workflow input image loader.
+"""
+import asyncio
+import io
+from unittest.mock import patch
+
+import pytest
+
+from app.infrastructure.storage.input_image import (
+    InputImage,
+    InputImageCache,
+    InputImageError,
+    InputImageLoader,
+    sniff_image_type,
+)
+from app.infrastructure.storage.local_storage import LocalStorageClient
+from app.infrastructure.storage.minio_client import UploadMetrics
+
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+JPEG = b"\xff\xd8\xff\xe0" + b"\x00" * 64
+URL = "http://testserver/api/v1/files/uploads/product.png"
+
+
+@pytest.fixture
+async def storage(tmp_path):
+    storage = LocalStorageClient(
+        root_dir=str(tmp_path / "objects"),
+        base_url="http://testserver/api/v1/files/",
+        metrics=UploadMetrics(),
+    )
+    await storage.upload_stream(io.BytesIO(PNG), "uploads/product.png", "image/png")
+    await storage.upload_stream(io.BytesIO(b"<html>not an image</html>"), "uploads/page.png", "image/png")
+    await storage.upload_stream(io.BytesIO(JPEG + b"\x00" * 4096), "uploads/large.jpg", "image/jpeg")
+    return storage
+
+
+def test_sniff_image_type():
+    assert sniff_image_type(PNG) == "image/png"
+    assert sniff_image_type(JPEG) == "image/jpeg"
+    assert sniff_image_type(b"GIF89a...") == "image/gif"
+    assert sniff_image_type(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "image/webp"
+    assert sniff_image_type(b"<svg xmlns=...>") is None
+    assert sniff_image_type(b"") is None
+
+
+@pytest.mark.asyncio
+class TestInputImageLoader:
+    async def test_downloads_once_and_saves_to_workspace(self, storage, tmp_path):
+        loader = InputImageLoader(storage)
+        workspace = str(tmp_path / "wf-1")
+
+        first = await loader.load(URL, workspace)
+        second = await loader.load(URL, workspace)
+
+        assert loader.downloads == 1
+        assert first.content_type == "image/png"
+        assert first.path == f"{workspace}/input/product_image.png"
+        assert second.data == PNG and second.digest == first.digest
+        with open(first.path, "rb") as f:
+            assert f.read() == PNG
+
+    async def test_concurrent_loads_share_download(self, storage):
+        loader = InputImageLoader(storage)
+
+        images = await asyncio.gather(*(loader.load(URL) for _ in range(5)))
+
+        assert loader.downloads == 1
+        assert {image.digest for image in images} == {images[0].digest}
+
+    async def test_workspace_copy_survives_cache_loss(self, storage, tmp_path):
+        workspace = str(tmp_path / "wf-1")
+        await InputImageLoader(storage).load(URL, workspace)
+
+        # A new process: empty cache, image already in the workspace
+        loader = InputImageLoader(storage)
+        with patch("app.infrastructure.storage.input_image.fetch_image_bytes") as fetch:
+            image = await loader.load(URL, workspace)
+
+        fetch.assert_not_called()
+        assert image.data == PNG
+
+    async def test_rejects_non_image_content(self, storage):
+        loader = InputImageLoader(storage)
+        with pytest.raises(InputImageError, match="not a JPEG"):
+            await loader.load("http://testserver/api/v1/files/uploads/page.png")
+
+    async def test_rejects_oversized_image(self, storage):
+        loader = InputImageLoader(storage, max_bytes=1024)
+        with pytest.raises(InputImageError, match="too large"):
+            await loader.load("http://testserver/api/v1/files/uploads/large.jpg")
+
+    async def test_rejects_disallowed_and_non_http_sources(self, storage):
+        loader = InputImageLoader(storage, allowed_domains={"cdn.example.com"})
+        with pytest.raises(InputImageError):
+            await loader.load("https://elsewhere.example.com/p.png")
+        with pytest.raises(InputImageError):
+            await loader.load("asset://1234")
+        assert loader.downloads == 0
+
+
+class TestInputImageCache:
+    def make(self, url, size):
+        return InputImage(url=url, data=b"\x00" * size, content_type="image/png", digest=url)
+
+    def test_evicts_by_total_bytes(self):
+        cache = InputImageCache(max_entries=10, max_bytes=250)
+        for name in ("a", "b", "c"):
+            cache.set(self.make(name, 100))
+
+        assert cache.get("a") is None
+        assert cache.get("c") is not None
+        assert cache.stats()["bytes"] == 200
+        assert cache.stats()["evictions"] == 1
+
+    def test_skips_images_larger_than_cache(self):
+        cache = InputImageCache(max_bytes=50)
+        cache.set(self.make("a", 100))
+        assert cache.stats()["size"] == 0
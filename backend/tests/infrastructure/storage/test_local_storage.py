@@ -0,0 +1,105 @@
+"""
+Tests for the local disk storage backend.
+"""
+import base64
+import hashlib
+import io
+
+import pytest
+
+from app.infrastructure.storage.local_storage import LocalStorageClient
+from app.infrastructure.storage.minio_client import (
+    MinIOError,
+    MinIOSizeLimitError,
+    UploadMetrics,
+)
+
+
+class OverLimitStream(io.BytesIO):
+    """Stream that fails its size limit after the first chunk, like Base64StreamReader."""
+
+    def read(self, size=-1):
+        if self.tell():
+            raise MinIOSizeLimitError("Image exceeds limit")
+        return super().read(size if 0 < size < 1000 else 1000)
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """Local storage rooted in a temp directory."""
+    return LocalStorageClient(
+        root_dir=str(tmp_path / "objects"),
+        base_url="http://testserver/api/v1/files/",
+        max_size_bytes=4096,
+        metrics=UploadMetrics(),
+    )
+
+
+class TestLocalStorageClient:
+    """Test LocalStorageClient against the MinIOClient contract."""
+
+    @pytest.mark.asyncio
+    async def test_base64_upload_is_content_addressed(self, storage):
+        """Uploads land under their sha256 and are deduplicated."""
+        payload = b"\x89PNG" + b"\x07" * 200
+        digest = hashlib.sha256(payload).hexdigest()
+        b64_data = base64.b64encode(payload).decode()
+
+        url = await storage.upload_base64_image(b64_data, "image/png")
+        again = await storage.upload_base64_image(b64_data, "image/png")
+
+        assert url == f"http://testserver/api/v1/files/images/{digest[:2]}/{digest}.png"
+        assert again == url
+        assert (storage.root / "images" / digest[:2] / f"{digest}.png").read_bytes() == payload
+        assert storage.metrics.stats()["deduplicated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_round_trip_through_url(self, storage):
+        """object_name_from_url and download_bytes invert get_object_url."""
+        await storage.upload_stream(io.BytesIO(b"hello"), "videos/a.mp4", "video/mp4")
+
+        name = storage.object_name_from_url(storage.get_object_url("videos/a.mp4"))
+
+        assert name == "videos/a.mp4"
+        assert await storage.download_bytes(name) == b"hello"
+        assert await storage.object_exists(name)
+        assert storage.object_name_from_url("https://picsum.photos/1") is None
+
+    @pytest.mark.asyncio
+    async def test_size_limit_leaves_no_partial_file(self, storage):
+        """A stream failing its size limit leaves no file behind."""
+        reader = OverLimitStream(b"x" * 5000)
+
+        with pytest.raises(MinIOSizeLimitError):
+            await storage.upload_stream(reader, "big.bin")
+
+        assert not any(p.is_file() for p in storage.root.rglob("*"))
+
+    @pytest.mark.asyncio
+    async def test_server_objects_are_not_capped(self, storage):
+        """Like MinIOClient, upload_stream stores objects over max_size_bytes."""
+        await storage.upload_stream(io.BytesIO(b"x" * 5000), "videos/long.mp4", "video/mp4")
+
+        assert (storage.root / "videos" / "long.mp4").stat().st_size == 5000
+
+    @pytest.mark.asyncio
+    async def test_path_traversal_rejected(self, storage):
+        """Object names cannot escape the storage root."""
+        assert storage.resolve_path("../secret.txt") is None
+        assert storage.resolve_path("images/../../secret.txt") is None
+        with pytest.raises(MinIOError):
+            await storage.upload_stream(io.BytesIO(b"x"), "../escape.txt")
+
+    @pytest.mark.asyncio
+    async def test_etag_is_content_hash(self, storage):
+        """ETags are the sha256 of the content, for any object name."""
+        await storage.upload_stream(io.BytesIO(b"abc"), "docs/readme.txt")
+        path = storage.resolve_path("docs/readme.txt")
+
+        etag = await storage.etag(path, path.stat())
+
+        assert etag == f'"{hashlib.sha256(b"abc").hexdigest()}"'
+        assert storage.cache_control_for("docs/readme.txt") == "no-cache"
+        assert "immutable" in storage.cache_control_for(
+            f"images/ab/{hashlib.sha256(b'abc').hexdigest()}.png"
+        )
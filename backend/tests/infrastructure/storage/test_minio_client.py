@@ -6,15 +6,31 @@ Tests Base64 image upload functionality for MCP integration.
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
+import asyncio
 import base64
+import io
+import threading
+import time
 
 from app.infrastructure.storage.minio_client import (
     MinIOClient,
     MinIOUploadError,
     MinIOSizeLimitError,
+    UploadMetrics,
 )
 
 
+def mock_sdk(**kwargs) -> MagicMock:
+    """Mocked minio SDK client whose bucket is empty (stat_object misses)."""
+    from minio.error import S3Error
+    
+    sdk = MagicMock(**kwargs)
+    sdk.stat_object.side_effect = S3Error(
+        MagicMock(), "NoSuchKey", "Object does not exist", None, None, None,
+    )
+    return sdk
+
+
 class TestMinIOClient:
     """Test MinIO storage client."""
     
@@ -95,7 +111,7 @@ class TestMinIOClient:
         b64_data = base64.b64encode(test_data).decode()
         
         with patch.object(client, '_get_minio_client') as mock_get_client:
-            mock_minio = MagicMock()
+            mock_minio = mock_sdk()
             mock_get_client.return_value = mock_minio
             mock_minio.put_object.return_value = MagicMock()
             
@@ -149,7 +165,7 @@ class TestMinIOClient:
         b64_data = base64.b64encode(test_data).decode()
         
         with patch.object(client, '_get_minio_client') as mock_get_client:
-            mock_minio = MagicMock()
+            mock_minio = mock_sdk()
             mock_get_client.return_value = mock_minio
             mock_minio.put_object.side_effect = Exception("Connection refused")
             
@@ -196,7 +212,7 @@ class TestMinIOSizeLimit:
         b64_data = base64.b64encode(small_data).decode()
         
         with patch.object(small_limit_client, '_get_minio_client') as mock_get_client:
-            mock_minio = MagicMock()
+            mock_minio = mock_sdk()
             mock_get_client.return_value = mock_minio
             mock_minio.put_object.return_value = MagicMock()
             
@@ -219,6 +235,97 @@ class TestMinIOSizeLimit:
         assert client.max_size_bytes == 10 * 1024 * 1024
 
 
+class TestMinIONonBlocking:
+    """Test that SDK calls run off the event loop."""
+    
+    @pytest.fixture
+    def client(self):
+        """Client with private metrics."""
+        return MinIOClient(
+            endpoint="localhost:9000",
+            access_key="access",
+            secret_key="secret",
+            bucket="bucket",
+            metrics=UploadMetrics(),
+        )
+    
+    @pytest.mark.asyncio
+    async def test_put_object_runs_in_worker_thread(self, client):
+        """A slow put_object does not block other coroutines."""
+        loop_thread = threading.get_ident()
+        seen = {}
+        
+        def slow_put(**kwargs):
+            seen["thread"] = threading.get_ident()
+            seen["kwargs"] = kwargs
+            time.sleep(0.2)
+        
+        ticks = []
+        
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.02)
+        
+        with patch.object(client, '_get_minio_client') as mock_get_client:
+            mock_get_client.return_value = mock_sdk(put_object=slow_put)
+            b64_data = base64.b64encode(b"\x00" * 100).decode()
+            
+            await asyncio.gather(
+                client.upload_base64_image(b64_data, "image/png"),
+                ticker(),
+            )
+        
+        assert seen["thread"] != loop_thread
+        assert seen["kwargs"]["part_size"] == 5 * 1024 * 1024
+        # The ticker kept running while the upload was in flight
+        assert ticks[-1] - ticks[0] < 0.2
+    
+    @pytest.mark.asyncio
+    async def test_upload_stream_unknown_length_uses_multipart(self, client):
+        """Streams of unknown length are handed to the SDK with part_size."""
+        with patch.object(client, '_get_minio_client') as mock_get_client:
+            mock_minio = MagicMock()
+            mock_get_client.return_value = mock_minio
+            
+            await client.upload_stream(io.BytesIO(b"abc"), "videos/a.mp4", "video/mp4")
+        
+        kwargs = mock_minio.put_object.call_args.kwargs
+        assert kwargs["length"] == -1
+        assert kwargs["part_size"] == client.part_size_bytes
+    
+    @pytest.mark.asyncio
+    async def test_metrics_record_success_and_failure(self, client):
+        """Uploads update latency, byte and failure counters."""
+        b64_data = base64.b64encode(b"\x00" * 100).decode()
+        
+        with patch.object(client, '_get_minio_client') as mock_get_client:
+            mock_minio = mock_sdk()
+            mock_get_client.return_value = mock_minio
+            await client.upload_base64_image(b64_data, "image/png")
+            
+            mock_minio.put_object.side_effect = Exception("boom")
+            with pytest.raises(MinIOUploadError):
+                await client.upload_base64_image(b64_data, "image/png")
+        
+        stats = client.metrics.stats()
+        assert stats["uploads"] == 1
+        assert stats["failures"] == 1
+        assert stats["bytes_uploaded"] == 100
+    
+    @pytest.mark.asyncio
+    async def test_ensure_bucket_exists_offloaded(self, client):
+        """Bucket creation also goes through the thread pool."""
+        with patch.object(client, '_get_minio_client') as mock_get_client:
+            mock_minio = MagicMock()
+            mock_minio.bucket_exists.return_value = False
+            mock_get_client.return_value = mock_minio
+            
+            await client.ensure_bucket_exists()
+        
+        mock_minio.make_bucket.assert_called_once_with("bucket")
+
+
 class TestMinIOExceptions:
     """Test MinIO exceptions."""
     
@@ -231,3 +338,220 @@ class TestMinIOExceptions:
         """Test MinIOSizeLimitError."""
         error = MinIOSizeLimitError("Image size exceeds limit")
         assert "exceeds limit" in str(error)
+
+
+class TestBase64StreamReader:
+    """Test incremental Base64 decoding."""
+    
+    def test_streams_in_chunks_with_digest(self):
+        """Output matches a full decode while reading small chunks."""
+        import hashlib
+        from app.infrastructure.storage.minio_client import Base64StreamReader
+        
+        payload = bytes(range(256)) * 50
+        reader = Base64StreamReader(
+            "data:image/png;base64," + base64.b64encode(payload).decode(),
+            chunk_chars=64,
+        )
+        
+        assert reader.length == len(payload)
+        chunks = []
+        while chunk := reader.read(100):
+            assert len(chunk) <= 100
+            chunks.append(chunk)
+        
+        assert b"".join(chunks) == payload
+        assert reader.hexdigest() == hashlib.sha256(payload).hexdigest()
+        # Only one decoded chunk is buffered at a time
+        assert len(reader._buffer) <= 48
+    
+    def test_line_breaks_are_accepted(self):
+        """MIME-style wrapped Base64 decodes with unknown length."""
+        from app.infrastructure.storage.minio_client import Base64StreamReader
+        
+        payload = b"x" * 1000
+        wrapped = base64.encodebytes(payload).decode()
+        reader = Base64StreamReader(wrapped, chunk_chars=64)
+        
+        assert reader.length is None
+        assert reader.read() == payload
+    
+    def test_size_limit_enforced_while_streaming(self):
+        """Unknown-length payloads fail once decoded bytes pass the limit."""
+        from app.infrastructure.storage.minio_client import Base64StreamReader
+        
+        wrapped = base64.encodebytes(b"x" * 5000).decode()
+        reader = Base64StreamReader(wrapped, max_size_bytes=1024, chunk_chars=64)
+        
+        with pytest.raises(MinIOSizeLimitError):
+            reader.read()
+    
+    def test_invalid_data_detected_mid_stream(self):
+        """Corruption after the first chunk surfaces as MinIOUploadError."""
+        from app.infrastructure.storage.minio_client import Base64StreamReader
+        
+        data = base64.b64encode(b"x" * 300).decode()[:200] + "!!!!" + "AAAA" * 10
+        reader = Base64StreamReader(data, chunk_chars=64)
+        
+        with pytest.raises(MinIOUploadError):
+            reader.read()
+    
+    @pytest.mark.asyncio
+    async def test_upload_streams_reader_to_put_object(self):
+        """With random keys, put_object gets a decoding stream, not decoded bytes."""
+        from app.infrastructure.storage.minio_client import Base64StreamReader
+        
+        client = MinIOClient(
+            endpoint="localhost:9000",
+            access_key="access",
+            secret_key="secret",
+            bucket="bucket",
+            metrics=UploadMetrics(),
+            content_addressed=False,
+        )
+        payload = b"\x89PNG" + b"\x00" * 500
+        received = {}
+        
+        def put_object(**kwargs):
+            received["data_type"] = type(kwargs["data"])
+            received["body"] = kwargs["data"].read()
+            received["length"] = kwargs["length"]
+        
+        with patch.object(client, '_get_minio_client') as mock_get_client:
+            mock_get_client.return_value = mock_sdk(put_object=put_object)
+            await client.upload_base64_image(base64.b64encode(payload).decode())
+        
+        assert received["data_type"] is Base64StreamReader
+        assert received["body"] == payload
+        assert received["length"] == len(payload)
+
+
+class TestMinIOContentAddressing:
+    """Test content-addressed keys and upload deduplication."""
+    
+    @pytest.fixture
+    def client(self):
+        """Client with private metrics."""
+        return MinIOClient(
+            endpoint="localhost:9000",
+            access_key="access",
+            secret_key="secret",
+            bucket="bucket",
+            metrics=UploadMetrics(),
+        )
+    
+    @pytest.mark.asyncio
+    async def test_object_name_is_content_hash(self, client):
+        """Identical bytes map to the same sha256-derived key."""
+        import hashlib
+        
+        payload = b"\x89PNG" + b"\x01" * 300
+        digest = hashlib.sha256(payload).hexdigest()
+        b64_data = base64.b64encode(payload).decode()
+        
+        with patch.object(client, '_get_minio_client') as mock_get_client:
+            mock_minio = mock_sdk()
+            mock_get_client.return_value = mock_minio
+            url = await client.upload_base64_image(b64_data, "image/png")
+            again = await client.upload_base64_image(
+                f"data:image/png;base64,{b64_data}", "image/png"
+            )
+        
+        assert url == f"http://localhost:9000/bucket/images/{digest[:2]}/{digest}.png"
+        assert again == url
+    
+    @pytest.mark.asyncio
+    async def test_payload_is_decoded_once(self, client):
+        """Hashing and uploading share one decode of the Base64 payload."""
+        import binascii
+        
+        payload = b"\x89PNG" + bytes(range(256)) * 1000
+        decoded = []
+        a2b_base64 = binascii.a2b_base64
+        
+        def counting_a2b_base64(data, **kwargs):
+            result = a2b_base64(data, **kwargs)
+            decoded.append(len(result))
+            return result
+        
+        received = {}
+        
+        def put_object(**kwargs):
+            received["body"] = kwargs["data"].read()
+            received["length"] = kwargs["length"]
+        
+        with patch.object(client, '_get_minio_client') as mock_get_client, \
+             patch("binascii.a2b_base64", counting_a2b_base64):
+            mock_get_client.return_value = mock_sdk(put_object=put_object)
+            await client.upload_base64_image(base64.b64encode(payload).decode())
+        
+        assert sum(decoded) == len(payload)
+        assert received["body"] == payload
+        assert received["length"] == len(payload)
+    
+    @pytest.mark.asyncio
+    async def test_existing_object_is_not_uploaded(self, client):
+        """Bytes already in the bucket are skipped and counted as deduplicated."""
+        b64_data = base64.b64encode(b"\x89PNG" + b"\x00" * 100).decode()
+        
+        with patch.object(client, '_get_minio_client') as mock_get_client:
+            mock_minio = MagicMock()
+            mock_get_client.return_value = mock_minio
+            url = await client.upload_base64_image(b64_data, "image/png")
+        
+        mock_minio.stat_object.assert_called_once()
+        mock_minio.put_object.assert_not_called()
+        assert url.endswith(".png")
+        stats = client.metrics.stats()
+        assert stats["deduplicated"] == 1
+        assert stats["uploads"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_uploads_carry_immutable_cache_control(self, client):
+        """Stored objects get a long-lived immutable Cache-Control header."""
+        b64_data = base64.b64encode(b"\x89PNG" + b"\x00" * 100).decode()
+        
+        with patch.object(client, '_get_minio_client') as mock_get_client:
+            mock_minio = mock_sdk()
+            mock_get_client.return_value = mock_minio
+            await client.upload_base64_image(b64_data, "image/png")
+        
+        metadata = mock_minio.put_object.call_args.kwargs["metadata"]
+        assert metadata == {"Cache-Control": "public, max-age=31536000, immutable"}
+    
+    @pytest.mark.asyncio
+    async def test_stat_errors_other_than_missing_are_raised(self, client):
+        """Only a missing key means "not stored"; other errors surface."""
+        from app.infrastructure.storage.minio_client import MinIOConnectionError
+        
+        with patch.object(client, '_get_minio_client') as mock_get_client:
+            mock_get_client.return_value = MagicMock(
+                stat_object=MagicMock(side_effect=OSError("connection refused"))
+            )
+            with pytest.raises(MinIOConnectionError):
+                await client.object_exists("images/ab/abc.png")
+    
+    @pytest.mark.asyncio
+    async def test_random_names_when_disabled(self):
+        """content_addressed=False keeps date/uuid names and skips the stat."""
+        client = MinIOClient(
+            endpoint="localhost:9000",
+            access_key="access",
+            secret_key="secret",
+            bucket="bucket",
+            metrics=UploadMetrics(),
+            content_addressed=False,
+            cache_control=None,
+        )
+        b64_data = base64.b64encode(b"\x89PNG" + b"\x00" * 100).decode()
+        
+        with patch.object(client, '_get_minio_client') as mock_get_client:
+            mock_minio = MagicMock()
+            mock_get_client.return_value = mock_minio
+            first = await client.upload_base64_image(b64_data, "image/png")
+            second = await client.upload_base64_image(b64_data, "image/png")
+        
+        assert first != second
+        mock_minio.stat_object.assert_not_called()
+        assert mock_minio.put_object.call_count == 2
+        assert mock_minio.put_object.call_args.kwargs["metadata"] is None
@@ -0,0 +1,117 @@
+"""
+Tests for the presigned URL signer.
+
+Signing uses the real minio SDK with a fixed region, so no request ever
+leaves the process (the endpoint below does not exist).
+"""
+from urllib.parse import parse_qs, urlparse
+from unittest.mock import patch
+
+import pytest
+
+from app.infrastructure.storage.minio_client import MinIOClient
+from app.infrastructure.storage.url_signer import PresignedURLSigner
+
+
+@pytest.fixture
+def minio_client():
+    """Client for an unreachable endpoint; signing must stay local."""
+    return MinIOClient(
+        endpoint="minio.invalid:9000",
+        access_key="access",
+        secret_key="secret",
+        bucket="private",
+        region="us-east-1",
+    )
+
+
+class FakeClock:
+    """Settable wall clock."""
+
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestPresignedURLSigner:
+    """Test presigned URL issuance and caching."""
+
+    def test_bucket_urls_are_presigned(self, minio_client):
+        """Object URLs get a SigV4 query string valid for expiry + window."""
+        signer = PresignedURLSigner(minio_client, expiry_seconds=3600, window_seconds=600)
+
+        url = signer.sign("http://minio.invalid:9000/private/images/ab/abc.png")
+
+        parsed = urlparse(url)
+        query = parse_qs(parsed.query)
+        assert parsed.path == "/private/images/ab/abc.png"
+        assert query["X-Amz-Algorithm"] == ["AWS4-HMAC-SHA256"]
+        assert query["X-Amz-Expires"] == ["4200"]
+
+    def test_foreign_urls_pass_through(self, minio_client):
+        """External URLs, data URIs and None are returned unchanged."""
+        signer = PresignedURLSigner(minio_client)
+        urls = ["https://picsum.photos/512", "data:image/png;base64,AAAA", None, ""]
+
+        assert signer.sign_many(urls) == urls
+
+    def test_urls_stable_within_window_and_cached(self, minio_client):
+        """Repeated and duplicate URLs reuse one signature per window."""
+        clock = FakeClock()
+        signer = PresignedURLSigner(minio_client, window_seconds=600, clock=clock)
+        original = "http://minio.invalid:9000/private/images/a.png"
+
+        with patch.object(
+            minio_client, "presigned_get_url", wraps=minio_client.presigned_get_url
+        ) as presign:
+            first = signer.sign_many([original, original])
+            clock.now += 100
+            second = signer.sign(original)
+            clock.now += 600
+            third = signer.sign(original)
+
+        assert first[0] == first[1] == second
+        assert third != second
+        assert presign.call_count == 2
+        assert signer.stats()["hits"] == 1
+
+    def test_hundred_assets_sign_without_network(self, minio_client):
+        """A gallery page is signed locally; the SDK never opens a connection."""
+        signer = PresignedURLSigner(minio_client)
+        urls = [f"http://minio.invalid:9000/private/images/{i}.png" for i in range(100)]
+
+        with patch.object(minio_client._get_minio_client(), "_url_open") as url_open:
+            signed = signer.sign_many(urls)
+
+        url_open.assert_not_called()
+        assert len(set(signed)) == 100
+
+    def test_cache_is_bounded(self, minio_client):
+        """Least recently used entries are evicted beyond max_entries."""
+        signer = PresignedURLSigner(minio_client, max_entries=2)
+
+        signer.sign_many([f"http://minio.invalid:9000/private/{i}.png" for i in range(5)])
+
+        assert signer.stats()["size"] == 2
+
+    def test_validity_capped_at_seven_days(self, minio_client):
+        """Expiry plus window never exceeds the S3 maximum."""
+        signer = PresignedURLSigner(minio_client, expiry_seconds=30 * 24 * 3600, window_seconds=600)
+
+        url = signer.sign("http://minio.invalid:9000/private/a.png")
+
+        assert parse_qs(urlparse(url).query)["X-Amz-Expires"] == ["604800"]
+
+    def test_client_without_region_is_rejected(self):
+        """A missing region would trigger a blocking bucket-location lookup."""
+        client = MinIOClient(
+            endpoint="minio.invalid:9000",
+            access_key="access",
+            secret_key="secret",
+            bucket="private",
+        )
+
+        with pytest.raises(ValueError):
+            PresignedURLSigner(client)
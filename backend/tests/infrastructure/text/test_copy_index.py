@@ -0,0 +1,109 @@
+"""
+Tests for the per-user near-duplicate copy index.
+"""
+from uuid import uuid4
+
+import pytest
+
+from app.infrastructure.text.copy_index import CopyDuplicateIndex, InMemoryCopySignatureStore
+
+
+COPY = (
+    "This waterproof backpack keeps your laptop dry on any commute. "
+    "The lightweight frame weighs under a kilo and the padded straps "
+    "make it the commuter bag you will carry every single day."
+)
+OTHER = "Running shoes with a responsive foam midsole for long weekend runs in the park."
+
+
+def copy_assets(content):
+    return [
+        {"channel": channel, "content": content}
+        for channel in ("product_page", "social_post", "ad_short")
+    ]
+
+
+class FailingStore(InMemoryCopySignatureStore):
+    async def save(self, signatures):
+        raise ConnectionError("database down")
+
+
+@pytest.fixture
+def store():
+    return InMemoryCopySignatureStore()
+
+
+class TestCopyDuplicateIndex:
+    async def test_flags_copy_repeated_across_workflows(self, store):
+        index = CopyDuplicateIndex(store)
+        user = uuid4()
+
+        first = copy_assets(COPY)
+        assert await index.check_and_register(user, "wf-1", first) == 0
+        assert all(asset["duplicates"] == [] for asset in first)
+
+        second = copy_assets(COPY.replace("every single day", "every day"))
+        assert await index.check_and_register(user, "wf-2", second) == 3
+        assert {d["workflow_id"] for d in second[0]["duplicates"]} == {"wf-1"}
+        assert len(second[0]["duplicates"]) == 3
+
+    async def test_users_are_isolated(self, store):
+        index = CopyDuplicateIndex(store)
+        await index.check_and_register(uuid4(), "wf-1", copy_assets(COPY))
+
+        assets = copy_assets(COPY)
+        assert await index.check_and_register(uuid4(), "wf-2", assets) == 0
+
+    async def test_index_is_rebuilt_from_store(self, store):
+        user = uuid4()
+        await CopyDuplicateIndex(store).check_and_register(user, "wf-1", copy_assets(COPY))
+
+        restarted = CopyDuplicateIndex(store)
+        assert await restarted.check_and_register(user, "wf-2", copy_assets(COPY)) == 3
+
+    async def test_sees_copy_registered_by_other_workers(self, store):
+        user = uuid4()
+        worker_a, worker_b = CopyDuplicateIndex(store), CopyDuplicateIndex(store)
+        await worker_a.check_and_register(user, "wf-1", copy_assets(OTHER))
+
+        # Worker A's index is already loaded when B registers new copy
+        await worker_b.check_and_register(user, "wf-2", copy_assets(COPY))
+
+        assets = copy_assets(COPY)
+        assert await worker_a.check_and_register(user, "wf-3", assets) == 3
+        assert {d["workflow_id"] for d in assets[0]["duplicates"]} == {"wf-2"}
+        assert (await worker_a.clusters(user))[0]["workflow_ids"] == ["wf-2", "wf-3"]
+
+    async def test_signatures_of_other_length_are_ignored(self, store):
+        user = uuid4()
+        await CopyDuplicateIndex(store, num_perm=64).check_and_register(user, "wf-1", copy_assets(COPY))
+
+        index = CopyDuplicateIndex(store, num_perm=128)
+        assert await index.check_and_register(user, "wf-2", copy_assets(COPY)) == 0
+
+    async def test_store_failure_keeps_in_memory_index(self):
+        index = CopyDuplicateIndex(FailingStore())
+        user = uuid4()
+        await index.check_and_register(user, "wf-1", copy_assets(COPY))
+
+        assert await index.check_and_register(user, "wf-2", copy_assets(COPY)) == 3
+
+    async def test_clusters_span_workflows(self, store):
+        index = CopyDuplicateIndex(store)
+        user = uuid4()
+        await index.check_and_register(user, "wf-1", copy_assets(COPY))
+        await index.check_and_register(user, "wf-2", copy_assets(COPY))
+        await index.check_and_register(user, "wf-3", copy_assets(OTHER))
+
+        clusters = await index.clusters(user)
+
+        assert len(clusters) == 1
+        assert clusters[0]["size"] == 6
+        assert clusters[0]["workflow_ids"] == ["wf-1", "wf-2"]
+
+    async def test_user_indexes_are_bounded(self, store):
+        index = CopyDuplicateIndex(store, max_users=2)
+        for _ in range(3):
+            await index.check_and_register(uuid4(), "wf", copy_assets(OTHER))
+
+        assert index.stats()["users"] == 2
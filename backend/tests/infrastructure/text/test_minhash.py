@@ -0,0 +1,98 @@
+"""
+Tests for MinHash signatures and the LSH index.
+"""
+import numpy as np
+import pytest
+
+from app.infrastructure.text.minhash import LSHIndex, MinHasher, lsh_params, shingles
+
+
+BASE = (
+    "This waterproof backpack keeps your laptop dry on any commute. "
+    "The lightweight frame weighs under a kilo and the padded straps "
+    "make it the commuter bag you will carry every single day."
+)
+NEAR = BASE.replace("every single day", "every day")
+OTHER = "Running shoes with a responsive foam midsole for long weekend runs in the park."
+
+
+class TestShingles:
+    def test_case_and_punctuation_are_ignored(self):
+        assert shingles("Waterproof, LIGHTWEIGHT backpack!") == shingles("waterproof lightweight backpack")
+
+    def test_short_text_forms_one_shingle(self):
+        assert len(shingles("backpack")) == 1
+        assert shingles("...") == set()
+
+    def test_cjk_characters_are_tokens(self):
+        assert len(shingles("这款背包防水又轻便")) == 7
+
+
+class TestMinHasher:
+    def test_similarity_tracks_jaccard(self):
+        hasher = MinHasher()
+        base = hasher.signature(BASE)
+
+        assert hasher.similarity(base, hasher.signature(BASE)) == 1.0
+        assert hasher.similarity(base, hasher.signature(NEAR)) > 0.7
+        assert hasher.similarity(base, hasher.signature(OTHER)) < 0.1
+
+    def test_signatures_are_deterministic_per_seed(self):
+        assert np.array_equal(MinHasher(seed=3).signature(BASE), MinHasher(seed=3).signature(BASE))
+        assert not np.array_equal(MinHasher(seed=3).signature(BASE), MinHasher(seed=4).signature(BASE))
+
+    def test_bytes_round_trip(self):
+        signature = MinHasher(num_perm=64).signature(BASE)
+        data = MinHasher.to_bytes(signature)
+
+        assert len(data) == 256
+        assert np.array_equal(MinHasher.from_bytes(data), signature)
+
+
+class TestLSHIndex:
+    @pytest.mark.parametrize("threshold", [0.5, 0.8, 0.9])
+    def test_params_fit_signature(self, threshold):
+        bands, rows = lsh_params(128, threshold)
+
+        assert bands * rows <= 128
+        assert (1 / bands) ** (1 / rows) <= threshold
+
+    def test_query_finds_near_duplicates(self):
+        hasher = MinHasher()
+        index = LSHIndex(threshold=0.7)
+        index.insert("base", hasher.signature(BASE))
+        index.insert("other", hasher.signature(OTHER))
+
+        matches = index.query(hasher.signature(NEAR))
+
+        assert [key for key, _ in matches] == ["base"]
+        assert matches[0][1] >= 0.7
+        assert index.query(hasher.signature(BASE), exclude=["base"]) == []
+
+    def test_remove_and_replace(self):
+        hasher = MinHasher()
+        index = LSHIndex()
+        index.insert("a", hasher.signature(BASE))
+        index.insert("a", hasher.signature(OTHER))
+
+        assert len(index) == 1
+        assert index.query(hasher.signature(BASE)) == []
+
+        index.remove("a")
+        assert "a" not in index
+        assert index.query(hasher.signature(OTHER)) == []
+
+    def test_rejects_wrong_signature_length(self):
+        with pytest.raises(ValueError):
+            LSHIndex(num_perm=128).insert("a", MinHasher(num_perm=64).signature(BASE))
+
+    def test_clusters_are_connected_components(self):
+        hasher = MinHasher()
+        index = LSHIndex(threshold=0.7)
+        for key, text in [("a", BASE), ("b", NEAR), ("c", BASE), ("d", OTHER)]:
+            index.insert(key, hasher.signature(text))
+
+        clusters = index.clusters()
+
+        assert len(clusters) == 1
+        assert sorted(clusters[0]) == ["a", "b", "c"]
@@ -0,0 +1,322 @@
+"""
+Tests for asynchronous video job tracking.
+"""
+import asyncio
+
+import pytest
+
+from app.infrastructure.video.jobs import (
+    JOB_FAILED,
+    JOB_PENDING,
+    JOB_SUCCEEDED,
+    JOB_TIMED_OUT,
+    InMemoryVideoJobStore,
+    VideoJobError,
+    VideoJobManager,
+    VideoJobProvider,
+    VideoJobStatus,
+    compute_backoff,
+    normalize_state,
+)
+
+
+class FakeProvider(VideoJobProvider):
+    """Provider whose jobs finish after a set number of polls."""
+
+    name = "fake"
+
+    def __init__(self, polls_needed=2, final_state=JOB_SUCCEEDED, errors=0):
+        self.polls_needed = polls_needed
+        self.final_state = final_state
+        self.errors = errors
+        self.polls = {}
+        self.callback_urls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def submit(self, prompt, images, duration, callback_url=None):
+        self.callback_urls.append(callback_url)
+        job_id = f"p{len(self.callback_urls)}"
+        self.polls[job_id] = 0
+        return job_id
+
+    async def poll(self, provider_job_id):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.005)
+            if self.errors:
+                self.errors -= 1
+                raise ConnectionError("provider unavailable")
+            self.polls[provider_job_id] += 1
+            if self.polls[provider_job_id] < self.polls_needed:
+                return VideoJobStatus(state=JOB_PENDING)
+            if self.final_state == JOB_SUCCEEDED:
+                return VideoJobStatus(
+                    state=JOB_SUCCEEDED,
+                    result={"url": f"https://cdn/{provider_job_id}.mp4", "provider": self.name},
+                )
+            return VideoJobStatus(state=self.final_state, error="render failed")
+        finally:
+            self.in_flight -= 1
+
+
+class Recorder:
+    """on_complete callback collecting finished jobs."""
+
+    def __init__(self):
+        self.jobs = []
+        self.done = asyncio.Event()
+        self.expected = 1
+
+    async def __call__(self, job):
+        self.jobs.append(job)
+        if len(self.jobs) >= self.expected:
+            self.done.set()
+
+
+def make_manager(provider, recorder, store=None, **kwargs):
+    options = dict(
+        poll_initial_seconds=0.01,
+        poll_max_seconds=0.02,
+        poll_jitter=0.0,
+        job_timeout_seconds=5.0,
+        webhook_secret="test-secret",
+    )
+    options.update(kwargs)
+    return VideoJobManager(
+        provider=provider,
+        store=store or InMemoryVideoJobStore(),
+        on_complete=recorder,
+        **options,
+    )
+
+
+class TestBackoff:
+    def test_grows_exponentially_up_to_cap(self):
+        delays = [compute_backoff(n, 1.0, 10.0, 2.0, jitter=0.0) for n in range(6)]
+        assert delays == [1.0, 2.0, 4.0, 8.0, 10.0, 10.0]
+
+    def test_jitter_only_shortens_delay(self):
+        assert compute_backoff(3, 1.0, 60.0, 2.0, jitter=0.5, rand=lambda: 0.0) == 8.0
+        assert compute_backoff(3, 1.0, 60.0, 2.0, jitter=0.5, rand=lambda: 0.999) == pytest.approx(4.0, rel=1e-2)
+
+    def test_normalize_state(self):
+        assert normalize_state("Completed") == JOB_SUCCEEDED
+        assert normalize_state("processing") == JOB_PENDING
+        with pytest.raises(VideoJobError):
+            normalize_state("teleported")
+
+
+@pytest.mark.asyncio
+class TestVideoJobManager:
+    async def test_polls_until_success_then_resumes(self):
+        provider, recorder = FakeProvider(polls_needed=3), Recorder()
+        manager = make_manager(provider, recorder)
+        await manager.start()
+        try:
+            job = await manager.submit("p", ["a.png"], 15, "wf-1", {"package_id": "x"})
+            await asyncio.wait_for(recorder.done.wait(), 2.0)
+        finally:
+            await manager.stop()
+
+        finished = recorder.jobs[0]
+        assert finished.job_id == job.job_id
+        assert finished.state == JOB_SUCCEEDED
+        assert finished.attempts == 3
+        assert finished.result["url"] == "https://cdn/p1.mp4"
+        assert finished.context == {"package_id": "x"}
+        assert (await manager.store.get(job.job_id)).state == JOB_SUCCEEDED
+
+    async def test_failed_job_is_reported(self):
+        provider, recorder = FakeProvider(polls_needed=1, final_state=JOB_FAILED), Recorder()
+        manager = make_manager(provider, recorder)
+        await manager.start()
+        try:
+            await manager.submit("p", [], 15, "wf-1")
+            await asyncio.wait_for(recorder.done.wait(), 2.0)
+        finally:
+            await manager.stop()
+
+        assert recorder.jobs[0].state == JOB_FAILED
+        assert recorder.jobs[0].error == "render failed"
+
+    async def test_poll_errors_are_retried(self):
+        provider, recorder = FakeProvider(polls_needed=1, errors=2), Recorder()
+        manager = make_manager(provider, recorder)
+        await manager.start()
+        try:
+            await manager.submit("p", [], 15, "wf-1")
+            await asyncio.wait_for(recorder.done.wait(), 2.0)
+        finally:
+            await manager.stop()
+
+        assert recorder.jobs[0].state == JOB_SUCCEEDED
+        assert manager.stats()["poll_errors"] == 2
+
+    async def test_deadline_times_out_job(self):
+        provider, recorder = FakeProvider(polls_needed=10_000), Recorder()
+        manager = make_manager(provider, recorder, job_timeout_seconds=0.1)
+        await manager.start()
+        try:
+            await manager.submit("p", [], 15, "wf-1")
+            await asyncio.wait_for(recorder.done.wait(), 2.0)
+        finally:
+            await manager.stop()
+
+        assert recorder.jobs[0].state == JOB_TIMED_OUT
+
+    async def test_webhook_completes_once(self):
+        provider, recorder = FakeProvider(polls_needed=10_000), Recorder()
+        manager = make_manager(provider, recorder, poll_initial_seconds=10.0, poll_max_seconds=10.0)
+        await manager.start()
+        try:
+            job = await manager.submit("p", [], 15, "wf-1")
+            payload = {"status": "completed", "url": "https://cdn/hook.mp4"}
+            await manager.handle_webhook(job.job_id, payload)
+            await manager.handle_webhook(job.job_id, payload)
+            await asyncio.wait_for(recorder.done.wait(), 2.0)
+            await asyncio.sleep(0.01)
+        finally:
+            await manager.stop()
+
+        assert len(recorder.jobs) == 1
+        assert recorder.jobs[0].result == {"provider": "fake", "url": "https://cdn/hook.mp4"}
+        assert provider.polls["p1"] == 0
+
+    async def test_non_terminal_webhook_keeps_polling(self):
+        provider, recorder = FakeProvider(polls_needed=10_000), Recorder()
+        manager = make_manager(provider, recorder, poll_initial_seconds=10.0)
+        await manager.start()
+        try:
+            job = await manager.submit("p", [], 15, "wf-1")
+            result = await manager.handle_webhook(job.job_id, {"status": "processing"})
+        finally:
+            await manager.stop()
+
+        assert result.state == JOB_PENDING
+        assert recorder.jobs == []
+
+    async def test_unknown_webhook_job(self):
+        manager = make_manager(FakeProvider(), Recorder())
+        assert await manager.handle_webhook("missing", {"status": "done"}) is None
+
+    async def test_callback_url_carries_verifiable_token(self):
+        provider = FakeProvider()
+        manager = make_manager(provider, Recorder(), webhook_base_url="https://api.example.com/video-jobs/")
+        job = await manager.submit("p", [], 15, "wf-1")
+
+        url = provider.callback_urls[0]
+        assert url.startswith(f"https://api.example.com/video-jobs/{job.job_id}/webhook?token=")
+        token = url.split("token=", 1)[1]
+        assert manager.verify_webhook_token(job.job_id, token)
+        assert not manager.verify_webhook_token(job.job_id, "forged")
+        assert not manager.verify_webhook_token("other-job", token)
+
+    async def test_start_reloads_pending_jobs(self):
+        store = InMemoryVideoJobStore()
+        provider, recorder = FakeProvider(polls_needed=1), Recorder()
+
+        # Submitted before a restart, never polled
+        first = make_manager(provider, Recorder(), store=store)
+        job = await first.submit("p", [], 15, "wf-1")
+
+        second = make_manager(provider, recorder, store=store)
+        await second.start()
+        try:
+            await asyncio.wait_for(recorder.done.wait(), 2.0)
+        finally:
+            await second.stop()
+
+        assert recorder.jobs[0].job_id == job.job_id
+        assert await store.list_active() == []
+
+    async def test_two_managers_resume_a_job_once(self):
+        store = InMemoryVideoJobStore()
+        provider, recorder = FakeProvider(polls_needed=10_000), Recorder()
+        recorder.expected = 2
+
+        submitter = make_manager(provider, recorder, store=store)
+        job = await submitter.submit("p", [], 15, "wf-1")
+        other = make_manager(provider, recorder, store=store)
+        await submitter.start()
+        await other.start()
+        try:
+            # The webhook lands on the worker that did not submit the job,
+            # then the submitter's own poll sees the same completion
+            await other.handle_webhook(job.job_id, {"status": "completed", "url": "https://cdn/a.mp4"})
+            provider.polls_needed = 1
+            await asyncio.sleep(0.1)
+        finally:
+            await submitter.stop()
+            await other.stop()
+
+        assert len(recorder.jobs) == 1
+        assert recorder.jobs[0].result["url"] == "https://cdn/a.mp4"
+        assert submitter.stats()["tracked"] == 0
+        assert submitter.stats()["completed"] + other.stats()["completed"] == 1
+        assert (await store.get(job.job_id)).result["url"] == "https://cdn/a.mp4"
+
+    async def test_attempts_are_persisted_on_each_poll(self):
+        store = InMemoryVideoJobStore()
+        provider, recorder = FakeProvider(polls_needed=10_000), Recorder()
+        manager = make_manager(provider, recorder, store=store)
+        await manager.start()
+        try:
+            job = await manager.submit("p", [], 15, "wf-1")
+            while provider.polls["p1"] < 3:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.01)
+        finally:
+            await manager.stop()
+
+        assert (await store.get(job.job_id)).attempts >= 3
+
+    async def test_poller_stops_when_job_finished_elsewhere(self):
+        store = InMemoryVideoJobStore()
+        provider, recorder = FakeProvider(polls_needed=10_000), Recorder()
+        manager = make_manager(provider, recorder, store=store)
+        job = await manager.submit("p", [], 15, "wf-1")
+        finished = await store.get(job.job_id)
+        finished.state = JOB_SUCCEEDED
+        await store.save(finished)
+
+        await manager.start()
+        try:
+            while provider.polls["p1"] < 1:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.05)
+        finally:
+            await manager.stop()
+
+        assert provider.polls["p1"] == 1
+        assert manager.stats()["tracked"] == 0
+        assert recorder.jobs == []
+
+    async def test_store_does_not_overwrite_finished_job(self):
+        store = InMemoryVideoJobStore()
+        manager = make_manager(FakeProvider(), Recorder(), store=store)
+        job = await manager.submit("p", [], 15, "wf-1")
+
+        first, second = await store.get(job.job_id), await store.get(job.job_id)
+        first.state, second.state = JOB_SUCCEEDED, JOB_FAILED
+
+        assert await store.save(first) is True
+        assert await store.save(second) is False
+        assert (await store.get(job.job_id)).state == JOB_SUCCEEDED
+
+    async def test_many_jobs_share_bounded_polls(self):
+        provider, recorder = FakeProvider(polls_needed=2), Recorder()
+        recorder.expected = 100
+        manager = make_manager(provider, recorder, max_concurrent_polls=8)
+        await manager.start()
+        try:
+            for n in range(100):
+                await manager.submit("p", [], 15, f"wf-{n}")
+            await asyncio.wait_for(recorder.done.wait(), 5.0)
+        finally:
+            await manager.stop()
+
+        assert len(recorder.jobs) == 100
+        assert provider.max_in_flight <= 8
+        assert manager.stats()["tracked"] == 0
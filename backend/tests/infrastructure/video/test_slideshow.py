@@ -0,0 +1,221 @@
+"""
+Tests for the local slideshow renderer.
+
+Rendering runs in a thread pool here (the worker functions are the same
+ones the process pool executes). MP4 encoding is exercised against a
+fake ffmpeg that records the raw frame stream it receives.
+"""
+import io
+import stat
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image
+
+from app.infrastructure.storage.local_storage import LocalStorageClient
+from app.infrastructure.storage.minio_client import UploadMetrics
+from app.infrastructure.video.slideshow import (
+    LocalSlideshowProvider,
+    SlideshowRenderError,
+    encode_webp_animation,
+    render_fade,
+    render_slide,
+    webp_fade_steps,
+    webp_size,
+)
+
+
+SIZE = (64, 36)
+
+
+def make_png(color) -> bytes:
+    """Encode a solid-color PNG."""
+    buffer = io.BytesIO()
+    Image.new("RGB", (120, 80), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """Local storage for sources and rendered output."""
+    return LocalStorageClient(
+        root_dir=str(tmp_path / "objects"),
+        base_url="http://test/files",
+        metrics=UploadMetrics(),
+    )
+
+
+@pytest.fixture
+async def image_urls(storage):
+    """Three stored source images."""
+    urls = []
+    for index, color in enumerate([(255, 0, 0), (0, 255, 0), (0, 0, 255)]):
+        name = f"images/src{index}.png"
+        data = make_png(color)
+        await storage.upload_stream(io.BytesIO(data), name, "image/png", len(data))
+        urls.append(storage.get_object_url(name))
+    return urls
+
+
+@pytest.fixture
+def executor():
+    """In-process pool standing in for the rendering process pool."""
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path):
+    """Executable that stores the length of its stdin in the output file."""
+    script = tmp_path / "ffmpeg"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        "size = 0\n"
+        "while True:\n"
+        "    chunk = sys.stdin.buffer.read(65536)\n"
+        "    if not chunk:\n"
+        "        break\n"
+        "    size += len(chunk)\n"
+        "open(sys.argv[-1], 'w').write(str(size))\n"
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    return str(script)
+
+
+class TestFrameRendering:
+    """Test worker-side frame functions."""
+
+    def test_render_slide_covers_frame(self):
+        """Slides are exactly width x height RGB24."""
+        frame = render_slide(make_png((10, 20, 30)), SIZE, caption="Summer sale")
+
+        assert len(frame) == SIZE[0] * SIZE[1] * 3
+
+    def test_fade_interpolates_between_slides(self):
+        """Intermediate fade frames move linearly from one slide to the next."""
+        black = bytes(SIZE[0] * SIZE[1] * 3)
+        white = bytes([255]) * len(black)
+
+        frames = render_fade(black, white, SIZE, steps=3)
+
+        levels = [frame[0] for frame in frames]
+        assert len(frames) == 3
+        assert levels == sorted(levels)
+        assert 120 <= levels[1] <= 135
+
+
+class TestWebPLimits:
+    """Test the bounds on the in-memory WebP fallback."""
+
+    def test_fades_are_thinned_to_the_frame_cap(self):
+        assert webp_fade_steps(3, 12, max_frames=48) == 12
+        assert webp_fade_steps(10, 12, max_frames=48) == 4
+        assert webp_fade_steps(60, 12, max_frames=48) == 0
+        assert webp_fade_steps(1, 12) == 0
+
+    def test_size_is_scaled_to_max_edge(self):
+        assert webp_size((1280, 720), max_edge=960) == (960, 540)
+        assert webp_size((64, 36), max_edge=960) == (64, 36)
+
+    def test_thinned_fade_keeps_its_length(self):
+        slides = [render_slide(None, SIZE, str(n)) for n in range(10)]
+
+        data = encode_webp_animation(slides, SIZE, hold_ms=500, fade_steps=12, frame_ms=40)
+
+        with Image.open(io.BytesIO(data)) as animation:
+            # 10 slides + 9 transitions x 4 fade frames of 3 x 40ms
+            assert animation.n_frames == 46
+            animation.seek(1)
+            animation.load()
+            assert animation.info["duration"] == 120
+
+
+class TestLocalSlideshowProvider:
+    """Test slideshow rendering end to end."""
+
+    @pytest.mark.asyncio
+    async def test_animated_webp_with_poster(self, storage, image_urls, executor):
+        """Without ffmpeg, an animated WebP with fades and a poster is stored."""
+        provider = LocalSlideshowProvider(
+            storage,
+            width=SIZE[0],
+            height=SIZE[1],
+            fps=4,
+            transition_seconds=0.5,
+            output_format="webp",
+            executor=executor,
+        )
+
+        result = await provider.create(image_urls, ["Caption"], duration=3)
+
+        video = await storage.download_bytes(storage.object_name_from_url(result["url"]))
+        with Image.open(io.BytesIO(video)) as animation:
+            assert animation.format == "WEBP"
+            # 3 held slides + 2 transitions x 2 fade frames
+            assert animation.n_frames == 7
+        poster = await storage.download_bytes(storage.object_name_from_url(result["poster_url"]))
+        assert Image.open(io.BytesIO(poster)).format == "JPEG"
+        assert result["provider"] == "slideshow"
+        assert result["images_count"] == 3
+        assert result["metadata"]["format"] == "webp"
+
+    @pytest.mark.asyncio
+    async def test_mp4_frames_streamed_to_encoder(self, storage, image_urls, executor, fake_ffmpeg):
+        """Every frame is written to the encoder's stdin as raw RGB24."""
+        provider = LocalSlideshowProvider(
+            storage,
+            width=SIZE[0],
+            height=SIZE[1],
+            fps=4,
+            transition_seconds=0.5,
+            ffmpeg_path=fake_ffmpeg,
+            executor=executor,
+        )
+
+        result = await provider.create(image_urls, [], duration=3)
+
+        assert provider.format == "mp4"
+        assert result["url"].endswith(".mp4")
+        frames = result["metadata"]["frames"]
+        # 12 total frames: 2 transitions x 2 fade frames, (12 - 4) // 3 held per slide
+        assert frames == 3 * 2 + 2 * 2
+        received = await storage.download_bytes(storage.object_name_from_url(result["url"]))
+        assert int(received) == frames * SIZE[0] * SIZE[1] * 3
+
+    @pytest.mark.asyncio
+    async def test_encoder_failure_raises(self, storage, image_urls, executor, tmp_path):
+        """A failing encoder surfaces as SlideshowRenderError."""
+        failing = tmp_path / "broken-ffmpeg"
+        failing.write_text(f"#!{sys.executable}\nimport sys\nsys.exit(3)\n")
+        failing.chmod(failing.stat().st_mode | stat.S_IEXEC)
+        provider = LocalSlideshowProvider(
+            storage,
+            width=SIZE[0],
+            height=SIZE[1],
+            fps=2,
+            ffmpeg_path=str(failing),
+            output_format="mp4",
+            executor=executor,
+        )
+
+        with pytest.raises(SlideshowRenderError):
+            await provider.create(image_urls, [], duration=2)
+
+    @pytest.mark.asyncio
+    async def test_unfetchable_images_render_title_card(self, storage, executor):
+        """Packages without usable images still get a real video."""
+        provider = LocalSlideshowProvider(
+            storage,
+            width=SIZE[0],
+            height=SIZE[1],
+            fps=2,
+            output_format="webp",
+            executor=executor,
+        )
+
+        result = await provider.create(["mock://image/1"], ["Title"], duration=2)
+
+        assert result["images_count"] == 0
+        assert await storage.object_exists(storage.object_name_from_url(result["url"]))
@@ -0,0 +1,142 @@
+"""
+Tests for local image feature extraction.
+"""
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.infrastructure.storage.local_storage import LocalStorageClient
+from app.infrastructure.storage.minio_client import UploadMetrics
+from app.infrastructure.vision.features import (
+    ImageFeatureExtractor,
+    extract_image_features,
+    kmeans_colors,
+)
+
+
+def encode(img: Image.Image, fmt: str = "PNG") -> bytes:
+    buf = io.BytesIO()
+    img.save(buf, fmt)
+    return buf.getvalue()
+
+
+def studio_shot(size=(800, 600)) -> Image.Image:
+    """Navy product on a white studio background."""
+    img = Image.new("RGB", size, (255, 255, 255))
+    w, h = size
+    img.paste((20, 40, 120), (w // 4, h // 4, 3 * w // 4, 3 * h // 4))
+    return img
+
+
+class TestKMeans:
+    def test_recovers_distinct_colors(self):
+        colors = np.array([[255, 0, 0], [0, 255, 0], [0, 0, 255]], dtype=np.float32)
+        pixels = np.repeat(colors, [600, 300, 100], axis=0)
+
+        centers, counts = kmeans_colors(pixels, 3)
+
+        found = {tuple(int(c) for c in center): int(n) for center, n in zip(centers, counts)}
+        assert found == {(255, 0, 0): 600, (0, 255, 0): 300, (0, 0, 255): 100}
+
+    def test_fewer_colors_than_clusters(self):
+        pixels = np.full((100, 3), 128, dtype=np.float32)
+
+        centers, counts = kmeans_colors(pixels, 5)
+
+        assert len(centers) == 1
+        assert counts.tolist() == [100]
+
+    def test_deterministic(self):
+        rng = np.random.default_rng(1)
+        pixels = rng.uniform(0, 255, (5000, 3)).astype(np.float32)
+
+        first, _ = kmeans_colors(pixels, 5)
+        second, _ = kmeans_colors(pixels, 5)
+
+        assert np.array_equal(first, second)
+
+
+class TestExtractImageFeatures:
+    def test_studio_shot(self):
+        features = extract_image_features(encode(studio_shot()))
+
+        assert features["color_palette"][:2] == ["#FFFFFF", "#142878"]
+        assert features["color_weights"][0] == pytest.approx(0.75, abs=0.02)
+        assert features["width"] == 800 and features["height"] == 600
+        assert features["aspect_ratio"] == pytest.approx(1.333, abs=0.001)
+        assert features["orientation"] == "landscape"
+        assert features["background"] == {"color": "#FFFFFF", "uniformity": 1.0, "plain": True}
+        assert 0.7 < features["brightness"] < 0.85
+        assert features["contrast"] > 0.5
+
+    def test_busy_background_is_not_plain(self):
+        rng = np.random.default_rng(0)
+        noise = rng.integers(0, 256, (300, 300, 3), dtype=np.uint8)
+
+        features = extract_image_features(encode(Image.fromarray(noise)))
+
+        assert features["background"]["plain"] is False
+        assert features["background"]["uniformity"] < 0.8
+        assert features["orientation"] == "square"
+
+    def test_transparency_is_flattened_onto_white(self):
+        img = Image.new("RGBA", (200, 400), (0, 0, 0, 0))
+        img.paste((200, 30, 30, 255), (50, 100, 150, 300))
+
+        features = extract_image_features(encode(img))
+
+        assert features["background"]["color"] == "#FFFFFF"
+        assert "#C81E1E" in features["color_palette"]
+        assert features["orientation"] == "portrait"
+
+    def test_jpeg_and_flat_image(self):
+        features = extract_image_features(encode(Image.new("RGB", (64, 64), (0, 0, 0)), "JPEG"))
+
+        assert features["color_palette"] == ["#000000"]
+        assert features["brightness"] == 0.0
+        assert features["contrast"] == 0.0
+
+    def test_invalid_image_raises(self):
+        with pytest.raises(Exception):
+            extract_image_features(b"not an image")
+
+
+@pytest.fixture
+async def storage(tmp_path):
+    storage = LocalStorageClient(
+        root_dir=str(tmp_path),
+        base_url="http://test/api/v1/files",
+        metrics=UploadMetrics(),
+    )
+    await storage.upload_stream(io.BytesIO(encode(studio_shot())), "uploads/shot.png", "image/png")
+    await storage.upload_stream(io.BytesIO(b"garbage"), "uploads/broken.png", "image/png")
+    return storage
+
+
+@pytest.mark.asyncio
+class TestImageFeatureExtractor:
+    async def test_extracts_from_storage(self, storage):
+        with ThreadPoolExecutor(1) as executor:
+            extractor = ImageFeatureExtractor(storage, executor=executor)
+            features = await extractor.extract("http://test/api/v1/files/uploads/shot.png")
+
+        assert features["color_palette"][0] == "#FFFFFF"
+        assert features["extract_ms"] >= 0
+
+    async def test_preloaded_bytes_skip_fetch(self, storage):
+        with ThreadPoolExecutor(1) as executor:
+            extractor = ImageFeatureExtractor(storage, executor=executor)
+            features = await extractor.extract("asset://1234", image_bytes=encode(studio_shot()))
+
+        assert features["color_palette"][0] == "#FFFFFF"
+
+    async def test_unusable_sources_return_none(self, storage):
+        with ThreadPoolExecutor(1) as executor:
+            extractor = ImageFeatureExtractor(storage, executor=executor)
+            assert await extractor.extract("http://test/api/v1/files/uploads/broken.png") is None
+            assert await extractor.extract("https://elsewhere.example.com/x.png") is None
+            assert await extractor.extract("asset://1234") is None
+            assert await extractor.extract("/etc/passwd") is None
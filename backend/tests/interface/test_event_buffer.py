@@ -0,0 +1,133 @@
+"""
+Tests for the per-workflow event replay buffer.
+"""
+import pytest
+
+from app.interface.ws import event_buffer
+from app.interface.ws.event_buffer import EventReplayBuffer, is_terminal_event
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(event_buffer.time, "monotonic", clock.monotonic)
+    return clock
+
+
+def thought(n):
+    return {"type": "thought", "workflowId": "wf-1", "data": {"content": f"t{n}"}}
+
+
+class TestEventReplayBuffer:
+    def test_sequence_numbers_increase_per_workflow(self):
+        buffer = EventReplayBuffer()
+
+        seqs = [buffer.append("wf-1", "agent:thought", thought(i)) for i in range(3)]
+        other = buffer.append("wf-2", "agent:thought", thought(0))
+
+        assert seqs == [1, 2, 3]
+        assert other == 1
+        assert buffer.last_seq("wf-1") == 3
+
+    def test_since_returns_missed_events_in_order(self):
+        buffer = EventReplayBuffer()
+        for i in range(5):
+            buffer.append("wf-1", "agent:thought", thought(i))
+
+        events, truncated = buffer.since("wf-1", last_seq=3)
+
+        assert [e.seq for e in events] == [4, 5]
+        assert truncated is False
+        assert buffer.since("wf-1", last_seq=5) == ([], False)
+
+    def test_ring_drops_oldest_and_reports_truncation(self):
+        buffer = EventReplayBuffer(max_events=3)
+        for i in range(6):
+            buffer.append("wf-1", "agent:thought", thought(i))
+
+        events, truncated = buffer.since("wf-1", last_seq=1)
+        _, caught_up = buffer.since("wf-1", last_seq=3)
+
+        assert [e.seq for e in events] == [4, 5, 6]
+        assert truncated is True
+        assert caught_up is False
+
+    def test_client_ahead_of_missing_or_restarted_buffer_is_truncated(self):
+        buffer = EventReplayBuffer()
+        assert buffer.since("wf-1", last_seq=7) == ([], True)
+        assert buffer.since("wf-1", last_seq=0) == ([], False)
+
+        # Numbering restarted at 1 while the client had seen up to 7
+        buffer.append("wf-1", "agent:thought", thought(0))
+        assert buffer.since("wf-1", last_seq=7) == ([], True)
+
+    def test_since_filters_by_namespace(self):
+        buffer = EventReplayBuffer()
+        buffer.append("wf-1", "agent:thought", thought(0), namespace="/")
+        buffer.append("wf-1", "agent:progress", {"data": {"stage": "copy"}}, namespace="/agents")
+
+        events, _ = buffer.since("wf-1", last_seq=0, namespace="/agents")
+
+        assert [e.seq for e in events] == [2]
+
+    def test_record_ignores_known_sequence_numbers(self):
+        buffer = EventReplayBuffer()
+
+        assert buffer.record("wf-1", 4, "agent:thought", thought(4)) is True
+        assert buffer.record("wf-1", 4, "agent:thought", thought(4)) is False
+        assert buffer.record("wf-1", 2, "agent:thought", thought(2)) is False
+        assert buffer.last_seq("wf-1") == 4
+
+    def test_buffer_expires_after_terminal_event(self, clock):
+        buffer = EventReplayBuffer(ttl_seconds=60)
+        buffer.append("wf-1", "agent:thought", thought(0))
+        buffer.append("wf-1", "agent:result", {"data": {}})
+
+        clock.now += 59
+        assert len(buffer.since("wf-1", 0)[0]) == 2
+
+        clock.now += 2
+        assert buffer.since("wf-1", 0) == ([], False)
+        assert buffer.last_seq("wf-1") == 0
+
+    def test_running_workflows_do_not_expire(self, clock):
+        buffer = EventReplayBuffer(ttl_seconds=60)
+        buffer.append("wf-1", "agent:thought", thought(0))
+
+        clock.now += 3600
+
+        assert len(buffer.since("wf-1", 0)[0]) == 1
+
+    def test_least_recently_used_workflow_evicted(self):
+        buffer = EventReplayBuffer(max_workflows=2)
+        buffer.append("wf-1", "agent:thought", thought(0))
+        buffer.append("wf-2", "agent:thought", thought(0))
+        buffer.since("wf-1", 0)
+
+        buffer.append("wf-3", "agent:thought", thought(0))
+
+        assert buffer.last_seq("wf-1") == 1
+        assert buffer.last_seq("wf-2") == 0
+        assert buffer.stats()["workflows"] == 2
+
+
+class TestIsTerminalEvent:
+    @pytest.mark.parametrize("event,payload,expected", [
+        ("agent:result", {}, True),
+        ("agent:error", {}, True),
+        ("agent:progress", {"data": {"stage": "done"}}, True),
+        ("agent:progress", {"data": {"stage": "failed"}}, True),
+        ("agent:progress", {"data": {"stage": "image_generation"}}, False),
+        ("agent:approval_required", {"data": {}}, False),
+        ("agent:thought", {"data": {}}, False),
+    ])
+    def test_terminal_events(self, event, payload, expected):
+        assert is_terminal_event(event, payload) is expected
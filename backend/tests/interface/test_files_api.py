@@ -0,0 +1,189 @@
+"""
+Integration tests for the local file route.
+
+Tests /api/v1/files conditional and range requests.
+"""
+import hashlib
+import io
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.infrastructure.storage.local_storage import LocalStorageClient
+from app.infrastructure.storage.minio_client import UploadMetrics
+from app.interface.routes.files import get_local_storage
+from app.main import fastapi_app
+
+
+VIDEO = bytes(range(256)) * 40
+
+
+@pytest.fixture
+async def storage(tmp_path):
+    """Local storage holding one video, wired into the route."""
+    storage = LocalStorageClient(
+        root_dir=str(tmp_path),
+        base_url="http://test/api/v1/files",
+        metrics=UploadMetrics(),
+    )
+    await storage.upload_stream(io.BytesIO(VIDEO), "videos/demo.mp4", "video/mp4")
+    fastapi_app.dependency_overrides[get_local_storage] = lambda: storage
+    yield storage
+    fastapi_app.dependency_overrides.pop(get_local_storage, None)
+
+
+@pytest.fixture
+async def client(storage):
+    """Create async test client."""
+    transport = ASGITransport(app=fastapi_app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+class TestFileRoute:
+    """Tests for GET /api/v1/files/{object_name}."""
+
+    @pytest.mark.asyncio
+    async def test_full_file_with_strong_etag(self, client):
+        """Full responses carry a content-hash ETag and range support."""
+        response = await client.get("/api/v1/files/videos/demo.mp4")
+
+        assert response.status_code == 200
+        assert response.content == VIDEO
+        assert response.headers["etag"] == f'"{hashlib.sha256(VIDEO).hexdigest()}"'
+        assert response.headers["accept-ranges"] == "bytes"
+        assert response.headers["content-type"] == "video/mp4"
+
+    @pytest.mark.asyncio
+    async def test_range_request(self, client):
+        """Range requests return 206 with only the requested bytes."""
+        response = await client.get(
+            "/api/v1/files/videos/demo.mp4", headers={"Range": "bytes=100-199"}
+        )
+
+        assert response.status_code == 206
+        assert response.content == VIDEO[100:200]
+        assert response.headers["content-range"] == f"bytes 100-199/{len(VIDEO)}"
+
+    @pytest.mark.asyncio
+    async def test_open_and_suffix_ranges(self, client):
+        """Open-ended and suffix ranges are resolved against the file size."""
+        tail = await client.get(
+            "/api/v1/files/videos/demo.mp4", headers={"Range": f"bytes={len(VIDEO) - 10}-"}
+        )
+        suffix = await client.get(
+            "/api/v1/files/videos/demo.mp4", headers={"Range": "bytes=-10"}
+        )
+
+        assert tail.status_code == suffix.status_code == 206
+        assert tail.content == suffix.content == VIDEO[-10:]
+        assert suffix.headers["content-length"] == "10"
+
+    @pytest.mark.asyncio
+    async def test_multiple_ranges(self, client):
+        """Several ranges are returned as multipart/byteranges."""
+        response = await client.get(
+            "/api/v1/files/videos/demo.mp4", headers={"Range": "bytes=0-9,100-109"}
+        )
+
+        assert response.status_code == 206
+        content_type = response.headers["content-type"]
+        assert content_type.startswith("multipart/byteranges; boundary=")
+        boundary = content_type.split("boundary=")[1]
+        assert int(response.headers["content-length"]) == len(response.content)
+        parts = response.content.split(f"--{boundary}".encode())
+        assert parts[1].endswith(b"\r\n\r\n" + VIDEO[0:10] + b"\r\n")
+        assert f"Content-Range: bytes 100-109/{len(VIDEO)}".encode() in parts[2]
+        assert parts[2].endswith(VIDEO[100:110] + b"\r\n")
+        assert parts[3] == b"--\r\n"
+
+    @pytest.mark.asyncio
+    async def test_unsatisfiable_range_returns_416(self, client):
+        """A range starting past the end of the file is rejected."""
+        response = await client.get(
+            "/api/v1/files/videos/demo.mp4", headers={"Range": f"bytes={len(VIDEO)}-"}
+        )
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == f"bytes */{len(VIDEO)}"
+
+    @pytest.mark.asyncio
+    async def test_malformed_range_returns_full_file(self, client):
+        """Range headers that cannot be parsed are ignored."""
+        for value in ("bytes=abc", "items=0-10", "bytes=20-10"):
+            response = await client.get(
+                "/api/v1/files/videos/demo.mp4", headers={"Range": value}
+            )
+
+            assert response.status_code == 200
+            assert response.content == VIDEO
+
+    @pytest.mark.asyncio
+    async def test_if_range(self, client):
+        """Ranges apply only while the If-Range validator still matches."""
+        first = await client.get("/api/v1/files/videos/demo.mp4")
+
+        current = await client.get(
+            "/api/v1/files/videos/demo.mp4",
+            headers={"Range": "bytes=0-9", "If-Range": first.headers["etag"]},
+        )
+        by_date = await client.get(
+            "/api/v1/files/videos/demo.mp4",
+            headers={"Range": "bytes=0-9", "If-Range": first.headers["last-modified"]},
+        )
+        changed = await client.get(
+            "/api/v1/files/videos/demo.mp4",
+            headers={"Range": "bytes=0-9", "If-Range": '"outdated"'},
+        )
+
+        assert current.status_code == by_date.status_code == 206
+        assert current.content == VIDEO[:10]
+        assert changed.status_code == 200
+        assert changed.content == VIDEO
+        assert changed.headers["content-length"] == str(len(VIDEO))
+
+    @pytest.mark.asyncio
+    async def test_if_none_match_returns_304(self, client):
+        """A matching ETag short-circuits with 304 Not Modified."""
+        first = await client.get("/api/v1/files/videos/demo.mp4")
+
+        response = await client.get(
+            "/api/v1/files/videos/demo.mp4",
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == first.headers["etag"]
+
+    @pytest.mark.asyncio
+    async def test_if_modified_since(self, client):
+        """If-Modified-Since at or after the mtime returns 304."""
+        first = await client.get("/api/v1/files/videos/demo.mp4")
+
+        fresh = await client.get(
+            "/api/v1/files/videos/demo.mp4",
+            headers={"If-Modified-Since": first.headers["last-modified"]},
+        )
+        stale = await client.get(
+            "/api/v1/files/videos/demo.mp4",
+            headers={"If-Modified-Since": "Thu, 01 Jan 2015 00:00:00 GMT"},
+        )
+
+        assert fresh.status_code == 304
+        assert stale.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_missing_and_traversal_return_404(self, client):
+        """Unknown files and paths outside the root are not served."""
+        assert (await client.get("/api/v1/files/videos/none.mp4")).status_code == 404
+        assert (await client.get("/api/v1/files/..%2F..%2Fetc%2Fpasswd")).status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_disabled_for_minio_backend(self):
+        """Without local storage the route does not exist."""
+        transport = ASGITransport(app=fastapi_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get("/api/v1/files/videos/demo.mp4")
+
+        assert response.status_code == 404
@@ -91,6 +91,76 @@ class TestImageGenerateEndpoint:
         assert response.status_code == 422
 
 
+class TestImageBatchGenerateEndpoint:
+    """Tests for POST /api/v1/images/generate-batch."""
+    
+    @pytest.mark.asyncio
+    async def test_batch_with_prompt_variants(self, client):
+        """One prompt with N variants expands to N items."""
+        with patch("app.interface.routes.images.get_agent") as mock_get_agent:
+            mock_agent = MagicMock()
+            mock_agent.run_batch_async = AsyncMock(return_value="batch-id")
+            mock_get_agent.return_value = mock_agent
+            
+            response = await client.post(
+                "/api/v1/images/generate-batch",
+                json={"prompt": "A sunset", "variants": 4}
+            )
+        
+        assert response.status_code == 202
+        data = response.json()
+        assert data["workflow_id"] == "batch-id"
+        assert data["item_count"] == 4
+        mock_agent.run_batch_async.assert_called_once_with(
+            prompts=["A sunset"] * 4,
+            width=512,
+            height=512,
+        )
+    
+    @pytest.mark.asyncio
+    async def test_batch_with_many_prompts(self, client):
+        """Multiple prompts are passed through in order."""
+        with patch("app.interface.routes.images.get_agent") as mock_get_agent:
+            mock_agent = MagicMock()
+            mock_agent.run_batch_async = AsyncMock(return_value="batch-id")
+            mock_get_agent.return_value = mock_agent
+            
+            response = await client.post(
+                "/api/v1/images/generate-batch",
+                json={"prompts": ["A", "B"], "width": 1024, "height": 1024}
+            )
+        
+        assert response.status_code == 202
+        assert response.json()["item_count"] == 2
+        mock_agent.run_batch_async.assert_called_once_with(
+            prompts=["A", "B"],
+            width=1024,
+            height=1024,
+        )
+    
+    @pytest.mark.asyncio
+    async def test_batch_requires_exactly_one_source(self, client):
+        """prompt and prompts are mutually exclusive."""
+        response = await client.post(
+            "/api/v1/images/generate-batch",
+            json={"prompt": "A", "prompts": ["B"]}
+        )
+        assert response.status_code == 422
+        
+        response = await client.post("/api/v1/images/generate-batch", json={})
+        assert response.status_code == 422
+    
+    @pytest.mark.asyncio
+    async def test_batch_size_limit(self, client):
+        """Batches larger than the limit are rejected."""
+        response = await client.post(
+            "/api/v1/images/generate-batch",
+            json={"prompts": ["A", "B", "C"], "variants": 8}
+        )
+        
+        assert response.status_code == 422
+
+
 class TestImageStatusEndpoint:
     """Tests for GET /api/v1/images/status/{workflow_id}."""
     
@@ -147,6 +217,28 @@ class TestImageStatusEndpoint:
         assert data["asset_id"] == "asset-uuid"
 
 
+    @pytest.mark.asyncio
+    async def test_status_returns_batch_items(self, client):
+        """Status endpoint should include per-item batch results."""
+        mock_status = {
+            "status": "running",
+            "current_stage": "generate_image",
+            "state": {},
+            "items": [
+                {"index": 0, "prompt": "A", "status": "generated", "image_url": "https://example.com/a.png"},
+                {"index": 1, "prompt": "B", "status": "failed", "error": "boom"},
+            ],
+        }
+        
+        with patch("app.application.agents.image_agent.ImageAgent.get_workflow_status", return_value=mock_status):
+            response = await client.get("/api/v1/images/status/batch-id")
+        
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert [item["status"] for item in items] == ["generated", "failed"]
+        assert items[0]["image_url"] == "https://example.com/a.png"
+
+
 class TestImageCancelEndpoint:
     """Tests for POST /api/v1/images/cancel/{workflow_id}."""
     
@@ -0,0 +1,144 @@
+"""
+Tests for cross-worker Socket.IO delivery through a pub/sub client manager.
+"""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.security import create_access_token
+from app.interface.ws import client_manager as client_manager_module
+from app.interface.ws.client_manager import (
+    InProcessBus,
+    InProcessPubSubManager,
+    create_client_manager,
+)
+from app.interface.ws.rate_limiter import connection_rate_limiter
+from app.interface.ws.socket_manager import SocketManager
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limiter():
+    connection_rate_limiter.reset()
+    yield
+    connection_rate_limiter.reset()
+
+
+@pytest.fixture
+async def workers():
+    """Two SocketManagers sharing one bus, like two uvicorn workers on Redis."""
+    bus = InProcessBus()
+    managers = []
+    for _ in range(2):
+        manager = SocketManager(
+            client_manager=InProcessPubSubManager(bus=bus),
+            owner_lookup=AsyncMock(return_value=None),
+        )
+        manager.sio._send_eio_packet = AsyncMock()
+        # Normally started by the first transport connection
+        manager.sio.manager_initialized = True
+        manager.sio.manager.initialize()
+        managers.append(manager)
+    yield managers
+    for manager in managers:
+        await manager.sio.manager.close()
+
+
+async def connect(manager, eio_sid, user_id, namespace="/"):
+    sid = await manager.sio.manager.connect(eio_sid, namespace)
+    auth = {"token": create_access_token({"sub": user_id})}
+    await manager._on_connect(sid, {"REMOTE_ADDR": eio_sid}, auth, namespace)
+    return sid
+
+
+def recipients(manager):
+    return {call.args[0] for call in manager.sio._send_eio_packet.await_args_list}
+
+
+async def delivered(manager, expected, timeout=1.0):
+    """Wait for the listener task of a worker to deliver to the expected sessions."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while recipients(manager) != expected and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.001)
+    return recipients(manager)
+
+
+class TestCrossWorkerDelivery:
+    async def test_owner_on_other_worker_receives_events(self, workers):
+        worker_a, worker_b = workers
+        await connect(worker_b, "eio-b", "user-a")
+        worker_a.register_workflow("wf-1", "user-a")
+
+        await worker_a.emit_thought("wf-1", "thinking")
+
+        assert await delivered(worker_b, {"eio-b"}) == {"eio-b"}
+        assert recipients(worker_a) == set()
+
+    async def test_subscriber_on_other_worker_receives_events(self, workers):
+        worker_a, worker_b = workers
+        sid = await connect(worker_b, "eio-b", "user-b")
+        await connect(worker_b, "eio-c", "user-c")
+        await worker_b._on_subscribe(sid, {"workflowId": "wf-2"})
+
+        await worker_a.emit_event({"type": "progress", "workflowId": "wf-2", "data": {}}, namespace="/")
+
+        assert await delivered(worker_b, {"eio-b"}) == {"eio-b"}
+
+    async def test_local_clients_receive_events_once(self, workers):
+        worker_a, _ = workers
+        await connect(worker_a, "eio-a", "user-a")
+        worker_a.register_workflow("wf-1", "user-a")
+
+        await worker_a.emit_result("wf-1", {"finalCopy": "done"})
+        await asyncio.sleep(0.01)
+
+        assert worker_a.sio._send_eio_packet.await_count == 1
+
+    async def test_close_leaves_bus(self):
+        bus = InProcessBus()
+        manager = SocketManager(client_manager=InProcessPubSubManager(bus=bus))
+        manager.sio.manager.initialize()
+        assert bus.subscriber_count == 1
+
+        await manager.sio.manager.close()
+
+        assert bus.subscriber_count == 0
+
+
+class TestCreateClientManager:
+    def test_local_uses_default_manager(self):
+        assert create_client_manager("local", "redis://localhost:6379/0") is None
+
+    def test_memory_backend(self):
+        manager = create_client_manager("memory", "redis://localhost:6379/0", channel="events")
+
+        assert isinstance(manager, InProcessPubSubManager)
+        assert manager.channel == "events"
+
+    def test_redis_without_package_falls_back_to_local(self):
+        with patch.object(client_manager_module, "REDIS_AVAILABLE", False):
+            assert create_client_manager("redis", "redis://localhost:6379/0") is None
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            create_client_manager("kafka", "redis://localhost:6379/0")
+
+
+class TestCrossWorkerReplay:
+    async def test_client_resumes_on_other_worker(self, workers):
+        worker_a, worker_b = workers
+        for content in ("one", "two", "three"):
+            await worker_a.emit_thought("wf-3", content)
+        # Wait for worker B's listener to buffer the events
+        deadline = asyncio.get_running_loop().time() + 1.0
+        while worker_b.replay.last_seq("wf-3") < 3 and asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(0.001)
+        sid = await connect(worker_b, "eio-b", "user-b")
+
+        ack = await worker_b._on_subscribe(sid, {"workflowId": "wf-3", "lastSeq": 1})
+
+        assert ack["replayed"] == 2
+        assert worker_b.replay.last_seq("wf-3") == 3
+        await asyncio.sleep(0.01)
+        # Replays go straight to the local client, not through the bus
+        assert recipients(worker_a) == set()
@@ -0,0 +1,117 @@
+"""
+Tests for Socket.IO event encoding with the precompiled wire structs.
+"""
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.interface.ws import codec
+from app.interface.ws.codec import EventJSON, resolve_serializer
+from app.interface.ws.schemas import EVENT_ADAPTERS
+from app.interface.ws.socket_manager import SocketManager
+
+
+def stdlib_dumps(obj):
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def progress(**data):
+    return {
+        "type": "progress",
+        "workflowId": "wf-1",
+        "data": {"stage": "copywriting", "percentage": 40, "current_step": "Writing copy", **data},
+        "timestamp": "2026-01-21T12:00:00Z",
+        "seq": 7,
+    }
+
+
+class TestEventJSON:
+    def test_event_packets_match_stdlib_json(self):
+        packet = ["agent:progress", progress()]
+
+        assert EventJSON.dumps(packet, separators=(",", ":")) == stdlib_dumps(packet)
+
+    def test_extra_and_mistyped_fields_are_kept(self):
+        payload = progress(percentage=40.5, preview_url="https://example.com/a.png")
+        payload["extra"] = {"nested": [1, 2]}
+
+        assert json.loads(EventJSON.dumps(["agent:progress", payload])) == ["agent:progress", payload]
+
+    def test_non_ascii_is_written_as_utf8(self):
+        packet = ["agent:thought", {
+            "type": "thought",
+            "workflowId": "wf-1",
+            "data": {"content": "轻盈透气的跑鞋"},
+            "timestamp": "2026-01-21T12:00:00Z",
+        }]
+
+        encoded = EventJSON.dumps(packet)
+
+        assert "轻盈透气的跑鞋" in encoded
+        assert len(encoded.encode("utf-8")) < len(json.dumps(packet).encode("utf-8"))
+
+    @pytest.mark.parametrize("obj", [
+        ["agent:approval_required", {"data": {"qa_score": 0.5}}],
+        {"sid": "abc", "upgrades": ["websocket"], "pingInterval": 25000},
+        ["subscribe", {"workflowId": "wf-1", "lastSeq": 3}],
+        "plain",
+    ])
+    def test_other_objects_use_generic_encoder(self, obj):
+        assert json.loads(EventJSON.dumps(obj)) == obj
+
+    def test_loads(self):
+        assert EventJSON.loads('["subscribe",{"workflowId":"wf-1"}]') == ["subscribe", {"workflowId": "wf-1"}]
+
+
+class TestEmittedPayloadsMatchWireStructs:
+    @pytest.fixture
+    def emitted(self):
+        manager = SocketManager()
+        with patch.object(manager.sio, "emit", new_callable=AsyncMock) as emit:
+            yield manager, emit
+
+    async def test_socket_manager_events(self, emitted):
+        manager, emit = emitted
+
+        await manager.emit_thought("wf-1", "thinking", node_name="plan")
+        await manager.emit_tool_call("wf-1", "image", "in_progress", "rendering", progress={"progress": 1})
+        await manager.emit_result("wf-1", {"finalCopy": "done"})
+        await manager.emit_error("wf-1", "FAILED", "boom")
+
+        for call in emit.await_args_list:
+            event, payload = call.args
+            EVENT_ADAPTERS[event].validate_python(payload)
+
+    async def test_orchestrator_events(self, emitted):
+        manager, emit = emitted
+
+        await manager.emit_event(progress())
+        await manager.emit_event({
+            "type": "artifact",
+            "workflowId": "wf-1",
+            "data": {"artifact_type": "image", "artifact_id": "a1", "url": "https://x", "label": "hero"},
+            "timestamp": "2026-01-21T12:00:00Z",
+        })
+
+        for call in emit.await_args_list:
+            event, payload = call.args
+            EVENT_ADAPTERS[event].validate_python(payload)
+
+
+class TestResolveSerializer:
+    def test_json_is_socketio_default(self):
+        assert resolve_serializer("json") == "default"
+
+    def test_msgpack_without_package_falls_back_to_json(self):
+        with patch.object(codec, "MSGPACK_AVAILABLE", False):
+            assert resolve_serializer("msgpack") == "default"
+
+    def test_msgpack_with_package(self):
+        with patch.object(codec, "MSGPACK_AVAILABLE", True):
+            assert resolve_serializer("msgpack") == "msgpack"
+
+    def test_server_uses_compiled_encoder(self):
+        manager = SocketManager()
+
+        assert manager.sio.packet_class.json is EventJSON
@@ -0,0 +1,209 @@
+"""
+Tests for per-user and per-workflow Socket.IO rooms.
+"""
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.security import create_access_token
+from app.interface.ws.event_buffer import EventReplayBuffer
+from app.interface.ws.rate_limiter import connection_rate_limiter
+from app.interface.ws.socket_manager import SocketManager, user_room, workflow_room
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limiter():
+    connection_rate_limiter.reset()
+    yield
+    connection_rate_limiter.reset()
+
+
+async def connect(manager, eio_sid, user_id, namespace="/"):
+    """Register a transport connection, then run the connect handler."""
+    sid = await manager.sio.manager.connect(eio_sid, namespace)
+    auth = {"token": create_access_token({"sub": user_id})}
+    await manager._on_connect(sid, {"REMOTE_ADDR": eio_sid}, auth, namespace)
+    return sid
+
+
+@pytest.fixture
+def manager():
+    # No workflow is owned in the database unless a test says otherwise
+    manager = SocketManager(owner_lookup=AsyncMock(return_value=None))
+    manager.sio._send_eio_packet = AsyncMock()
+    return manager
+
+
+def recipients(manager):
+    """Engine.IO sessions that received a packet."""
+    return {call.args[0] for call in manager.sio._send_eio_packet.await_args_list}
+
+
+class TestSocketRooms:
+    async def test_connect_joins_user_room(self, manager):
+        sid = await connect(manager, "eio-a", "user-a")
+
+        assert manager.sio.manager.rooms["/"][user_room("user-a")][sid] == "eio-a"
+
+    async def test_owner_receives_workflow_events_without_subscribing(self, manager):
+        await connect(manager, "eio-a", "user-a")
+        await connect(manager, "eio-b", "user-b")
+        manager.register_workflow("wf-1", "user-a")
+
+        await manager.emit_thought("wf-1", "thinking")
+
+        assert recipients(manager) == {"eio-a"}
+
+    async def test_subscribers_receive_unowned_workflow_events(self, manager):
+        sid_a = await connect(manager, "eio-a", "user-a")
+        await connect(manager, "eio-b", "user-b")
+
+        ack = await manager._on_subscribe(sid_a, {"workflowId": "wf-2"})
+        await manager.emit_result("wf-2", {"finalCopy": "done"})
+
+        assert ack == {"ok": True, "workflowId": "wf-2"}
+        assert recipients(manager) == {"eio-a"}
+
+    async def test_other_users_cannot_subscribe_to_owned_workflow(self, manager):
+        sid_b = await connect(manager, "eio-b", "user-b")
+        manager.register_workflow("wf-1", "user-a")
+
+        ack = await manager._on_subscribe(sid_b, {"workflowId": "wf-1"})
+
+        assert ack["ok"] is False
+        assert workflow_room("wf-1") not in manager.sio.manager.rooms["/"]
+
+    async def test_owner_from_database_guards_workflow_of_other_worker(self, manager):
+        manager._owner_lookup.return_value = "user-a"
+        sid_a = await connect(manager, "eio-a", "user-a")
+        sid_b = await connect(manager, "eio-b", "user-b")
+
+        denied = await manager._on_subscribe(sid_b, {"workflowId": "wf-1"})
+        allowed = await manager._on_subscribe(sid_a, {"workflowId": "wf-1"})
+
+        assert denied["ok"] is False
+        assert allowed == {"ok": True, "workflowId": "wf-1"}
+        # Looked up once, then remembered like a local registration
+        manager._owner_lookup.assert_awaited_once_with("wf-1")
+        assert manager.get_workflow_owner("wf-1") == "user-a"
+
+    async def test_failed_owner_lookup_denies_subscription(self, manager):
+        manager._owner_lookup.side_effect = ConnectionError("database down")
+        sid_a = await connect(manager, "eio-a", "user-a")
+
+        ack = await manager._on_subscribe(sid_a, {"workflowId": "wf-1"})
+
+        assert ack["ok"] is False
+        assert workflow_room("wf-1") not in manager.sio.manager.rooms["/"]
+
+    async def test_owner_subscribed_twice_gets_one_copy(self, manager):
+        sid_a = await connect(manager, "eio-a", "user-a")
+        manager.register_workflow("wf-1", "user-a")
+        await manager._on_subscribe(sid_a, {"workflowId": "wf-1"})
+
+        await manager.emit_tool_call("wf-1", "image", "in_progress", "rendering")
+
+        assert manager.sio._send_eio_packet.await_count == 1
+
+    async def test_unsubscribe_stops_delivery(self, manager):
+        sid_a = await connect(manager, "eio-a", "user-a")
+        await manager._on_subscribe(sid_a, {"workflowId": "wf-2"})
+        await manager._on_unsubscribe(sid_a, {"workflowId": "wf-2"})
+
+        await manager.emit_error("wf-2", "FAILED", "boom")
+
+        assert recipients(manager) == set()
+
+    async def test_emit_event_uses_payload_workflow(self, manager):
+        await connect(manager, "eio-a", "user-a", namespace="/agents")
+        await connect(manager, "eio-b", "user-b", namespace="/agents")
+        manager.register_workflow("wf-1", "user-b")
+
+        await manager.emit_event({"type": "progress", "workflowId": "wf-1", "data": {}})
+
+        assert recipients(manager) == {"eio-b"}
+
+    async def test_subscribe_requires_workflow_id(self, manager):
+        sid_a = await connect(manager, "eio-a", "user-a")
+
+        assert (await manager._on_subscribe(sid_a, {}))["ok"] is False
+
+    async def test_sid_overrides_rooms(self, manager):
+        with patch.object(manager.sio, "emit", new_callable=AsyncMock) as emit:
+            manager.register_workflow("wf-1", "user-a")
+            await manager.emit_thought("wf-1", "hi", sid="socket-1")
+
+        assert emit.call_args.kwargs["room"] == "socket-1"
+
+
+def delivered_payloads(manager, eio_sid):
+    """Payloads of the events sent to an Engine.IO session, in order."""
+    payloads = []
+    for call in manager.sio._send_eio_packet.await_args_list:
+        if call.args[0] == eio_sid:
+            payloads.append(manager.sio.packet_class(encoded_packet=call.args[1].data).data[1])
+    return payloads
+
+
+class TestEventReplay:
+    async def test_workflow_events_carry_sequence_numbers(self, manager):
+        await connect(manager, "eio-a", "user-a")
+        manager.register_workflow("wf-1", "user-a")
+
+        await manager.emit_thought("wf-1", "one")
+        await manager.emit_thought("wf-1", "two")
+
+        assert [p["seq"] for p in delivered_payloads(manager, "eio-a")] == [1, 2]
+
+    async def test_sid_events_are_not_buffered(self, manager):
+        with patch.object(manager.sio, "emit", new_callable=AsyncMock) as emit:
+            await manager.emit_thought("wf-1", "hi", sid="socket-1")
+
+        assert "seq" not in emit.call_args.args[1]
+        assert manager.replay.last_seq("wf-1") == 0
+
+    async def test_resubscribe_replays_missed_events_then_joins_room(self, manager):
+        for content in ("one", "two", "three"):
+            await manager.emit_thought("wf-2", content)
+        sid_a = await connect(manager, "eio-a", "user-a")
+
+        ack = await manager._on_subscribe(sid_a, {"workflowId": "wf-2", "lastSeq": 1})
+        await manager.emit_thought("wf-2", "four")
+
+        contents = [p["data"]["content"] for p in delivered_payloads(manager, "eio-a")]
+        assert contents == ["two", "three", "four"]
+        assert ack == {"ok": True, "workflowId": "wf-2", "lastSeq": 3, "replayed": 2, "truncated": False, "reset": False}
+
+    async def test_resubscribe_reports_dropped_events(self):
+        manager = SocketManager(
+            replay=EventReplayBuffer(max_events=2), owner_lookup=AsyncMock(return_value=None)
+        )
+        manager.sio._send_eio_packet = AsyncMock()
+        for content in ("one", "two", "three", "four"):
+            await manager.emit_thought("wf-2", content)
+        sid_a = await connect(manager, "eio-a", "user-a")
+
+        ack = await manager._on_subscribe(sid_a, {"workflowId": "wf-2", "lastSeq": 0})
+
+        assert ack["replayed"] == 2
+        assert ack["truncated"] is True
+
+    async def test_resubscribe_after_numbering_restart_asks_for_reset(self, manager):
+        # The client saw seq 1..9 before the buffer was lost (restart, TTL, LRU)
+        await manager.emit_thought("wf-2", "after restart")
+        sid_a = await connect(manager, "eio-a", "user-a")
+
+        ack = await manager._on_subscribe(sid_a, {"workflowId": "wf-2", "lastSeq": 9})
+
+        assert ack["reset"] is True
+        assert ack["truncated"] is True
+        assert ack["replayed"] == 0
+        assert sid_a in manager.sio.manager.rooms["/"][workflow_room("wf-2")]
+
+    async def test_subscribe_rejects_invalid_last_seq(self, manager):
+        sid_a = await connect(manager, "eio-a", "user-a")
+
+        ack = await manager._on_subscribe(sid_a, {"workflowId": "wf-2", "lastSeq": "7"})
+
+        assert ack["ok"] is False
+        assert workflow_room("wf-2") not in manager.sio.manager.rooms["/"]
@@ -0,0 +1,113 @@
+"""
+Integration tests for the video job webhook route.
+"""
+from unittest.mock import AsyncMock
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.infrastructure.video.jobs import (
+    InMemoryVideoJobStore,
+    VideoJobManager,
+    VideoJobProvider,
+    VideoJobStatus,
+)
+from app.interface.routes.video_jobs import require_video_job_manager
+from app.main import fastapi_app
+
+
+class FakeProvider(VideoJobProvider):
+    """Provider that never finishes on its own."""
+
+    name = "fake"
+
+    async def submit(self, prompt, images, duration, callback_url=None):
+        return "provider-job"
+
+    async def poll(self, provider_job_id):
+        return VideoJobStatus(state="pending")
+
+
+@pytest.fixture
+async def manager():
+    """Job manager wired into the route."""
+    manager = VideoJobManager(
+        provider=FakeProvider(),
+        store=InMemoryVideoJobStore(),
+        on_complete=AsyncMock(),
+        webhook_secret="secret",
+    )
+    fastapi_app.dependency_overrides[require_video_job_manager] = lambda: manager
+    yield manager
+    fastapi_app.dependency_overrides.pop(require_video_job_manager, None)
+    await manager.stop()
+
+
+@pytest.fixture
+async def client(manager):
+    """Create async test client."""
+    transport = ASGITransport(app=fastapi_app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+class TestVideoJobWebhook:
+    """Tests for POST /api/v1/video-jobs/{job_id}/webhook."""
+
+    @pytest.mark.asyncio
+    async def test_completes_job(self, client, manager):
+        job = await manager.submit("p", [], 15, "wf-1")
+        token = manager.webhook_token(job.job_id)
+
+        response = await client.post(
+            f"/api/v1/video-jobs/{job.job_id}/webhook?token={token}",
+            json={"status": "succeeded", "url": "https://cdn/v.mp4"},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"job_id": job.job_id, "state": "succeeded"}
+        assert job.result["url"] == "https://cdn/v.mp4"
+
+    @pytest.mark.asyncio
+    async def test_rejects_bad_token(self, client, manager):
+        job = await manager.submit("p", [], 15, "wf-1")
+
+        response = await client.post(
+            f"/api/v1/video-jobs/{job.job_id}/webhook?token=forged",
+            json={"status": "succeeded"},
+        )
+
+        assert response.status_code == 403
+        assert job.state == "pending"
+
+    @pytest.mark.asyncio
+    async def test_unknown_status_is_rejected(self, client, manager):
+        job = await manager.submit("p", [], 15, "wf-1")
+        token = manager.webhook_token(job.job_id)
+
+        response = await client.post(
+            f"/api/v1/video-jobs/{job.job_id}/webhook?token={token}",
+            json={"status": "teleported"},
+        )
+
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_unknown_job(self, client, manager):
+        token = manager.webhook_token("missing")
+
+        response = await client.post(
+            f"/api/v1/video-jobs/missing/webhook?token={token}",
+            json={"status": "succeeded"},
+        )
+
+        assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_disabled_without_manager():
+    """The route 404s when asynchronous video jobs are off."""
+    transport = ASGITransport(app=fastapi_app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post("/api/v1/video-jobs/x/webhook?token=t", json={"status": "done"})
+    assert response.status_code == 404
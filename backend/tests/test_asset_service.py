@@ -259,3 +259,54 @@ class TestAssetService:
         # Should use truncated prompt as title
         assert result.items[0].title is not None
         assert len(result.items[0].title) <= 53  # 50 chars + "..."
+
+    @pytest.mark.asyncio
+    async def test_derivative_urls_exposed(self, service, mock_repository, sample_asset):
+        """Derivatives from metadata populate thumbnail/medium URLs."""
+        sample_asset.metadata = {
+            "derivatives": {
+                "thumbnail": {"webp": "https://cdn/t.webp", "avif": "https://cdn/t.avif"},
+                "medium": {"avif": "https://cdn/m.avif"},
+            }
+        }
+        mock_repository.list_assets.return_value = ([sample_asset], 1)
+
+        result = await service.get_gallery_assets(user_id=uuid4())
+        item = result.items[0]
+
+        assert item.thumbnail_url == "https://cdn/t.webp"
+        assert item.medium_url == "https://cdn/m.avif"
+        assert item.sources["thumbnail"]["avif"] == "https://cdn/t.avif"
+        assert "thumbnailUrl" in item.model_dump(by_alias=True)
+
+    @pytest.mark.asyncio
+    async def test_derivative_urls_fall_back_to_original(self, service, mock_repository, sample_asset):
+        """Images without derivatives use the original URL for every size."""
+        mock_repository.list_assets.return_value = ([sample_asset], 1)
+
+        result = await service.get_gallery_assets(user_id=uuid4())
+        item = result.items[0]
+
+        assert item.thumbnail_url == sample_asset.url
+        assert item.medium_url == sample_asset.url
+        assert item.sources is None
+
+    @pytest.mark.asyncio
+    async def test_urls_presigned_in_one_bulk_pass(self, mock_repository, sample_asset):
+        """With a signer, every URL of the page is signed in a single call."""
+        sample_asset.metadata = {
+            "derivatives": {"thumbnail": {"webp": "https://example.com/image_thumbnail.webp"}}
+        }
+        signer = MagicMock()
+        signer.sign_many.side_effect = lambda urls: [f"{url}?sig" if url else url for url in urls]
+        service = AssetService(mock_repository, url_signer=signer)
+        mock_repository.list_assets.return_value = ([sample_asset, sample_asset], 2)
+
+        result = await service.get_gallery_assets(user_id=uuid4())
+
+        signer.sign_many.assert_called_once()
+        item = result.items[0]
+        assert item.url == "https://example.com/image.png?sig"
+        assert item.thumbnail_url == "https://example.com/image_thumbnail.webp?sig"
+        assert item.medium_url == "https://example.com/image.png?sig"
+        assert item.sources == {"thumbnail": {"webp": "https://example.com/image_thumbnail.webp?sig"}}
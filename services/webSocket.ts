@@ -22,6 +22,7 @@ export interface ThoughtEvent {
         content: string;
     };
     timestamp: string;
+    seq?: number;  // Per-workflow sequence number (for replay after reconnect)
 }
 
 export interface ResultEvent {
@@ -33,6 +34,7 @@ export interface ResultEvent {
         [key: string]: unknown;
     };
     timestamp: string;
+    seq?: number;  // Per-workflow sequence number (for replay after reconnect)
 }
 
 export interface ErrorEvent {
@@ -44,6 +46,7 @@ export interface ErrorEvent {
         details?: unknown;
     };
     timestamp: string;
+    seq?: number;  // Per-workflow sequence number (for replay after reconnect)
 }
 
 export interface ToolCallEvent {
@@ -55,6 +58,7 @@ export interface ToolCallEvent {
         message: string;
     };
     timestamp: string;
+    seq?: number;  // Per-workflow sequence number (for replay after reconnect)
 }
 
 export type AgentEvent = ThoughtEvent | ResultEvent | ErrorEvent | ToolCallEvent;
@@ -67,8 +71,22 @@ export interface SocketEventHandlers {
     onConnect?: () => void;
     onDisconnect?: (reason: string) => void;
     onConnectError?: (error: Error) => void;
+    onResyncRequired?: (workflowId: string) => void;  // Missed events are gone; refetch status
 }
 
+interface SubscribeAck {
+    ok: boolean;
+    workflowId?: string;
+    error?: string;
+    lastSeq?: number;
+    replayed?: number;
+    truncated?: boolean;
+    reset?: boolean;  // Server numbering restarted; seen sequence numbers are stale
+}
+
+// Sequence numbers remembered for de-duplication (server buffers 500 per workflow)
+const MAX_SEEN_SEQS = 1000;
+
 // =====================
 // Socket Manager
 // =====================
@@ -77,6 +95,9 @@ class WebSocketService {
     private socket: Socket | null = null;
     private handlers: SocketEventHandlers = {};
     private workflowId: string | null = null;
+    private lastSeq = 0;
+    private resumeSeq = 0;
+    private seenSeqs = new Set<number>();
 
     /**
      * Connect to Socket.io server with authentication
@@ -115,10 +136,58 @@ class WebSocketService {
     }
 
     /**
-     * Set the active workflow ID for filtering events
+     * Set the active workflow ID for filtering events and join its room
      */
     setWorkflowId(workflowId: string): void {
         this.workflowId = workflowId;
+        this.lastSeq = 0;
+        this.resumeSeq = 0;
+        this.seenSeqs.clear();
+        this.subscribeWorkflow();
+    }
+
+    /**
+     * Join the active workflow's room (events are only sent to subscribers).
+     * The server first replays the buffered events after resumeSeq.
+     */
+    private subscribeWorkflow(): void {
+        if (this.socket?.connected && this.workflowId) {
+            const workflowId = this.workflowId;
+            this.socket.emit('subscribe', { workflowId, lastSeq: this.resumeSeq }, (ack: SubscribeAck) => {
+                if (workflowId !== this.workflowId) return;
+                if (ack?.truncated) {
+                    console.warn('[WebSocket] Some missed events are no longer buffered:', workflowId);
+                    this.handlers.onResyncRequired?.(workflowId);
+                }
+                if (ack?.reset) {
+                    // New numbering would collide with seqs seen before; start over
+                    // and fetch whatever the server buffered since the restart
+                    this.lastSeq = 0;
+                    this.resumeSeq = 0;
+                    this.seenSeqs.clear();
+                    this.subscribeWorkflow();
+                }
+            });
+        }
+    }
+
+    /**
+     * Whether an event belongs to the active workflow and has not been seen
+     * (replayed events may overlap with live ones after a reconnect)
+     */
+    private accept(event: AgentEvent): boolean {
+        // Ignore all agent events until the current workflowId is known.
+        if (!this.workflowId || event.workflowId !== this.workflowId) return false;
+        if (typeof event.seq !== 'number') return true;
+        if (this.seenSeqs.has(event.seq)) return false;
+        this.seenSeqs.add(event.seq);
+        this.lastSeq = Math.max(this.lastSeq, event.seq);
+        if (this.seenSeqs.size > MAX_SEEN_SEQS) {
+            for (const seq of this.seenSeqs) {
+                if (seq <= this.lastSeq - MAX_SEEN_SEQS / 2) this.seenSeqs.delete(seq);
+            }
+        }
+        return true;
     }
 
     /**
@@ -137,11 +206,15 @@ class WebSocketService {
         // Connection events
         this.socket.on('connect', () => {
             console.log('[WebSocket] Connected');
+            // Rooms do not survive a reconnect
+            this.subscribeWorkflow();
             this.handlers.onConnect?.();
         });
 
         this.socket.on('disconnect', (reason) => {
             console.log('[WebSocket] Disconnected:', reason);
+            // Resume from here; live events may arrive before the resubscribe
+            this.resumeSeq = this.lastSeq;
             this.handlers.onDisconnect?.(reason);
         });
 
@@ -153,33 +226,28 @@ class WebSocketService {
         // Agent events
         this.socket.on('agent:thought', (event: ThoughtEvent) => {
             console.log('[WebSocket] Thought:', event);
-            // Ignore all agent events until the current workflowId is known.
-            if (!this.workflowId) return;
-            if (event.workflowId === this.workflowId) {
+            if (this.accept(event)) {
                 this.handlers.onThought?.(event);
             }
         });
 
         this.socket.on('agent:result', (event: ResultEvent) => {
             console.log('[WebSocket] Result:', event);
-            if (!this.workflowId) return;
-            if (event.workflowId === this.workflowId) {
+            if (this.accept(event)) {
                 this.handlers.onResult?.(event);
             }
         });
 
         this.socket.on('agent:error', (event: ErrorEvent) => {
             console.error('[WebSocket] Error:', event);
-            if (!this.workflowId) return;
-            if (event.workflowId === this.workflowId) {
+            if (this.accept(event)) {
                 this.handlers.onError?.(event);
             }
         });
 
         this.socket.on('agent:tool_call', (event: ToolCallEvent) => {
             console.log('[WebSocket] Tool call:', event);
-            if (!this.workflowId) return;
-            if (event.workflowId === this.workflowId) {
+            if (this.accept(event)) {
                 this.handlers.onToolCall?.(event);
             }
         });
@@ -196,6 +264,9 @@ class WebSocketService {
         }
         this.handlers = {};
         this.workflowId = null;
+        this.lastSeq = 0;
+        this.resumeSeq = 0;
+        this.seenSeqs.clear();
         console.log('[WebSocket] Cleaned up');
     }
 